@@ -24,6 +24,22 @@ var board_data: Dictionary = {}
 enum AIDifficulty { EASY, MEDIUM, HARD }
 var ai_difficulty: AIDifficulty = AIDifficulty.MEDIUM
 
+# Solved placements for HARD, built by tools/content_editor/board_solver.py
+const BOARD_BOOK_PATH = "res://resources/board_book.json"
+# Rotations and reflections of the grid: transformed cell i is cell perm[i] (row-major)
+const BOARD_SYMMETRIES = [
+	[0, 1, 2, 3, 4, 5, 6, 7, 8],
+	[2, 5, 8, 1, 4, 7, 0, 3, 6],
+	[8, 7, 6, 5, 4, 3, 2, 1, 0],
+	[6, 3, 0, 7, 4, 1, 8, 5, 2],
+	[2, 1, 0, 5, 4, 3, 8, 7, 6],
+	[6, 7, 8, 3, 4, 5, 0, 1, 2],
+	[0, 3, 6, 1, 4, 7, 2, 5, 8],
+	[8, 5, 2, 7, 4, 1, 6, 3, 0]
+]
+var board_book: Dictionary = {}  # "board_code:enemy_reserve:player_reserve" -> [cell mask, value * 1000]
+var board_book_loaded: bool = false
+
 # References
 @onready var grid_container = $GridContainer
 @onready var turn_label = $UI/TurnLabel
@@ -109,7 +125,18 @@ var ability_tooltip: Control = null
 # Results animator
 var results_animator: BattleResultsAnimator = null
 
+# Replay log, one JSON line per finished battle (read by tools/content_editor/replay.py)
+const REPLAY_DIR = "user://replays/"
+const REPLAY_VERSION = 1
+var replay_seed: int = 0
+var replay_turns: Array = []  # Per turn: [player actions, enemy actions]; action = [unit index, cell, ability index]
+var replay_abilities: Dictionary = {}  # UnitInstance -> ability index last written to the replay
+
 func _ready():
+	# Seed the battle so its replay records the RNG state it started from
+	replay_seed = randi()
+	seed(replay_seed)
+
 	# Load chapter-specific theme (board and cells)
 	_load_chapter_theme()
 
@@ -215,7 +242,7 @@ func _load_chapter_theme():
 
 	# Center position for the grid (where GridContainer is)
 	var center_pos = $GridContainer.position
-	board_data = board_builder.build_board(self, theme_name, center_pos)
+	board_data = board_builder.build_board(self, theme_name, center_pos, chapter)
 
 	# Move board behind GridContainer
 	move_child(board_data["root"], get_node("GridContainer").get_index())
@@ -727,12 +754,17 @@ func _do_enemy_turn():
 
 	var ai_actions = min(ACTIONS_PER_TURN, min(available_cells.size(), available_units.size()))
 
+	# HARD plays the solved cells when the position is in the board book
+	var book_cells = []
+	if ai_difficulty == AIDifficulty.HARD:
+		book_cells = _get_board_book_cells(available_cells, available_units.size())
+
 	for i in range(ai_actions):
 		if available_cells.is_empty() or available_units.is_empty():
 			break
 
 		var unit = available_units.pop_front()
-		var cell = _select_cell_by_difficulty(available_cells)
+		var cell = book_cells[i] if i < book_cells.size() else _select_cell_by_difficulty(available_cells)
 		available_cells.erase(cell)
 
 		# Enemy picks a random ability
@@ -796,6 +828,59 @@ func _select_cell_by_difficulty(available_cells: Array) -> Dictionary:
 
 	return selected_cell
 
+func _load_board_book():
+	board_book_loaded = true
+	if not FileAccess.file_exists(BOARD_BOOK_PATH):
+		push_warning("Board book missing: " + BOARD_BOOK_PATH + " (run tools/content_editor/board_solver.py)")
+		return
+	var data = JSON.parse_string(FileAccess.get_file_as_string(BOARD_BOOK_PATH))
+	if data is Dictionary:
+		board_book = data.get("positions", {})
+	else:
+		push_warning("Board book is not valid JSON: " + BOARD_BOOK_PATH)
+
+func _get_board_book_cells(available_cells: Array, enemy_reserve: int) -> Array:
+	# Looks the position up by its symmetry-reduced board and both sides' units in reserve.
+	# Returns [] when it isn't booked, so the heuristic picks instead.
+	if not board_book_loaded:
+		_load_board_book()
+	if board_book.is_empty():
+		return []
+
+	var best_code = -1
+	var best_perm = BOARD_SYMMETRIES[0]
+	for perm in BOARD_SYMMETRIES:
+		var code = 0
+		for i in range(GRID_SIZE * GRID_SIZE):
+			code |= grid_ownership[perm[i] / GRID_SIZE][perm[i] % GRID_SIZE] << (2 * i)
+		if best_code < 0 or code < best_code:
+			best_code = code
+			best_perm = perm
+
+	# Pending placements are hidden from the enemy: count the player's units off the grid
+	var player_reserve = player_units.filter(func(u): return u.is_alive()).size()
+	for row in range(GRID_SIZE):
+		for col in range(GRID_SIZE):
+			if grid_player_units[row][col] != null:
+				player_reserve -= 1
+
+	var entry = board_book.get("%d:%d:%d" % [best_code, enemy_reserve, player_reserve])
+	if entry == null:
+		return []
+
+	var mask = int(entry[0])
+	var cells = []
+	for i in range(GRID_SIZE * GRID_SIZE):
+		if (mask & (1 << i)) == 0:
+			continue
+		var cell = best_perm[i]
+		var match_index = available_cells.find({"row": cell / GRID_SIZE, "col": cell % GRID_SIZE})
+		if match_index < 0:
+			return []
+		cells.append(available_cells[match_index])
+	print("Board book: ", cells.size(), " cells, value ", int(entry[1]) / 1000.0)
+	return cells
+
 func _is_cell_being_vacated(row: int, col: int) -> bool:
 	# Check if there's a pending move FROM this cell
 	for move in player_pending_moves:
@@ -892,6 +977,7 @@ func _resolve_turn():
 	print("=== Resolving Turn ===")
 	current_phase = GamePhase.RESOLVING
 	_update_ui()
+	_record_replay_turn()
 
 	# First, process player moves (vacate old squares)
 	for move in player_pending_moves:
@@ -1547,6 +1633,85 @@ func _calculate_team_hp_percent(units: Array) -> float:
 
 	return total_current_hp / total_max_hp
 
+# --- Replays ---
+
+func _record_replay_turn():
+	# Placements, moves and ability changes of both sides, before they resolve
+	var sides = []
+	for side in [1, 2]:
+		var units = player_units if side == 1 else enemy_units
+		var targets = {}
+		for placement in (player_pending_placements if side == 1 else enemy_pending_placements):
+			targets[placement.unit] = placement.row * GRID_SIZE + placement.col
+		if side == 1:
+			for move in player_pending_moves:
+				targets[move.unit] = move.to_row * GRID_SIZE + move.to_col
+
+		var actions = []
+		for i in range(units.size()):
+			var unit = units[i]
+			var ability = unit.selected_ability_index
+			if targets.has(unit):
+				actions.append([i, targets[unit], ability])
+			elif unit.is_placed() and replay_abilities.get(unit, ability) != ability:
+				actions.append([i, -1, ability])  # Ability changed while on the grid
+			else:
+				continue
+			replay_abilities[unit] = ability
+		sides.append(actions)
+	replay_turns.append(sides)
+
+func _write_replay(winner: int):
+	# Append the battle to today's replay file
+	var teams = []
+	for units in [player_units, enemy_units]:
+		var team = []
+		for unit in units:
+			team.append([unit.unit_data.unit_id, unit.level, unit.imprint_level, unit.max_hp])
+		teams.append(team)
+
+	var record = {
+		"v": REPLAY_VERSION,
+		"seed": replay_seed,
+		"time": int(Time.get_unix_time_from_system()),
+		"difficulty": AIDifficulty.keys()[ai_difficulty].to_lower(),
+		"teams": teams,
+		"turns": replay_turns,
+		"result": {
+			"winner": winner,
+			"turn": current_turn,
+			"knockouts": [player_knockouts, enemy_knockouts],
+			"hp": [_sum_team_hp(player_units), _sum_team_hp(enemy_units)]
+		}
+	}
+	if PlayerData.pvp_mode:
+		record["mode"] = "pvp"
+	elif PlayerData.is_campaign_mode():
+		record["mode"] = "campaign"
+		record["stage"] = PlayerData.current_stage_id
+	elif PlayerData.is_dungeon_mode():
+		record["mode"] = "dungeon"
+		record["dungeon"] = PlayerData.current_dungeon.dungeon_id
+		record["tier"] = PlayerData.current_dungeon_tier
+	else:
+		record["mode"] = "random"
+
+	DirAccess.make_dir_recursive_absolute(REPLAY_DIR)
+	var path = REPLAY_DIR + Time.get_date_string_from_system() + ".jsonl"
+	var file = FileAccess.open(path, FileAccess.READ_WRITE if FileAccess.file_exists(path) else FileAccess.WRITE)
+	if file == null:
+		push_warning("Could not write replay: " + path)
+		return
+	file.seek_end()
+	file.store_line(JSON.stringify(record))
+	file.close()
+
+func _sum_team_hp(units: Array) -> int:
+	var total = 0
+	for unit in units:
+		total += max(0, unit.current_hp)
+	return total
+
 ## Revive a knocked out unit with a percentage of max HP
 ## Call this from revive abilities. Adjusts knockout counter.
 ## Returns true if unit was successfully revived
@@ -1915,6 +2080,8 @@ func _update_roster_selection():
 			display.set_selected(false)
 
 func _show_results(winner: int):
+	_write_replay(winner)
+
 	# Hide other UI elements first
 	if ability_panel:
 		ability_panel.visible = false
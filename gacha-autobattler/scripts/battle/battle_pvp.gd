@@ -255,6 +255,7 @@ func _resolve_turn_combat():
 	print("=== Resolving Combat ===")
 	current_phase = GamePhase.RESOLVING
 	_update_ui()
+	_record_replay_turn()
 
 	# Process player moves
 	for move in player_pending_moves:
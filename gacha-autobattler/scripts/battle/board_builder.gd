@@ -34,7 +34,7 @@ const BOARD_DISPLAY_SIZE = Vector2(432, 432)  # 9 tiles * 48px
 var board_root: Node2D
 
 
-func build_board(parent: Node2D, theme_name: String, center_position: Vector2) -> Dictionary:
+func build_board(parent: Node2D, theme_name: String, center_position: Vector2, chapter: int = 0) -> Dictionary:
 	"""Load a background image and position it centered on the grid."""
 
 	# Create container
@@ -42,9 +42,11 @@ func build_board(parent: Node2D, theme_name: String, center_position: Vector2) -
 	board_root.name = "BoardRoot"
 	parent.add_child(board_root)
 
-	# Pick a random board image for this theme
-	var boards = BOARD_IMAGES.get(theme_name, BOARD_IMAGES["dungeon"])
-	var board_path = boards[randi() % boards.size()]
+	# Prefer a farmed variant for the chapter, else pick a random board image for this theme
+	var board_path = BoardAssetLoader.pick_board_variant(chapter) if chapter > 0 else ""
+	if board_path.is_empty() or not ResourceLoader.exists(board_path):
+		var boards = BOARD_IMAGES.get(theme_name, BOARD_IMAGES["dungeon"])
+		board_path = boards[randi() % boards.size()]
 
 	# Load and create the background sprite
 	var texture = load(board_path)
@@ -53,6 +55,8 @@ func build_board(parent: Node2D, theme_name: String, center_position: Vector2) -
 		background.texture = texture
 		background.centered = true
 		background.position = Vector2.ZERO  # Centered on board_root
+		# Pixel art boards (including native-resolution exports) upscale crisply
+		background.texture_filter = CanvasItem.TEXTURE_FILTER_NEAREST
 
 		# Scale to fit our display size
 		var tex_size = texture.get_size()
@@ -12,6 +12,7 @@ const BASE_PATH = "res://assets/board/"
 const BASE_GRID_PATH = BASE_PATH + "base/grid.png"
 const OWNERSHIP_PATH = BASE_PATH + "ownership/"
 const FIELD_EFFECTS_PATH = BASE_PATH + "field_effects/"
+const VARIANT_INDEX_PATH = BASE_PATH + "variants/index.json"
 
 # Current chapter (affects which themed assets to load)
 var current_chapter: int = 0
@@ -21,6 +22,9 @@ var _base_grid: Texture2D = null
 var _ownership_textures: Dictionary = {}  # {chapter: {Ownership: Texture2D}}
 var _field_effect_textures: Dictionary = {}  # {chapter: {FieldEffect: Texture2D}}
 
+# Seeded board variants from tools/board_variants.py (keyed by chapter)
+var _board_variants: Dictionary = {}  # {chapter: [res:// path]}
+
 
 func _ready():
 	_preload_assets()
@@ -36,6 +40,8 @@ func set_chapter(chapter: int):
 
 func _preload_assets():
 	"""Preload default board assets for quick access."""
+	_load_board_variants()
+
 	# Load base grid
 	if ResourceLoader.exists(BASE_GRID_PATH):
 		_base_grid = load(BASE_GRID_PATH)
@@ -93,6 +99,33 @@ func _load_chapter_assets(chapter: int):
 				_field_effect_textures[chapter][effect] = load(fallback)
 
 
+func _load_board_variants():
+	"""Read the board variant index written by tools/board_variants.py."""
+	if not FileAccess.file_exists(VARIANT_INDEX_PATH):
+		return
+
+	var data = JSON.parse_string(FileAccess.get_file_as_string(VARIANT_INDEX_PATH))
+	if not (data is Dictionary):
+		push_warning("BoardAssetLoader: could not parse " + VARIANT_INDEX_PATH)
+		return
+
+	var themes = data.get("themes", {})
+	for theme_name in themes:
+		var entry = themes[theme_name]
+		for variant in entry.get("variants", []):
+			var path = BASE_PATH + variant["path"]
+			for chapter in entry.get("chapters", []):
+				_board_variants.get_or_add(int(chapter), []).append(path)
+
+
+func pick_board_variant(chapter: int) -> String:
+	"""Pick a random farmed board variant for a chapter ("" if none were generated)."""
+	var variants = _board_variants.get(chapter, [])
+	if variants.is_empty():
+		return ""
+	return variants[randi() % variants.size()]
+
+
 func get_base_grid() -> Texture2D:
 	"""Get the base grid texture."""
 	return _base_grid
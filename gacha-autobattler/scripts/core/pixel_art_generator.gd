@@ -40,6 +40,8 @@ enum AnimFrame { IDLE, ATTACK, HURT, SPECIAL }
 static var texture_cache: Dictionary = {}
 static var anim_cache: Dictionary = {}  # Cache for animation frames
 
+const GENERATOR_VERSION = 1  # Bump with any drawing change; tools/content_editor/pixel_atlas.py must be ported to match
+
 # === MAIN GENERATION FUNCTIONS ===
 
 static func generate_unit_texture(unit_data: UnitData, frame: AnimFrame = AnimFrame.IDLE) -> ImageTexture:
@@ -52,6 +54,11 @@ static func generate_unit_texture(unit_data: UnitData, frame: AnimFrame = AnimFr
 		return texture_cache[cache_key]
 
 	# Generate new texture
+	var texture = ImageTexture.create_from_image(draw_unit_image(unit_data, frame))
+	texture_cache[cache_key] = texture
+	return texture
+
+static func draw_unit_image(unit_data: UnitData, frame: AnimFrame = AnimFrame.IDLE) -> Image:
 	var image = Image.create(SPRITE_SIZE, SPRITE_SIZE, false, Image.FORMAT_RGBA8)
 	image.fill(Color(0, 0, 0, 0))  # Transparent background
 
@@ -92,9 +99,7 @@ static func generate_unit_texture(unit_data: UnitData, frame: AnimFrame = AnimFr
 	elif unit_data.star_rating >= 4:
 		_add_subtle_glow(image, rarity_color)
 
-	var texture = ImageTexture.create_from_image(image)
-	texture_cache[cache_key] = texture
-	return texture
+	return image
 
 static func _determine_class(unit_id: String) -> UnitClass:
 	var id_lower = unit_id.to_lower()
@@ -73,12 +73,23 @@ var unit_pool_5_star: Array[UnitData] = []
 # Unit paths for save/load (maps unit_id to resource path)
 var unit_paths: Dictionary = {}
 
+# Pre-indexed catalog (unit pools, gear templates, ids to paths)
+const CONTENT_PACK_PATH = "res://resources/content_pack.json"
+var content_pack: Dictionary = {}
+
+# Precomputed stats per unit/level/imprint and gear bonus per level
+const STAT_TABLES_PATH = "res://resources/stat_tables.json"
+const UNIT_TABLE_COLUMNS: int = 5  # max_hp, attack, defense, speed, cp
+var unit_stat_tables: Dictionary = {}  # {unit_id: {max_level: int, stats: Array}}
+var gear_stat_tables: Dictionary = {}  # {gear_id: {stat_type: int, percentage: bool, values: Array}}
+
 const MIN_UNITS_REQUIRED: int = 3  # Minimum units needed for battle
 
 func _ready():
+	_load_content_pack()
+	_load_stat_tables()
 	_load_unit_pools()
 	_build_unit_paths()
-	_load_gear_templates()
 	if not load_game():
 		# No save file - give starter units to new players
 		_give_starter_units()
@@ -86,45 +97,40 @@ func _ready():
 		# Ensure player has minimum units (safety net for corruption/edge cases)
 		_ensure_minimum_units()
 
+func _load_content_pack():
+	# Catalog index compiled by tools/content_editor/content_pack.py
+	if not FileAccess.file_exists(CONTENT_PACK_PATH):
+		push_error("Content pack missing: " + CONTENT_PACK_PATH + " (run tools/content_editor/content_pack.py)")
+		return
+	var data = JSON.parse_string(FileAccess.get_file_as_string(CONTENT_PACK_PATH))
+	if data is Dictionary:
+		content_pack = data
+	else:
+		push_error("Content pack is not valid JSON: " + CONTENT_PACK_PATH)
+
+func _load_stat_tables():
+	# Lookup tables built by tools/content_editor/stat_tables.py; the formulas cover anything missing
+	if not FileAccess.file_exists(STAT_TABLES_PATH):
+		push_warning("Stat tables missing: " + STAT_TABLES_PATH + " (run tools/content_editor/stat_tables.py)")
+		return
+	var data = JSON.parse_string(FileAccess.get_file_as_string(STAT_TABLES_PATH))
+	if data is Dictionary:
+		unit_stat_tables = data.get("units", {})
+		gear_stat_tables = data.get("gear", {})
+	else:
+		push_error("Stat tables are not valid JSON: " + STAT_TABLES_PATH)
+
 func _load_unit_pools():
-	# Load all available units and sort by rarity
-	var all_units: Array[UnitData] = []
-
-	# Fire units
-	all_units.append(load("res://resources/units/fire_warrior.tres") as UnitData)
-	all_units.append(load("res://resources/units/ember.tres") as UnitData)
-	all_units.append(load("res://resources/units/vance.tres") as UnitData)  # v0.17
-
-	# Water units
-	all_units.append(load("res://resources/units/water_mage.tres") as UnitData)
-	all_units.append(load("res://resources/units/coral.tres") as UnitData)
-
-	# Nature units
-	all_units.append(load("res://resources/units/nature_tank.tres") as UnitData)
-	all_units.append(load("res://resources/units/nature_wisp.tres") as UnitData)
-	all_units.append(load("res://resources/units/ursok.tres") as UnitData)  # v0.17
-	all_units.append(load("res://resources/units/fenris.tres") as UnitData)  # v0.17
-
-	# Light units
-	all_units.append(load("res://resources/units/spark.tres") as UnitData)
-	all_units.append(load("res://resources/units/radiant_paladin.tres") as UnitData)
-
-	# Dark units
-	all_units.append(load("res://resources/units/shadow_scout.tres") as UnitData)
-	all_units.append(load("res://resources/units/dark_knight.tres") as UnitData)
-	all_units.append(load("res://resources/units/gravebane.tres") as UnitData)  # v0.17
-	all_units.append(load("res://resources/units/shade.tres") as UnitData)  # v0.17
-
-	# Sort into pools by star rating
-	for unit in all_units:
-		if unit:
-			match unit.star_rating:
-				3:
-					unit_pool_3_star.append(unit)
-				4:
-					unit_pool_4_star.append(unit)
-				5:
-					unit_pool_5_star.append(unit)
+	# Pool membership comes from the content pack; only summonable units are loaded
+	var pools = content_pack.get("unit_pools", {})
+	var units = content_pack.get("units", {})
+	var targets = {"3": unit_pool_3_star, "4": unit_pool_4_star, "5": unit_pool_5_star}
+
+	for stars in targets:
+		for unit_id in pools.get(stars, []):
+			var unit = load(units[unit_id]["path"]) as UnitData
+			if unit:
+				targets[stars].append(unit)
 
 	print("Loaded unit pools - 3★: ", unit_pool_3_star.size(), ", 4★: ", unit_pool_4_star.size(), ", 5★: ", unit_pool_5_star.size())
 
@@ -170,60 +176,22 @@ func _ensure_minimum_units():
 	save_game()
 
 func _build_unit_paths():
-	# Build a mapping of unit_id to resource path for save/load
-	var unit_files = [
-		"res://resources/units/fire_warrior.tres",
-		"res://resources/units/fire_imp.tres",
-		"res://resources/units/water_mage.tres",
-		"res://resources/units/water_sprite.tres",
-		"res://resources/units/nature_tank.tres",
-		"res://resources/units/nature_wisp.tres",
-		"res://resources/units/light_cleric.tres",
-		"res://resources/units/radiant_paladin.tres",
-		"res://resources/units/shadow_scout.tres",
-		"res://resources/units/dark_knight.tres",
-		# v0.15 units
-		"res://resources/units/ember.tres",
-		"res://resources/units/coral.tres",
-		"res://resources/units/spark.tres",
-		# v0.17 units
-		"res://resources/units/gravebane.tres",
-		"res://resources/units/ursok.tres",
-		"res://resources/units/shade.tres",
-		"res://resources/units/fenris.tres",
-		"res://resources/units/vance.tres"
-	]
-
-	for path in unit_files:
-		var unit_data = load(path) as UnitData
-		if unit_data:
-			unit_paths[unit_data.unit_id] = path
-
-# Gear template paths for generating drops
-var gear_templates: Dictionary = {}  # {stat_type: {rarity: [GearData]}}
-
-func _load_gear_templates():
-	# Initialize structure
-	for stat in GearData.StatType.values():
-		gear_templates[stat] = {}
-		for rarity in GearData.GearRarity.values():
-			gear_templates[stat][rarity] = []
-
-	# Load all gear resources
-	var gear_dir = "res://resources/gear/"
-	var dir = DirAccess.open(gear_dir)
-	if dir:
-		dir.list_dir_begin()
-		var file_name = dir.get_next()
-		while file_name != "":
-			if file_name.ends_with(".tres"):
-				var gear = load(gear_dir + file_name) as GearData
-				if gear:
-					gear_templates[gear.stat_type][gear.rarity].append(gear)
-			file_name = dir.get_next()
-		dir.list_dir_end()
-
-	print("Loaded gear templates")
+	# Map unit_id to resource path for save/load (includes retired units)
+	var units = content_pack.get("units", {})
+	for unit_id in units:
+		if not units[unit_id].get("monster", false):
+			unit_paths[unit_id] = units[unit_id]["path"]
+
+# Gear templates for generating drops, loaded on first use
+var gear_templates: Dictionary = {}  # {gear_id: GearData}
+
+func _load_gear_template(gear_id: String) -> GearData:
+	if not gear_templates.has(gear_id):
+		var entry = content_pack.get("gear", {}).get(gear_id)
+		gear_templates[gear_id] = null
+		if entry:
+			gear_templates[gear_id] = load(entry["path"]) as GearData
+	return gear_templates[gear_id]
 
 func can_afford_single() -> bool:
 	return gems >= SINGLE_PULL_COST
@@ -604,8 +572,29 @@ func add_xp_to_unit(instance_id: String, xp_amount: int) -> Dictionary:
 
 	return result
 
+func _unit_table_row(unit_data: UnitData, level: int, imprint_level: int) -> int:
+	# Index of the unit's [max_hp, attack, defense, speed, cp] row in its stat table, or -1
+	var table = unit_stat_tables.get(unit_data.unit_id)
+	if table == null:
+		return -1
+	var max_level = int(table["max_level"])
+	var row = ((imprint_level * max_level) + level - 1) * UNIT_TABLE_COLUMNS
+	if level < 1 or level > max_level or imprint_level < 0 or row + UNIT_TABLE_COLUMNS > table["stats"].size():
+		return -1
+	return row
+
 func get_unit_stats_at_level(unit_data: UnitData, level: int, imprint_level: int = 0) -> Dictionary:
 	# Calculate stats for a unit at a specific level
+	var row = _unit_table_row(unit_data, level, imprint_level)
+	if row >= 0:
+		var stats = unit_stat_tables[unit_data.unit_id]["stats"]
+		return {
+			"max_hp": int(stats[row]),
+			"attack": int(stats[row + 1]),
+			"defense": int(stats[row + 2]),
+			"speed": int(stats[row + 3])
+		}
+
 	var level_mult = 1.0 + (STAT_GROWTH_PER_LEVEL * (level - 1))
 	var imprint_mult = 1.0 + (0.05 * imprint_level)  # 5% per imprint level
 	var total_mult = level_mult * imprint_mult
@@ -630,7 +619,12 @@ func calculate_unit_cp(unit_entry: Dictionary) -> int:
 	var stats = get_unit_stats_at_level(unit_data, level, imprint_level)
 
 	# Base CP from stats (HP weighted less since it's larger numbers)
-	var base_cp = int(stats.max_hp / 10.0) + stats.attack + stats.defense + stats.speed
+	var base_cp = 0
+	var row = _unit_table_row(unit_data, level, imprint_level)
+	if row >= 0:
+		base_cp = int(unit_stat_tables[unit_data.unit_id]["stats"][row + 4])
+	else:
+		base_cp = int(stats.max_hp / 10.0) + stats.attack + stats.defense + stats.speed
 
 	# Add gear bonuses
 	var gear_bonuses = get_gear_bonuses(unit_entry.instance_id)
@@ -688,13 +682,7 @@ func get_gear_by_instance_id(instance_id: String) -> Dictionary:
 	return {}
 
 func get_gear_template(gear_id: String) -> GearData:
-	# Find the gear template by gear_id
-	for stat_type in gear_templates:
-		for rarity in gear_templates[stat_type]:
-			for gear in gear_templates[stat_type][rarity]:
-				if gear.gear_id == gear_id:
-					return gear
-	return null
+	return _load_gear_template(gear_id)
 
 func get_gear_equipped_unit(gear_instance_id: String) -> String:
 	for gear in owned_gear:
@@ -853,24 +841,8 @@ func get_gear_bonuses(id: String) -> Dictionary:
 	# Check if this is a gear instance ID (starts with 'g')
 	if id.begins_with("g"):
 		var gear = get_gear_by_instance_id(id)
-		if gear.is_empty():
-			return bonuses
-		var template = get_gear_template(gear.gear_id)
-		if template == null:
-			return bonuses
-
-		var stat_value = template.get_stat_at_level(gear.level)
-		var stat_key = ""
-		match template.stat_type:
-			GearData.StatType.HP: stat_key = "hp"
-			GearData.StatType.ATTACK: stat_key = "attack"
-			GearData.StatType.DEFENSE: stat_key = "defense"
-			GearData.StatType.SPEED: stat_key = "speed"
-
-		if template.is_percentage:
-			bonuses["percent_" + stat_key] += stat_value / 100.0
-		else:
-			bonuses["flat_" + stat_key] += int(stat_value)
+		if not gear.is_empty():
+			_add_gear_bonus(bonuses, gear.gear_id, gear.level)
 		return bonuses
 
 	# Otherwise, treat as unit instance ID and sum all equipped gear
@@ -884,23 +856,42 @@ func get_gear_bonuses(id: String) -> Dictionary:
 		if gear_instance_id != "":
 			var gear = get_gear_by_instance_id(gear_instance_id)
 			if not gear.is_empty():
-				var template = get_gear_template(gear.gear_id)
-				if template:
-					var stat_value = template.get_stat_at_level(gear.level)
-					var stat_key = ""
-					match template.stat_type:
-						GearData.StatType.HP: stat_key = "hp"
-						GearData.StatType.ATTACK: stat_key = "attack"
-						GearData.StatType.DEFENSE: stat_key = "defense"
-						GearData.StatType.SPEED: stat_key = "speed"
-
-					if template.is_percentage:
-						bonuses["percent_" + stat_key] += stat_value / 100.0
-					else:
-						bonuses["flat_" + stat_key] += int(stat_value)
+				_add_gear_bonus(bonuses, gear.gear_id, gear.level)
 
 	return bonuses
 
+func _add_gear_bonus(bonuses: Dictionary, gear_id: String, level: int):
+	# Bonus of one gear piece, from the stat tables when they cover it
+	var stat_type = 0
+	var is_percentage = false
+	var stat_value = 0.0
+	var table = gear_stat_tables.get(gear_id)
+	if table != null and level >= 0 and level < table["values"].size():
+		stat_type = int(table["stat_type"])
+		is_percentage = table["percentage"]
+		stat_value = table["values"][level]
+	else:
+		var template = get_gear_template(gear_id)
+		if template == null:
+			return
+		stat_type = template.stat_type
+		is_percentage = template.is_percentage
+		stat_value = template.get_stat_at_level(level)
+		if is_percentage:
+			stat_value /= 100.0
+
+	var stat_key = ""
+	match stat_type:
+		GearData.StatType.HP: stat_key = "hp"
+		GearData.StatType.ATTACK: stat_key = "attack"
+		GearData.StatType.DEFENSE: stat_key = "defense"
+		GearData.StatType.SPEED: stat_key = "speed"
+
+	if is_percentage:
+		bonuses["percent_" + stat_key] += stat_value
+	else:
+		bonuses["flat_" + stat_key] += int(stat_value)
+
 # --- Dungeon Mode ---
 
 func is_dungeon_mode() -> bool:
@@ -937,11 +928,10 @@ func generate_gear_drop() -> GearData:
 			rarity = i
 			break
 
-	# Get gear from templates
-	if gear_templates.has(stat_type) and gear_templates[stat_type].has(rarity):
-		var templates = gear_templates[stat_type][rarity]
-		if templates.size() > 0:
-			return templates[randi() % templates.size()]
+	# Get gear from templates (keys are strings in the content pack)
+	var templates = content_pack.get("gear_templates", {}).get(str(stat_type), {}).get(str(rarity), [])
+	if templates.size() > 0:
+		return _load_gear_template(templates[randi() % templates.size()])
 
 	return null
 
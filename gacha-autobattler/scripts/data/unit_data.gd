@@ -6,6 +6,7 @@ class_name UnitData
 @export var unit_name: String = "Unit"
 @export var unit_id: String = "unit_001"
 @export var star_rating: int = 3  # 3, 4, or 5 star base
+@export var retired: bool = false  # Still loads for old saves, but is never summoned
 
 # Element: fire, water, nature, dark, light
 @export var element: String = "fire"
@@ -0,0 +1,28 @@
+extends SceneTree
+## Writes every unit's procedural sprites as <unit_id>_<frame>.png, drawn by the GDScript generator
+## For checking tools/content_editor/pixel_atlas.py against it:
+##   godot --headless --script res://scripts/tools/export_pixel_art.gd -- <output dir>
+##   python pixel_atlas.py --parity <output dir>
+
+const UNIT_FOLDERS = ["res://resources/units/", "res://resources/units/monsters/"]
+
+func _init():
+	var args = OS.get_cmdline_user_args()
+	var output_dir = args[0] if args.size() > 0 else "user://pixel_art/"
+	DirAccess.make_dir_recursive_absolute(output_dir)
+
+	var count = 0
+	for folder in UNIT_FOLDERS:
+		for file_name in DirAccess.get_files_at(folder):
+			if not file_name.ends_with(".tres"):
+				continue
+			var unit_data = load(folder + file_name) as UnitData
+			if unit_data == null:
+				continue
+			for frame in PixelArtGenerator.AnimFrame.values():
+				var image = PixelArtGenerator.draw_unit_image(unit_data, frame)
+				image.save_png(output_dir.path_join("%s_%d.png" % [unit_data.unit_id, frame]))
+				count += 1
+
+	print("Wrote %d sprites to %s" % [count, output_dir])
+	quit()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Board Variant Farm
+Generates many seeded variants of each board theme for arena rotation.
+
+Each variant re-renders a theme's board from board_themes.json with a different
+seed (tile fill and decoration scatter) across a worker pool. Results stream
+back in seed order and are written as they arrive. Variants whose perceptual
+hash is within --threshold bits of an already kept variant are dropped as
+near-duplicates. The survivors are listed in assets/board/variants/index.json,
+which BoardAssetLoader samples from.
+
+Variants are saved at native resolution; the index records the display size.
+
+Usage:
+    python board_variants.py
+    python board_variants.py --count 500 --themes forest
+    python board_variants.py --count 200 --start-seed 1000 --threshold 24 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install Pillow")
+    sys.exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from create_battle_board import OUTPUT_DIR, THEME_SPEC_FILE, load_theme_spec, render_board
+from png_optimizer import encode_png
+
+VARIANTS_DIR = OUTPUT_DIR / "variants"
+INDEX_FILE = VARIANTS_DIR / "index.json"
+
+HASH_SIZE = 16  # 16x16 difference hash = 256 bits
+DEFAULT_THRESHOLD = 16  # Max differing hash bits for two boards to count as near-identical
+
+
+def difference_hash(img: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """
+    Perceptual difference hash: shrink to (hash_size + 1) x hash_size grayscale and
+    set one bit per horizontally adjacent pair that gets brighter.
+    """
+    gray = np.asarray(img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def render_variant(board_spec: dict, seed: int) -> tuple[int, int, tuple[int, int], bytes]:
+    """Render and encode one seeded board. Returns (seed, hash, size, png_bytes)."""
+    board = render_board({**board_spec, "seed": seed})
+    data, _ = encode_png(board)
+    return seed, difference_hash(board), board.size, data
+
+
+def is_near_duplicate(phash: int, kept: list[int], threshold: int) -> bool:
+    """Check a hash against every kept hash by Hamming distance."""
+    return any((phash ^ other).bit_count() <= threshold for other in kept)
+
+
+def farm_theme(name: str, theme: dict, display_size: list[int], seeds: range,
+               threshold: int, workers: int | None) -> dict:
+    """Generate, dedupe and save the variants of one theme. Returns its index entry."""
+    theme_dir = VARIANTS_DIR / name
+    theme_dir.mkdir(parents=True, exist_ok=True)
+    for old in theme_dir.glob(f"{name}_*.png"):
+        old.unlink()
+
+    kept_hashes = []
+    variants = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        board_specs = [theme["board"]] * len(seeds)
+        # map() yields in seed order as soon as each result is ready, so output streams
+        for seed, phash, size, data in pool.map(render_variant, board_specs, seeds, chunksize=4):
+            if is_near_duplicate(phash, kept_hashes, threshold):
+                continue
+            path = theme_dir / f"{name}_{seed:05d}.png"
+            path.write_bytes(data)
+            kept_hashes.append(phash)
+            variants.append({
+                "seed": seed,
+                "path": path.relative_to(OUTPUT_DIR).as_posix(),
+                "phash": f"{phash:0{HASH_SIZE * HASH_SIZE // 4}x}",
+                "native_size": list(size),
+            })
+
+    print(f"  {name}: kept {len(variants)} of {len(seeds)} variants "
+          f"({len(seeds) - len(variants)} near-duplicates dropped)")
+    if "seed" not in theme["board"]:
+        print(f"  {name}: board has no seeded elements, so every seed renders the same image")
+
+    return {"chapters": theme["chapters"], "display_size": display_size, "variants": variants}
+
+
+def write_index(entries: dict):
+    """Merge theme entries into INDEX_FILE (themes not farmed this run are kept)."""
+    index = {"themes": {}}
+    if INDEX_FILE.exists():
+        index = json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+    index["themes"].update(entries)
+    INDEX_FILE.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    total = sum(len(t["variants"]) for t in index["themes"].values())
+    print(f"Saved variant index ({total} variants) to: {INDEX_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded board variants for arena rotation")
+    parser.add_argument("--count", "-c", type=int, default=200, help="Seeds to try per theme (default: 200)")
+    parser.add_argument("--start-seed", type=int, default=0, help="First seed (default: 0)")
+    parser.add_argument("--themes", nargs="+", default=None,
+                        help="Themes to farm (default: every theme whose board has a seed)")
+    parser.add_argument("--threshold", "-t", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"Max differing hash bits (of {HASH_SIZE * HASH_SIZE}) to treat as a duplicate "
+                             f"(default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--spec", type=Path, default=THEME_SPEC_FILE, help="Theme spec JSON")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args()
+
+    spec = load_theme_spec(args.spec)
+    themes = spec["themes"]
+    theme_names = args.themes or [name for name, theme in themes.items() if "seed" in theme["board"]]
+    for name in theme_names:
+        if name not in themes:
+            print(f"ERROR: Unknown theme: {name} (available: {', '.join(themes)})")
+            sys.exit(1)
+
+    seeds = range(args.start_seed, args.start_seed + args.count)
+    workers = args.workers or os.cpu_count()
+    print(f"Farming {len(seeds)} seeds for: {', '.join(theme_names)} ({workers} workers)")
+
+    entries = {}
+    for name in theme_names:
+        entries[name] = farm_theme(name, themes[name], spec["board_display_size"], seeds,
+                                   args.threshold, workers)
+
+    write_index(entries)
+
+
+if __name__ == "__main__":
+    main()
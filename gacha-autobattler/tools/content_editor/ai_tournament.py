@@ -0,0 +1,391 @@
+"""
+AI Tournament
+Measures the battle AIs by playing many headless battles between them.
+
+Every matchup pairs a player-side controller with an enemy AI difficulty on a
+campaign stage:
+  - player side: 'auto' (the game's auto-battle) or an enemy AI difficulty
+    playing the player's half of the board
+  - enemy side: the enemy AI at 'easy', 'medium' or 'hard'
+  - teams: the stage's enemies against either a mirror copy of them (the
+    default, so only the AIs differ) or a fixed --player team. The 'random'
+    stage draws both teams from the summon pool instead.
+  - the enemy's HARD places from resources/board_book.json like the game;
+    --no-book measures its heuristic instead
+
+Battles run across a process pool in batches. Each battle is seeded from
+(--seed, stage, controllers, battle index), so a run gives the same results
+with any number of workers, and any single battle can be replayed. Results
+stream to an optional CSV log (gzip when the name ends in .gz) as batches
+finish; the report is built from fixed-size running totals, so memory stays
+flat however long the run. --summarize rebuilds the report from a log.
+
+Usage:
+    python ai_tournament.py
+    python ai_tournament.py --battles 2000 --stages 1-1,2-5,3-5 --log tournament.csv.gz
+    python ai_tournament.py --player fire_warrior_001,coral_001,nature_wisp_001 --level 10 --player-ai auto
+    python ai_tournament.py --summarize tournament.csv.gz
+"""
+
+import csv
+import gzip
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from battle_sim import (DIFFICULTIES, ENEMY, MAX_TURNS, PLAYER, Battle, BattleCatalog, EnemyAI, Fighter,
+                        Policy, auto_battle)
+from board_solver import BoardBook
+
+CONTROLLERS = ('auto',) + DIFFICULTIES
+RANDOM_STAGE = 'random'
+RANDOM_TEAM_SIZE = 5
+REASONS = ('elimination', 'line', 'hp')
+BATCH_SIZE = 250
+MAX_PENDING_PER_WORKER = 4  # Batches queued ahead per worker; bounds results held in memory
+LOG_FIELDS = ('stage', 'player', 'enemy', 'index', 'winner', 'reason', 'turns',
+              'player_knockouts', 'enemy_knockouts', 'player_hp', 'enemy_hp')
+
+Matchup = Tuple[str, str, str]  # (stage, player controller, enemy controller)
+Outcome = Tuple[int, str, int, int, int, float, float]  # BattleResult fields, in order
+Job = Tuple[str, str, str, int, int]  # Matchup plus (first battle index, battle count)
+
+
+def policy(controller: str, book: Optional[BoardBook] = None) -> Policy:
+    """Placement policy of a controller name; the book only steers HARD on the enemy side"""
+    return auto_battle if controller == 'auto' else EnemyAI(controller, book)
+
+
+def battle_rng(seed: int, matchup: Matchup, index: int) -> random.Random:
+    """RNG of one battle; depends only on the seed, matchup and index, never on batching"""
+    stage, player, enemy = matchup
+    return random.Random(f"{seed}:{stage}:{player}:{enemy}:{index}")
+
+
+def make_teams(catalog: BattleCatalog, stage: str, player_ids: List[str], level: int,
+               rng: random.Random) -> Tuple[List[Fighter], List[Fighter]]:
+    """Fresh teams of a matchup; without player_ids the player side mirrors the enemy"""
+    if stage == RANDOM_STAGE:
+        pool = catalog.summon_pool()
+        enemy = [Fighter(pool[rng.randrange(len(pool))], ENEMY) for _ in range(RANDOM_TEAM_SIZE)]
+        enemy_level = 1
+    else:
+        enemy = catalog.stage_team(stage)
+        enemy_level = catalog.stages[stage].enemy_levels[0]
+    if player_ids:
+        return catalog.team(player_ids, PLAYER, level), enemy
+    return [Fighter(f.spec, PLAYER, enemy_level) for f in enemy], enemy
+
+
+def play_battle(catalog: BattleCatalog, matchup: Matchup, index: int, seed: int,
+                player_ids: List[str], level: int, book: Optional[BoardBook] = None) -> Outcome:
+    """Play battle number index of a matchup"""
+    stage, player, enemy = matchup
+    rng = battle_rng(seed, matchup, index)
+    player_team, enemy_team = make_teams(catalog, stage, player_ids, level, rng)
+    r = Battle(player_team, enemy_team, rng).play(policy(player, book), policy(enemy, book))
+    return r.winner, r.reason, r.turns, r.player_knockouts, r.enemy_knockouts, r.player_hp, r.enemy_hp
+
+
+_worker_catalog: Optional[BattleCatalog] = None
+_worker_book: Optional[BoardBook] = None
+_worker_settings: Tuple[int, List[str], int] = (0, [], 1)  # (seed, player_ids, level)
+
+
+def _init_worker(game_root: str, seed: int, player_ids: List[str], level: int, use_book: bool):
+    global _worker_catalog, _worker_book, _worker_settings
+    _worker_catalog = BattleCatalog(game_root).load()
+    _worker_book = BoardBook.load(game_root) if use_book else None
+    _worker_settings = (seed, player_ids, level)
+
+
+def _play_batch(job: Job) -> List[Outcome]:
+    """Worker entry point: (stage, player, enemy, start, count) -> outcomes in index order"""
+    stage, player, enemy, start, count = job
+    seed, player_ids, level = _worker_settings
+    return [play_battle(_worker_catalog, (stage, player, enemy), i, seed, player_ids, level, _worker_book)
+            for i in range(start, start + count)]
+
+
+# --- Aggregation ---
+
+class Tally:
+    """Running totals of one matchup; its size does not grow with the number of battles"""
+    __slots__ = ('battles', 'wins', 'reasons', 'turns', 'player_hp', 'enemy_hp')
+
+    def __init__(self):
+        self.battles = 0
+        self.wins = [0, 0, 0]  # By winner (PLAYER, ENEMY)
+        self.reasons = {reason: 0 for reason in REASONS}
+        self.turns = [0] * (MAX_TURNS + 1)  # Battles ending on each turn
+        self.player_hp = 0.0
+        self.enemy_hp = 0.0
+
+    def add(self, outcome: Outcome):
+        winner, reason, turns, _, _, player_hp, enemy_hp = outcome
+        self.battles += 1
+        self.wins[winner] += 1
+        self.reasons[reason] += 1
+        self.turns[min(turns, MAX_TURNS)] += 1
+        self.player_hp += player_hp
+        self.enemy_hp += enemy_hp
+
+    def merge(self, other: 'Tally'):
+        self.battles += other.battles
+        for i in range(3):
+            self.wins[i] += other.wins[i]
+        for reason in REASONS:
+            self.reasons[reason] += other.reasons[reason]
+        for i in range(MAX_TURNS + 1):
+            self.turns[i] += other.turns[i]
+        self.player_hp += other.player_hp
+        self.enemy_hp += other.enemy_hp
+
+    @property
+    def player_win_rate(self) -> float:
+        return self.wins[PLAYER] / self.battles if self.battles else 0.0
+
+    def mean_turns(self) -> float:
+        return sum(t * n for t, n in enumerate(self.turns)) / self.battles if self.battles else 0.0
+
+    def turn_percentile(self, q: float) -> int:
+        """Smallest turn count reached by at least q of the battles"""
+        target, seen = q * self.battles, 0
+        for t, n in enumerate(self.turns):
+            seen += n
+            if n and seen >= target:
+                return t
+        return MAX_TURNS
+
+
+def tally(outcomes: Iterable[Tuple[Matchup, Outcome]]) -> Dict[Matchup, Tally]:
+    tallies: Dict[Matchup, Tally] = {}
+    for matchup, outcome in outcomes:
+        if matchup not in tallies:
+            tallies[matchup] = Tally()
+        tallies[matchup].add(outcome)
+    return tallies
+
+
+# --- Log ---
+
+def _open_log(path: str, mode: str) -> TextIO:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+class OutcomeLog:
+    """CSV log written one batch at a time: one short row per battle"""
+
+    def __init__(self, path: str):
+        self.file = _open_log(path, 'w')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(LOG_FIELDS)
+
+    def write(self, matchup: Matchup, start: int, outcomes: List[Outcome]):
+        stage, player, enemy = matchup
+        self.writer.writerows(
+            (stage, player, enemy, start + i, winner, reason, turns, p_ko, e_ko, f"{p_hp:.3f}", f"{e_hp:.3f}")
+            for i, (winner, reason, turns, p_ko, e_ko, p_hp, e_hp) in enumerate(outcomes))
+
+    def close(self):
+        self.file.close()
+
+
+def read_log(path: str) -> Iterator[Tuple[Matchup, Outcome]]:
+    """Stream (matchup, outcome) pairs back out of a log"""
+    with _open_log(path, 'r') as f:
+        for row in csv.DictReader(f):
+            yield ((row['stage'], row['player'], row['enemy']),
+                   (int(row['winner']), row['reason'], int(row['turns']), int(row['player_knockouts']),
+                    int(row['enemy_knockouts']), float(row['player_hp']), float(row['enemy_hp'])))
+
+
+# --- Tournament ---
+
+class Tournament:
+    """Every (stage, player controller, enemy controller) matchup, battles times each"""
+
+    def __init__(self, game_root: str, stages: List[str], player_controllers: List[str],
+                 enemy_controllers: List[str], battles: int, seed: int = 0,
+                 player_ids: Optional[List[str]] = None, level: int = 1, workers: Optional[int] = None,
+                 use_book: bool = True):
+        self.game_root = game_root
+        self.stages = stages
+        self.player_controllers = player_controllers
+        self.enemy_controllers = enemy_controllers
+        self.battles = battles
+        self.seed = seed
+        self.player_ids = player_ids or []
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self.use_book = use_book
+
+    @property
+    def matchups(self) -> List[Matchup]:
+        return [(stage, player, enemy) for stage in self.stages
+                for player in self.player_controllers for enemy in self.enemy_controllers]
+
+    def jobs(self) -> Iterator[Job]:
+        for stage, player, enemy in self.matchups:
+            for start in range(0, self.battles, BATCH_SIZE):
+                yield stage, player, enemy, start, min(BATCH_SIZE, self.battles - start)
+
+    def run(self, log: Optional[OutcomeLog] = None) -> Dict[Matchup, Tally]:
+        """Play every battle; outcomes go to the log and the tallies as each batch finishes"""
+        tallies = {matchup: Tally() for matchup in self.matchups}
+        for job, outcomes in self._play(self.jobs()):
+            stage, player, enemy, start, _ = job
+            matchup = (stage, player, enemy)
+            if log:
+                log.write(matchup, start, outcomes)
+            for outcome in outcomes:
+                tallies[matchup].add(outcome)
+        return tallies
+
+    def _play(self, jobs: Iterator[Job]) -> Iterator[Tuple[Job, List[Outcome]]]:
+        """Batches in submission order, across a process pool with a bounded queue"""
+        initargs = (self.game_root, self.seed, self.player_ids, self.level, self.use_book)
+        if self.workers < 2:
+            _init_worker(*initargs)
+            for job in jobs:
+                yield job, _play_batch(job)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for job in jobs:
+                pending.append((job, pool.submit(_play_batch, job)))
+                if len(pending) >= self.workers * MAX_PENDING_PER_WORKER:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+
+
+# --- Report ---
+
+def format_report(tallies: Dict[Matchup, Tally]) -> str:
+    """Win rates and turn distributions per controller pairing, then per stage"""
+    pairings: Dict[Tuple[str, str], Tally] = {}
+    for (_, player, enemy), t in tallies.items():
+        pairings.setdefault((player, enemy), Tally()).merge(t)
+
+    lines = ["All stages",
+             f"  {'player':<8} {'enemy':<8} {'battles':>8} {'P win':>7} "
+             f"{'elim':>6} {'line':>6} {'hp':>6}   turns: {'mean':>5} {'p10':>4} {'p50':>4} {'p90':>4}"]
+    for (player, enemy), t in sorted(pairings.items(), key=lambda kv: _pairing_order(kv[0])):
+        lines.append(
+            f"  {player:<8} {enemy:<8} {t.battles:>8} {t.player_win_rate:>7.1%} "
+            + " ".join(f"{t.reasons[r] / t.battles:>6.1%}" for r in REASONS)
+            + f"          {t.mean_turns():>5.1f} {t.turn_percentile(0.1):>4} "
+              f"{t.turn_percentile(0.5):>4} {t.turn_percentile(0.9):>4}")
+
+    stages = sorted({stage for stage, _, _ in tallies}, key=_stage_order)
+    players = [c for c in CONTROLLERS if any(p == c for _, p, _ in tallies)]
+    enemies = [c for c in DIFFICULTIES if any(e == c for _, _, e in tallies)]
+    for player in players:
+        lines.append("")
+        lines.append(f"Player win rate and median turns by stage ({player} vs enemy AI)")
+        lines.append(f"  {'stage':<8}" + "".join(f"{enemy:>14}" for enemy in enemies))
+        for stage in stages:
+            cells = []
+            for enemy in enemies:
+                t = tallies.get((stage, player, enemy))
+                cells.append(f"{t.player_win_rate:.1%} t{t.turn_percentile(0.5)}" if t and t.battles else '-')
+            lines.append(f"  {stage:<8}" + "".join(f"{cell:>14}" for cell in cells))
+    return "\n".join(lines)
+
+
+def _pairing_order(pairing: Tuple[str, str]) -> Tuple[int, int]:
+    player, enemy = pairing
+    return CONTROLLERS.index(player), CONTROLLERS.index(enemy)
+
+
+def _stage_order(stage: str) -> Tuple:
+    """Campaign order (1-2 before 1-10), random teams last"""
+    if stage == RANDOM_STAGE:
+        return (1,)
+    return (0,) + tuple(int(part) if part.isdigit() else part for part in stage.split('-'))
+
+
+def _split(value: str) -> List[str]:
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Play the battle AIs against each other headlessly")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--stages", default=None,
+                            help=f"Comma-separated stage ids, or '{RANDOM_STAGE}' (default: every stage)")
+    arg_parser.add_argument("--player-ai", default=','.join(CONTROLLERS),
+                            help="Comma-separated player-side controllers: auto, easy, medium, hard")
+    arg_parser.add_argument("--enemy-ai", default=','.join(DIFFICULTIES),
+                            help="Comma-separated enemy difficulties: easy, medium, hard")
+    arg_parser.add_argument("--player", default=None,
+                            help="Comma-separated unit ids of a fixed player team (default: mirror the enemy)")
+    arg_parser.add_argument("--level", type=int, default=1, help="Level of --player units")
+    arg_parser.add_argument("--battles", type=int, default=200, help="Battles per matchup")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--no-book", action="store_true", help="Enemy HARD ignores the board book")
+    arg_parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--log", default=None, help="Write one CSV row per battle (gzip if it ends in .gz)")
+    arg_parser.add_argument("--summarize", metavar="LOG", default=None, help="Report on an existing log instead")
+    args = arg_parser.parse_args()
+
+    if args.summarize:
+        if not os.path.isfile(args.summarize):
+            print(f"ERROR: Log not found: {args.summarize}")
+            sys.exit(1)
+        print(format_report(tally(read_log(args.summarize))))
+        return
+
+    game_root = os.path.normpath(args.root)
+    catalog = BattleCatalog(game_root).load()
+    stages = _split(args.stages) if args.stages else sorted(catalog.stages, key=_stage_order)
+    player_controllers, enemy_controllers = _split(args.player_ai), _split(args.enemy_ai)
+    player_ids = _split(args.player) if args.player else []
+    for stage in stages:
+        if stage != RANDOM_STAGE and stage not in catalog.stages:
+            print(f"ERROR: Unknown stage '{stage}' (known: {', '.join(sorted(catalog.stages))}, {RANDOM_STAGE})")
+            sys.exit(1)
+    for controller in player_controllers:
+        if controller not in CONTROLLERS:
+            print(f"ERROR: Unknown player controller '{controller}' (known: {', '.join(CONTROLLERS)})")
+            sys.exit(1)
+    for controller in enemy_controllers:
+        if controller not in DIFFICULTIES:
+            print(f"ERROR: Unknown enemy difficulty '{controller}' (known: {', '.join(DIFFICULTIES)})")
+            sys.exit(1)
+    for unit_id in player_ids:
+        if unit_id not in catalog.units:
+            print(f"ERROR: Unknown unit '{unit_id}'")
+            sys.exit(1)
+
+    tournament = Tournament(game_root, stages, player_controllers, enemy_controllers, args.battles,
+                            args.seed, player_ids, args.level, args.workers, not args.no_book)
+    log = OutcomeLog(args.log) if args.log else None
+    start = time.perf_counter()
+    try:
+        tallies = tournament.run(log)
+    finally:
+        if log:
+            log.close()
+    elapsed = time.perf_counter() - start
+
+    total = sum(t.battles for t in tallies.values())
+    print(format_report(tallies))
+    print(f"{total} battles in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
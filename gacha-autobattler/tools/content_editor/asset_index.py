@@ -0,0 +1,360 @@
+"""
+Project Asset Indexer
+Walks assets/ once and records each file's size, content hash and image info,
+then cross-references res:// paths in scripts, scenes and resources to find
+orphaned assets and byte- or pixel-identical duplicates.
+
+The index is persisted to .asset_index.json in the game root; files whose size
+and modification time are unchanged are not re-read on the next scan.
+
+Usage:
+    python asset_index.py
+    python asset_index.py --list
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+INDEX_FILE = '.asset_index.json'
+INDEX_VERSION = 1
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif')
+REFERENCE_EXTENSIONS = ('.tres', '.tscn', '.gd', '.godot')
+SKIP_DIRS = {'.godot', '.git', '.import', '__pycache__'}
+
+# res:// paths inside quotes; %s / %d / {name} placeholders are matched as wildcards
+RES_PATH_PATTERN = re.compile(r'"(res://[^"]*)"')
+PLACEHOLDER_PATTERN = re.compile(r'%[-+0-9.]*[sdif]|\{[^}]*\}')
+# GDScript path constants and CONST + "literal" concatenations
+CONST_PATTERN = re.compile(r'^\s*const\s+(\w+)(?:\s*:\s*\w+)?\s*=\s*(.+?)\s*$', re.MULTILINE)
+CONCAT_PATTERN = re.compile(r'\b([A-Z][A-Z0-9_]*)\s*\+\s*"([^"]*)"')
+
+
+@dataclass
+class AssetEntry:
+    """One indexed file under assets/"""
+    path: str  # res:// path
+    size: int
+    mtime_ns: int
+    sha1: str
+    width: int = 0
+    height: int = 0
+    mode: str = ""
+    pixel_hash: str = ""
+    has_import: bool = False
+
+    @property
+    def is_image(self) -> bool:
+        return self.path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+@dataclass
+class AssetReport:
+    """Result of a scan"""
+    entries: Dict[str, AssetEntry] = field(default_factory=dict)
+    orphans: List[str] = field(default_factory=list)
+    byte_duplicates: List[List[str]] = field(default_factory=list)
+    pixel_duplicates: List[List[str]] = field(default_factory=list)
+    stale_sidecars: List[str] = field(default_factory=list)
+    reread: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.size for e in self.entries.values())
+
+    @property
+    def orphan_bytes(self) -> int:
+        return sum(self.entries[p].size for p in self.orphans)
+
+    def duplicate_bytes(self, groups: List[List[str]]) -> int:
+        """Bytes that would be freed by keeping one file per duplicate group"""
+        return sum(sum(self.entries[p].size for p in group[1:]) for group in groups)
+
+
+class AssetIndexer:
+    """Builds and incrementally updates the project asset index"""
+
+    def __init__(self, game_root: str):
+        self.game_root = game_root
+        self.assets_path = os.path.join(game_root, "assets")
+        self.index_path = os.path.join(game_root, INDEX_FILE)
+        self.entries: Dict[str, AssetEntry] = {}
+
+    # === Persistence ===
+
+    def load(self) -> Dict[str, AssetEntry]:
+        """Load the persisted index (empty if missing or from another version)"""
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION:
+                    self.entries = {e['path']: AssetEntry(**e) for e in data.get('entries', [])}
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Ignoring unreadable asset index: {e}")
+        return self.entries
+
+    def save(self):
+        """Write the index to disk"""
+        data = {
+            'version': INDEX_VERSION,
+            'entries': [asdict(self.entries[p]) for p in sorted(self.entries)],
+        }
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    # === Scanning ===
+
+    def to_res_path(self, filepath: str) -> str:
+        """Convert an absolute file path to a res:// path"""
+        return "res://" + os.path.relpath(filepath, self.game_root).replace(os.sep, '/')
+
+    def to_file_path(self, res_path: str) -> str:
+        """Convert a res:// path to an absolute file path"""
+        return os.path.join(self.game_root, *res_path[len("res://"):].split('/'))
+
+    def walk(self, folder: str):
+        """Yield os.DirEntry for every file below folder (stat results come from scandir)"""
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from self.walk(entry.path)
+            elif entry.is_file():
+                yield entry
+
+    def scan(self, progress: Optional[Callable[[int], None]] = None) -> AssetReport:
+        """
+        Walk assets/ once, re-reading only new or changed files, then analyze
+        references and duplicates. progress is called with the number of files seen.
+        """
+        previous = self.load()
+        entries: Dict[str, AssetEntry] = {}
+        sidecars: Set[str] = set()
+        reread = 0
+
+        for count, dir_entry in enumerate(self.walk(self.assets_path), 1):
+            if dir_entry.name.endswith('.import'):
+                sidecars.add(self.to_res_path(dir_entry.path[:-len('.import')]))
+                continue
+
+            res_path = self.to_res_path(dir_entry.path)
+            stat = dir_entry.stat()
+            cached = previous.get(res_path)
+            if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                entries[res_path] = cached
+            else:
+                entries[res_path] = self._read_entry(dir_entry.path, res_path, stat)
+                reread += 1
+
+            if progress and count % 200 == 0:
+                progress(count)
+
+        for res_path, entry in entries.items():
+            entry.has_import = res_path in sidecars
+
+        self.entries = entries
+        report = AssetReport(entries=entries, reread=reread)
+        report.stale_sidecars = sorted(p + '.import' for p in sidecars if p not in entries)
+        report.byte_duplicates, report.pixel_duplicates = self.find_duplicates()
+        report.orphans = self.find_orphans()
+
+        self.save()  # Pixel hashes computed during duplicate detection are persisted too
+        return report
+
+    def _read_entry(self, filepath: str, res_path: str, stat) -> AssetEntry:
+        """Hash a file and read its image header"""
+        with open(filepath, 'rb') as f:
+            sha1 = hashlib.sha1(f.read()).hexdigest()
+        entry = AssetEntry(path=res_path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha1=sha1)
+
+        if entry.is_image and Image is not None:
+            try:
+                with Image.open(filepath) as img:  # Header only, pixels are not decoded
+                    entry.width, entry.height = img.size
+                    entry.mode = img.mode
+            except Exception:
+                pass
+        return entry
+
+    def _pixel_hash(self, entry: AssetEntry) -> str:
+        """Hash of an image's decoded RGBA pixels (computed once, then kept in the index)"""
+        if not entry.pixel_hash and Image is not None:
+            try:
+                with Image.open(self.to_file_path(entry.path)) as img:
+                    pixels = img.convert('RGBA').tobytes()
+                entry.pixel_hash = hashlib.sha1(f"{entry.width}x{entry.height}".encode() + pixels).hexdigest()
+            except Exception:
+                entry.pixel_hash = "unreadable:" + entry.sha1
+        return entry.pixel_hash
+
+    # === Analysis ===
+
+    def find_duplicates(self) -> Tuple[List[List[str]], List[List[str]]]:
+        """
+        Group byte-identical files, then pixel-identical images with different bytes.
+        Pixels are only decoded for images that share their dimensions with an
+        image of different content.
+        """
+        by_sha: Dict[str, List[str]] = {}
+        for path, entry in self.entries.items():
+            if entry.size > 0:
+                by_sha.setdefault(entry.sha1, []).append(path)
+        byte_groups = sorted(sorted(g) for g in by_sha.values() if len(g) > 1)
+
+        # One representative per distinct content, bucketed by image size
+        by_size: Dict[Tuple[int, int], List[str]] = {}
+        for paths in by_sha.values():
+            entry = self.entries[min(paths)]
+            if entry.is_image and entry.width:
+                by_size.setdefault((entry.width, entry.height), []).append(entry.path)
+
+        pixel_groups = []
+        for candidates in by_size.values():
+            if len(candidates) < 2:
+                continue
+            by_pixels: Dict[str, List[str]] = {}
+            for path in candidates:
+                by_pixels.setdefault(self._pixel_hash(self.entries[path]), []).append(path)
+            for group in by_pixels.values():
+                if len(group) > 1:
+                    # Include every byte-identical copy of each representative
+                    shas = {self.entries[p].sha1 for p in group}
+                    pixel_groups.append(sorted(p for s in shas for p in by_sha[s]))
+
+        return byte_groups, sorted(pixel_groups)
+
+    @staticmethod
+    def _script_constants(content: str) -> Dict[str, str]:
+        """Resolve string constants built from res:// literals (e.g. BASE_PATH + "ownership/")"""
+        raw = CONST_PATTERN.findall(content)
+        constants: Dict[str, str] = {}
+        for _ in range(3):  # Enough passes for chained constants
+            for name, expr in raw:
+                values = []
+                for part in (p.strip() for p in expr.split('+')):
+                    if len(part) >= 2 and part[0] == part[-1] == '"':
+                        values.append(part[1:-1])
+                    elif part in constants:
+                        values.append(constants[part])
+                    else:
+                        break
+                else:
+                    if values and values[0].startswith('res://'):
+                        constants[name] = ''.join(values)
+        return constants
+
+    @staticmethod
+    def _add_reference(ref: str, exact: Set[str], patterns: Dict[str, re.Pattern]):
+        """Record one res:// reference as an exact path or a wildcard pattern"""
+        if PLACEHOLDER_PATTERN.search(ref):
+            parts = PLACEHOLDER_PATTERN.split(ref)
+            regex = '[^/]+'.join(re.escape(p) for p in parts)
+            patterns.setdefault(ref, re.compile(regex + ('[^/]+' if ref.endswith('/') else '') + '$'))
+        elif ref.endswith('/'):
+            patterns.setdefault(ref, re.compile(re.escape(ref) + '[^/]+$'))
+        else:
+            exact.add(ref)
+
+    def find_references(self) -> Tuple[Set[str], List[re.Pattern]]:
+        """
+        Collect res:// paths from .tres/.tscn/.gd files and project.godot.
+        Returns (exact paths, patterns). Format strings ("res://a/%s/idle.png")
+        become wildcard patterns and directory paths ("res://a/b/") match the
+        files directly inside them. In scripts, path constants joined with string
+        literals (OWNERSHIP_PATH + "chapter_%d/") are resolved as well.
+        """
+        exact: Set[str] = set()
+        patterns: Dict[str, re.Pattern] = {}
+
+        for dir_entry in self.walk(self.game_root):
+            if not dir_entry.name.endswith(REFERENCE_EXTENSIONS):
+                continue
+            try:
+                with open(dir_entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except OSError:
+                continue
+
+            refs = RES_PATH_PATTERN.findall(content)
+            if dir_entry.name.endswith('.gd'):
+                constants = self._script_constants(content)
+                refs.extend(constants.values())
+                refs.extend(constants[name] + literal for name, literal in CONCAT_PATTERN.findall(content)
+                            if name in constants)
+            for ref in refs:
+                self._add_reference(ref, exact, patterns)
+
+        return exact, list(patterns.values())
+
+    def find_orphans(self) -> List[str]:
+        """Assets not referenced by any script, scene, resource or project setting"""
+        exact, patterns = self.find_references()
+        orphans = []
+        for path in self.entries:
+            if path in exact or any(p.match(path) for p in patterns):
+                continue
+            orphans.append(path)
+        return sorted(orphans)
+
+
+def format_size(num_bytes: int) -> str:
+    """Human-readable byte count"""
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):.1f} MB"
+    if num_bytes >= 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes} B"
+
+
+def summarize(report: AssetReport) -> str:
+    """Multi-line text summary of a scan"""
+    images = sum(1 for e in report.entries.values() if e.is_image)
+    return "\n".join([
+        f"{len(report.entries)} files ({images} images), {format_size(report.total_bytes)}",
+        f"Byte-identical: {len(report.byte_duplicates)} groups, "
+        f"{format_size(report.duplicate_bytes(report.byte_duplicates))} reclaimable",
+        f"Pixel-identical: {len(report.pixel_duplicates)} groups, "
+        f"{format_size(report.duplicate_bytes(report.pixel_duplicates))} reclaimable",
+        f"Unreferenced: {len(report.orphans)} files, {format_size(report.orphan_bytes)}",
+        f"Stale .import sidecars: {len(report.stale_sidecars)}",
+    ])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Index project assets and report duplicates and orphans")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(__file__), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--list", action="store_true", help="List every duplicate group and orphan")
+    args = arg_parser.parse_args()
+
+    indexer = AssetIndexer(os.path.normpath(args.root))
+    scan_report = indexer.scan()
+    print(summarize(scan_report))
+    print(f"({scan_report.reread} files re-read, index saved to {indexer.index_path})")
+
+    if args.list:
+        for title, groups in (("Byte-identical", scan_report.byte_duplicates),
+                              ("Pixel-identical", scan_report.pixel_duplicates)):
+            print(f"\n{title} duplicates:")
+            for group in groups:
+                print("  " + "\n    = ".join(group))
+        print("\nUnreferenced:")
+        for path in scan_report.orphans:
+            print(f"  {path}")
@@ -0,0 +1,868 @@
+"""
+Headless Battle Simulator
+Plays battles without the Godot scene, for balancing.
+
+Reproduces battle.gd turn resolution, minus animations and timers:
+  - each side queues up to 3 placements from the same board, then placements
+    resolve (player first) and every contested cell duels in row-major order
+  - duels: speed order (ties hit simultaneously), element multipliers,
+    piercing, guaranteed_survive, shields, heals, ability cooldowns, status
+    effects and field effects
+  - field damage/healing, field durations, then cooldowns and status effects
+  - victory by knocking out the whole other team, or at the 25-turn limit by
+    3x3 line control, then team HP% (ties go to the player)
+
+battle.gd quirks are kept so results match the game. Duels use the UnitData
+base attack/defense/speed, while level, imprint and gear only scale HP. Units
+killed by field or status damage leave the grid without counting as knockouts.
+
+Unit, ability, status and field data is read with TresParser, so results
+always follow the current .tres content. Randomness comes from a seeded
+random.Random: runs are reproducible, but do not replay Godot's RNG.
+
+Usage:
+    python battle_sim.py --player fire_warrior_001,coral_001,nature_wisp_001 --stage 1-3
+    python battle_sim.py --player ember_001,water_mage_001,spark_001 --battles 5000
+    python battle_sim.py --player gravebane,vance,ursok --level 20 --dungeon power_sanctum --tier 2
+    python battle_sim.py --player ember_001,water_mage_001,spark_001 --replays replays.jsonl.gz
+"""
+
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tres_parser import TresParser, TresResource
+from content_pack import GACHA_STARS
+
+GRID_SIZE = 3
+CELL_COUNT = GRID_SIZE * GRID_SIZE
+ACTIONS_PER_TURN = 3
+MAX_TURNS = 25
+
+PLAYER = 1
+ENEMY = 2
+
+# Cell ownership, as battle.gd grid_ownership
+EMPTY, PLAYER_ONLY, ENEMY_ONLY, CONTESTED = 0, 1, 2, 3
+
+# Rows, columns, then diagonals (the order _check_line_control tests them)
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+CELL_LINES = tuple(tuple(line for line in LINES if cell in line) for cell in range(CELL_COUNT))
+CENTER = 4
+CORNERS = (0, 2, 6, 8)
+
+# Fire > Nature > Water > Fire, Dark <-> Light (UnitData.get_element_multiplier)
+ELEMENT_MULTIPLIERS = {
+    ('fire', 'nature'): 1.3, ('fire', 'water'): 0.7,
+    ('water', 'fire'): 1.3, ('water', 'nature'): 0.7,
+    ('nature', 'water'): 1.3, ('nature', 'fire'): 0.7,
+    ('dark', 'light'): 1.3, ('light', 'dark'): 1.3,
+}
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+# --- Content ---
+
+@dataclass(frozen=True)
+class StatusEffectSpec:
+    """StatusEffectData fields used in combat"""
+    effect_id: str
+    name: str
+    base_duration: int
+    damage_per_turn: int
+    attack_modifier: float
+    defense_modifier: float
+    attack_boost: float
+    defense_boost: float
+    prevents_abilities: bool
+    shield_amount: int
+    refresh_on_reapply: bool
+
+
+@dataclass(frozen=True)
+class FieldEffectSpec:
+    """FieldEffectData fields used in combat"""
+    field_id: str
+    name: str
+    base_duration: int
+    affects_enemies: bool
+    affects_allies: bool
+    attack_modifier: float
+    defense_modifier: float
+    damage_per_turn: int
+    heal_per_turn: int
+
+
+@dataclass(frozen=True)
+class AbilitySpec:
+    """AbilityData fields used in combat"""
+    ability_id: str
+    name: str
+    damage_multiplier: float
+    defense_multiplier: float
+    heal_amount: int
+    bonus_damage: int
+    ignores_element: bool
+    guaranteed_survive: bool
+    piercing: bool
+    cooldown: int
+    status: Optional[StatusEffectSpec]
+    applies_to_self: bool
+    field: Optional[FieldEffectSpec]
+
+
+@dataclass(frozen=True)
+class UnitSpec:
+    """UnitData fields used in combat"""
+    unit_id: str
+    name: str
+    element: str
+    star_rating: int
+    max_hp: int
+    attack: int
+    defense: int
+    speed: int
+    abilities: Tuple[AbilitySpec, ...]
+    path: str
+    retired: bool = False
+
+    @property
+    def summonable(self) -> bool:
+        return '/monsters/' not in self.path and not self.retired and self.star_rating in GACHA_STARS
+
+
+@dataclass(frozen=True)
+class EncounterSpec:
+    """Enemy setup of a stage or dungeon"""
+    kind: str  # 'stage' or 'dungeon'
+    encounter_id: str
+    name: str
+    enemy_units: Tuple[UnitSpec, ...]
+    enemy_levels: Tuple[int, ...]  # One level per tier; stages have a single tier
+
+
+def _items(value: Any) -> List[Any]:
+    """Items of a parsed (typed) array"""
+    if isinstance(value, dict):
+        return value.get('items', [])
+    return value or []
+
+
+class BattleCatalog:
+    """Units, stages and dungeons read from the .tres catalog, with references resolved"""
+
+    def __init__(self, game_root: str):
+        self.game_root = game_root
+        self.parser = TresParser(game_root)
+        self.units: Dict[str, UnitSpec] = {}
+        self.stages: Dict[str, EncounterSpec] = {}
+        self.dungeons: Dict[str, EncounterSpec] = {}
+        self._specs: Dict[str, Any] = {}  # {res path: spec}
+
+    def load(self) -> 'BattleCatalog':
+        for dirpath, dirnames, filenames in os.walk(self.parser.resources_path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.endswith('.tres'):
+                    continue
+                spec = self._spec(self._res_path(os.path.join(dirpath, filename)))
+                if isinstance(spec, UnitSpec):
+                    self.units[spec.unit_id] = spec
+                elif isinstance(spec, EncounterSpec):
+                    encounters = self.stages if spec.kind == 'stage' else self.dungeons
+                    encounters[spec.encounter_id] = spec
+        return self
+
+    def _res_path(self, filepath: str) -> str:
+        return "res://" + os.path.relpath(filepath, self.game_root).replace(os.sep, '/')
+
+    def _spec(self, res_path: str) -> Any:
+        """Build (once) the spec for a resource path"""
+        if res_path not in self._specs:
+            self._specs[res_path] = None  # Guards reference cycles
+            filepath = os.path.join(self.game_root, res_path[len('res://'):])
+            if os.path.exists(filepath):
+                self._specs[res_path] = self._build(self.parser.parse_file(filepath), res_path)
+        return self._specs[res_path]
+
+    def _ref(self, resource: TresResource, value: Any) -> Any:
+        """Spec of an ExtResource reference, or None"""
+        if isinstance(value, dict) and value.get('type') == 'ExtResource':
+            ext = resource.ext_resources.get(value.get('id', ''))
+            if ext:
+                return self._spec(ext['path'])
+        return None
+
+    def _build(self, resource: TresResource, res_path: str) -> Any:
+        schema = self.parser.schemas.get(resource.script_class)
+        if schema is None:
+            return None
+        p = {**schema.defaults(), **resource.properties}
+        cls = resource.script_class
+
+        if cls == 'StatusEffectData':
+            return StatusEffectSpec(
+                p['effect_id'], p['effect_name'], p['base_duration'], p['damage_per_turn'],
+                p['attack_modifier'], p['defense_modifier'], p['attack_boost'], p['defense_boost'],
+                p['prevents_abilities'], p['shield_amount'], p['refresh_on_reapply'])
+        if cls == 'FieldEffectData':
+            return FieldEffectSpec(
+                p['field_id'], p['field_name'], p['base_duration'], p['affects_enemies'], p['affects_allies'],
+                p['attack_modifier'], p['defense_modifier'], p['damage_per_turn'], p['heal_per_turn'])
+        if cls == 'AbilityData':
+            return AbilitySpec(
+                p['ability_id'], p['ability_name'], p['damage_multiplier'], p['defense_multiplier'],
+                p['heal_amount'], p['bonus_damage'], p['ignores_element'], p['guaranteed_survive'],
+                p['piercing'], p['cooldown'], self._ref(resource, p['applies_status_effect']),
+                p['applies_to_self'], self._ref(resource, p['applies_field_effect']))
+        if cls == 'UnitData':
+            abilities = tuple(a for a in (self._ref(resource, v) for v in _items(p['abilities'])) if a)
+            return UnitSpec(
+                p['unit_id'], p['unit_name'], p['element'], p['star_rating'],
+                p['max_hp'], p['attack'], p['defense'], p['speed'], abilities, res_path, p.get('retired', False))
+        if cls == 'StageData':
+            enemies = tuple(u for u in (self._ref(resource, v) for v in _items(p['enemy_units'])) if u)
+            return EncounterSpec('stage', p['stage_id'], p['stage_name'], enemies, (p['enemy_level'],))
+        if cls == 'DungeonData':
+            enemies = tuple(u for u in (self._ref(resource, v) for v in _items(p['enemy_units'])) if u)
+            return EncounterSpec('dungeon', p['dungeon_id'], p['dungeon_name'], enemies,
+                                 tuple(_items(p['tier_enemy_levels'])))
+        return None
+
+    def summon_pool(self, max_stars: int = 5) -> List[UnitSpec]:
+        """Summonable units up to max_stars (PlayerData's unit pools)"""
+        return [u for u in self.units.values() if u.summonable and u.star_rating <= max_stars]
+
+    def team(self, unit_ids: List[str], owner: int = PLAYER, level: int = 1, imprint: int = 0) -> List['Fighter']:
+        """Fighters for a list of unit ids; raises KeyError for unknown ids"""
+        return [Fighter(self.units[unit_id], owner, level, imprint) for unit_id in unit_ids]
+
+    def stage_team(self, stage_id: str) -> List['Fighter']:
+        """Enemy team of a campaign stage (_generate_campaign_enemies)"""
+        stage = self.stages[stage_id]
+        return [Fighter(unit, ENEMY, stage.enemy_levels[0]) for unit in stage.enemy_units]
+
+    def dungeon_team(self, dungeon_id: str, tier: int, rng: random.Random) -> List['Fighter']:
+        """Random enemy team of a dungeon tier (_generate_dungeon_enemies)"""
+        dungeon = self.dungeons[dungeon_id]
+        levels = dungeon.enemy_levels
+        level = levels[tier] if 0 <= tier < len(levels) else 1
+        pool = list(dungeon.enemy_units) or self.summon_pool(max_stars=4)
+        return [Fighter(pool[rng.randrange(len(pool))], ENEMY, level) for _ in range(3 + tier)]
+
+    def random_team(self, rng: random.Random, count: int = 5) -> List['Fighter']:
+        """Random level 1 enemies from the summon pool (_generate_enemy_team outside campaign and dungeons)"""
+        pool = self.summon_pool()
+        return [Fighter(pool[rng.randrange(len(pool))], ENEMY) for _ in range(count)]
+
+
+# --- Battle state ---
+
+class Fighter:
+    """A unit in battle (UnitInstance)"""
+    __slots__ = ('spec', 'owner', 'level', 'imprint', 'max_hp', 'attack', 'defense', 'speed', 'hp',
+                 'cell', 'ability_index', 'cooldowns', 'statuses')
+
+    def __init__(self, spec: UnitSpec, owner: int = PLAYER, level: int = 1, imprint: int = 0,
+                 gear_bonuses: Optional[Dict[str, float]] = None):
+        self.spec = spec
+        self.owner = owner
+        self.level = level
+        self.imprint = imprint
+
+        mult = (1.0 + 0.03 * (level - 1)) * (1.0 + 0.05 * imprint)
+        stats = [int(spec.max_hp * mult), int(spec.attack * mult), int(spec.defense * mult), int(spec.speed * mult)]
+        if gear_bonuses:
+            # Same keys as PlayerData.get_gear_bonuses: flat first, then percentages
+            for i, stat in enumerate(('hp', 'attack', 'defense', 'speed')):
+                stats[i] += int(gear_bonuses.get('flat_' + stat, 0))
+                stats[i] = int(stats[i] * (1.0 + gear_bonuses.get('percent_' + stat, 0.0)))
+        self.max_hp, self.attack, self.defense, self.speed = stats
+
+        self.hp = self.max_hp
+        self.cell = -1
+        self.ability_index = 0
+        self.cooldowns: Dict[str, int] = {}  # {ability_id: turns remaining}
+        self.statuses: List[list] = []  # [[StatusEffectSpec, turns remaining, shield remaining]]
+
+    def __repr__(self):
+        return f"<Fighter {self.spec.unit_id} owner={self.owner} hp={self.hp}/{self.max_hp} cell={self.cell}>"
+
+    def is_alive(self) -> bool:
+        return self.hp > 0
+
+    def is_ability_available(self, index: int) -> bool:
+        abilities = self.spec.abilities
+        if index >= len(abilities):
+            return False
+        return self.cooldowns.get(abilities[index].ability_id, 0) <= 0
+
+    def is_disrupted(self) -> bool:
+        for status in self.statuses:
+            if status[0].prevents_abilities:
+                return True
+        return False
+
+    def duel_ability(self) -> Optional[AbilitySpec]:
+        """Ability used this duel: None (basic Strike) when disrupted or on cooldown"""
+        if self.is_disrupted() or not self.is_ability_available(self.ability_index):
+            return None
+        return self.spec.abilities[self.ability_index]
+
+    def apply_status(self, effect: StatusEffectSpec):
+        for status in self.statuses:
+            if status[0].effect_id == effect.effect_id:
+                if effect.refresh_on_reapply:
+                    status[1] = effect.base_duration
+                    if effect.shield_amount > 0:
+                        status[2] = effect.shield_amount
+                return
+        self.statuses.append([effect, effect.base_duration, effect.shield_amount])
+
+    def absorb(self, damage: int) -> int:
+        """Damage left after shields"""
+        for status in self.statuses:
+            if status[2] > 0:
+                absorbed = min(status[2], damage)
+                status[2] -= absorbed
+                damage -= absorbed
+                if damage <= 0:
+                    break
+        return max(0, damage)
+
+    def end_turn(self):
+        """Tick ability cooldowns and status effects (UnitInstance.process_turn_end)"""
+        if self.cooldowns:
+            for ability_id in list(self.cooldowns):
+                self.cooldowns[ability_id] -= 1
+                if self.cooldowns[ability_id] <= 0:
+                    del self.cooldowns[ability_id]
+        if self.statuses:
+            damage = 0
+            for status in self.statuses:
+                damage += status[0].damage_per_turn
+                status[1] -= 1
+            self.statuses = [s for s in self.statuses if s[1] > 0]
+            if damage > 0:
+                self.hp = max(0, self.hp - damage)
+
+
+@dataclass
+class BattleResult:
+    """Outcome of one battle"""
+    winner: int  # PLAYER or ENEMY
+    reason: str  # 'elimination', 'line' or 'hp'
+    turns: int
+    player_knockouts: int  # Enemy units knocked out by the player
+    enemy_knockouts: int
+    player_hp: float  # Team HP fraction at the end
+    enemy_hp: float
+
+
+Placement = Tuple[Fighter, int]  # (fighter, cell); the fighter's ability_index is already chosen
+
+
+class Battle:
+    """One battle on the 3x3 grid"""
+
+    def __init__(self, player_team: List[Fighter], enemy_team: List[Fighter], rng: Optional[random.Random] = None):
+        self.teams = (None, player_team, enemy_team)
+        self.grid: Tuple[Any, List[Optional[Fighter]], List[Optional[Fighter]]] = (
+            None, [None] * CELL_COUNT, [None] * CELL_COUNT)
+        self.fields: List[list] = [[] for _ in range(CELL_COUNT)]  # [[FieldEffectSpec, turns remaining, owner]]
+        self.knockouts = [0, 0, 0]  # Knockouts scored by each owner
+        self.rng = rng or random.Random()
+        self.turn = 1
+        self.result: Optional[BattleResult] = None
+        self.log: Optional[List[list]] = None  # Set to a list to record every turn's actions (replay.py)
+
+    # Board queries used by the AIs
+
+    def ownership(self) -> Tuple[int, ...]:
+        player, enemy = self.grid[PLAYER], self.grid[ENEMY]
+        return tuple((1 if player[c] else 0) | (2 if enemy[c] else 0) for c in range(CELL_COUNT))
+
+    def free_cells(self, owner: int) -> List[int]:
+        """Cells without a unit of this owner, row-major"""
+        side = self.grid[owner]
+        return [c for c in range(CELL_COUNT) if side[c] is None]
+
+    def ready_units(self, owner: int) -> List[Fighter]:
+        """Living units of this owner that are not on the grid, in roster order"""
+        return [u for u in self.teams[owner] if u.hp > 0 and u.cell < 0]
+
+    # Turn resolution
+
+    def play(self, player_policy: 'Policy', enemy_policy: 'Policy') -> BattleResult:
+        """Play turns until there is a winner; a settled board skips straight to the turn limit"""
+        while self.result is None:
+            player_moves = player_policy(self, PLAYER)
+            enemy_moves = enemy_policy(self, ENEMY)
+            self.resolve_turn(player_moves, enemy_moves)
+            self.finish_if_settled()
+        return self.result
+
+    def finish_if_settled(self) -> bool:
+        """Skip to the turn limit when no remaining turn can change anything. Returns whether there is a result."""
+        if self.result is None and self.is_settled():
+            self.turn = MAX_TURNS
+            self._check_winner()
+        return self.result is not None
+
+    def is_settled(self) -> bool:
+        """Whether every remaining turn would be a no-op: no duels, fields, status effects or placements left"""
+        if any(self.fields):
+            return False
+        player, enemy = self.grid[PLAYER], self.grid[ENEMY]
+        for cell in range(CELL_COUNT):
+            if player[cell] is not None and enemy[cell] is not None:
+                return False
+        for owner in (PLAYER, ENEMY):
+            if any(u.statuses for u in self.teams[owner]):
+                return False
+            if self.ready_units(owner) and None in self.grid[owner]:
+                return False
+        return True
+
+    def resolve_turn(self, player_moves: List[Placement], enemy_moves: List[Placement]):
+        """Confirm placements, duel, apply fields and statuses, then check for a winner (_resolve_turn)"""
+        if self.log is not None:
+            self.log.append([[[self.teams[owner].index(unit), cell, unit.ability_index] for unit, cell in moves]
+                             for owner, moves in ((PLAYER, player_moves), (ENEMY, enemy_moves))])
+        for owner, moves in ((PLAYER, player_moves), (ENEMY, enemy_moves)):
+            side = self.grid[owner]
+            for unit, cell in moves:
+                if unit.cell >= 0 and side[unit.cell] is unit:
+                    side[unit.cell] = None  # A move vacates the old cell first
+                side[cell] = unit
+                unit.cell = cell
+
+        player, enemy = self.grid[PLAYER], self.grid[ENEMY]
+        for cell in range(CELL_COUNT):
+            p_unit, e_unit = player[cell], enemy[cell]
+            if p_unit is not None and e_unit is not None and p_unit.hp > 0 and e_unit.hp > 0:
+                self._duel(cell, p_unit, e_unit)
+
+        for cell in range(CELL_COUNT):
+            if not self.fields[cell]:
+                continue
+            for unit in (player[cell], enemy[cell]):
+                if unit is None or unit.hp <= 0:
+                    continue
+                damage, healing = self._field_ticks(cell, unit.owner)
+                if damage > 0:
+                    unit.hp = max(0, unit.hp - damage)
+                if healing > 0:
+                    unit.hp = min(unit.max_hp, unit.hp + healing)
+                if unit.hp <= 0:
+                    self._remove(unit)
+
+        for cell_fields in self.fields:
+            if cell_fields:
+                for field in cell_fields:
+                    field[1] -= 1
+                cell_fields[:] = [f for f in cell_fields if f[1] > 0]
+
+        for team in (self.teams[PLAYER], self.teams[ENEMY]):
+            for unit in team:
+                if unit.cooldowns or unit.statuses:
+                    unit.end_turn()
+                    if unit.cell >= 0 and unit.hp <= 0:
+                        self._remove(unit)
+
+        self._check_winner()
+        self.turn += 1
+
+    def _remove(self, unit: Fighter):
+        self.grid[unit.owner][unit.cell] = None
+        unit.cell = -1
+
+    def _field_mods(self, cell: int, owner: int) -> Tuple[float, float]:
+        attack = defense = 1.0
+        for data, _, field_owner in self.fields[cell]:
+            if data.affects_allies if owner == field_owner else data.affects_enemies:
+                attack *= data.attack_modifier
+                defense *= data.defense_modifier
+        return attack, defense
+
+    def _field_ticks(self, cell: int, owner: int) -> Tuple[int, int]:
+        damage = healing = 0
+        for data, _, field_owner in self.fields[cell]:
+            if data.affects_allies if owner == field_owner else data.affects_enemies:
+                if data.damage_per_turn > 0:
+                    damage += data.damage_per_turn
+                if data.heal_per_turn > 0:
+                    healing += data.heal_per_turn
+        return damage, healing
+
+    def _apply_field(self, cell: int, data: FieldEffectSpec, owner: int):
+        for field in self.fields[cell]:
+            if field[0].field_id == data.field_id:
+                field[1] = data.base_duration
+                return
+        self.fields[cell].append([data, data.base_duration, owner])
+
+    def _attack_power(self, unit: Fighter, target: Fighter, ability: Optional[AbilitySpec],
+                      cell: int) -> Tuple[int, int]:
+        """(attack power, effective defense) of one side of a duel"""
+        spec = unit.spec
+        status_attack = status_defense = 1.0
+        for status in unit.statuses:
+            data = status[0]
+            status_attack *= data.attack_modifier
+            status_defense *= data.defense_modifier
+            status_attack *= data.attack_boost
+            status_defense *= data.defense_boost
+        field_attack, field_defense = self._field_mods(cell, unit.owner) if self.fields[cell] else (1.0, 1.0)
+
+        effective_attack = int(spec.attack * status_attack * field_attack)
+        effective_defense = int(spec.defense * status_defense * field_defense)
+        if ability is None:
+            element_mult = ELEMENT_MULTIPLIERS.get((spec.element, target.spec.element), 1.0)
+            return int(effective_attack * 1.0 * element_mult), effective_defense
+        element_mult = 1.0 if ability.ignores_element else \
+            ELEMENT_MULTIPLIERS.get((spec.element, target.spec.element), 1.0)
+        return int(effective_attack * ability.damage_multiplier * element_mult) + ability.bonus_damage, effective_defense
+
+    def _duel(self, cell: int, p_unit: Fighter, e_unit: Fighter):
+        """Resolve one contested cell (_resolve_duel)"""
+        p_ability = p_unit.duel_ability()
+        e_ability = e_unit.duel_ability()
+        if p_ability is not None and p_ability.cooldown > 0:
+            p_unit.cooldowns[p_ability.ability_id] = p_ability.cooldown
+        if e_ability is not None and e_ability.cooldown > 0:
+            e_unit.cooldowns[e_ability.ability_id] = e_ability.cooldown
+
+        p_power, p_defense = self._attack_power(p_unit, e_unit, p_ability, cell)
+        e_power, e_defense = self._attack_power(e_unit, p_unit, e_ability, cell)
+
+        p_damage_taken = e_power
+        e_damage_taken = p_power
+        if not (e_ability is not None and e_ability.piercing):
+            p_damage_taken = max(1, e_power - int(p_defense * (p_ability.defense_multiplier if p_ability else 1.0)))
+        if not (p_ability is not None and p_ability.piercing):
+            e_damage_taken = max(1, p_power - int(e_defense * (e_ability.defense_multiplier if e_ability else 1.0)))
+
+        # Both shields absorb up front, even for a hit that never lands
+        p_damage_taken = p_unit.absorb(p_damage_taken) if p_unit.statuses else p_damage_taken
+        e_damage_taken = e_unit.absorb(e_damage_taken) if e_unit.statuses else e_damage_taken
+
+        p_survive = p_ability is not None and p_ability.guaranteed_survive
+        e_survive = e_ability is not None and e_ability.guaranteed_survive
+        p_speed, e_speed = p_unit.spec.speed, e_unit.spec.speed
+        if p_speed > e_speed:
+            e_unit.hp = max(0, e_unit.hp - e_damage_taken)
+            if e_survive and e_unit.hp <= 0:
+                e_unit.hp = 1
+            if e_unit.hp > 0:
+                p_unit.hp = max(0, p_unit.hp - p_damage_taken)
+                if p_survive and p_unit.hp <= 0:
+                    p_unit.hp = 1
+        elif e_speed > p_speed:
+            p_unit.hp = max(0, p_unit.hp - p_damage_taken)
+            if p_survive and p_unit.hp <= 0:
+                p_unit.hp = 1
+            if p_unit.hp > 0:
+                e_unit.hp = max(0, e_unit.hp - e_damage_taken)
+                if e_survive and e_unit.hp <= 0:
+                    e_unit.hp = 1
+        else:
+            e_unit.hp = max(0, e_unit.hp - e_damage_taken)
+            p_unit.hp = max(0, p_unit.hp - p_damage_taken)
+            if p_survive and p_unit.hp <= 0:
+                p_unit.hp = 1
+            if e_survive and e_unit.hp <= 0:
+                e_unit.hp = 1
+
+        if p_ability is not None or e_ability is not None:
+            self._after_duel(cell, p_unit, e_unit, p_ability, e_ability)
+
+        if p_unit.hp <= 0:
+            self.knockouts[ENEMY] += 1
+            self._remove(p_unit)
+        if e_unit.hp <= 0:
+            self.knockouts[PLAYER] += 1
+            self._remove(e_unit)
+
+    def _after_duel(self, cell: int, p_unit: Fighter, e_unit: Fighter,
+                    p_ability: Optional[AbilitySpec], e_ability: Optional[AbilitySpec]):
+        """Heals, then status effects, then field effects"""
+        if p_ability and p_ability.heal_amount > 0 and p_unit.hp > 0:
+            p_unit.hp = min(p_unit.max_hp, p_unit.hp + p_ability.heal_amount)
+        if e_ability and e_ability.heal_amount > 0 and e_unit.hp > 0:
+            e_unit.hp = min(e_unit.max_hp, e_unit.hp + e_ability.heal_amount)
+
+        for unit, other, ability in ((p_unit, e_unit, p_ability), (e_unit, p_unit, e_ability)):
+            if ability and ability.status and unit.hp > 0:
+                if ability.applies_to_self:
+                    unit.apply_status(ability.status)
+                elif other.hp > 0:
+                    other.apply_status(ability.status)
+
+        # Fields are created even if the caster fell
+        if p_ability and p_ability.field:
+            self._apply_field(cell, p_ability.field, PLAYER)
+        if e_ability and e_ability.field:
+            self._apply_field(cell, e_ability.field, ENEMY)
+
+    def _check_winner(self):
+        """Elimination, or tiebreakers at the turn limit (_check_win_condition)"""
+        if self.knockouts[PLAYER] >= len(self.teams[ENEMY]):
+            self._finish(PLAYER, 'elimination')
+        elif self.knockouts[ENEMY] >= len(self.teams[PLAYER]):
+            self._finish(ENEMY, 'elimination')
+        elif self.turn >= MAX_TURNS:
+            owners = self.ownership()
+            for a, b, c in LINES:
+                if owners[a] == owners[b] == owners[c] and owners[a] in (PLAYER_ONLY, ENEMY_ONLY):
+                    self._finish(owners[a], 'line')
+                    return
+            player_hp, enemy_hp = team_hp(self.teams[PLAYER]), team_hp(self.teams[ENEMY])
+            self._finish(ENEMY if enemy_hp > player_hp else PLAYER, 'hp')
+
+    def _finish(self, winner: int, reason: str):
+        self.result = BattleResult(
+            winner, reason, self.turn, self.knockouts[PLAYER], self.knockouts[ENEMY],
+            team_hp(self.teams[PLAYER]), team_hp(self.teams[ENEMY]))
+
+
+def team_hp(units: List[Fighter]) -> float:
+    """Current HP over max HP across a team (_calculate_team_hp_percent)"""
+    total_max = sum(u.max_hp for u in units if u.max_hp > 0)
+    if total_max <= 0:
+        return 0.0
+    return sum(u.hp for u in units if u.max_hp > 0) / total_max
+
+
+# --- AI ---
+
+# A policy returns the placements one side queues this turn
+Policy = Callable[[Battle, int], List[Placement]]
+
+
+@lru_cache(maxsize=None)
+def cell_scores(owners: Tuple[int, ...], me: int, edge_bonus: int) -> Tuple[int, ...]:
+    """Score of every cell for one side; there are only 4^9 boards, so results are memoized"""
+    them = ENEMY_ONLY if me == PLAYER_ONLY else PLAYER_ONLY
+    return tuple(_cell_score(owners, cell, me, them, edge_bonus) for cell in range(CELL_COUNT))
+
+
+def _cell_score(owners: Tuple[int, ...], cell: int, me: int, them: int, edge_bonus: int) -> int:
+    """Line threats plus position (_evaluate_cell_priority; auto-battle has no edge bonus)"""
+    score = 0
+    for line in CELL_LINES[cell]:
+        mine = theirs = empty = 0
+        for c in line:
+            o = owners[c]
+            if o == me:
+                mine += 1
+            elif o == them:
+                theirs += 1
+            elif o == EMPTY:
+                empty += 1
+        if mine == 2 and empty == 1:
+            score += 100
+        if theirs == 2 and empty == 1:
+            score += 90
+        if mine == 1 and empty == 2:
+            score += 30
+    if cell == CENTER:
+        score += 20
+    elif cell in CORNERS:
+        score += 10
+    else:
+        score += edge_bonus
+    return score
+
+
+class EnemyAI:
+    """The game's enemy AI at a difficulty (_do_enemy_turn)
+
+    book: a board_solver.BoardBook. On the enemy side, HARD places on its cells
+    whenever the position is booked (_get_board_book_cells).
+    """
+
+    def __init__(self, difficulty: str = 'medium', book: Optional[Any] = None):
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+        self.difficulty = difficulty
+        self.book = book if difficulty == 'hard' else None
+
+    def __call__(self, battle: Battle, owner: int) -> List[Placement]:
+        units = battle.ready_units(owner)
+        if not units:
+            return []
+        rng = battle.rng
+        cells = battle.free_cells(owner)
+        scores = cell_scores(battle.ownership(), owner, 5)
+        booked = ()
+        if self.book is not None and owner == ENEMY:
+            booked = self.book.cells(battle.ownership(), len(units), len(battle.ready_units(PLAYER))) or ()
+
+        moves = []
+        for i, unit in enumerate(units[:min(ACTIONS_PER_TURN, len(cells))]):
+            cell = booked[i] if i < len(booked) else self._select_cell(cells, scores, rng)
+            cells.remove(cell)
+            if unit.spec.abilities:
+                unit.ability_index = rng.randrange(len(unit.spec.abilities))
+            moves.append((unit, cell))
+        return moves
+
+    def _select_cell(self, cells: List[int], scores: Tuple[int, ...], rng: random.Random) -> int:
+        ranked = sorted(cells, key=lambda c: -scores[c])
+        if self.difficulty == 'easy':
+            return ranked[0] if rng.random() < 0.3 else cells[rng.randrange(len(cells))]
+        if self.difficulty == 'medium':
+            return ranked[0] if rng.random() < 0.7 else ranked[rng.randrange(min(3, len(ranked)))]
+        # Hard always takes winning (100+) and blocking (90+) cells
+        if scores[ranked[0]] >= 90 or rng.random() < 0.95:
+            return ranked[0]
+        return ranked[rng.randrange(min(2, len(ranked)))]
+
+
+def auto_battle(battle: Battle, owner: int) -> List[Placement]:
+    """The player's auto-battle (_do_auto_turn): strongest units first, best-scoring cells"""
+    units = battle.ready_units(owner)
+    if not units:
+        return []
+    units.sort(key=lambda u: -u.attack)
+    cells = battle.free_cells(owner)
+    scores = cell_scores(battle.ownership(), owner, 0)
+    team = battle.teams[owner]
+
+    moves = []
+    for unit in units[:min(ACTIONS_PER_TURN, len(cells))]:
+        cell = max(cells, key=lambda c: scores[c])
+        cells.remove(cell)
+        _select_best_ability(unit, team)
+        moves.append((unit, cell))
+    return moves
+
+
+def _select_best_ability(unit: Fighter, team: List[Fighter]):
+    """Highest damage multiplier, +50 for heals while an ally is under half HP"""
+    best_index, best_score = 0, -999
+    for i, ability in enumerate(unit.spec.abilities):
+        if not unit.is_ability_available(i):
+            continue
+        score = ability.damage_multiplier * 100
+        if ability.heal_amount > 0 and any(u.hp > 0 and u.hp < u.max_hp * 0.5 for u in team):
+            score += 50
+        if score > best_score:
+            best_index, best_score = i, score
+    unit.ability_index = best_index
+
+
+# --- CLI ---
+
+def simulate(make_teams: Callable[[random.Random], Tuple[List[Fighter], List[Fighter]]],
+             battles: int, player_policy: Policy, enemy_policy: Policy, seed: Optional[int] = None,
+             record: Optional[Callable[[Battle], None]] = None) -> List[BattleResult]:
+    """Play a batch of battles; make_teams builds fresh fighters for each, record gets every logged battle"""
+    rng = random.Random(seed)
+    results = []
+    for _ in range(battles):
+        player_team, enemy_team = make_teams(rng)
+        battle = Battle(player_team, enemy_team, rng)
+        if record:
+            battle.log = []
+        results.append(battle.play(player_policy, enemy_policy))
+        if record:
+            record(battle)
+    return results
+
+
+def format_summary(results: List[BattleResult]) -> str:
+    n = len(results)
+    wins = [r for r in results if r.winner == PLAYER]
+    lines = [f"Player win rate: {len(wins) / n:.1%} ({len(wins)}/{n})"]
+    for reason in ('elimination', 'line', 'hp'):
+        won = sum(1 for r in wins if r.reason == reason)
+        lost = sum(1 for r in results if r.winner == ENEMY and r.reason == reason)
+        lines.append(f"  {reason:<12} won {won:>6}   lost {lost:>6}")
+    lines.append(f"Average turns: {sum(r.turns for r in results) / n:.1f}")
+    lines.append(f"Average HP left: player {sum(r.player_hp for r in results) / n:.1%}, "
+                 f"enemy {sum(r.enemy_hp for r in results) / n:.1%}")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Simulate battles headlessly")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--player", required=True, help="Comma-separated unit ids of the player team")
+    arg_parser.add_argument("--level", type=int, default=1, help="Player unit level")
+    arg_parser.add_argument("--imprint", type=int, default=0, help="Player unit imprint level")
+    enemy = arg_parser.add_mutually_exclusive_group()
+    enemy.add_argument("--stage", help="Fight a campaign stage by stage_id (e.g. 1-3)")
+    enemy.add_argument("--dungeon", help="Fight a dungeon by dungeon_id")
+    enemy.add_argument("--enemy", help="Comma-separated unit ids of the enemy team")
+    arg_parser.add_argument("--tier", type=int, default=0, help="Dungeon tier (0-2)")
+    arg_parser.add_argument("--enemy-level", type=int, default=1, help="Level of --enemy units")
+    arg_parser.add_argument("--difficulty", choices=DIFFICULTIES, default='medium', help="Enemy AI difficulty")
+    arg_parser.add_argument("--no-book", action="store_true", help="HARD ignores the board book")
+    arg_parser.add_argument("--battles", type=int, default=1000)
+    arg_parser.add_argument("--seed", type=int, default=None)
+    arg_parser.add_argument("--replays", metavar="PATH", help="Also write every battle as a replay (.jsonl or .jsonl.gz)")
+    args = arg_parser.parse_args()
+
+    catalog = BattleCatalog(os.path.normpath(args.root)).load()
+    player_ids = [u.strip() for u in args.player.split(',') if u.strip()]
+    enemy_ids = [u.strip() for u in args.enemy.split(',') if u.strip()] if args.enemy else []
+    for unit_id in player_ids + enemy_ids:
+        if unit_id not in catalog.units:
+            print(f"ERROR: Unknown unit '{unit_id}'")
+            sys.exit(1)
+    if args.stage and args.stage not in catalog.stages:
+        print(f"ERROR: Unknown stage '{args.stage}' (known: {', '.join(sorted(catalog.stages))})")
+        sys.exit(1)
+    if args.dungeon and args.dungeon not in catalog.dungeons:
+        print(f"ERROR: Unknown dungeon '{args.dungeon}' (known: {', '.join(sorted(catalog.dungeons))})")
+        sys.exit(1)
+
+    def make_teams(rng: random.Random):
+        player_team = catalog.team(player_ids, PLAYER, args.level, args.imprint)
+        if args.stage:
+            return player_team, catalog.stage_team(args.stage)
+        if args.dungeon:
+            return player_team, catalog.dungeon_team(args.dungeon, args.tier, rng)
+        if enemy_ids:
+            return player_team, catalog.team(enemy_ids, ENEMY, args.enemy_level)
+        return player_team, catalog.random_team(rng)
+
+    start = time.perf_counter()
+    from board_solver import BoardBook
+    book = None if args.no_book else BoardBook.load(catalog.game_root)
+    writer = None
+    if args.replays:
+        from replay import ReplayWriter
+        mode = ({'mode': 'campaign', 'stage': args.stage} if args.stage else
+                {'mode': 'dungeon', 'dungeon': args.dungeon, 'tier': args.tier} if args.dungeon else {'mode': 'random'})
+        writer = ReplayWriter(args.replays, seed=args.seed, difficulty=args.difficulty, **mode)
+    try:
+        results = simulate(make_teams, args.battles, auto_battle, EnemyAI(args.difficulty, book), args.seed,
+                           record=writer.write if writer else None)
+    finally:
+        if writer:
+            writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(results))
+    print(f"{len(results)} battles in {elapsed:.2f}s ({len(results) / max(elapsed, 1e-9):,.0f}/s)")
+    if writer:
+        print(f"Wrote {writer.count} replays to {args.replays}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+"""
+Board Solver
+Solves the 3x3 line-control placement game under the duels and writes
+resources/board_book.json, which the HARD enemy AI looks moves up in.
+
+The model keeps what battle.gd makes deterministic and turns the duels into
+chance:
+  - a position is the grid ownership (empty, player, enemy, contested) plus the
+    units each side still has in reserve. Knocked-out units never come back, so
+    reserves only shrink and the whole game is a few placement turns deep.
+  - each turn the enemy places min(3, reserve, free cells) units, and so does
+    the player. Placements are simultaneous, so the player's are a chance
+    node: the auto-battle's cells (_select_cell_for_auto), mixed with any other
+    cells for human play (PLAYER_NOISE)
+  - every contested cell duels once per turn, with per-turn odds measured by
+    battle_sim.py (DUEL_ODDS). Once both reserves are empty, contested cells
+    play out to their eventual winner.
+  - value: +1 when the enemy wins (elimination, or a line at the turn limit),
+    -1 when the player does, 0 when team HP% would decide
+
+Positions are reduced over the 8 symmetries of the grid and kept in a
+transposition table. Searches deepen one turn at a time until they reach the
+end of every reserve (exact), or stop at --depth with a static evaluation.
+
+The book holds the best enemy cells for each team size pairing at turn 1, and
+for every position the player's turn-1 placements and the duels can lead to.
+Keys are "<board code>:<enemy reserve>:<player reserve>", with the board code
+of the canonical orientation (cell i in bits 2i..2i+1, cells row-major).
+Values are [cell mask, value * 1000] in that orientation.
+
+Usage:
+    python board_solver.py
+    python board_solver.py --check
+    python board_solver.py --board .E./.X./P.. --enemy 2 --player 2
+"""
+
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import battle_sim
+from battle_sim import (ACTIONS_PER_TURN, CELL_COUNT, CONTESTED, EMPTY, ENEMY_ONLY, GRID_SIZE, LINES, PLAYER,
+                        PLAYER_ONLY, cell_scores)
+
+BOOK_PATH = os.path.join('resources', 'board_book.json')
+BOOK_VERSION = 1
+
+# Per-turn odds of one contested duel, measured with battle_sim.py (auto-battle against HARD,
+# campaign mirrors and random teams): (only the player unit falls, only the enemy unit falls, both fall)
+DUEL_ODDS = (0.047, 0.075, 0.015)
+# Weight of "any cells" against the auto-battle's cells in the player model
+PLAYER_NOISE = 0.5
+TEAM_SIZES = (3, 4, 5)  # Campaign, dungeon and player teams
+MAX_DEPTH = 8
+
+Board = Tuple[int, ...]
+SYMBOLS = {'.': EMPTY, 'P': PLAYER_ONLY, 'E': ENEMY_ONLY, 'X': CONTESTED}
+
+
+def _symmetries() -> Tuple[Tuple[int, ...], ...]:
+    """The 8 rotations and reflections as permutations: transformed[i] = board[perm[i]]"""
+    last = GRID_SIZE - 1
+    transforms = (
+        lambda r, c: (r, c), lambda r, c: (c, last - r), lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r), lambda r, c: (r, last - c), lambda r, c: (last - r, c),
+        lambda r, c: (c, r), lambda r, c: (last - c, last - r),
+    )
+    perms = []
+    for transform in transforms:
+        perm = []
+        for cell in range(CELL_COUNT):
+            r, c = transform(cell // GRID_SIZE, cell % GRID_SIZE)
+            perm.append(r * GRID_SIZE + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+SYMMETRIES = _symmetries()
+
+
+def board_code(board: Sequence[int]) -> int:
+    code = 0
+    for cell in range(CELL_COUNT):
+        code |= board[cell] << (2 * cell)
+    return code
+
+
+def canonical(board: Sequence[int]) -> Tuple[int, Board, Tuple[int, ...]]:
+    """(code, board, perm) of the orientation with the smallest code; canonical cell i is board cell perm[i]"""
+    best = None
+    for perm in SYMMETRIES:
+        transformed = tuple(board[p] for p in perm)
+        code = board_code(transformed)
+        if best is None or code < best[0]:
+            best = (code, transformed, perm)
+    return best
+
+
+def cell_mask(cells: Sequence[int]) -> int:
+    mask = 0
+    for cell in cells:
+        mask |= 1 << cell
+    return mask
+
+
+def parse_board(text: str) -> Board:
+    """Board from 9 symbols (. P E X), rows optionally separated by '/'"""
+    symbols = text.replace('/', '').upper()
+    if len(symbols) != CELL_COUNT or any(s not in SYMBOLS for s in symbols):
+        raise ValueError(f"Expected 9 of '.PEX', got '{text}'")
+    return tuple(SYMBOLS[s] for s in symbols)
+
+
+def format_board(board: Board, cells: Sequence[int] = ()) -> str:
+    """Grid rows, with the chosen cells shown as '*' (or '#' on a player cell)"""
+    names = {v: k for k, v in SYMBOLS.items()}
+    rows = []
+    for r in range(GRID_SIZE):
+        row = ''
+        for c in range(GRID_SIZE):
+            cell = r * GRID_SIZE + c
+            row += ('#' if board[cell] == PLAYER_ONLY else '*') if cell in cells else names[board[cell]]
+        rows.append(row)
+    return "\n".join(rows)
+
+
+def auto_battle_cells(board: Board, count: int) -> Tuple[int, ...]:
+    """Cells the player's auto-battle takes: best score first, row-major on ties"""
+    scores = cell_scores(board, PLAYER, 0)
+    free = [c for c in range(CELL_COUNT) if board[c] in (EMPTY, ENEMY_ONLY)]
+    chosen = []
+    for _ in range(min(count, len(free))):
+        cell = max(free, key=lambda c: scores[c])
+        free.remove(cell)
+        chosen.append(cell)
+    return tuple(sorted(chosen))
+
+
+def _duel_outcomes(count: int, odds: Tuple[float, ...], results: Tuple[int, ...]) -> List[Tuple[Tuple[int, ...], float]]:
+    """Every combination of per-cell results for count contested cells, with its probability"""
+    outcomes = []
+    for combo in itertools.product(range(len(results)), repeat=count):
+        prob = 1.0
+        for i in combo:
+            prob *= odds[i]
+        if prob > 0:
+            outcomes.append((tuple(results[i] for i in combo), prob))
+    return outcomes
+
+
+class BoardSolver:
+    """Expectimax over enemy placements, with a transposition table of canonical positions"""
+
+    def __init__(self, duel_odds: Tuple[float, float, float] = DUEL_ODDS, player_noise: float = PLAYER_NOISE):
+        self.duel_odds = duel_odds
+        self.player_noise = player_noise
+        enemy_keeps, player_keeps, both_fall = duel_odds
+        # A contested cell ends up enemy-held, player-held or empty; "neither falls" keeps it contested
+        self.turn_results = (ENEMY_ONLY, PLAYER_ONLY, EMPTY, CONTESTED)
+        self.turn_odds = (enemy_keeps, player_keeps, both_fall, 1.0 - enemy_keeps - player_keeps - both_fall)
+        decided = enemy_keeps + player_keeps + both_fall
+        self.final_results = (ENEMY_ONLY, PLAYER_ONLY, EMPTY)
+        self.final_odds = (enemy_keeps / decided, player_keeps / decided, both_fall / decided)
+
+        self.table: Dict[Tuple[int, int, int], Tuple[float, Tuple[int, ...]]] = {}  # Exact results, canonical frame
+        self._shallow: Dict[Tuple[int, int, int, int], Tuple[float, Tuple[int, ...]]] = {}
+        self._final: Dict[int, float] = {}
+        self._turn_outcomes: Dict[int, list] = {}
+        self._final_outcomes: Dict[int, list] = {}
+        self.nodes = 0
+
+    # Evaluation
+
+    @staticmethod
+    def outcome_value(board: Sequence[int], enemy_reserve: int, player_reserve: int) -> Optional[float]:
+        """+1/-1 for elimination (the player's is checked first, as in _check_win_condition), else None"""
+        enemies = enemy_reserve + sum(1 for o in board if o & ENEMY_ONLY)
+        players = player_reserve + sum(1 for o in board if o & PLAYER_ONLY)
+        if enemies == 0:
+            return -1.0
+        if players == 0:
+            return 1.0
+        return None
+
+    @staticmethod
+    def line_value(board: Sequence[int]) -> float:
+        """Line control at the turn limit (_check_line_control): first sole-owned line wins"""
+        for a, b, c in LINES:
+            owner = board[a]
+            if owner == board[b] == board[c] and owner in (PLAYER_ONLY, ENEMY_ONLY):
+                return 1.0 if owner == ENEMY_ONLY else -1.0
+        return 0.0
+
+    def final_value(self, board: Board) -> float:
+        """Expected result once nothing more is placed: every contested cell plays out"""
+        code = board_code(board)
+        value = self._final.get(code)
+        if value is not None:
+            return value
+        contested = [c for c in range(CELL_COUNT) if board[c] == CONTESTED]
+        if not contested:
+            value = self.outcome_value(board, 0, 0)
+            value = self.line_value(board) if value is None else value
+        else:
+            if len(contested) not in self._final_outcomes:
+                self._final_outcomes[len(contested)] = _duel_outcomes(len(contested), self.final_odds,
+                                                                     self.final_results)
+            value = 0.0
+            settled = list(board)
+            for results, prob in self._final_outcomes[len(contested)]:
+                for cell, result in zip(contested, results):
+                    settled[cell] = result
+                outcome = self.outcome_value(settled, 0, 0)
+                value += prob * (self.line_value(settled) if outcome is None else outcome)
+        self._final[code] = value
+        return value
+
+    # Player model
+
+    def player_replies(self, board: Board, count: int) -> List[Tuple[float, Tuple[int, ...]]]:
+        """(probability, cells) of the player's placements this turn"""
+        free = [c for c in range(CELL_COUNT) if board[c] in (EMPTY, ENEMY_ONLY)]
+        count = min(count, len(free))
+        replies = {auto_battle_cells(board, count): 1.0 - self.player_noise}
+        if self.player_noise > 0:
+            others = list(itertools.combinations(free, count))
+            for cells in others:
+                replies[cells] = replies.get(cells, 0.0) + self.player_noise / len(others)
+        return [(prob, cells) for cells, prob in replies.items() if prob > 0]
+
+    # Search
+
+    def solve(self, board: Board, enemy_reserve: int, player_reserve: int,
+              max_depth: int = MAX_DEPTH) -> Tuple[float, Tuple[int, ...], bool]:
+        """(value, best enemy cells, exact) by iterative deepening; cells are in the frame of board"""
+        _, canon, perm = canonical(board)
+        value, cells, exact = 0.0, (), False
+        for depth in range(1, max_depth + 1):
+            value, cells, exact = self._search(canon, enemy_reserve, player_reserve, depth)
+            if exact:
+                break
+        return value, tuple(sorted(perm[c] for c in cells)), exact
+
+    def ranked_moves(self, board: Board, enemy_reserve: int, player_reserve: int,
+                     depth: int = MAX_DEPTH) -> List[Tuple[float, Tuple[int, ...]]]:
+        """Every enemy move of a position with its value, best first"""
+        replies = self.player_replies(board, min(ACTIONS_PER_TURN, player_reserve))
+        moves = [(self._move_value(board, move, replies, enemy_reserve, player_reserve, depth)[0], move)
+                 for move in self._enemy_moves(board, enemy_reserve)]
+        return sorted(moves, key=lambda m: -m[0])
+
+    def _enemy_moves(self, board: Board, enemy_reserve: int) -> Iterator[Tuple[int, ...]]:
+        free = [c for c in range(CELL_COUNT) if board[c] in (EMPTY, PLAYER_ONLY)]
+        return itertools.combinations(free, min(ACTIONS_PER_TURN, enemy_reserve, len(free)))
+
+    def _search(self, board: Board, enemy_reserve: int, player_reserve: int,
+                depth: int) -> Tuple[float, Tuple[int, ...], bool]:
+        """Best move of a canonical position; (value, cells, exact)"""
+        if enemy_reserve == 0 and player_reserve == 0:
+            return self.final_value(board), (), True
+        code = board_code(board)
+        hit = self.table.get((code, enemy_reserve, player_reserve))
+        if hit is not None:
+            return hit[0], hit[1], True
+        hit = self._shallow.get((code, enemy_reserve, player_reserve, depth))
+        if hit is not None:
+            return hit[0], hit[1], False
+        if depth == 0:
+            return self.final_value(board), (), False
+
+        self.nodes += 1
+        best_value, best_move, all_exact = -2.0, (), True
+        replies = self.player_replies(board, min(ACTIONS_PER_TURN, player_reserve))
+        for move in self._enemy_moves(board, enemy_reserve):
+            value, exact = self._move_value(board, move, replies, enemy_reserve, player_reserve, depth)
+            all_exact &= exact
+            if value > best_value + 1e-12:
+                best_value, best_move = value, move
+        if all_exact:
+            self.table[(code, enemy_reserve, player_reserve)] = (best_value, best_move)
+        else:
+            self._shallow[(code, enemy_reserve, player_reserve, depth)] = (best_value, best_move)
+        return best_value, best_move, all_exact
+
+    def _move_value(self, board: Board, move: Tuple[int, ...], replies: List[Tuple[float, Tuple[int, ...]]],
+                    enemy_reserve: int, player_reserve: int, depth: int) -> Tuple[float, bool]:
+        """Expected value of one enemy move over the player's replies and the duels"""
+        value, all_exact = 0.0, True
+        for prob, reply in replies:
+            placed = list(board)
+            for cell in move:
+                placed[cell] |= ENEMY_ONLY
+            for cell in reply:
+                placed[cell] |= PLAYER_ONLY
+            reply_value, exact = self._turn_value(placed, enemy_reserve - len(move),
+                                                  player_reserve - len(reply), depth)
+            value += prob * reply_value
+            all_exact &= exact
+        return value, all_exact
+
+    def _turn_value(self, placed: List[int], enemy_reserve: int, player_reserve: int,
+                    depth: int) -> Tuple[float, bool]:
+        """Value after placements: the duels of this turn, then the next position"""
+        if enemy_reserve == 0 and player_reserve == 0:
+            return self.final_value(tuple(placed)), True
+        contested = [c for c in range(CELL_COUNT) if placed[c] == CONTESTED]
+        if len(contested) not in self._turn_outcomes:
+            self._turn_outcomes[len(contested)] = _duel_outcomes(len(contested), self.turn_odds, self.turn_results)
+        value, all_exact = 0.0, True
+        for results, prob in self._turn_outcomes[len(contested)]:
+            for cell, result in zip(contested, results):
+                placed[cell] = result
+            outcome = self.outcome_value(placed, enemy_reserve, player_reserve)
+            if outcome is None:
+                if enemy_reserve == 0:
+                    # Nothing left for the enemy to decide: only the player places from here
+                    board = tuple(placed)
+                    replies = self.player_replies(board, min(ACTIONS_PER_TURN, player_reserve))
+                    outcome, exact = self._move_value(board, (), replies, 0, player_reserve, depth)
+                else:
+                    _, canon, _ = canonical(placed)
+                    outcome, _, exact = self._search(canon, enemy_reserve, player_reserve, depth - 1)
+                all_exact &= exact
+            value += prob * outcome
+        for cell in contested:
+            placed[cell] = CONTESTED
+        return value, all_exact
+
+    # Book
+
+    def build_book(self, team_sizes: Sequence[int] = TEAM_SIZES) -> Dict[str, List[int]]:
+        """Best moves at turn 1 for every pairing of team sizes, and after any turn-1 reply"""
+        positions: Dict[str, List[int]] = {}
+        empty = (EMPTY,) * CELL_COUNT
+        for enemy_team in team_sizes:
+            for player_team in team_sizes:
+                self._book_line(empty, enemy_team, player_team, positions)
+        return dict(sorted(positions.items(), key=lambda kv: tuple(int(p) for p in kv[0].split(':'))))
+
+    def _book_line(self, board: Board, enemy_reserve: int, player_reserve: int, positions: Dict[str, List[int]]):
+        """Book a canonical position, then every position any player reply and the duels lead to"""
+        code, board, _ = canonical(board)
+        key = f"{code}:{enemy_reserve}:{player_reserve}"
+        if enemy_reserve == 0 or key in positions:
+            return
+        value, move, _ = self.solve(board, enemy_reserve, player_reserve)
+        positions[key] = [cell_mask(move), round(value * 1000)]
+
+        free = [c for c in range(CELL_COUNT) if board[c] in (EMPTY, ENEMY_ONLY)]
+        for size in range(min(ACTIONS_PER_TURN, player_reserve, len(free)) + 1):
+            for reply in itertools.combinations(free, size):
+                placed = list(board)
+                for cell in move:
+                    placed[cell] |= ENEMY_ONLY
+                for cell in reply:
+                    placed[cell] |= PLAYER_ONLY
+                contested = [c for c in range(CELL_COUNT) if placed[c] == CONTESTED]
+                for results, _ in _duel_outcomes(len(contested), (1.0,) * 4, self.turn_results):
+                    for cell, result in zip(contested, results):
+                        placed[cell] = result
+                    rest = (enemy_reserve - len(move), player_reserve - size)
+                    if self.outcome_value(placed, *rest) is None:
+                        self._book_line(tuple(placed), rest[0], rest[1], positions)
+
+    def source_hash(self) -> str:
+        """Hash of the solver, the battle_sim rules it reuses and its parameters
+
+        Only the imported rule code is hashed, so battle_sim edits to logging or
+        the CLI leave the shipped book current.
+        """
+        digest = hashlib.sha1()
+        with open(os.path.abspath(__file__), 'rb') as f:
+            digest.update(f.read())
+        for func in (battle_sim.cell_scores, battle_sim._cell_score):
+            digest.update(inspect.getsource(func).encode('utf-8'))
+        rules = (ACTIONS_PER_TURN, CELL_COUNT, CONTESTED, EMPTY, ENEMY_ONLY, GRID_SIZE, LINES, PLAYER, PLAYER_ONLY)
+        digest.update(repr((rules, self.duel_odds, self.player_noise, TEAM_SIZES)).encode('utf-8'))
+        return digest.hexdigest()
+
+
+class BoardBook:
+    """The written book, looked up the way battle.gd _get_board_book_cells does"""
+
+    def __init__(self, positions: Dict[str, List[int]]):
+        self.positions = positions
+
+    @classmethod
+    def load(cls, game_root: str) -> Optional['BoardBook']:
+        """The game's book, or None when it is missing or unreadable"""
+        try:
+            with open(os.path.join(game_root, BOOK_PATH), 'r', encoding='utf-8') as f:
+                return cls(json.load(f)['positions'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def cells(self, owners: Sequence[int], enemy_reserve: int, player_reserve: int) -> Optional[Tuple[int, ...]]:
+        """Booked enemy cells of a position, in placement order, or None"""
+        code, _, perm = canonical(owners)
+        entry = self.positions.get(f"{code}:{enemy_reserve}:{player_reserve}")
+        if entry is None:
+            return None
+        return tuple(perm[i] for i in range(CELL_COUNT) if entry[0] >> i & 1)
+
+
+def write_book(path: str, positions: Dict[str, List[int]], solver: BoardSolver) -> int:
+    """Write the book compactly, one position per line. Returns bytes written."""
+    header = {'version': BOOK_VERSION, 'source_hash': solver.source_hash(),
+              'duel_odds': list(solver.duel_odds), 'player_noise': solver.player_noise}
+    lines = [f"{json.dumps(key)}:{json.dumps(value)}" for key, value in header.items()]
+    entries = ",\n".join(f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}"
+                         for key, value in positions.items())
+    text = "{\n" + ",\n".join(lines) + ',\n"positions":{\n' + entries + "\n}\n}\n"
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+def is_current(path: str, solver: BoardSolver) -> bool:
+    """Whether the book on disk was built by the current solver and parameters"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            book = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return book.get('version') == BOOK_VERSION and book.get('source_hash') == solver.source_hash()
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Solve the line-control placement game and write the AI book")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--check", action="store_true", help="Exit with status 1 if the book is stale")
+    arg_parser.add_argument("--board", default=None,
+                            help="Analyse one position instead, e.g. .E./.X./P.. (. empty, P, E, X contested)")
+    arg_parser.add_argument("--enemy", type=int, default=3, help="Enemy units in reserve (with --board)")
+    arg_parser.add_argument("--player", type=int, default=3, help="Player units in reserve (with --board)")
+    arg_parser.add_argument("--depth", type=int, default=MAX_DEPTH, help="Deepest search, in turns (with --board)")
+    args = arg_parser.parse_args()
+
+    solver = BoardSolver()
+    book_path = os.path.join(os.path.normpath(args.root), BOOK_PATH)
+
+    if args.board:
+        try:
+            board = parse_board(args.board)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        if args.enemy < 1:
+            print("ERROR: The enemy needs units in reserve to place")
+            sys.exit(1)
+        start = time.perf_counter()
+        value, move, exact = solver.solve(board, args.enemy, args.player, args.depth)
+        print(format_board(board, move))
+        print(f"Best cells {list(move)}: value {value:+.3f} ({'exact' if exact else f'depth {args.depth}'})")
+        for move_value, cells in solver.ranked_moves(board, args.enemy, args.player, args.depth)[:5]:
+            print(f"  {str(list(cells)):<12} {move_value:+.3f}")
+        print(f"{solver.nodes} positions searched in {time.perf_counter() - start:.2f}s")
+        return
+
+    if args.check:
+        if is_current(book_path, solver):
+            print(f"Board book is up to date: {book_path}")
+            sys.exit(0)
+        print("Board book is stale, run: python board_solver.py")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    positions = solver.build_book()
+    size = write_book(book_path, positions, solver)
+    print(f"Wrote {book_path} ({size / 1024:.1f} KB)")
+    print(f"  {len(positions)} book positions, {len(solver.table)} positions solved "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
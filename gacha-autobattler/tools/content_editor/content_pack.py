@@ -0,0 +1,186 @@
+"""
+Content Pack Builder
+Compiles the resource catalog into resources/content_pack.json, which PlayerData
+reads once at boot instead of loading .tres files to discover what exists.
+
+The pack holds pre-built lookup tables:
+  - units by id (path, name, element, star rating), gacha pools by star rating
+    and by element
+  - gear by id and gear drop templates by stat type and rarity
+  - abilities, stages (with play order), dungeons and achievements by id
+
+Only metadata is stored; the game still load()s the .tres of a unit or gear item
+when it is actually used. source_hash covers every input file, so --check can
+tell CI whether the committed pack is stale.
+
+Usage:
+    python content_pack.py
+    python content_pack.py --check
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from tres_parser import TresParser, TresResource
+
+PACK_PATH = os.path.join('resources', 'content_pack.json')
+PACK_VERSION = 1
+
+GACHA_STARS = (3, 4, 5)
+
+
+class ContentPackBuilder:
+    """Builds the content pack from the .tres catalog"""
+
+    def __init__(self, game_root: str):
+        self.game_root = game_root
+        self.parser = TresParser(game_root)
+        self.pack_path = os.path.join(game_root, PACK_PATH)
+
+    def to_res_path(self, filepath: str) -> str:
+        return "res://" + os.path.relpath(filepath, self.game_root).replace(os.sep, '/')
+
+    def source_files(self) -> List[str]:
+        """Every .tres under resources/, sorted"""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.parser.resources_path):
+            dirnames.sort()
+            files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.tres'))
+        return files
+
+    def source_hash(self, files: List[str]) -> str:
+        """Hash of every input path and its content"""
+        digest = hashlib.sha1()
+        for filepath in files:
+            with open(filepath, 'rb') as f:
+                digest.update(self.to_res_path(filepath).encode('utf-8'))
+                digest.update(hashlib.sha1(f.read()).digest())
+        return digest.hexdigest()
+
+    def build(self) -> Dict[str, Any]:
+        """Parse the catalog and assemble the pack"""
+        files = self.source_files()
+        by_class: Dict[str, List[TresResource]] = {}
+        for filepath in files:
+            resource = self.parser.parse_file(filepath)
+            by_class.setdefault(resource.script_class, []).append(resource)
+
+        pack = {
+            'version': PACK_VERSION,
+            'source_hash': self.source_hash(files),
+            'units': {},
+            'unit_pools': {str(stars): [] for stars in GACHA_STARS},
+            'units_by_element': {},
+            'abilities': {},
+            'gear': {},
+            'gear_templates': {},
+            'stages': {},
+            'stage_order': [],
+            'dungeons': {},
+            'achievements': {},
+        }
+
+        for unit in sorted(by_class.get('UnitData', []), key=lambda r: r.file_path):
+            props = unit.properties
+            res_path = self.to_res_path(unit.file_path)
+            unit_id = props.get('unit_id', '')
+            is_monster = '/monsters/' in res_path
+            summonable = not is_monster and not props.get('retired', False) and props.get('star_rating') in GACHA_STARS
+            pack['units'][unit_id] = {
+                'path': res_path,
+                'name': props.get('unit_name', ''),
+                'element': props.get('element', ''),
+                'star_rating': props.get('star_rating', 0),
+                'summonable': summonable,
+                'monster': is_monster,
+            }
+            if summonable:
+                pack['unit_pools'][str(props['star_rating'])].append(unit_id)
+                pack['units_by_element'].setdefault(props.get('element', ''), []).append(unit_id)
+
+        for ability in by_class.get('AbilityData', []):
+            pack['abilities'][ability.properties.get('ability_id', '')] = self.to_res_path(ability.file_path)
+
+        gear_schema = self.parser.schemas.get('GearData')
+        for gear in sorted(by_class.get('GearData', []), key=lambda r: r.file_path):
+            props = {**gear_schema.defaults(), **gear.properties} if gear_schema else gear.properties
+            gear_id = props.get('gear_id', '')
+            pack['gear'][gear_id] = {
+                'path': self.to_res_path(gear.file_path),
+                'name': props.get('gear_name', ''),
+                'gear_type': props.get('gear_type', 0),
+                'rarity': props.get('rarity', 0),
+                'stat_type': props.get('stat_type', 0),
+            }
+            stat_templates = pack['gear_templates'].setdefault(str(props.get('stat_type', 0)), {})
+            stat_templates.setdefault(str(props.get('rarity', 0)), []).append(gear_id)
+
+        stages = by_class.get('StageData', [])
+        stages.sort(key=lambda r: (r.properties.get('chapter', 0), r.properties.get('stage_number', 0)))
+        for stage in stages:
+            stage_id = stage.properties.get('stage_id', '')
+            pack['stages'][stage_id] = {
+                'path': self.to_res_path(stage.file_path),
+                'chapter': stage.properties.get('chapter', 1),
+                'stage_number': stage.properties.get('stage_number', 1),
+            }
+            pack['stage_order'].append(stage_id)
+
+        for dungeon in sorted(by_class.get('DungeonData', []), key=lambda r: r.file_path):
+            pack['dungeons'][dungeon.properties.get('dungeon_id', '')] = self.to_res_path(dungeon.file_path)
+
+        for achievement in sorted(by_class.get('AchievementData', []), key=lambda r: r.file_path):
+            pack['achievements'][achievement.properties.get('id', '')] = self.to_res_path(achievement.file_path)
+
+        return pack
+
+    def write(self, pack: Dict[str, Any]) -> int:
+        """Write the pack compactly (one table per line so diffs stay readable). Returns bytes written."""
+        lines = [f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'), sort_keys=True)}"
+                 for key, value in pack.items()]
+        text = "{\n" + ",\n".join(lines) + "\n}\n"
+        with open(self.pack_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        return len(text.encode('utf-8'))
+
+    def is_current(self) -> bool:
+        """Whether the pack on disk was built from the current catalog"""
+        try:
+            with open(self.pack_path, 'r', encoding='utf-8') as f:
+                pack = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return pack.get('version') == PACK_VERSION and pack.get('source_hash') == self.source_hash(self.source_files())
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compile the resource catalog into a content pack")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--check", action="store_true", help="Exit with status 1 if the pack is stale")
+    args = arg_parser.parse_args()
+
+    builder = ContentPackBuilder(os.path.normpath(args.root))
+    if args.check:
+        if builder.is_current():
+            print(f"Content pack is up to date: {builder.pack_path}")
+            sys.exit(0)
+        print("Content pack is stale, run: python content_pack.py")
+        sys.exit(1)
+
+    pack = builder.build()
+    size = builder.write(pack)
+    pools = ", ".join(f"{stars}★: {len(ids)}" for stars, ids in pack['unit_pools'].items())
+    print(f"Wrote {builder.pack_path} ({size / 1024:.1f} KB)")
+    print(f"  {len(pack['units'])} units (pools {pools}), {len(pack['gear'])} gear, "
+          f"{len(pack['abilities'])} abilities, {len(pack['stages'])} stages, "
+          f"{len(pack['dungeons'])} dungeons, {len(pack['achievements'])} achievements")
+
+
+if __name__ == "__main__":
+    main()
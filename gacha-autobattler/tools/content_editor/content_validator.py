@@ -0,0 +1,536 @@
+"""
+Content Validator
+Lints every .tres resource under resources/ before Godot loads it.
+
+Rules come in two kinds:
+  - file rules look at one parsed resource (types against the data script
+    schema, star ratings, ability counts, empty enemy lists, ...). They run
+    across a process pool and their results are cached per file in
+    .validation_cache.json, keyed by content hash.
+  - catalog rules look across all files (duplicate uids and ids, ext_resource
+    paths that don't exist). They run over the cached per-file facts in memory.
+
+Files whose size and modification time are unchanged are not even read again,
+so repeated runs (--watch, CI with a restored cache) only cost a directory walk
+plus the catalog pass. The cache is dropped when this module, the parser or any
+data script changes.
+
+Usage:
+    python content_validator.py
+    python content_validator.py --format json --output report.json
+    python content_validator.py --watch
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import gd_schema
+import tres_parser
+from tres_parser import TresParser, TresResource
+
+CACHE_FILE = '.validation_cache.json'
+RESOURCE_DIRS = ('resources',)
+SKIP_DIRS = {'.godot', '.git', '__pycache__'}
+
+PARALLEL_MIN_FILES = 2000  # Below this, process start-up costs more than it saves
+BATCH_SIZE = 500
+
+ELEMENTS = ('fire', 'water', 'nature', 'light', 'dark')
+STAR_RANGE = (1, 5)  # Monsters use 1-2 stars
+SUMMONABLE_MIN_STARS = 3
+UNIT_ABILITY_COUNT = 3
+
+# Property holding each class's gameplay id (must be unique within the class)
+ID_PROPERTIES = {
+    'UnitData': 'unit_id',
+    'AbilityData': 'ability_id',
+    'GearData': 'gear_id',
+    'StageData': 'stage_id',
+    'DungeonData': 'dungeon_id',
+    'AchievementData': 'id',
+    'FieldEffectData': 'field_id',
+    'StatusEffectData': 'effect_id',
+}
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# rule id -> (script_class or None for every resource, check(parser, resource) -> [(severity, message)])
+FileRule = Callable[[TresParser, TresResource], Iterable[Tuple[str, str]]]
+FILE_RULES: Dict[str, Tuple[Optional[str], FileRule]] = {}
+# rule id -> check(catalog) -> [(res_path, severity, message)]
+CatalogRule = Callable[['Catalog'], Iterable[Tuple[str, str, str]]]
+CATALOG_RULES: Dict[str, CatalogRule] = {}
+
+
+def file_rule(rule_id: str, script_class: Optional[str] = None):
+    """Register a per-file rule"""
+    def register(func: FileRule) -> FileRule:
+        FILE_RULES[rule_id] = (script_class, func)
+        return func
+    return register
+
+
+def catalog_rule(rule_id: str):
+    """Register a rule that needs the whole catalog"""
+    def register(func: CatalogRule) -> CatalogRule:
+        CATALOG_RULES[rule_id] = func
+        return func
+    return register
+
+
+@dataclass
+class Issue:
+    """One problem found in a resource file"""
+    path: str  # res:// path
+    rule: str
+    severity: str
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    """Result of a validation run"""
+    files: int = 0
+    rechecked: int = 0
+    elapsed: float = 0.0
+    issues: List[Issue] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)  # Files re-checked this run
+
+    def count(self, severity: str) -> int:
+        return sum(1 for issue in self.issues if issue.severity == severity)
+
+    def to_dict(self, changed_only: bool = False) -> Dict[str, Any]:
+        changed = set(self.changed)
+        issues = [i for i in self.issues if i.path in changed] if changed_only else self.issues
+        return {
+            'files': self.files,
+            'rechecked': self.rechecked,
+            'elapsed': round(self.elapsed, 3),
+            'errors': self.count(ERROR),
+            'warnings': self.count(WARNING),
+            'issues': [asdict(i) for i in issues],
+        }
+
+
+class Catalog:
+    """Per-file facts of every resource, shared by the catalog rules"""
+
+    def __init__(self, game_root: str, entries: Dict[str, Dict[str, Any]]):
+        self.game_root = game_root
+        self.entries = entries
+        self._exists: Dict[str, bool] = {path: True for path in entries}
+
+    def exists(self, res_path: str) -> bool:
+        """Whether a res:// path exists (checked on disk once per run)"""
+        found = self._exists.get(res_path)
+        if found is None:
+            file_path = os.path.join(self.game_root, *res_path[len('res://'):].split('/'))
+            found = self._exists[res_path] = os.path.exists(file_path)
+        return found
+
+
+# === File rules ===
+
+def _ext_ids(value: Any, found: Set[str]):
+    """Collect ExtResource ids referenced anywhere in a property value"""
+    if isinstance(value, dict):
+        if value.get('type') == 'ExtResource':
+            found.add(value.get('id', ''))
+        for item in value.get('items', []):
+            _ext_ids(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _ext_ids(item, found)
+
+
+@file_rule('schema')
+def check_schema(parser: TresParser, resource: TresResource):
+    if not resource.script_class:
+        return
+    schema = parser.schemas.get(resource.script_class)
+    if schema is None:
+        yield WARNING, f"no data script declares class_name {resource.script_class}"
+        return
+    for name, value in resource.properties.items():
+        if name == 'script':
+            continue
+        schema_field = schema.fields.get(name)
+        if schema_field is None:
+            yield WARNING, f"{name}: not an exported property of {schema.class_name} (ignored by Godot)"
+            continue
+        error = schema_field.check(value)
+        if error:
+            yield ERROR, error
+
+
+@file_rule('undeclared-ext-resource')
+def check_ext_ids(parser: TresParser, resource: TresResource):
+    referenced: Set[str] = set()
+    for value in resource.properties.values():
+        _ext_ids(value, referenced)
+    for ext_id in sorted(referenced - set(resource.ext_resources)):
+        yield ERROR, f'ExtResource("{ext_id}") is used but not declared'
+
+
+@file_rule('unit-star-rating', 'UnitData')
+def check_star_rating(parser: TresParser, resource: TresResource):
+    stars = resource.properties.get('star_rating')
+    if not isinstance(stars, int):
+        return  # Reported by the schema rule
+    low, high = STAR_RANGE
+    if not low <= stars <= high:
+        yield ERROR, f"star_rating {stars} is outside {low}..{high}"
+    elif stars < SUMMONABLE_MIN_STARS and '/monsters/' not in resource.file_path.replace('\\', '/'):
+        yield WARNING, f"star_rating {stars} is below {SUMMONABLE_MIN_STARS} for a non-monster unit"
+
+
+@file_rule('unit-ability-count', 'UnitData')
+def check_ability_count(parser: TresParser, resource: TresResource):
+    abilities = resource.properties.get('abilities')
+    items = abilities.get('items', []) if isinstance(abilities, dict) else abilities or []
+    if len(items) != UNIT_ABILITY_COUNT:
+        yield ERROR, f"has {len(items)} abilities, expected {UNIT_ABILITY_COUNT}"
+
+
+@file_rule('unit-element', 'UnitData')
+def check_element(parser: TresParser, resource: TresResource):
+    element = resource.properties.get('element', 'fire')
+    if element not in ELEMENTS:
+        yield ERROR, f"unknown element '{element}' (expected one of {', '.join(ELEMENTS)})"
+
+
+@file_rule('unit-stats', 'UnitData')
+def check_unit_stats(parser: TresParser, resource: TresResource):
+    props = resource.properties
+    if isinstance(props.get('max_hp'), int) and props['max_hp'] <= 0:
+        yield ERROR, f"max_hp must be positive, got {props['max_hp']}"
+    for stat in ('attack', 'defense', 'speed'):
+        if isinstance(props.get(stat), int) and props[stat] < 0:
+            yield ERROR, f"{stat} must not be negative, got {props[stat]}"
+
+
+@file_rule('stage-enemies', 'StageData')
+def check_stage_enemies(parser: TresParser, resource: TresResource):
+    enemies = resource.properties.get('enemy_units')
+    items = enemies.get('items', []) if isinstance(enemies, dict) else enemies or []
+    if not items:
+        yield ERROR, "stage has no enemy units"
+
+
+@file_rule('dungeon-tiers', 'DungeonData')
+def check_dungeon_tiers(parser: TresParser, resource: TresResource):
+    schema = parser.schemas.get('DungeonData')
+    lengths = []
+    for name in ('tier_enemy_levels', 'tier_names'):
+        value = resource.properties.get(name, schema.fields[name].default if schema else None)
+        items = value.get('items', []) if isinstance(value, dict) else value or []
+        lengths.append(len(items))
+    if lengths[0] != lengths[1]:
+        yield ERROR, f"{lengths[0]} tier_enemy_levels but {lengths[1]} tier_names"
+
+
+# === Catalog rules ===
+
+def _others(paths: List[str], path: str, limit: int = 3) -> str:
+    """The other files in a duplicate group, abbreviated for large groups"""
+    others = [p for p in paths if p != path]
+    text = ', '.join(others[:limit])
+    return text + (f" and {len(others) - limit} more" if len(others) > limit else "")
+
+
+@catalog_rule('duplicate-uid')
+def check_duplicate_uids(catalog: Catalog):
+    by_uid: Dict[str, List[str]] = {}
+    for path, entry in catalog.entries.items():
+        uid = entry['facts'].get('uid')
+        if uid:
+            by_uid.setdefault(uid, []).append(path)
+    for uid, paths in by_uid.items():
+        if len(paths) > 1:
+            paths.sort()
+            for path in paths:
+                yield path, ERROR, f"uid {uid} is also used by {_others(paths, path)}"
+
+
+@catalog_rule('duplicate-id')
+def check_duplicate_ids(catalog: Catalog):
+    by_id: Dict[Tuple[str, str], List[str]] = {}
+    for path, entry in catalog.entries.items():
+        facts = entry['facts']
+        if facts.get('id'):
+            by_id.setdefault((facts['class'], facts['id']), []).append(path)
+    for (script_class, item_id), paths in by_id.items():
+        if len(paths) > 1:
+            paths.sort()
+            for path in paths:
+                yield path, ERROR, f"{ID_PROPERTIES[script_class]} '{item_id}' is also used by {_others(paths, path)}"
+
+
+@catalog_rule('missing-ext-resource')
+def check_ext_paths(catalog: Catalog):
+    for path, entry in catalog.entries.items():
+        for ext_id, ext_type, _, ext_path in entry['facts'].get('refs', []):
+            if ext_path.startswith('res://') and not catalog.exists(ext_path):
+                yield path, ERROR, f'{ext_type} "{ext_id}" points to missing {ext_path}'
+
+
+@catalog_rule('ext-resource-uid-mismatch')
+def check_ext_uids(catalog: Catalog):
+    for path, entry in catalog.entries.items():
+        for ext_id, _, ext_uid, ext_path in entry['facts'].get('refs', []):
+            target = catalog.entries.get(ext_path)
+            if ext_uid and target and target['facts'].get('uid') and target['facts']['uid'] != ext_uid:
+                yield path, WARNING, (f'"{ext_id}" expects uid {ext_uid} but {ext_path} has '
+                                      f'{target["facts"]["uid"]} (Godot falls back to the path)')
+
+
+# === Running ===
+
+def check_file(parser: TresParser, file_path: str, cached_sha1: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Hash and lint one file. Returns None if its content hash equals cached_sha1,
+    otherwise {'sha1', 'facts', 'issues': [[rule, severity, message]]}.
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    sha1 = hashlib.sha1(raw).hexdigest()
+    if sha1 == cached_sha1:
+        return None
+
+    try:
+        resource = parser.parse_text(raw.decode('utf-8'), file_path)
+    except Exception as e:
+        return {'sha1': sha1, 'facts': {}, 'issues': [['parse', ERROR, f"could not parse: {e}"]]}
+    if not resource.resource_type:
+        return {'sha1': sha1, 'facts': {}, 'issues': [['parse', ERROR, "missing [gd_resource] header"]]}
+
+    issues = []
+    for rule_id, (script_class, check) in FILE_RULES.items():
+        if script_class and script_class != resource.script_class:
+            continue
+        try:
+            issues.extend([rule_id, severity, message] for severity, message in check(parser, resource))
+        except Exception as e:
+            issues.append([rule_id, ERROR, f"rule crashed: {e}"])
+
+    id_property = ID_PROPERTIES.get(resource.script_class)
+    facts = {
+        'uid': resource.uid,
+        'class': resource.script_class,
+        'id': resource.properties.get(id_property) if id_property else None,
+        'refs': [[ext_id, info['type'], info.get('uid', ''), info['path']]
+                 for ext_id, info in resource.ext_resources.items()],
+    }
+    return {'sha1': sha1, 'facts': facts, 'issues': issues}
+
+
+@lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    """Hash of the rule, parser and schema sources"""
+    digest = hashlib.sha1()
+    for module in (sys.modules[__name__], tres_parser, gd_schema):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+_worker_parser: Optional[TresParser] = None
+
+
+def _init_worker(game_root: str):
+    global _worker_parser
+    _worker_parser = TresParser(game_root)
+
+
+def _check_batch(batch: List[Tuple[str, str, str]]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Worker entry point: [(res_path, file_path, cached_sha1)] -> [(res_path, result)]"""
+    return [(res_path, check_file(_worker_parser, file_path, sha1)) for res_path, file_path, sha1 in batch]
+
+
+class ContentValidator:
+    """Runs the rules over the resource catalog, reusing cached per-file results"""
+
+    def __init__(self, game_root: str, workers: Optional[int] = None, use_cache: bool = True):
+        self.game_root = game_root
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_path = os.path.join(game_root, CACHE_FILE)
+        self.parser = TresParser(game_root)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever cached results may no longer be valid"""
+        return f"{_code_fingerprint()}:{self.parser.schemas.fingerprint}"
+
+    # === Persistence ===
+
+    def load(self):
+        """Load cached per-file results (empty if missing, disabled or made by other rules)"""
+        self.entries = {}
+        self._loaded = True
+        if not self.use_cache or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == self.fingerprint:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable validation cache: {e}")
+
+    def save(self):
+        if not self.use_cache:
+            return
+        # dumps() uses the C encoder; dump() to a file streams through the pure-Python one
+        data = json.dumps({'fingerprint': self.fingerprint, 'files': self.entries}, separators=(',', ':'))
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+
+    # === Scanning ===
+
+    def walk(self, folder: str, res_folder: str):
+        """Yield (os.DirEntry, res:// path) for every .tres file below folder"""
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from self.walk(entry.path, f"{res_folder}/{entry.name}")
+            elif entry.name.endswith('.tres') and entry.is_file():
+                yield entry, f"{res_folder}/{entry.name}"
+
+    def run(self) -> ValidationReport:
+        """Validate the catalog, re-checking only files that changed since the cached run"""
+        start = time.perf_counter()
+        if self.parser.schemas.reparsed or not self._loaded:
+            self.load()  # First run, or a data script changed (the fingerprint drops stale results)
+        previous = self.entries
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        stats: Dict[str, Tuple[int, int]] = {}
+        todo: List[Tuple[str, str, str]] = []
+        for folder in RESOURCE_DIRS:
+            for dir_entry, res_path in self.walk(os.path.join(self.game_root, folder), f"res://{folder}"):
+                stat = dir_entry.stat()
+                stats[res_path] = (stat.st_size, stat.st_mtime_ns)
+                cached = previous.get(res_path)
+                if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                    entries[res_path] = cached
+                else:
+                    todo.append((res_path, dir_entry.path, cached['sha1'] if cached else ""))
+
+        changed = []
+        for res_path, result in self._check(todo):
+            if result is None:
+                result = previous[res_path]  # Touched but identical content
+            else:
+                changed.append(res_path)
+            size, mtime_ns = stats[res_path]
+            entries[res_path] = {**result, 'size': size, 'mtime_ns': mtime_ns}
+
+        self.entries = entries
+        if todo or len(entries) != len(previous):
+            self.save()
+
+        issues = [Issue(path, rule, severity, message)
+                  for path, entry in entries.items() for rule, severity, message in entry['issues']]
+        catalog = Catalog(self.game_root, entries)
+        for rule_id, check in CATALOG_RULES.items():
+            issues.extend(Issue(path, rule_id, severity, message) for path, severity, message in check(catalog))
+        issues.sort(key=lambda i: (i.path, i.severity != ERROR, i.rule))
+
+        return ValidationReport(files=len(entries), rechecked=len(changed), issues=issues,
+                                changed=sorted(changed), elapsed=time.perf_counter() - start)
+
+    def _check(self, todo: List[Tuple[str, str, str]]) -> Iterable[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Lint files, across a process pool when there are enough of them"""
+        if len(todo) < PARALLEL_MIN_FILES or self.workers < 2:
+            for res_path, file_path, sha1 in todo:
+                yield res_path, check_file(self.parser, file_path, sha1)
+            return
+
+        batches = [todo[i:i + BATCH_SIZE] for i in range(0, len(todo), BATCH_SIZE)]
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.game_root,)) as pool:
+            for results in pool.map(_check_batch, batches):
+                yield from results
+
+
+def format_report(report: ValidationReport, changed_only: bool = False) -> str:
+    """Human-readable report, one line per issue"""
+    changed = set(report.changed)
+    lines = []
+    for issue in report.issues:
+        if changed_only and issue.path not in changed:
+            continue
+        lines.append(f"{issue.path}: {issue.severity} [{issue.rule}] {issue.message}")
+    lines.append(f"{report.files} files ({report.rechecked} re-checked) in {report.elapsed:.2f}s: "
+                 f"{report.count(ERROR)} errors, {report.count(WARNING)} warnings")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Lint game resources before Godot loads them")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--format", choices=("text", "json"), default="text", help="Report format on stdout")
+    arg_parser.add_argument("--output", "-o", help="Also write the JSON report to this file")
+    arg_parser.add_argument("--changed-only", action="store_true",
+                            help="Only report issues in files re-checked this run")
+    arg_parser.add_argument("--strict", action="store_true", help="Exit with status 1 on warnings too")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Re-check every file and don't write the cache")
+    arg_parser.add_argument("--watch", action="store_true", help="Re-validate whenever resources change")
+    arg_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between --watch polls")
+    arg_parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args()
+
+    validator = ContentValidator(os.path.normpath(args.root), args.workers, use_cache=not args.no_cache)
+
+    def emit(report: ValidationReport):
+        data = report.to_dict(args.changed_only)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        if args.format == "json":
+            print(json.dumps(data, indent=2))
+        else:
+            print(format_report(report, args.changed_only))
+
+    report = validator.run()
+    emit(report)
+    if not args.watch:
+        failed = report.count(ERROR) or (args.strict and report.count(WARNING))
+        sys.exit(1 if failed else 0)
+
+    print(f"Watching {', '.join(RESOURCE_DIRS)} (Ctrl+C to stop)")
+    seen = {(i.path, i.rule, i.message) for i in report.issues}
+    try:
+        while True:
+            time.sleep(args.interval)
+            validator.parser.schemas.load()
+            report = validator.run()
+            current = {(i.path, i.rule, i.message) for i in report.issues}
+            if report.rechecked or current != seen:
+                seen = current
+                emit(report)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
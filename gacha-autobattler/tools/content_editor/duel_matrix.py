@@ -0,0 +1,619 @@
+"""
+Duel Matrix
+Outcome of every 1v1 duel for balance analysis: unit x unit x ability x
+ability x level, computed in one NumPy-batched pass.
+
+Each entry puts unit A (player side) and unit B (enemy side) on the same cell,
+with fixed ability choices, and replays turns as battle.gd does until one falls
+or the 25-turn limit. Each turn runs the duel (speed order, elements,
+piercing, shields, guaranteed survive, heals, cooldowns, status and field
+effects), then field ticks and end-of-turn status ticks. A unit whose ability
+is on cooldown or disrupted strikes with the basic attack, as in the game.
+Scores count a win as 1, a double knockout as 0.5, and at the turn limit
+compare remaining HP fractions.
+
+Stats come from PlayerData.get_unit_stats_at_level (no imprint or gear). Duels
+in battle.gd read base attack/defense/speed, so by default level only raises HP.
+Pass --stats level to scale every stat.
+
+Results are cached in .duel_matrix_cache.npz in the game root, keyed by a hash
+of the unit, ability, status and field .tres files, the levels and this code.
+
+Usage:
+    python duel_matrix.py
+    python duel_matrix.py --unit ember_001 --level 30
+    python duel_matrix.py --levels 1,10,20,30,40,50 --stats level
+    python duel_matrix.py --verify 500
+"""
+
+import hashlib
+import os
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+import battle_sim
+from battle_sim import MAX_TURNS, AbilitySpec, BattleCatalog, UnitSpec
+
+CACHE_FILE = '.duel_matrix_cache.npz'
+SOURCE_DIRS = ('units', 'abilities', 'status_effects', 'field_effects')
+DEFAULT_LEVELS = (1, 10, 20, 30, 40, 50)
+STAT_GROWTH_PER_LEVEL = 0.03  # PlayerData.STAT_GROWTH_PER_LEVEL
+CHUNK_SIZE = 1 << 17  # Duel-levels per batch; bounds memory for large catalogs
+
+# Outcome codes
+A_WINS, B_WINS, DOUBLE_KO, TIMEOUT = 0, 1, 2, 3
+
+ELEMENT_ORDER = ('fire', 'water', 'nature', 'light', 'dark')
+
+
+@lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    """Changes whenever the simulation code changes"""
+    digest = hashlib.sha1()
+    for module_file in (__file__, battle_sim.__file__):
+        with open(module_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class DuelTable:
+    """Duel outcomes indexed [level, unit A, unit B, ability A, ability B]"""
+
+    def __init__(self, unit_ids: List[str], levels: Sequence[int], outcome: np.ndarray, turns: np.ndarray,
+                 hp_a: np.ndarray, hp_b: np.ndarray, ability_names: List[List[str]]):
+        self.unit_ids = unit_ids
+        self.levels = list(levels)
+        self.outcome = outcome
+        self.turns = turns
+        self.hp_a = hp_a  # HP fraction left at the end
+        self.hp_b = hp_b
+        self.ability_names = ability_names  # Per unit, padded with "" to the ability axis
+        self.index = {unit_id: i for i, unit_id in enumerate(unit_ids)}
+
+    def score(self) -> np.ndarray:
+        """A's score per duel: 1 win, 0.5 double knockout or equal HP at the limit, 0 loss"""
+        timeout_score = np.where(self.hp_a > self.hp_b, 1.0, np.where(self.hp_a < self.hp_b, 0.0, 0.5))
+        return np.select(
+            [self.outcome == A_WINS, self.outcome == B_WINS, self.outcome == DOUBLE_KO],
+            [1.0, 0.0, 0.5], timeout_score).astype(np.float32)
+
+    def ability_mask(self) -> np.ndarray:
+        """[unit, ability] True where the unit has that ability slot"""
+        return np.array([[bool(name) for name in names] for names in self.ability_names])
+
+    def _weights(self) -> np.ndarray:
+        """[A, B, ability A, ability B] weights that average over real ability slots only"""
+        mask = self.ability_mask().astype(np.float32)
+        return mask[:, None, :, None] * mask[None, :, None, :]
+
+    def win_rates(self, level_index: int) -> np.ndarray:
+        """[A, B] A's score against B averaged over both ability choices and both sides of the board"""
+        score = self.score()[level_index]
+        weights = self._weights()
+        as_player = (score * weights).sum(axis=(2, 3)) / weights.sum(axis=(2, 3))
+        # B against A from the other side, seen from A
+        as_enemy = 1.0 - as_player.T
+        return (as_player + as_enemy) / 2
+
+    def ability_win_rates(self, level_index: int) -> np.ndarray:
+        """[unit, ability] score of each ability against every unit and ability, from the player side"""
+        score = self.score()[level_index]
+        weights = self._weights()
+        totals = weights.sum(axis=(1, 3))
+        return np.where(totals > 0, (score * weights).sum(axis=(1, 3)) / np.maximum(totals, 1), np.nan)
+
+
+class DuelMatrix:
+    """Builds DuelTables from the .tres catalog"""
+
+    def __init__(self, game_root: str, levels: Sequence[int] = DEFAULT_LEVELS, stats: str = 'base'):
+        if stats not in ('base', 'level'):
+            raise ValueError(f"Unknown stats mode '{stats}'")
+        self.game_root = game_root
+        self.levels = tuple(levels)
+        self.stats = stats
+        self.cache_path = os.path.join(game_root, CACHE_FILE)
+        self.catalog: Optional[BattleCatalog] = None
+        self.from_cache = False
+
+    def cache_key(self) -> str:
+        digest = hashlib.sha1(_code_fingerprint().encode('utf-8'))
+        digest.update(repr((self.levels, self.stats)).encode('utf-8'))
+        resources = os.path.join(self.game_root, 'resources')
+        for folder in SOURCE_DIRS:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(resources, folder)):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.tres'):
+                        filepath = os.path.join(dirpath, filename)
+                        digest.update(os.path.relpath(filepath, resources).encode('utf-8'))
+                        with open(filepath, 'rb') as f:
+                            digest.update(hashlib.sha1(f.read()).digest())
+        return digest.hexdigest()
+
+    def load_catalog(self) -> BattleCatalog:
+        if self.catalog is None:
+            self.catalog = BattleCatalog(self.game_root).load()
+        return self.catalog
+
+    def compute(self, use_cache: bool = True) -> DuelTable:
+        """Load the table from cache, or simulate every duel"""
+        key = self.cache_key()
+        self.from_cache = False
+        if use_cache and os.path.exists(self.cache_path):
+            try:
+                with np.load(self.cache_path, allow_pickle=False) as data:
+                    if str(data['key']) == key:
+                        self.from_cache = True
+                        unit_ids = [str(unit_id) for unit_id in data['unit_ids']]
+                        names = [[str(name) for name in row] for row in data['ability_names']]
+                        return DuelTable(unit_ids, self.levels, data['outcome'], data['turns'],
+                                         data['hp_a'], data['hp_b'], names)
+            except (OSError, KeyError, ValueError):
+                pass  # Unreadable cache; rebuild
+
+        units = list(self.load_catalog().units.values())
+        table = simulate(units, self.levels, self.stats)
+        if use_cache:
+            with open(self.cache_path, 'wb') as f:
+                np.savez_compressed(
+                    f, key=np.array(key), unit_ids=np.array(table.unit_ids), outcome=table.outcome,
+                    turns=table.turns, hp_a=table.hp_a, hp_b=table.hp_b,
+                    ability_names=np.array(table.ability_names))
+        return table
+
+
+# --- Vectorized engine ---
+
+class _Tables:
+    """Catalog flattened into arrays; ability 0 is the basic Strike used when none applies"""
+
+    def __init__(self, units: List[UnitSpec]):
+        abilities: List[Optional[AbilitySpec]] = [None]
+        ability_index: Dict[str, int] = {}
+        statuses, fields = [], []
+        status_index: Dict[str, int] = {}
+        field_index: Dict[str, int] = {}
+
+        self.slots = max((len(u.abilities) for u in units), default=1) or 1
+        self.unit_abilities = np.zeros((len(units), self.slots), dtype=np.int32)
+        for u, unit in enumerate(units):
+            for k, ability in enumerate(unit.abilities):
+                if ability.ability_id not in ability_index:
+                    ability_index[ability.ability_id] = len(abilities)
+                    abilities.append(ability)
+                    if ability.status and ability.status.effect_id not in status_index:
+                        status_index[ability.status.effect_id] = len(statuses)
+                        statuses.append(ability.status)
+                    if ability.field and ability.field.field_id not in field_index:
+                        field_index[ability.field.field_id] = len(fields)
+                        fields.append(ability.field)
+                self.unit_abilities[u, k] = ability_index[ability.ability_id]
+
+        self.hp = np.array([u.max_hp for u in units], dtype=np.float64)
+        self.attack = np.array([u.attack for u in units], dtype=np.float64)
+        self.defense = np.array([u.defense for u in units], dtype=np.float64)
+        self.speed = np.array([u.speed for u in units], dtype=np.float64)
+        self.element = np.array([ELEMENT_ORDER.index(u.element) if u.element in ELEMENT_ORDER else len(ELEMENT_ORDER)
+                                 for u in units], dtype=np.int32)
+        self.element_mult = np.ones((len(ELEMENT_ORDER) + 1, len(ELEMENT_ORDER) + 1))
+        for (attacker, defender), mult in battle_sim.ELEMENT_MULTIPLIERS.items():
+            self.element_mult[ELEMENT_ORDER.index(attacker), ELEMENT_ORDER.index(defender)] = mult
+
+        def column(attr, default, dtype, source=abilities):
+            return np.array([default if a is None else getattr(a, attr) for a in source], dtype=dtype)
+
+        self.damage_mult = column('damage_multiplier', 1.0, np.float64)
+        self.defense_mult = column('defense_multiplier', 1.0, np.float64)
+        self.heal = column('heal_amount', 0, np.int32)
+        self.bonus = column('bonus_damage', 0, np.int64)
+        self.ignores_element = column('ignores_element', False, bool)
+        self.survive = column('guaranteed_survive', False, bool)
+        self.piercing = column('piercing', False, bool)
+        self.cooldown = column('cooldown', 0, np.int64)
+        self.to_self = column('applies_to_self', False, bool)
+        self.status = np.array([-1 if a is None or a.status is None else status_index[a.status.effect_id]
+                                for a in abilities], dtype=np.int32)
+        self.field = np.array([-1 if a is None or a.field is None else field_index[a.field.field_id]
+                               for a in abilities], dtype=np.int32)
+
+        # Damage over time per status; index -1 (no status) deals none
+        self.status_dot = np.array([s.damage_per_turn for s in statuses] + [0], dtype=np.int32)
+        self.statuses = statuses
+        self.fields = fields
+
+
+def simulate(units: List[UnitSpec], levels: Sequence[int], stats: str = 'base') -> DuelTable:
+    """Simulate every (level, A, B, ability A, ability B) duel"""
+    t = _Tables(units)
+    n_units, slots, n_levels = len(units), t.slots, len(levels)
+    pair_shape = (n_units, n_units, slots, slots)
+    pairs = int(np.prod(pair_shape))
+
+    outcome = np.empty((n_levels, pairs), dtype=np.int8)
+    turns = np.empty((n_levels, pairs), dtype=np.int8)
+    hp_a = np.empty((n_levels, pairs), dtype=np.float32)
+    hp_b = np.empty((n_levels, pairs), dtype=np.float32)
+
+    # Stat multiplier per level, computed as PlayerData.get_unit_stats_at_level (imprint 0)
+    level_mult = np.array([1.0 + STAT_GROWTH_PER_LEVEL * (level - 1) for level in levels])
+    if stats == 'base':
+        # Only HP depends on level, so every level shares one pass over the duels
+        passes = [(slice(None), level_mult, 1.0)]
+    else:
+        passes = [(slice(i, i + 1), level_mult[i:i + 1], level_mult[i]) for i in range(n_levels)]
+
+    chunk = max(1, CHUNK_SIZE // n_levels) if stats == 'base' else CHUNK_SIZE
+    for level_slice, hp_mult, stat_mult in passes:
+        for start in range(0, pairs, chunk):
+            flat = np.arange(start, min(start + chunk, pairs), dtype=np.int64)
+            ua, ub, ka, kb = np.unravel_index(flat, pair_shape)
+            result = _run_chunk(t, ua, ub, t.unit_abilities[ua, ka], t.unit_abilities[ub, kb], hp_mult, stat_mult)
+            for out, values in zip((outcome, turns, hp_a, hp_b), result):
+                out[level_slice, flat[0]:flat[-1] + 1] = values.T
+
+    shape = (n_levels,) + pair_shape
+    names = [[a.name for a in u.abilities] + [""] * (slots - len(u.abilities)) for u in units]
+    return DuelTable([u.unit_id for u in units], levels, outcome.reshape(shape), turns.reshape(shape),
+                     hp_a.reshape(shape), hp_b.reshape(shape), names)
+
+
+def _trunc(x: np.ndarray) -> np.ndarray:
+    """GDScript int() of a float (truncates toward zero)"""
+    return np.trunc(x).astype(np.int64)
+
+
+class _Side:
+    """State of one side across a batch of duels; HP has one column per level"""
+
+    def __init__(self, t: _Tables, unit: np.ndarray, ability: np.ndarray, hp_mult: np.ndarray, stat_mult: float,
+                 owner: int):
+        self.owner = owner
+        self.max_hp = _trunc(t.hp[unit][:, None] * hp_mult[None, :]).astype(np.int32)
+        self.attack = _trunc(t.attack[unit] * stat_mult).astype(np.float64)
+        self.defense = _trunc(t.defense[unit] * stat_mult).astype(np.float64)
+        self.speed = _trunc(t.speed[unit] * stat_mult)
+        self.element = t.element[unit]
+        self.ability = ability
+        self.hp = self.max_hp.copy()
+        self.cooldown = np.zeros(len(unit), dtype=np.int64)
+        self.status_turns = np.zeros((len(unit), len(t.statuses)), dtype=np.int64)
+        self.shield = np.zeros((len(unit), len(t.statuses)), dtype=np.int64)
+
+    def take(self, keep: np.ndarray):
+        for name in ('max_hp', 'attack', 'defense', 'speed', 'element', 'ability', 'hp', 'cooldown',
+                     'status_turns', 'shield'):
+            setattr(self, name, getattr(self, name)[keep])
+
+
+def _run_chunk(t: _Tables, ua: np.ndarray, ub: np.ndarray, ability_a: np.ndarray, ability_b: np.ndarray,
+               hp_mult: np.ndarray, stat_mult: float) -> Tuple[np.ndarray, ...]:
+    """Play a batch of duels at several HP multipliers at once.
+
+    While both units stand, nothing but HP depends on the HP multiplier (abilities, cooldowns,
+    statuses, shields and fields evolve the same), so that state is shared and only HP is kept
+    per level. A level stops updating once its duel is decided.
+    """
+    n, n_levels = len(ua), len(hp_mult)
+    a = _Side(t, ua, ability_a, hp_mult, stat_mult, battle_sim.PLAYER)
+    b = _Side(t, ub, ability_b, hp_mult, stat_mult, battle_sim.ENEMY)
+    field_turns = np.zeros((n, len(t.fields)), dtype=np.int64)
+    field_owner = np.zeros((n, len(t.fields)), dtype=np.int64)
+    element_a = t.element_mult[a.element, b.element]
+    element_b = t.element_mult[b.element, a.element]
+    a_first = (a.speed > b.speed)[:, None]
+    b_first = (b.speed > a.speed)[:, None]
+    strikes_first_a = ~b_first  # Hits in the first exchange (both on a speed tie)
+    strikes_first_b = ~a_first
+
+    outcome = np.full((n, n_levels), TIMEOUT, dtype=np.int8)
+    turns = np.full((n, n_levels), MAX_TURNS, dtype=np.int8)
+    hp_a = np.zeros((n, n_levels), dtype=np.float32)
+    hp_b = np.zeros((n, n_levels), dtype=np.float32)
+    rows = np.arange(n)
+    live = np.ones((n, n_levels), dtype=bool)
+
+    for turn in range(1, MAX_TURNS + 1):
+        # Ability in use: the chosen one unless on cooldown or disrupted (then basic Strike)
+        used = []
+        for side in (a, b):
+            blocked = side.cooldown > 0
+            for s, effect in enumerate(t.statuses):
+                if effect.prevents_abilities:
+                    blocked |= side.status_turns[:, s] > 0
+            use = np.where(blocked, 0, side.ability)
+            side.cooldown = np.where(t.cooldown[use] > 0, t.cooldown[use], side.cooldown)
+            used.append(use)
+        use_a, use_b = used
+
+        power_a, defense_a = _attack_power(t, a, use_a, element_a, field_turns, field_owner)
+        power_b, defense_b = _attack_power(t, b, use_b, element_b, field_turns, field_owner)
+        damage_to_a = np.where(t.piercing[use_b], power_b,
+                               np.maximum(1, power_b - _trunc(defense_a * t.defense_mult[use_a])))
+        damage_to_b = np.where(t.piercing[use_a], power_a,
+                               np.maximum(1, power_a - _trunc(defense_b * t.defense_mult[use_b])))
+        damage_to_a = _absorb(t, a, damage_to_a).astype(np.int32)[:, None]
+        damage_to_b = _absorb(t, b, damage_to_b).astype(np.int32)[:, None]
+        survive_a, survive_b = t.survive[use_a][:, None], t.survive[use_b][:, None]
+
+        # First strikes, then retaliation only from a survivor
+        _hit(b.hp, damage_to_b, strikes_first_a, survive_b)
+        _hit(a.hp, damage_to_a, strikes_first_b, survive_a)
+        retaliates_a = a_first & (b.hp > 0)
+        retaliates_b = b_first & (a.hp > 0)
+        _hit(a.hp, damage_to_a, retaliates_a, survive_a)
+        _hit(b.hp, damage_to_b, retaliates_b, survive_b)
+
+        # Heals, then status effects (A's first), then fields (even from a fallen caster).
+        # Statuses are applied as if both units stand: where one fell, that level is decided this turn,
+        # but a fallen caster's new damage over time must not tick on the survivor.
+        for side, use in ((a, use_a), (b, use_b)):
+            heal = t.heal[use][:, None]
+            if heal.any():
+                side.hp = np.where(side.hp > 0, np.minimum(side.max_hp, side.hp + heal), side.hp)
+        unearned_dot = {a.owner: 0, b.owner: 0}
+        for side, other, use, other_use in ((a, b, use_a, use_b), (b, a, use_b, use_a)):
+            status = t.status[use]
+            applies = status >= 0
+            if applies.any():
+                to_self = t.to_self[use]
+                _apply_status(t, side, status, applies & to_self)
+                added = _apply_status(t, other, status, applies & ~to_self)
+                # Unless the target also gives itself that status this turn
+                added &= ~(t.to_self[other_use] & (t.status[other_use] == status))
+                if added.any():
+                    dot = np.where(added, t.status_dot[status], 0)[:, None] * (side.hp <= 0)
+                    unearned_dot[other.owner] = unearned_dot[other.owner] + dot
+        for side, use in ((a, use_a), (b, use_b)):
+            field = t.field[use]
+            for f, effect in enumerate(t.fields):
+                cast = field == f
+                if cast.any():
+                    field_owner[:, f] = np.where(cast & (field_turns[:, f] <= 0), side.owner, field_owner[:, f])
+                    field_turns[:, f] = np.where(cast, effect.base_duration, field_turns[:, f])
+
+        # Field damage and healing on units still standing (healing applies even after lethal damage)
+        if t.fields:
+            for side in (a, b):
+                damage, healing = _field_ticks(t, side.owner, field_turns, field_owner)
+                if damage.any() or healing.any():
+                    standing = side.hp > 0
+                    side.hp -= damage[:, None] * standing
+                    np.maximum(side.hp, 0, out=side.hp)
+                    side.hp = np.where(standing, np.minimum(side.max_hp, side.hp + healing[:, None]), side.hp)
+            field_turns = np.maximum(0, field_turns - 1)
+
+        # End of turn: ability cooldowns and status effects tick
+        for side in (a, b):
+            side.cooldown = np.maximum(0, side.cooldown - 1)
+            if t.statuses:
+                active = side.status_turns > 0
+                dot = (active * t.status_dot[:-1]).sum(axis=1)[:, None] - unearned_dot[side.owner]
+                side.status_turns = np.where(active, side.status_turns - 1, 0)
+                side.shield = np.where(side.status_turns > 0, side.shield, 0)
+                if (dot > 0).any():
+                    side.hp -= np.maximum(dot, 0)
+                    np.maximum(side.hp, 0, out=side.hp)
+
+        a_down, b_down = a.hp <= 0, b.hp <= 0
+        done = live & (a_down | b_down) if turn < MAX_TURNS else live
+        if done.any():
+            r, level = np.nonzero(done)
+            out = rows[r], level
+            a_fell, b_fell = a_down[r, level], b_down[r, level]
+            outcome[out] = np.where(a_fell, np.where(b_fell, DOUBLE_KO, B_WINS), np.where(b_fell, A_WINS, TIMEOUT))
+            turns[out] = turn
+            hp_a[out] = a.hp[r, level] / a.max_hp[r, level]
+            hp_b[out] = b.hp[r, level] / b.max_hp[r, level]
+            live &= ~done
+
+            keep = live.any(axis=1)
+            if not keep.any():
+                break
+            if keep.mean() < 0.8:
+                rows, live = rows[keep], live[keep]
+                a.take(keep)
+                b.take(keep)
+                field_turns, field_owner = field_turns[keep], field_owner[keep]
+                element_a, element_b = element_a[keep], element_b[keep]
+                a_first, b_first = a_first[keep], b_first[keep]
+                strikes_first_a, strikes_first_b = strikes_first_a[keep], strikes_first_b[keep]
+
+    return outcome, turns, hp_a, hp_b
+
+
+def _attack_power(t: _Tables, side: _Side, use: np.ndarray, element: np.ndarray,
+                  field_turns: np.ndarray, field_owner: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(attack power, effective defense) with status, field, ability and element modifiers"""
+    status_attack = np.ones(len(use))
+    status_defense = np.ones(len(use))
+    for s, effect in enumerate(t.statuses):
+        on = side.status_turns[:, s] > 0
+        if on.any():
+            status_attack = np.where(on, status_attack * effect.attack_modifier * effect.attack_boost, status_attack)
+            status_defense = np.where(on, status_defense * effect.defense_modifier * effect.defense_boost,
+                                      status_defense)
+    field_attack = np.ones(len(use))
+    field_defense = np.ones(len(use))
+    for f, effect in enumerate(t.fields):
+        on = (field_turns[:, f] > 0) & np.where(field_owner[:, f] == side.owner,
+                                                 effect.affects_allies, effect.affects_enemies)
+        if on.any():
+            field_attack = np.where(on, field_attack * effect.attack_modifier, field_attack)
+            field_defense = np.where(on, field_defense * effect.defense_modifier, field_defense)
+
+    effective_attack = _trunc(side.attack * status_attack * field_attack)
+    effective_defense = _trunc(side.defense * status_defense * field_defense)
+    element = np.where(t.ignores_element[use], 1.0, element)
+    power = _trunc(effective_attack * t.damage_mult[use] * element) + t.bonus[use]
+    return power, effective_defense
+
+
+def _hit(hp: np.ndarray, damage: np.ndarray, lands: np.ndarray, survive: np.ndarray):
+    """Deal damage in place where the hit lands; guaranteed survive leaves 1 HP"""
+    hp -= damage * lands
+    np.maximum(hp, 0, out=hp)
+    if survive.any():
+        hp[(hp <= 0) & lands & survive] = 1
+
+
+def _absorb(t: _Tables, side: _Side, damage: np.ndarray) -> np.ndarray:
+    for s, effect in enumerate(t.statuses):
+        if effect.shield_amount > 0:
+            absorbed = np.minimum(side.shield[:, s], damage)
+            side.shield[:, s] -= absorbed
+            damage = damage - absorbed
+    return np.maximum(0, damage)
+
+
+def _apply_status(t: _Tables, side: _Side, status: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Apply each row's status where mask is set; returns the rows where it was not already active"""
+    added = np.zeros(len(mask), dtype=bool)
+    for s, effect in enumerate(t.statuses):
+        hit = mask & (status == s)
+        if not hit.any():
+            continue
+        fresh = hit & (side.status_turns[:, s] <= 0)
+        added |= fresh
+        if effect.refresh_on_reapply:
+            side.status_turns[:, s] = np.where(hit, effect.base_duration, side.status_turns[:, s])
+            if effect.shield_amount > 0:
+                side.shield[:, s] = np.where(hit, effect.shield_amount, side.shield[:, s])
+        else:
+            side.status_turns[:, s] = np.where(fresh, effect.base_duration, side.status_turns[:, s])
+            side.shield[:, s] = np.where(fresh, effect.shield_amount, side.shield[:, s])
+    return added
+
+
+def _field_ticks(t: _Tables, owner: int, field_turns: np.ndarray,
+                 field_owner: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    damage = np.zeros(len(field_turns), dtype=np.int32)
+    healing = np.zeros(len(field_turns), dtype=np.int32)
+    for f, effect in enumerate(t.fields):
+        on = (field_turns[:, f] > 0) & np.where(field_owner[:, f] == owner, effect.affects_allies,
+                                                 effect.affects_enemies)
+        damage += np.where(on, max(0, effect.damage_per_turn), 0)
+        healing += np.where(on, max(0, effect.heal_per_turn), 0)
+    return damage, healing
+
+
+# --- Checks and reports ---
+
+def verify(catalog: BattleCatalog, table: DuelTable, samples: int, seed: int = 0) -> int:
+    """Replay random table entries with battle_sim; returns the number of mismatches"""
+    rng = np.random.default_rng(seed)
+    mask = table.ability_mask()
+    mismatches = 0
+    for _ in range(samples):
+        lv = int(rng.integers(len(table.levels)))
+        ua, ub = (int(i) for i in rng.integers(len(table.unit_ids), size=2))
+        ka = int(rng.choice(np.flatnonzero(mask[ua])))
+        kb = int(rng.choice(np.flatnonzero(mask[ub])))
+        level = table.levels[lv]
+
+        p = battle_sim.Fighter(catalog.units[table.unit_ids[ua]], battle_sim.PLAYER, level)
+        e = battle_sim.Fighter(catalog.units[table.unit_ids[ub]], battle_sim.ENEMY, level)
+        p.ability_index, e.ability_index = ka, kb
+        battle = battle_sim.Battle([p], [e])
+        battle.resolve_turn([(p, 4)], [(e, 4)])
+        while p.hp > 0 and e.hp > 0 and battle.turn <= MAX_TURNS:
+            battle.resolve_turn([], [])
+        expected = (A_WINS if e.hp <= 0 < p.hp else B_WINS if p.hp <= 0 < e.hp
+                    else DOUBLE_KO if p.hp <= 0 else TIMEOUT)
+        got = (int(table.outcome[lv, ua, ub, ka, kb]), int(table.turns[lv, ua, ub, ka, kb]))
+        if got != (expected, min(battle.turn - 1, MAX_TURNS)) or \
+                abs(float(table.hp_a[lv, ua, ub, ka, kb]) - p.hp / p.max_hp) > 1e-6:
+            mismatches += 1
+            print(f"  Mismatch: L{level} {table.unit_ids[ua]}[{ka}] vs {table.unit_ids[ub]}[{kb}]: "
+                  f"table {got}, battle_sim {(expected, battle.turn - 1)}, HP {p.hp}/{e.hp}")
+    return mismatches
+
+
+def format_rankings(table: DuelTable, catalog: BattleCatalog, level_index: int) -> str:
+    rates = table.win_rates(level_index)
+    overall = rates.mean(axis=1)
+    ability_rates = table.ability_win_rates(level_index)
+    lines = [f"Level {table.levels[level_index]} - average score against every unit "
+             f"(both sides, all ability pairs):",
+             f"  {'Unit':<48}{'Stars':>6}{'Element':>9}{'Score':>8}   Best ability"]
+    for u in np.argsort(-overall):
+        spec = catalog.units[table.unit_ids[u]]
+        best = int(np.nanargmax(ability_rates[u]))
+        lines.append(f"  {spec.name + ' (' + spec.unit_id + ')':<48}{spec.star_rating:>6}{spec.element:>9}"
+                     f"{overall[u]:>8.1%}   {table.ability_names[u][best]} ({ability_rates[u, best]:.0%})")
+    return "\n".join(lines)
+
+
+def format_matchups(table: DuelTable, catalog: BattleCatalog, unit_id: str, level_index: int) -> str:
+    u = table.index[unit_id]
+    rates = table.win_rates(level_index)[u]
+    ability_rates = table.ability_win_rates(level_index)[u]
+    lines = [f"{catalog.units[unit_id].name} at level {table.levels[level_index]}: {rates.mean():.1%} overall"]
+    for k, name in enumerate(table.ability_names[u]):
+        if name:
+            lines.append(f"  {name:<24}{ability_rates[k]:>7.1%}")
+    lines.append("  Matchups (worst first):")
+    for v in np.argsort(rates):
+        lines.append(f"    vs {catalog.units[table.unit_ids[v]].name:<24}{rates[v]:>7.1%}")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compute the all-pairs duel matrix")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--levels", default=",".join(str(level) for level in DEFAULT_LEVELS),
+                            help="Comma-separated unit levels")
+    arg_parser.add_argument("--stats", choices=('base', 'level'), default='base',
+                            help="'base': duels use base attack/defense/speed as battle.gd does; "
+                                 "'level': scale every stat with level")
+    arg_parser.add_argument("--level", type=int, help="Level to report (default: the first)")
+    arg_parser.add_argument("--unit", help="Show one unit's matchups")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the cache")
+    arg_parser.add_argument("--verify", type=int, default=0, metavar="N",
+                            help="Check N random entries against battle_sim (base stats only)")
+    args = arg_parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+    if args.level is not None and args.level not in levels:
+        print(f"ERROR: Level {args.level} not in --levels")
+        sys.exit(1)
+    if args.verify and args.stats != 'base':
+        print("ERROR: --verify needs --stats base (battle_sim duels use base stats)")
+        sys.exit(1)
+
+    matrix = DuelMatrix(os.path.normpath(args.root), levels, args.stats)
+    start = time.perf_counter()
+    table = matrix.compute(use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+    catalog = matrix.load_catalog()
+    print(f"{table.outcome.size:,} duels ({len(table.unit_ids)} units, {len(levels)} levels) in {elapsed:.2f}s"
+          f"{' (cached)' if matrix.from_cache else ''}")
+
+    level_index = levels.index(args.level) if args.level is not None else 0
+    if args.unit:
+        if args.unit not in table.index:
+            print(f"ERROR: Unknown unit '{args.unit}'")
+            sys.exit(1)
+        print(format_matchups(table, catalog, args.unit, level_index))
+    else:
+        print(format_rankings(table, catalog, level_index))
+
+    if args.verify:
+        mismatches = verify(catalog, table, args.verify)
+        print(f"Verified {args.verify} duels against battle_sim: {mismatches} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,26 @@ A desktop application for managing game content
 import os
 import sys
 import shutil
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 try:
     import customtkinter as ctk
+    import numpy as np
     from PIL import Image, ImageTk
 except ImportError:
-    print("Missing dependencies. Please run: pip install customtkinter pillow")
+    print("Missing dependencies. Please run: pip install customtkinter pillow numpy")
     sys.exit(1)
 
 from tres_parser import TresParser, TresResource
+from gd_schema import ScriptSchema
+from asset_index import AssetIndexer, AssetReport, format_size, summarize
+from thumbnail_cache import THUMBNAIL_CACHE_DIR, AsyncThumbnailer, ThumbnailCache
+from content_pack import ContentPackBuilder
+from stat_tables import StatTableBuilder
+from duel_matrix import DEFAULT_LEVELS, DuelMatrix, DuelTable
 
 # Theme configuration
 ctk.set_appearance_mode("dark")
@@ -78,6 +86,18 @@ class ContentEditor(ctk.CTk):
 
         self._create_ui()
         self._load_all_data()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        """Rebuild the game's content pack and stat tables if resources changed, then exit"""
+        for builder, name in ((ContentPackBuilder(self.game_root), "content pack"),
+                              (StatTableBuilder(self.game_root), "stat tables")):
+            if not builder.is_current():
+                try:
+                    builder.write(builder.build())
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to rebuild {name}: {e}")
+        self.destroy()
 
     def _find_game_root(self) -> Optional[str]:
         """Find the game root directory"""
@@ -119,6 +139,7 @@ class ContentEditor(ctk.CTk):
             ("Stages", "stages"),
             ("Dungeons", "dungeons"),
             ("Assets", "assets"),
+            ("Balance", "balance"),
         ]
 
         self.nav_buttons = {}
@@ -147,6 +168,7 @@ class ContentEditor(ctk.CTk):
         self.panels['stages'] = StagesPanel(self.content_frame, self)
         self.panels['dungeons'] = DungeonsPanel(self.content_frame, self)
         self.panels['assets'] = AssetsPanel(self.content_frame, self)
+        self.panels['balance'] = BalancePanel(self.content_frame, self)
 
         # Show initial panel
         self._switch_panel('units')
@@ -208,10 +230,78 @@ class BasePanel(ctk.CTkFrame):
         """Override to refresh panel data"""
         pass
 
+    # === Schema-driven forms ===
+    # Panels set SCRIPT_CLASS and list their form as FORM_SECTIONS; widget types,
+    # enum options, defaults and input checking come from the data script's @exports.
+
+    SCRIPT_CLASS = ""
+    FORM_SECTIONS: List[Tuple[str, List[str]]] = []
+    FIELD_LABELS: Dict[str, str] = {}
+    FIELD_OPTIONS: Dict[str, List[str]] = {}  # Fixed choices for non-enum properties
+
+    @property
+    def schema(self) -> ScriptSchema:
+        return self.app.parser.schemas.get(self.SCRIPT_CLASS)
+
+    def _form_field_names(self) -> List[str]:
+        return [name for _, names in self.FORM_SECTIONS for name in names]
+
+    def _add_schema_form(self):
+        """Add a section and a field for every property in FORM_SECTIONS"""
+        for title, names in self.FORM_SECTIONS:
+            self._add_section(title)
+            for name in names:
+                schema_field = self.schema.fields[name]
+                label = self.FIELD_LABELS.get(name, schema_field.label)
+                if schema_field.kind == 'bool':
+                    self.fields[name] = self._add_field(label, "checkbox")
+                elif schema_field.kind == 'enum':
+                    self.fields[name] = self._add_field(label, "combo", schema_field.enum_options())
+                elif name in self.FIELD_OPTIONS:
+                    self.fields[name] = self._add_field(label, "combo", self.FIELD_OPTIONS[name])
+                else:
+                    self.fields[name] = self._add_field(label, "entry")
+
+    def _load_schema_form(self, resource: TresResource):
+        """Show a resource's values in the form, using schema defaults for unset properties"""
+        for name in self._form_field_names():
+            schema_field = self.schema.fields[name]
+            value = resource.properties.get(name, schema_field.default)
+            widget = self.fields[name]
+            if schema_field.kind == 'bool':
+                widget.var.set(bool(value))
+            elif isinstance(widget, ctk.CTkComboBox):
+                widget.set(schema_field.enum_label(value) if schema_field.enum else str(value))
+            else:
+                widget.delete(0, 'end')
+                widget.insert(0, str(value))
+
+    def _store_schema_form(self, resource: TresResource) -> bool:
+        """Copy form values into a resource; shows the first invalid value and returns False instead"""
+        values = {}
+        for name in self._form_field_names():
+            widget = self.fields[name]
+            raw = widget.var.get() if hasattr(widget, 'var') else widget.get()
+            try:
+                values[name] = self.schema.fields[name].coerce(raw)
+            except ValueError as e:
+                messagebox.showerror("Invalid Value", str(e))
+                return False
+        resource.properties.update(values)
+        return True
+
 
 class UnitsPanel(BasePanel):
     """Panel for editing units"""
 
+    SCRIPT_CLASS = "UnitData"
+    FORM_SECTIONS = [
+        ("Basic Info", ['unit_name', 'unit_id', 'element', 'star_rating', 'retired']),
+        ("Base Stats", ['max_hp', 'attack', 'defense', 'speed']),
+    ]
+    FIELD_LABELS = {'unit_name': "Name", 'unit_id': "ID", 'max_hp': "Max HP"}
+    FIELD_OPTIONS = {'element': ELEMENTS, 'star_rating': ["3", "4", "5"]}
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
         self._create_ui()
@@ -286,20 +376,7 @@ class UnitsPanel(BasePanel):
 
         # Form fields
         self.fields = {}
-
-        # Basic info section
-        self._add_section("Basic Info")
-        self.fields['unit_name'] = self._add_field("Name", "entry")
-        self.fields['unit_id'] = self._add_field("ID", "entry")
-        self.fields['element'] = self._add_field("Element", "combo", ELEMENTS)
-        self.fields['star_rating'] = self._add_field("Star Rating", "combo", ["3", "4", "5"])
-
-        # Stats section
-        self._add_section("Base Stats")
-        self.fields['max_hp'] = self._add_field("Max HP", "entry")
-        self.fields['attack'] = self._add_field("Attack", "entry")
-        self.fields['defense'] = self._add_field("Defense", "entry")
-        self.fields['speed'] = self._add_field("Speed", "entry")
+        self._add_schema_form()
 
         # Abilities section
         self._add_section("Abilities")
@@ -354,7 +431,9 @@ class UnitsPanel(BasePanel):
         elif field_type == "combo":
             widget = ctk.CTkComboBox(frame, values=options or [], width=200)
         elif field_type == "checkbox":
-            widget = ctk.CTkCheckBox(frame, text="")
+            var = ctk.BooleanVar()
+            widget = ctk.CTkCheckBox(frame, text="", variable=var)
+            widget.var = var
         else:
             widget = ctk.CTkEntry(frame, width=200)
 
@@ -446,26 +525,7 @@ class UnitsPanel(BasePanel):
         self.editor_title.configure(text=f"Editing: {unit.properties.get('unit_name', 'Unknown')}")
 
         # Populate fields
-        self.fields['unit_name'].delete(0, 'end')
-        self.fields['unit_name'].insert(0, unit.properties.get('unit_name', ''))
-
-        self.fields['unit_id'].delete(0, 'end')
-        self.fields['unit_id'].insert(0, unit.properties.get('unit_id', ''))
-
-        self.fields['element'].set(unit.properties.get('element', 'fire'))
-        self.fields['star_rating'].set(str(unit.properties.get('star_rating', 3)))
-
-        self.fields['max_hp'].delete(0, 'end')
-        self.fields['max_hp'].insert(0, str(unit.properties.get('max_hp', 100)))
-
-        self.fields['attack'].delete(0, 'end')
-        self.fields['attack'].insert(0, str(unit.properties.get('attack', 20)))
-
-        self.fields['defense'].delete(0, 'end')
-        self.fields['defense'].insert(0, str(unit.properties.get('defense', 10)))
-
-        self.fields['speed'].delete(0, 'end')
-        self.fields['speed'].insert(0, str(unit.properties.get('speed', 10)))
+        self._load_schema_form(unit)
 
         # Load abilities
         abilities_prop = unit.properties.get('abilities', {'type': 'Array', 'items': []})
@@ -493,39 +553,13 @@ class UnitsPanel(BasePanel):
 
     def _create_new(self):
         """Create a new unit"""
-        # Generate new unit
-        new_unit = TresResource()
-        new_unit.resource_type = "Resource"
-        new_unit.script_class = "UnitData"
-        new_unit.uid = self.app.parser.generate_uid("unit")
-
-        new_unit.ext_resources = {
-            '1_script': {
-                'type': 'Script',
-                'uid': '',
-                'path': 'res://scripts/data/unit_data.gd'
-            }
-        }
-
-        new_unit.properties = {
-            'script': {'type': 'ExtResource', 'id': '1_script'},
-            'unit_name': 'New Unit',
-            'unit_id': f'new_unit_{len(self.app.units) + 1:03d}',
-            'star_rating': 3,
-            'element': 'fire',
-            'max_hp': 100,
-            'attack': 20,
-            'defense': 10,
-            'speed': 10,
-            'abilities': {'type': 'Array', 'element_type': 'Resource', 'items': []},
-            'portrait_color': {'type': 'Color', 'values': [1.0, 1.0, 1.0, 1.0]}
-        }
-
-        # Save to file
-        filename = f"{new_unit.properties['unit_id']}.tres"
+        # Generate new unit from the UnitData defaults
+        unit_id = f'new_unit_{len(self.app.units) + 1:03d}'
+        filename = f"{unit_id}.tres"
         filepath = os.path.join(self.app.game_root, 'resources', 'units', filename)
-        new_unit.file_path = filepath
+        new_unit = self.app.parser.new_resource(self.SCRIPT_CLASS, filepath, unit_name='New Unit', unit_id=unit_id)
 
+        # Save to file
         self.app.parser.write_file(new_unit, filepath)
         self.app.units.append(new_unit)
         self._populate_list()
@@ -542,14 +576,8 @@ class UnitsPanel(BasePanel):
         unit = self.selected_unit
 
         # Update properties from fields
-        unit.properties['unit_name'] = self.fields['unit_name'].get()
-        unit.properties['unit_id'] = self.fields['unit_id'].get()
-        unit.properties['element'] = self.fields['element'].get()
-        unit.properties['star_rating'] = int(self.fields['star_rating'].get())
-        unit.properties['max_hp'] = int(self.fields['max_hp'].get())
-        unit.properties['attack'] = int(self.fields['attack'].get())
-        unit.properties['defense'] = int(self.fields['defense'].get())
-        unit.properties['speed'] = int(self.fields['speed'].get())
+        if not self._store_schema_form(unit):
+            return
 
         # Update abilities
         ability_refs = []
@@ -558,7 +586,7 @@ class UnitsPanel(BasePanel):
             '1_script': unit.ext_resources.get('1_script', {
                 'type': 'Script',
                 'uid': '',
-                'path': 'res://scripts/data/unit_data.gd'
+                'path': self.schema.script_path
             })
         }
 
@@ -616,6 +644,17 @@ class UnitsPanel(BasePanel):
 class AbilitiesPanel(BasePanel):
     """Panel for editing abilities"""
 
+    SCRIPT_CLASS = "AbilityData"
+    FORM_SECTIONS = [
+        ("Basic Info", ['ability_name', 'ability_id', 'description', 'ability_type']),
+        ("Combat Stats", ['damage_multiplier', 'defense_multiplier', 'heal_amount', 'bonus_damage', 'cooldown']),
+        ("Special Effects", ['ignores_element', 'guaranteed_survive', 'counter_attack', 'piercing']),
+    ]
+    FIELD_LABELS = {
+        'ability_name': "Name", 'ability_id': "ID", 'ability_type': "Type",
+        'damage_multiplier': "Damage Mult", 'defense_multiplier': "Defense Mult",
+    }
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
         self._create_ui()
@@ -661,28 +700,7 @@ class AbilitiesPanel(BasePanel):
         self.editor_title.pack(anchor='w', pady=(0, 20))
 
         self.fields = {}
-
-        # Basic info
-        self._add_section("Basic Info")
-        self.fields['ability_name'] = self._add_field("Name", "entry")
-        self.fields['ability_id'] = self._add_field("ID", "entry")
-        self.fields['description'] = self._add_field("Description", "entry")
-        self.fields['ability_type'] = self._add_field("Type", "combo", ["0 (Active)", "1 (Passive)"])
-
-        # Combat stats
-        self._add_section("Combat Stats")
-        self.fields['damage_multiplier'] = self._add_field("Damage Mult", "entry")
-        self.fields['defense_multiplier'] = self._add_field("Defense Mult", "entry")
-        self.fields['heal_amount'] = self._add_field("Heal Amount", "entry")
-        self.fields['bonus_damage'] = self._add_field("Bonus Damage", "entry")
-        self.fields['cooldown'] = self._add_field("Cooldown", "entry")
-
-        # Special effects
-        self._add_section("Special Effects")
-        self.fields['ignores_element'] = self._add_field("Ignores Element", "checkbox")
-        self.fields['guaranteed_survive'] = self._add_field("Guaranteed Survive", "checkbox")
-        self.fields['counter_attack'] = self._add_field("Counter Attack", "checkbox")
-        self.fields['piercing'] = self._add_field("Piercing", "checkbox")
+        self._add_schema_form()
 
         # Save/Delete
         btn_frame = ctk.CTkFrame(self.editor_scroll, fg_color='transparent')
@@ -748,70 +766,16 @@ class AbilitiesPanel(BasePanel):
     def _select_ability(self, ability: TresResource):
         self.selected_ability = ability
         self.editor_title.configure(text=f"Editing: {ability.properties.get('ability_name', 'Unknown')}")
-
-        self.fields['ability_name'].delete(0, 'end')
-        self.fields['ability_name'].insert(0, ability.properties.get('ability_name', ''))
-
-        self.fields['ability_id'].delete(0, 'end')
-        self.fields['ability_id'].insert(0, ability.properties.get('ability_id', ''))
-
-        self.fields['description'].delete(0, 'end')
-        self.fields['description'].insert(0, ability.properties.get('description', ''))
-
-        ability_type = ability.properties.get('ability_type', 0)
-        self.fields['ability_type'].set(f"{ability_type} ({'Active' if ability_type == 0 else 'Passive'})")
-
-        self.fields['damage_multiplier'].delete(0, 'end')
-        self.fields['damage_multiplier'].insert(0, str(ability.properties.get('damage_multiplier', 1.0)))
-
-        self.fields['defense_multiplier'].delete(0, 'end')
-        self.fields['defense_multiplier'].insert(0, str(ability.properties.get('defense_multiplier', 1.0)))
-
-        self.fields['heal_amount'].delete(0, 'end')
-        self.fields['heal_amount'].insert(0, str(ability.properties.get('heal_amount', 0)))
-
-        self.fields['bonus_damage'].delete(0, 'end')
-        self.fields['bonus_damage'].insert(0, str(ability.properties.get('bonus_damage', 0)))
-
-        self.fields['cooldown'].delete(0, 'end')
-        self.fields['cooldown'].insert(0, str(ability.properties.get('cooldown', 0)))
-
-        self.fields['ignores_element'].var.set(ability.properties.get('ignores_element', False))
-        self.fields['guaranteed_survive'].var.set(ability.properties.get('guaranteed_survive', False))
-        self.fields['counter_attack'].var.set(ability.properties.get('counter_attack', False))
-        self.fields['piercing'].var.set(ability.properties.get('piercing', False))
+        self._load_schema_form(ability)
 
     def _create_new(self):
-        new_ability = TresResource()
-        new_ability.resource_type = "Resource"
-        new_ability.script_class = "AbilityData"
-        new_ability.uid = self.app.parser.generate_uid("ability")
-
-        new_ability.ext_resources = {
-            '1_script': {'type': 'Script', 'uid': '', 'path': 'res://scripts/data/ability_data.gd'}
-        }
-
-        new_ability.properties = {
-            'script': {'type': 'ExtResource', 'id': '1_script'},
-            'ability_name': 'New Ability',
-            'ability_id': f'new_ability_{len(self.app.abilities) + 1:03d}',
-            'description': 'A new ability.',
-            'ability_type': 0,
-            'damage_multiplier': 1.0,
-            'defense_multiplier': 1.0,
-            'heal_amount': 0,
-            'bonus_damage': 0,
-            'ignores_element': False,
-            'guaranteed_survive': False,
-            'counter_attack': False,
-            'piercing': False,
-            'cooldown': 0,
-            'icon_color': {'type': 'Color', 'values': [1.0, 1.0, 1.0, 1.0]}
-        }
-
-        filename = f"{new_ability.properties['ability_id']}.tres"
+        ability_id = f'new_ability_{len(self.app.abilities) + 1:03d}'
+        filename = f"{ability_id}.tres"
         filepath = os.path.join(self.app.game_root, 'resources', 'abilities', filename)
-        new_ability.file_path = filepath
+        new_ability = self.app.parser.new_resource(
+            self.SCRIPT_CLASS, filepath,
+            ability_name='New Ability', ability_id=ability_id, description='A new ability.'
+        )
 
         self.app.parser.write_file(new_ability, filepath)
         self.app.abilities.append(new_ability)
@@ -826,23 +790,8 @@ class AbilitiesPanel(BasePanel):
             return
 
         ability = self.selected_ability
-        ability.properties['ability_name'] = self.fields['ability_name'].get()
-        ability.properties['ability_id'] = self.fields['ability_id'].get()
-        ability.properties['description'] = self.fields['description'].get()
-
-        type_str = self.fields['ability_type'].get()
-        ability.properties['ability_type'] = int(type_str.split()[0])
-
-        ability.properties['damage_multiplier'] = float(self.fields['damage_multiplier'].get())
-        ability.properties['defense_multiplier'] = float(self.fields['defense_multiplier'].get())
-        ability.properties['heal_amount'] = int(self.fields['heal_amount'].get())
-        ability.properties['bonus_damage'] = int(self.fields['bonus_damage'].get())
-        ability.properties['cooldown'] = int(self.fields['cooldown'].get())
-
-        ability.properties['ignores_element'] = self.fields['ignores_element'].var.get()
-        ability.properties['guaranteed_survive'] = self.fields['guaranteed_survive'].var.get()
-        ability.properties['counter_attack'] = self.fields['counter_attack'].var.get()
-        ability.properties['piercing'] = self.fields['piercing'].var.get()
+        if not self._store_schema_form(ability):
+            return
 
         self.app.parser.write_file(ability, ability.file_path)
         self._populate_list()
@@ -872,6 +821,13 @@ class AbilitiesPanel(BasePanel):
 class GearPanel(BasePanel):
     """Panel for editing gear"""
 
+    SCRIPT_CLASS = "GearData"
+    FORM_SECTIONS = [
+        ("Basic Info", ['gear_name', 'gear_id', 'gear_type', 'rarity']),
+        ("Stats", ['stat_type', 'is_percentage', 'base_value']),
+    ]
+    FIELD_LABELS = {'gear_name': "Name", 'gear_id': "ID", 'gear_type': "Type"}
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
         self._create_ui()
@@ -908,17 +864,7 @@ class GearPanel(BasePanel):
         self.editor_title.pack(anchor='w', pady=(0, 20))
 
         self.fields = {}
-
-        self._add_section("Basic Info")
-        self.fields['gear_name'] = self._add_field("Name", "entry")
-        self.fields['gear_id'] = self._add_field("ID", "entry")
-        self.fields['gear_type'] = self._add_field("Type", "combo", ["0 (Weapon)", "1 (Armor)", "2 (Accessory)"])
-        self.fields['rarity'] = self._add_field("Rarity", "combo", ["0 (Common)", "1 (Rare)", "2 (Epic)", "3 (Legendary)"])
-
-        self._add_section("Stats")
-        self.fields['stat_type'] = self._add_field("Stat Type", "combo", ["0 (HP)", "1 (Attack)", "2 (Defense)", "3 (Speed)"])
-        self.fields['is_percentage'] = self._add_field("Is Percentage", "checkbox")
-        self.fields['base_value'] = self._add_field("Base Value", "entry")
+        self._add_schema_form()
 
         btn_frame = ctk.CTkFrame(self.editor_scroll, fg_color='transparent')
         btn_frame.pack(fill='x', pady=20)
@@ -989,54 +935,13 @@ class GearPanel(BasePanel):
     def _select_gear(self, gear: TresResource):
         self.selected_gear = gear
         self.editor_title.configure(text=f"Editing: {gear.properties.get('gear_name', 'Unknown')}")
-
-        self.fields['gear_name'].delete(0, 'end')
-        self.fields['gear_name'].insert(0, gear.properties.get('gear_name', ''))
-
-        self.fields['gear_id'].delete(0, 'end')
-        self.fields['gear_id'].insert(0, gear.properties.get('gear_id', ''))
-
-        gear_type = gear.properties.get('gear_type', 0)
-        type_names = ['Weapon', 'Armor', 'Accessory']
-        self.fields['gear_type'].set(f"{gear_type} ({type_names[gear_type]})")
-
-        rarity = gear.properties.get('rarity', 0)
-        rarity_names = ['Common', 'Rare', 'Epic', 'Legendary']
-        self.fields['rarity'].set(f"{rarity} ({rarity_names[rarity]})")
-
-        stat_type = gear.properties.get('stat_type', 0)
-        stat_names = ['HP', 'Attack', 'Defense', 'Speed']
-        self.fields['stat_type'].set(f"{stat_type} ({stat_names[stat_type]})")
-
-        self.fields['is_percentage'].var.set(gear.properties.get('is_percentage', False))
-
-        self.fields['base_value'].delete(0, 'end')
-        self.fields['base_value'].insert(0, str(gear.properties.get('base_value', 10.0)))
+        self._load_schema_form(gear)
 
     def _create_new(self):
-        new_gear = TresResource()
-        new_gear.resource_type = "Resource"
-        new_gear.script_class = "GearData"
-        new_gear.uid = self.app.parser.generate_uid("gear")
-
-        new_gear.ext_resources = {
-            '1_script': {'type': 'Script', 'uid': '', 'path': 'res://scripts/data/gear_data.gd'}
-        }
-
-        new_gear.properties = {
-            'script': {'type': 'ExtResource', 'id': '1_script'},
-            'gear_id': f'new_gear_{len(self.app.gear) + 1:03d}',
-            'gear_name': 'New Gear',
-            'gear_type': 0,
-            'rarity': 0,
-            'stat_type': 1,
-            'is_percentage': False,
-            'base_value': 10.0
-        }
-
-        filename = f"{new_gear.properties['gear_id']}.tres"
+        gear_id = f'new_gear_{len(self.app.gear) + 1:03d}'
+        filename = f"{gear_id}.tres"
         filepath = os.path.join(self.app.game_root, 'resources', 'gear', filename)
-        new_gear.file_path = filepath
+        new_gear = self.app.parser.new_resource(self.SCRIPT_CLASS, filepath, gear_id=gear_id, gear_name='New Gear')
 
         self.app.parser.write_file(new_gear, filepath)
         self.app.gear.append(new_gear)
@@ -1051,13 +956,8 @@ class GearPanel(BasePanel):
             return
 
         gear = self.selected_gear
-        gear.properties['gear_name'] = self.fields['gear_name'].get()
-        gear.properties['gear_id'] = self.fields['gear_id'].get()
-        gear.properties['gear_type'] = int(self.fields['gear_type'].get().split()[0])
-        gear.properties['rarity'] = int(self.fields['rarity'].get().split()[0])
-        gear.properties['stat_type'] = int(self.fields['stat_type'].get().split()[0])
-        gear.properties['is_percentage'] = self.fields['is_percentage'].var.get()
-        gear.properties['base_value'] = float(self.fields['base_value'].get())
+        if not self._store_schema_form(gear):
+            return
 
         self.app.parser.write_file(gear, gear.file_path)
         self._populate_list()
@@ -1087,6 +987,13 @@ class GearPanel(BasePanel):
 class StagesPanel(BasePanel):
     """Panel for editing stages"""
 
+    SCRIPT_CLASS = "StageData"
+    FORM_SECTIONS = [
+        ("Basic Info", ['stage_id', 'stage_name', 'chapter', 'stage_number', 'difficulty', 'enemy_level']),
+        ("Rewards", ['gem_reward', 'gold_reward', 'material_reward', 'xp_reward']),
+    ]
+    FIELD_LABELS = {'stage_id': "Stage ID", 'stage_name': "Name", 'difficulty': "Difficulty (1-5)", 'xp_reward': "XP Reward"}
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
         self._create_ui()
@@ -1119,20 +1026,7 @@ class StagesPanel(BasePanel):
         self.editor_title.pack(anchor='w', pady=(0, 20))
 
         self.fields = {}
-
-        self._add_section("Basic Info")
-        self.fields['stage_id'] = self._add_field("Stage ID", "entry")
-        self.fields['stage_name'] = self._add_field("Name", "entry")
-        self.fields['chapter'] = self._add_field("Chapter", "entry")
-        self.fields['stage_number'] = self._add_field("Stage Number", "entry")
-        self.fields['difficulty'] = self._add_field("Difficulty (1-5)", "entry")
-        self.fields['enemy_level'] = self._add_field("Enemy Level", "entry")
-
-        self._add_section("Rewards")
-        self.fields['gem_reward'] = self._add_field("Gem Reward", "entry")
-        self.fields['gold_reward'] = self._add_field("Gold Reward", "entry")
-        self.fields['material_reward'] = self._add_field("Material Reward", "entry")
-        self.fields['xp_reward'] = self._add_field("XP Reward", "entry")
+        self._add_schema_form()
 
         btn_frame = ctk.CTkFrame(self.editor_scroll, fg_color='transparent')
         btn_frame.pack(fill='x', pady=20)
@@ -1190,36 +1084,7 @@ class StagesPanel(BasePanel):
     def _select_stage(self, stage: TresResource):
         self.selected_stage = stage
         self.editor_title.configure(text=f"Editing: {stage.properties.get('stage_id', '?')}")
-
-        self.fields['stage_id'].delete(0, 'end')
-        self.fields['stage_id'].insert(0, stage.properties.get('stage_id', ''))
-
-        self.fields['stage_name'].delete(0, 'end')
-        self.fields['stage_name'].insert(0, stage.properties.get('stage_name', ''))
-
-        self.fields['chapter'].delete(0, 'end')
-        self.fields['chapter'].insert(0, str(stage.properties.get('chapter', 1)))
-
-        self.fields['stage_number'].delete(0, 'end')
-        self.fields['stage_number'].insert(0, str(stage.properties.get('stage_number', 1)))
-
-        self.fields['difficulty'].delete(0, 'end')
-        self.fields['difficulty'].insert(0, str(stage.properties.get('difficulty', 1)))
-
-        self.fields['enemy_level'].delete(0, 'end')
-        self.fields['enemy_level'].insert(0, str(stage.properties.get('enemy_level', 1)))
-
-        self.fields['gem_reward'].delete(0, 'end')
-        self.fields['gem_reward'].insert(0, str(stage.properties.get('gem_reward', 50)))
-
-        self.fields['gold_reward'].delete(0, 'end')
-        self.fields['gold_reward'].insert(0, str(stage.properties.get('gold_reward', 100)))
-
-        self.fields['material_reward'].delete(0, 'end')
-        self.fields['material_reward'].insert(0, str(stage.properties.get('material_reward', 5)))
-
-        self.fields['xp_reward'].delete(0, 'end')
-        self.fields['xp_reward'].insert(0, str(stage.properties.get('xp_reward', 30)))
+        self._load_schema_form(stage)
 
     def _create_new(self):
         # Find next stage number
@@ -1228,33 +1093,7 @@ class StagesPanel(BasePanel):
             if stage.properties.get('chapter') == 1:
                 max_stage = max(max_stage, stage.properties.get('stage_number', 0))
 
-        new_stage = TresResource()
-        new_stage.resource_type = "Resource"
-        new_stage.script_class = "StageData"
-        new_stage.uid = self.app.parser.generate_uid("stage")
-
-        new_stage.ext_resources = {
-            '1_script': {'type': 'Script', 'uid': '', 'path': 'res://scripts/data/stage_data.gd'}
-        }
-
         stage_num = max_stage + 1
-        new_stage.properties = {
-            'script': {'type': 'ExtResource', 'id': '1_script'},
-            'stage_id': f'1-{stage_num}',
-            'stage_name': f'New Stage {stage_num}',
-            'chapter': 1,
-            'stage_number': stage_num,
-            'story_intro': 'A new challenge awaits...',
-            'story_outro': 'Victory!',
-            'enemy_units': {'type': 'Array', 'element_type': 'Resource', 'items': []},
-            'enemy_level': 1,
-            'difficulty': 1,
-            'gem_reward': 50,
-            'gold_reward': 100,
-            'material_reward': 5,
-            'xp_reward': 30,
-            'first_clear_unit': None
-        }
 
         # Ensure chapter folder exists
         chapter_path = os.path.join(self.app.game_root, 'resources', 'stages', 'chapter_1')
@@ -1262,7 +1101,10 @@ class StagesPanel(BasePanel):
 
         filename = f"stage_1_{stage_num}.tres"
         filepath = os.path.join(chapter_path, filename)
-        new_stage.file_path = filepath
+        new_stage = self.app.parser.new_resource(
+            self.SCRIPT_CLASS, filepath,
+            stage_id=f'1-{stage_num}', stage_name=f'New Stage {stage_num}', chapter=1, stage_number=stage_num
+        )
 
         self.app.parser.write_file(new_stage, filepath)
         self.app.stages.append(new_stage)
@@ -1277,16 +1119,8 @@ class StagesPanel(BasePanel):
             return
 
         stage = self.selected_stage
-        stage.properties['stage_id'] = self.fields['stage_id'].get()
-        stage.properties['stage_name'] = self.fields['stage_name'].get()
-        stage.properties['chapter'] = int(self.fields['chapter'].get())
-        stage.properties['stage_number'] = int(self.fields['stage_number'].get())
-        stage.properties['difficulty'] = int(self.fields['difficulty'].get())
-        stage.properties['enemy_level'] = int(self.fields['enemy_level'].get())
-        stage.properties['gem_reward'] = int(self.fields['gem_reward'].get())
-        stage.properties['gold_reward'] = int(self.fields['gold_reward'].get())
-        stage.properties['material_reward'] = int(self.fields['material_reward'].get())
-        stage.properties['xp_reward'] = int(self.fields['xp_reward'].get())
+        if not self._store_schema_form(stage):
+            return
 
         self.app.parser.write_file(stage, stage.file_path)
         self._populate_list()
@@ -1316,6 +1150,12 @@ class StagesPanel(BasePanel):
 class DungeonsPanel(BasePanel):
     """Panel for editing dungeons"""
 
+    SCRIPT_CLASS = "DungeonData"
+    FORM_SECTIONS = [
+        ("Basic Info", ['dungeon_id', 'dungeon_name', 'description', 'drops_stat_type']),
+    ]
+    FIELD_LABELS = {'dungeon_id': "ID", 'dungeon_name': "Name", 'drops_stat_type': "Drops Stat"}
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
         self._create_ui()
@@ -1348,12 +1188,7 @@ class DungeonsPanel(BasePanel):
         self.editor_title.pack(anchor='w', pady=(0, 20))
 
         self.fields = {}
-
-        self._add_section("Basic Info")
-        self.fields['dungeon_id'] = self._add_field("ID", "entry")
-        self.fields['dungeon_name'] = self._add_field("Name", "entry")
-        self.fields['description'] = self._add_field("Description", "entry")
-        self.fields['drops_stat_type'] = self._add_field("Drops Stat", "combo", ["0 (HP)", "1 (Attack)", "2 (Defense)", "3 (Speed)"])
+        self._add_schema_form()
 
         btn_frame = ctk.CTkFrame(self.editor_scroll, fg_color='transparent')
         btn_frame.pack(fill='x', pady=20)
@@ -1413,44 +1248,16 @@ class DungeonsPanel(BasePanel):
     def _select_dungeon(self, dungeon: TresResource):
         self.selected_dungeon = dungeon
         self.editor_title.configure(text=f"Editing: {dungeon.properties.get('dungeon_name', 'Unknown')}")
-
-        self.fields['dungeon_id'].delete(0, 'end')
-        self.fields['dungeon_id'].insert(0, dungeon.properties.get('dungeon_id', ''))
-
-        self.fields['dungeon_name'].delete(0, 'end')
-        self.fields['dungeon_name'].insert(0, dungeon.properties.get('dungeon_name', ''))
-
-        self.fields['description'].delete(0, 'end')
-        self.fields['description'].insert(0, dungeon.properties.get('description', ''))
-
-        stat_type = dungeon.properties.get('drops_stat_type', 0)
-        stat_names = ['HP', 'Attack', 'Defense', 'Speed']
-        self.fields['drops_stat_type'].set(f"{stat_type} ({stat_names[stat_type]})")
+        self._load_schema_form(dungeon)
 
     def _create_new(self):
-        new_dungeon = TresResource()
-        new_dungeon.resource_type = "Resource"
-        new_dungeon.script_class = "DungeonData"
-        new_dungeon.uid = self.app.parser.generate_uid("dungeon")
-
-        new_dungeon.ext_resources = {
-            '1_script': {'type': 'Script', 'uid': '', 'path': 'res://scripts/data/dungeon_data.gd'}
-        }
-
-        new_dungeon.properties = {
-            'script': {'type': 'ExtResource', 'id': '1_script'},
-            'dungeon_id': f'new_dungeon_{len(self.app.dungeons) + 1}',
-            'dungeon_name': 'New Dungeon',
-            'description': 'A new dungeon to explore.',
-            'drops_stat_type': 1,
-            'enemy_units': {'type': 'Array', 'element_type': 'Resource', 'items': []},
-            'tier_enemy_levels': [3, 6, 10],
-            'tier_names': ['Easy', 'Normal', 'Hard']
-        }
-
-        filename = f"{new_dungeon.properties['dungeon_id']}.tres"
+        dungeon_id = f'new_dungeon_{len(self.app.dungeons) + 1}'
+        filename = f"{dungeon_id}.tres"
         filepath = os.path.join(self.app.game_root, 'resources', 'dungeons', filename)
-        new_dungeon.file_path = filepath
+        new_dungeon = self.app.parser.new_resource(
+            self.SCRIPT_CLASS, filepath,
+            dungeon_id=dungeon_id, dungeon_name='New Dungeon', description='A new dungeon to explore.'
+        )
 
         self.app.parser.write_file(new_dungeon, filepath)
         self.app.dungeons.append(new_dungeon)
@@ -1465,10 +1272,8 @@ class DungeonsPanel(BasePanel):
             return
 
         dungeon = self.selected_dungeon
-        dungeon.properties['dungeon_id'] = self.fields['dungeon_id'].get()
-        dungeon.properties['dungeon_name'] = self.fields['dungeon_name'].get()
-        dungeon.properties['description'] = self.fields['description'].get()
-        dungeon.properties['drops_stat_type'] = int(self.fields['drops_stat_type'].get().split()[0])
+        if not self._store_schema_form(dungeon):
+            return
 
         self.app.parser.write_file(dungeon, dungeon.file_path)
         self._populate_list()
@@ -1498,9 +1303,43 @@ class DungeonsPanel(BasePanel):
 class AssetsPanel(BasePanel):
     """Panel for managing game assets"""
 
+    # Rows shown at most for index-backed lists (duplicates, unreferenced, search)
+    MAX_INDEX_ROWS = 200
+    # Children shown per expanded folder before a "Show more" row
+    MAX_FOLDER_ROWS = 200
+    # Browser categories: (folders under the game root, file extensions shown)
+    # UISpriteLoader's UI_PATH and BACKGROUND_PATH; they live under assets/board but aren't board art
+    UI_IMAGE_DIRS = [os.path.join('assets', 'board', 'Sprites'), os.path.join('assets', 'board', 'PNG')]
+    # Category -> (root folders, file extensions or None for all, folders left out)
+    ASSET_CATEGORIES = {
+        "All Assets": (['assets'], None, []),
+        "Unit Sprites": ([os.path.join('assets', 'sprites'), os.path.join('assets', 'units', 'ai_sprites')], ('.png', '.jpg', '.jpeg'), []),
+        "Board Assets": ([os.path.join('assets', 'board')], ('.png', '.jpg', '.jpeg', '.json'), UI_IMAGE_DIRS),
+        "UI Images": (UI_IMAGE_DIRS, ('.png', '.jpg', '.jpeg'), []),
+        "Audio": ([os.path.join('assets', 'audio')], ('.ogg', '.wav', '.mp3'), []),
+    }
+    THUMB_SIZE = (28, 28)
+    PREVIEW_SIZE = (280, 280)
+
     def __init__(self, parent, app: ContentEditor):
         super().__init__(parent, app)
+        self.indexer = AssetIndexer(app.game_root)
+        self.index_report: Optional[AssetReport] = None
+        self._scan_thread: Optional[threading.Thread] = None
+        self._scan_result = None
+
+        # Thumbnails are decoded off the UI thread and only for rows scrolled into view
+        self.thumbnails = AsyncThumbnailer(ThumbnailCache(os.path.join(app.game_root, THUMBNAIL_CACHE_DIR)))
+        self._thumb_rows: Dict[int, Dict[str, Any]] = {}  # {row id: {frame, label, path, requested}}
+        self._preview_path: Optional[str] = None
+        self._row_counter = 0
+
+        # Tree browser: folders are only read when expanded
+        self._dir_cache: Dict[str, Tuple[int, List[Tuple[str, bool, int]]]] = {}  # {path: (mtime_ns, entries)}
+        self._folder_rows: Dict[str, Dict[str, Any]] = {}  # {path: {frame, label, indent, children, expanded}}
+
         self._create_ui()
+        self.after(100, self._thumbnail_tick)
 
     def _create_ui(self):
         # Left side - asset browser
@@ -1513,12 +1352,21 @@ class AssetsPanel(BasePanel):
         # Asset type selector
         self.asset_type = ctk.CTkComboBox(
             self.browser_frame,
-            values=["Unit Sprites", "Board Assets", "UI Images"],
+            values=list(self.ASSET_CATEGORIES) + ["Duplicates", "Unreferenced"],
             command=self._on_asset_type_change
         )
         self.asset_type.set("Unit Sprites")
         self.asset_type.pack(fill='x', padx=10, pady=10)
 
+        # Search runs against the asset index, not the filesystem
+        self.search_var = ctk.StringVar()
+        self.search_var.trace('w', lambda *args: self._refresh_asset_list())
+        ctk.CTkEntry(
+            self.browser_frame,
+            placeholder_text="Search assets...",
+            textvariable=self.search_var
+        ).pack(fill='x', padx=10, pady=(0, 10))
+
         # Asset list
         self.asset_list = ctk.CTkScrollableFrame(self.browser_frame, fg_color='transparent')
         self.asset_list.pack(fill='both', expand=True, padx=5)
@@ -1575,6 +1423,23 @@ class AssetsPanel(BasePanel):
             fg_color=COLORS['primary']
         ).pack(pady=5)
 
+        # Asset index summary
+        index_frame = ctk.CTkFrame(self.preview_frame, fg_color='transparent')
+        index_frame.pack(fill='x', padx=20, pady=10)
+
+        ctk.CTkLabel(index_frame, text="Asset Index", font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS['primary']).pack(anchor='w')
+
+        self.index_summary = ctk.CTkLabel(index_frame, text="Not scanned yet", justify='left', anchor='w', text_color=COLORS['text_secondary'])
+        self.index_summary.pack(anchor='w', pady=5)
+
+        self.scan_button = ctk.CTkButton(
+            index_frame,
+            text="Scan Assets",
+            command=self._start_index_scan,
+            fg_color=COLORS['primary']
+        )
+        self.scan_button.pack(pady=5)
+
         # Preview area
         self.preview_label = ctk.CTkLabel(
             self.preview_frame,
@@ -1590,6 +1455,40 @@ class AssetsPanel(BasePanel):
     def refresh(self):
         self._update_unit_list()
         self._refresh_asset_list()
+        if self.index_report is None:
+            self._start_index_scan()
+
+    def _start_index_scan(self):
+        """Scan assets on a worker thread (incremental after the first run)"""
+        if self._scan_thread and self._scan_thread.is_alive():
+            return
+        self.scan_button.configure(state='disabled', text="Scanning...")
+        self._scan_result = None
+        self._scan_thread = threading.Thread(target=self._run_index_scan, daemon=True)
+        self._scan_thread.start()
+        self.after(200, self._poll_index_scan)
+
+    def _run_index_scan(self):
+        # Runs off the UI thread, so it must not touch any widgets
+        try:
+            self._scan_result = self.indexer.scan()
+        except Exception as e:
+            self._scan_result = e
+
+    def _poll_index_scan(self):
+        if self._scan_thread.is_alive():
+            self.after(200, self._poll_index_scan)
+            return
+
+        self.scan_button.configure(state='normal', text="Rescan Assets")
+        if isinstance(self._scan_result, Exception):
+            self.index_summary.configure(text=f"Scan failed: {self._scan_result}")
+            return
+
+        self.index_report = self._scan_result
+        self.index_summary.configure(text=summarize(self.index_report))
+        if self.asset_type.get() in ("Duplicates", "Unreferenced") or self.search_var.get().strip():
+            self._refresh_asset_list()
 
     def _update_unit_list(self):
         unit_ids = [u.properties.get('unit_id', 'unknown') for u in self.app.units]
@@ -1604,34 +1503,269 @@ class AssetsPanel(BasePanel):
         for item in self.list_items:
             item.destroy()
         self.list_items.clear()
+        self._thumb_rows.clear()
+        self._folder_rows.clear()
+        self.thumbnails.cancel_pending()
 
         asset_type = self.asset_type.get()
+        query = self.search_var.get().strip().lower()
 
-        if asset_type == "Unit Sprites":
-            sprites_path = os.path.join(self.app.game_root, 'assets', 'units', 'ai_sprites')
-            if os.path.exists(sprites_path):
-                for unit_folder in os.listdir(sprites_path):
-                    unit_path = os.path.join(sprites_path, unit_folder)
-                    if os.path.isdir(unit_path):
-                        item = ctk.CTkFrame(self.asset_list, fg_color=COLORS['bg_light'], height=35)
-                        item.pack(fill='x', pady=2)
-                        item.pack_propagate(False)
-
-                        files = os.listdir(unit_path)
-                        ctk.CTkLabel(item, text=f"{unit_folder} ({len(files)} files)", anchor='w').pack(side='left', padx=10, pady=5)
-                        self.list_items.append(item)
-
-        elif asset_type == "Board Assets":
-            board_path = os.path.join(self.app.game_root, 'assets', 'board')
-            if os.path.exists(board_path):
-                for filename in os.listdir(board_path):
-                    if filename.endswith(('.png', '.jpg')):
-                        item = ctk.CTkFrame(self.asset_list, fg_color=COLORS['bg_light'], height=35)
-                        item.pack(fill='x', pady=2)
-                        item.pack_propagate(False)
-
-                        ctk.CTkLabel(item, text=filename, anchor='w').pack(side='left', padx=10, pady=5)
-                        self.list_items.append(item)
+        if asset_type in ("Duplicates", "Unreferenced"):
+            self._populate_index_list(asset_type, query)
+        elif query:
+            self._populate_search_results(asset_type, query)
+        else:
+            roots = [os.path.join(self.app.game_root, r) for r in self.ASSET_CATEGORIES[asset_type][0]]
+            roots = [r for r in roots if os.path.isdir(r)]
+            if not roots:
+                self._add_list_row("No assets in this category", COLORS['text_secondary'])
+            for root in roots:
+                self._add_folder_row(root, indent=0)
+            if len(roots) == 1:
+                self._toggle_folder(roots[0])
+
+    # === Tree browser ===
+
+    def _list_dir(self, path: str) -> List[Tuple[str, bool, int]]:
+        """
+        List a folder as [(name, is_dir, size)], folders first. Uses os.scandir (whose
+        entries carry their stat results) and caches until the folder's mtime changes.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._dir_cache.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or entry.name.endswith('.import'):
+                        continue
+                    is_dir = entry.is_dir()
+                    entries.append((entry.name, is_dir, 0 if is_dir else entry.stat().st_size))
+        except OSError:
+            return []
+        entries.sort(key=lambda e: (not e[1], e[0].lower()))
+        self._dir_cache[path] = (mtime_ns, entries)
+        return entries
+
+    def _category_extensions(self) -> Optional[Tuple[str, ...]]:
+        category = self.ASSET_CATEGORIES.get(self.asset_type.get())
+        return category[1] if category else None
+
+    def _category_excluded(self) -> List[str]:
+        category = self.ASSET_CATEGORIES.get(self.asset_type.get())
+        return [os.path.join(self.app.game_root, r) for r in category[2]] if category else []
+
+    def _add_folder_row(self, path: str, indent: int, after: ctk.CTkFrame = None) -> ctk.CTkFrame:
+        name = os.path.relpath(path, self.app.game_root) if indent == 0 else os.path.basename(path)
+        item = self._add_list_row(f"▸ {name}/", COLORS['primary'], indent=indent, after=after,
+                                  on_click=lambda p=path: self._toggle_folder(p))
+        self._folder_rows[path] = {'frame': item, 'name': name, 'indent': indent, 'children': [], 'expanded': False}
+        return item
+
+    def _toggle_folder(self, path: str):
+        folder = self._folder_rows.get(path)
+        if folder is None:
+            return
+        if folder['expanded']:
+            self._collapse_folder(path)
+        else:
+            self._expand_folder(path)
+
+    def _expand_folder(self, path: str, limit: int = None):
+        """Read a folder (cached scandir) and insert its children below its row"""
+        folder = self._folder_rows[path]
+        extensions = self._category_extensions()
+        excluded = self._category_excluded()
+        entries = [e for e in self._list_dir(path)
+                   if (os.path.join(path, e[0]) not in excluded if e[1]
+                       else extensions is None or e[0].lower().endswith(extensions))]
+        limit = limit or self.MAX_FOLDER_ROWS
+
+        folder['expanded'] = True
+        folder['frame'].text_label.configure(text=f"▾ {folder['name']}/ ({len(entries)})")
+
+        after = folder['frame']
+        for name, is_dir, size in entries[:limit]:
+            child_path = os.path.join(path, name)
+            if is_dir:
+                row = self._add_folder_row(child_path, folder['indent'] + 1, after=after)
+            else:
+                is_image = name.lower().endswith(('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif'))
+                row = self._add_list_row(f"{name}  ({format_size(size)})", indent=folder['indent'] + 1, after=after,
+                                         image_path=child_path if is_image else None)
+            folder['children'].append(child_path if is_dir else row)
+            after = row
+
+        if len(entries) > limit:
+            more = self._add_list_row(f"Show {min(len(entries) - limit, self.MAX_FOLDER_ROWS)} more of {len(entries) - limit}...",
+                                      COLORS['text_secondary'], indent=folder['indent'] + 1, after=after,
+                                      on_click=lambda: self._show_more(path, limit + self.MAX_FOLDER_ROWS))
+            folder['children'].append(more)
+
+    def _show_more(self, path: str, limit: int):
+        self._collapse_folder(path)
+        self._expand_folder(path, limit)
+
+    def _collapse_folder(self, path: str):
+        folder = self._folder_rows[path]
+        for child in folder['children']:
+            if isinstance(child, str):  # Sub-folder: remove its own subtree first
+                if self._folder_rows.get(child, {}).get('expanded'):
+                    self._collapse_folder(child)
+                child = self._folder_rows.pop(child)['frame']
+            self._remove_row(child)
+        folder['children'] = []
+        folder['expanded'] = False
+        folder['frame'].text_label.configure(text=f"▸ {folder['name']}/")
+
+    def _remove_row(self, item: ctk.CTkFrame):
+        self._thumb_rows.pop(item.row_id, None)
+        if item in self.list_items:
+            self.list_items.remove(item)
+        item.destroy()
+
+    def _populate_search_results(self, asset_type: str, query: str):
+        """Match file names/paths in the asset index within the selected category"""
+        report = self.index_report
+        if report is None:
+            self._add_list_row("Indexing assets...", COLORS['text_secondary'])
+            return
+
+        roots, _, excluded = self.ASSET_CATEGORIES[asset_type]
+        roots = ["res://" + r.replace(os.sep, '/') + '/' for r in roots]
+        excluded = tuple("res://" + r.replace(os.sep, '/') + '/' for r in excluded)
+        extensions = self._category_extensions()
+        matches = [entry for path, entry in report.entries.items()
+                   if query in path.lower()
+                   and any(path.startswith(r) for r in roots) and not path.startswith(excluded)
+                   and (extensions is None or path.lower().endswith(extensions))]
+        matches.sort(key=lambda e: e.path)
+
+        if not matches:
+            self._add_list_row(f"No assets match \"{query}\"", COLORS['text_secondary'])
+        for entry in matches[:self.MAX_INDEX_ROWS]:
+            dims = f", {entry.width}x{entry.height}" if entry.width else ""
+            self._add_list_row(f"{entry.path[len('res://assets/'):]}  ({format_size(entry.size)}{dims})",
+                               image_path=self.indexer.to_file_path(entry.path) if entry.is_image else None)
+        if len(matches) > self.MAX_INDEX_ROWS:
+            self._add_list_row(f"... {len(matches) - self.MAX_INDEX_ROWS} more, refine the search", COLORS['text_secondary'])
+
+    def _add_list_row(self, text: str, color: str = None, image_path: str = None, indent: int = 0,
+                      after: ctk.CTkFrame = None, on_click=None) -> ctk.CTkFrame:
+        item = ctk.CTkFrame(self.asset_list, fg_color=COLORS['bg_light'], height=35)
+        if after is not None:
+            item.pack(fill='x', pady=2, padx=(indent * 16, 0), after=after)
+        else:
+            item.pack(fill='x', pady=2, padx=(indent * 16, 0))
+        item.pack_propagate(False)
+        self._row_counter += 1
+        item.row_id = self._row_counter
+
+        widgets = [item]
+        if image_path:
+            # Placeholder until the thumbnail arrives; filled in by _thumbnail_tick
+            thumb_label = ctk.CTkLabel(item, text="", width=self.THUMB_SIZE[0], height=self.THUMB_SIZE[1], fg_color=COLORS['bg_medium'])
+            thumb_label.pack(side='left', padx=(5, 0), pady=3)
+            widgets.append(thumb_label)
+            self._thumb_rows[item.row_id] = {'frame': item, 'label': thumb_label, 'path': image_path, 'requested': False}
+
+        text_label = ctk.CTkLabel(item, text=text, anchor='w', text_color=color or COLORS['text'])
+        text_label.pack(side='left', padx=10, pady=5)
+        widgets.append(text_label)
+        item.text_label = text_label
+
+        if on_click is None and image_path:
+            on_click = lambda p=image_path: self._show_preview(p)
+        if on_click is not None:
+            for widget in widgets:
+                widget.bind('<Button-1>', lambda e, c=on_click: c())
+        self.list_items.append(item)
+        return item
+
+    # === Thumbnails ===
+
+    def _thumbnail_tick(self):
+        """Apply finished thumbnails and request ones for rows that scrolled into view"""
+        for token, image in self.thumbnails.poll():
+            kind, key = token
+            if kind == 'row' and key in self._thumb_rows:
+                if image is not None:
+                    self._set_label_image(self._thumb_rows[key]['label'], image)
+            elif kind == 'preview' and key == self._preview_path:
+                if image is None:
+                    self.preview_label.configure(text="Could not load image", image=None)
+                else:
+                    self._set_label_image(self.preview_label, image)
+                    self.preview_label.configure(text="")
+
+        self._request_visible_thumbnails()
+        self.after(100, self._thumbnail_tick)
+
+    def _request_visible_thumbnails(self):
+        pending = [row for row in self._thumb_rows.items() if not row[1]['requested']]
+        if not pending or not self.winfo_ismapped():
+            return
+
+        # Rows are laid out on the scrollable frame's canvas; prefetch one screen below the view
+        canvas = self.asset_list._parent_canvas
+        view_height = canvas.winfo_height()
+        top = canvas.canvasy(0)
+        bottom = top + 2 * view_height
+
+        for index, row in pending:
+            y = row['frame'].winfo_y()
+            if y + row['frame'].winfo_height() >= top and y <= bottom:
+                row['requested'] = True
+                self.thumbnails.request(row['path'], self.THUMB_SIZE, ('row', index))
+
+    def _show_preview(self, image_path: str):
+        self._preview_path = image_path
+        self.preview_label.configure(text=f"Loading {os.path.basename(image_path)}...", image=None)
+        self.thumbnails.request(image_path, self.PREVIEW_SIZE, ('preview', image_path))
+
+    @staticmethod
+    def _set_label_image(label: ctk.CTkLabel, image: Image.Image):
+        ctk_image = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        label.configure(image=ctk_image)
+        label.image = ctk_image  # Keep a reference so it is not garbage collected
+
+    def _populate_index_list(self, asset_type: str, query: str = ""):
+        """List duplicate groups or unreferenced files from the asset index"""
+        report = self.index_report
+        if report is None:
+            self._add_list_row("Scanning assets...", COLORS['text_secondary'])
+            return
+
+        def short(path: str) -> str:
+            return path[len("res://assets/"):] if path.startswith("res://assets/") else path
+
+        rows = []
+        if asset_type == "Duplicates":
+            groups = [("bytes", g) for g in report.byte_duplicates] + [("pixels", g) for g in report.pixel_duplicates]
+            groups = [(kind, g) for kind, g in groups if not query or any(query in p.lower() for p in g)]
+            # Largest savings first
+            groups.sort(key=lambda kg: -report.duplicate_bytes([kg[1]]))
+            for kind, group in groups:
+                rows.append((f"{len(group)}x {short(group[0])} (same {kind}, "
+                             f"{format_size(report.duplicate_bytes([group]))} reclaimable)", COLORS['gold'], group[0]))
+                rows.extend((f"    = {short(p)}", COLORS['text_secondary'], p) for p in group[1:])
+        else:
+            orphans = sorted((p for p in report.orphans if query in p.lower()), key=lambda p: -report.entries[p].size)
+            rows = [(f"{short(p)} ({format_size(report.entries[p].size)})", None, p) for p in orphans]
+
+        if not rows:
+            self._add_list_row(f"No {asset_type.lower()} assets found", COLORS['success'])
+        for text, color, res_path in rows[:self.MAX_INDEX_ROWS]:
+            image_path = self.indexer.to_file_path(res_path) if report.entries[res_path].is_image else None
+            self._add_list_row(text, color, image_path)
+        if len(rows) > self.MAX_INDEX_ROWS:
+            self._add_list_row(f"... {len(rows) - self.MAX_INDEX_ROWS} more (see asset_index.py --list)", COLORS['text_secondary'])
 
     def _import_sprite(self):
         unit_id = self.unit_selector.get()
@@ -1678,6 +1812,156 @@ class AssetsPanel(BasePanel):
             messagebox.showinfo("Success", f"Imported board asset: {filename}")
 
 
+class BalancePanel(BasePanel):
+    """Panel showing the all-pairs duel matrix"""
+
+    def __init__(self, parent, app: ContentEditor):
+        super().__init__(parent, app)
+        self.table: Optional[DuelTable] = None
+        self.catalog = None
+        self.selected_unit: Optional[str] = None
+        self._compute_thread: Optional[threading.Thread] = None
+        self._compute_result = None
+        self._create_ui()
+
+    def _create_ui(self):
+        # Left side - unit ranking
+        self.ranking_frame = ctk.CTkFrame(self, width=520, fg_color=COLORS['bg_medium'])
+        self.ranking_frame.pack(side='left', fill='y', padx=(0, 10))
+        self.ranking_frame.pack_propagate(False)
+
+        ctk.CTkLabel(self.ranking_frame, text="Duel Matrix", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+
+        controls = ctk.CTkFrame(self.ranking_frame, fg_color='transparent')
+        controls.pack(fill='x', padx=10)
+        ctk.CTkLabel(controls, text="Level:").pack(side='left')
+        self.level_selector = ctk.CTkComboBox(controls, values=[str(level) for level in DEFAULT_LEVELS], width=70,
+                                              command=lambda value: self._show_table())
+        self.level_selector.set(str(DEFAULT_LEVELS[0]))
+        self.level_selector.pack(side='left', padx=5)
+        ctk.CTkLabel(controls, text="Stats:").pack(side='left', padx=(10, 0))
+        self.stats_selector = ctk.CTkComboBox(controls, values=["base", "level"], width=80,
+                                              command=lambda value: self._start_compute())
+        self.stats_selector.set("base")
+        self.stats_selector.pack(side='left', padx=5)
+        self.compute_button = ctk.CTkButton(controls, text="Recompute", width=100, command=self._start_compute,
+                                            fg_color=COLORS['primary'])
+        self.compute_button.pack(side='right')
+
+        self.status_label = ctk.CTkLabel(self.ranking_frame, text="Not computed yet", anchor='w',
+                                         text_color=COLORS['text_secondary'])
+        self.status_label.pack(fill='x', padx=10, pady=5)
+
+        self.ranking_list = ctk.CTkScrollableFrame(self.ranking_frame, fg_color='transparent')
+        self.ranking_list.pack(fill='both', expand=True, padx=5, pady=(0, 5))
+
+        # Right side - matchups of the selected unit
+        self.detail_frame = ctk.CTkFrame(self, fg_color=COLORS['bg_medium'])
+        self.detail_frame.pack(side='right', fill='both', expand=True)
+
+        self.detail_title = ctk.CTkLabel(self.detail_frame, text="Select a unit",
+                                         font=ctk.CTkFont(size=16, weight="bold"))
+        self.detail_title.pack(pady=10)
+        self.detail_list = ctk.CTkScrollableFrame(self.detail_frame, fg_color='transparent')
+        self.detail_list.pack(fill='both', expand=True, padx=5, pady=(0, 5))
+
+    def refresh(self):
+        # Cached results load in well under a second; a stale cache recomputes in the background
+        if self.table is None:
+            self._start_compute()
+
+    def _start_compute(self):
+        """Compute (or load from cache) the duel matrix on a worker thread"""
+        if self._compute_thread and self._compute_thread.is_alive():
+            return
+        self.compute_button.configure(state='disabled', text="Computing...")
+        self.status_label.configure(text="Simulating every duel...")
+        self._compute_result = None
+        self._compute_thread = threading.Thread(target=self._run_compute, args=(self.stats_selector.get(),),
+                                                daemon=True)
+        self._compute_thread.start()
+        self.after(200, self._poll_compute)
+
+    def _run_compute(self, stats: str):
+        # Runs off the UI thread, so it must not touch any widgets
+        try:
+            matrix = DuelMatrix(self.app.game_root, DEFAULT_LEVELS, stats)
+            table = matrix.compute()
+            self._compute_result = (table, matrix.load_catalog(), matrix.from_cache)
+        except Exception as e:
+            self._compute_result = e
+
+    def _poll_compute(self):
+        if self._compute_thread.is_alive():
+            self.after(200, self._poll_compute)
+            return
+
+        self.compute_button.configure(state='normal', text="Recompute")
+        if isinstance(self._compute_result, Exception):
+            self.status_label.configure(text=f"Failed: {self._compute_result}")
+            return
+
+        self.table, self.catalog, from_cache = self._compute_result
+        self.status_label.configure(text=f"{self.table.outcome.size:,} duels, {len(self.table.unit_ids)} units"
+                                         f"{' (cached)' if from_cache else ''}")
+        self._show_table()
+
+    def _level_index(self) -> int:
+        return self.table.levels.index(int(self.level_selector.get()))
+
+    def _show_table(self):
+        if self.table is None:
+            return
+        for widget in self.ranking_list.winfo_children():
+            widget.destroy()
+
+        level_index = self._level_index()
+        overall = self.table.win_rates(level_index).mean(axis=1)
+        ability_rates = self.table.ability_win_rates(level_index)
+        for u in np.argsort(-overall):
+            spec = self.catalog.units[self.table.unit_ids[u]]
+            best = int(np.nanargmax(ability_rates[u]))
+            self._add_row(self.ranking_list, f"{spec.name} ({'★' * spec.star_rating})",
+                          f"{overall[u]:.1%}  best: {self.table.ability_names[u][best]}",
+                          ELEMENT_COLORS.get(spec.element, COLORS['text']),
+                          lambda unit_id=spec.unit_id: self._show_unit(unit_id))
+
+        if self.selected_unit in self.table.index:
+            self._show_unit(self.selected_unit)
+
+    def _show_unit(self, unit_id: str):
+        self.selected_unit = unit_id
+        for widget in self.detail_list.winfo_children():
+            widget.destroy()
+
+        level_index = self._level_index()
+        u = self.table.index[unit_id]
+        rates = self.table.win_rates(level_index)[u]
+        ability_rates = self.table.ability_win_rates(level_index)[u]
+        self.detail_title.configure(text=f"{self.catalog.units[unit_id].name} - level "
+                                         f"{self.table.levels[level_index]}: {rates.mean():.1%}")
+
+        for k, name in enumerate(self.table.ability_names[u]):
+            if name:
+                self._add_row(self.detail_list, name, f"{ability_rates[k]:.1%}", COLORS['primary'])
+        for v in np.argsort(rates):
+            spec = self.catalog.units[self.table.unit_ids[v]]
+            color = COLORS['danger'] if rates[v] < 0.4 else COLORS['success'] if rates[v] > 0.6 else COLORS['text']
+            self._add_row(self.detail_list, f"vs {spec.name}", f"{rates[v]:.1%}", color)
+
+    def _add_row(self, parent, text: str, value: str, color: str, on_click=None):
+        item = ctk.CTkFrame(parent, fg_color=COLORS['bg_light'], height=30)
+        item.pack(fill='x', pady=2)
+        item.pack_propagate(False)
+        name_label = ctk.CTkLabel(item, text=text, anchor='w', text_color=color)
+        name_label.pack(side='left', padx=10)
+        value_label = ctk.CTkLabel(item, text=value, anchor='e', text_color=COLORS['text_secondary'])
+        value_label.pack(side='right', padx=10)
+        if on_click is not None:
+            for widget in (item, name_label, value_label):
+                widget.bind('<Button-1>', lambda e: on_click())
+
+
 if __name__ == "__main__":
     app = ContentEditor()
     app.mainloop()
@@ -0,0 +1,347 @@
+"""
+Gacha Economy Simulator
+Monte Carlo simulation of summoning for a whole population of players at once,
+for checking rate changes before they ship.
+
+Follows PlayerData.do_single_pull / do_multi_pull / _perform_pull:
+  - base 5★ rate, raised per pull from the soft pity start, 5★ guaranteed at
+    hard pity, pity reset on every 5★
+  - base 4★ rate, everything else 3★
+  - a 10-pull whose first 9 pulls had no 4★ or better rolls the last one
+    between 4★ and 5★ only
+  - each star rating picks uniformly from its pool
+
+Rates and costs are read from scripts/core/player_data.gd and can be
+overridden to try changes. Pools come from resources/units with the same
+rules as the content pack. Every player is an element of NumPy arrays, so a
+million players take seconds.
+
+Usage:
+    python gacha_sim.py
+    python gacha_sim.py --gems 30000 --players 2000000
+    python gacha_sim.py --soft-pity 40 --five-star-rate 0.03 --strategy single
+"""
+
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from content_pack import GACHA_STARS, ContentPackBuilder
+
+PLAYER_DATA_PATH = os.path.join('scripts', 'core', 'player_data.gd')
+MULTI_PULL_SIZE = 10
+PLAYER_CHUNK = 1 << 18  # Players simulated at once; bounds memory for big pools
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass(frozen=True)
+class GachaRates:
+    """Summon rates and costs (PlayerData constants)"""
+    five_star_rate: float
+    four_star_rate: float
+    soft_pity_start: int
+    soft_pity_step: float
+    hard_pity: int
+    single_cost: int
+    multi_cost: int
+    starting_gems: int
+
+    @classmethod
+    def from_player_data(cls, game_root: str) -> 'GachaRates':
+        """Read the constants from player_data.gd"""
+        with open(os.path.join(game_root, PLAYER_DATA_PATH), 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        def read(pattern: str, name: str) -> str:
+            match = re.search(pattern, source, re.MULTILINE)
+            if not match:
+                raise ValueError(f"Could not find {name} in {PLAYER_DATA_PATH}")
+            return match.group(1)
+
+        def const(name: str) -> str:
+            return read(rf'^const\s+{name}\s*(?::\s*\w+)?\s*=\s*([0-9.]+)', name)
+
+        return cls(
+            five_star_rate=float(const('BASE_5_STAR_RATE')),
+            four_star_rate=float(const('BASE_4_STAR_RATE')),
+            soft_pity_start=int(const('SOFT_PITY_START')),
+            # Literal in _perform_pull: rate += (pity_counter - SOFT_PITY_START + 1) * step
+            soft_pity_step=float(read(r'SOFT_PITY_START\s*\+\s*1\)\s*\*\s*([0-9.]+)', 'the soft pity step')),
+            hard_pity=int(const('HARD_PITY')),
+            single_cost=int(const('SINGLE_PULL_COST')),
+            multi_cost=int(const('MULTI_PULL_COST')),
+            starting_gems=int(read(r'^var\s+gems\s*(?::\s*int)?\s*=\s*(\d+)', 'starting gems')),
+        )
+
+    def five_star_rate_by_pity(self) -> np.ndarray:
+        """5★ rate indexed by the pity counter after its increment, with _perform_pull's float arithmetic"""
+        return np.array([self.five_star_rate + (pity - self.soft_pity_start + 1) * self.soft_pity_step
+                         if pity >= self.soft_pity_start else self.five_star_rate
+                         for pity in range(self.hard_pity + 1)])
+
+    def pulls_to_five_star(self) -> np.ndarray:
+        """Exact chance that the next 5★ takes k single pulls, indexed by k (no budget, no 10-pull guarantee)"""
+        rate = np.clip(self.five_star_rate_by_pity(), 0.0, 1.0)
+        rate[self.hard_pity] = 1.0
+        rate[0] = 0.0
+        miss_before = np.concatenate(([1.0], np.cumprod(1.0 - rate)[:-1]))
+        return miss_before * rate
+
+
+@dataclass
+class PullPlan:
+    """The same purchase sequence for every player: what each pull costs and whether it ends a 10-pull"""
+    multis: int
+    singles: int
+    gems_after: np.ndarray  # Gems spent once pull i has been bought
+    batch_start: np.ndarray  # Pull i is the first of a 10-pull
+    batch_end: np.ndarray  # Pull i is the last of a 10-pull
+
+    @classmethod
+    def for_budget(cls, rates: GachaRates, gems: int, strategy: str) -> 'PullPlan':
+        """Spend gems on 10-pulls while affordable, then single pulls ('multi'), or on single pulls only"""
+        multis = gems // rates.multi_cost if strategy == 'multi' else 0
+        singles = (gems - multis * rates.multi_cost) // rates.single_cost
+        pulls = multis * MULTI_PULL_SIZE + singles
+        index = np.arange(pulls)
+        in_multi = index < multis * MULTI_PULL_SIZE
+        gems_after = np.where(in_multi, (index // MULTI_PULL_SIZE + 1) * rates.multi_cost,
+                              multis * rates.multi_cost + (index - multis * MULTI_PULL_SIZE + 1) * rates.single_cost)
+        return cls(multis, singles, gems_after,
+                   in_multi & (index % MULTI_PULL_SIZE == 0),
+                   in_multi & (index % MULTI_PULL_SIZE == MULTI_PULL_SIZE - 1))
+
+    @property
+    def pulls(self) -> int:
+        return len(self.gems_after)
+
+
+class GachaResult:
+    """Population totals, kept as histograms so any number of players fits in memory"""
+
+    def __init__(self, rates: GachaRates, plan: PullPlan, unit_ids: List[str], unit_stars: List[int]):
+        self.rates = rates
+        self.plan = plan
+        self.unit_ids = unit_ids
+        self.unit_stars = np.array(unit_stars)
+        self.players = 0
+        self.star_counts = np.zeros(6, dtype=np.int64)  # Pulls by star rating
+        self.pity_at_five_star = np.zeros(rates.hard_pity + 1, dtype=np.int64)  # Pulls since the last 5★
+        self.guarantees_used = 0
+        # First pull index at which each player got a 5★ / each unit; index plan.pulls = never
+        self.first_five_star = np.zeros(plan.pulls + 1, dtype=np.int64)
+        self.first_copy = np.zeros((len(unit_ids), plan.pulls + 1), dtype=np.int64)
+        self.copies = np.zeros(len(unit_ids), dtype=np.int64)
+
+    def pull_percentiles(self, histogram: np.ndarray) -> List[Optional[int]]:
+        """Pull number (1-based) at each of PERCENTILES, None where it lies beyond the budget"""
+        return [index + 1 if index < self.plan.pulls else None for index in histogram_percentiles(histogram)]
+
+    def gem_percentiles(self, histogram: np.ndarray) -> List[Optional[int]]:
+        return [None if pull is None else int(self.plan.gems_after[pull - 1])
+                for pull in self.pull_percentiles(histogram)]
+
+
+def histogram_percentiles(histogram: np.ndarray) -> List[int]:
+    """Bin index at each of PERCENTILES"""
+    cumulative = np.cumsum(histogram) / max(histogram.sum(), 1)
+    return [int(np.searchsorted(cumulative, p / 100.0 - 1e-12)) for p in PERCENTILES]
+
+
+def unit_pools(game_root: str) -> Dict[int, List[str]]:
+    """Summonable unit ids by star rating, as the content pack builds them from resources/units"""
+    pack = ContentPackBuilder(game_root).build()
+    return {stars: pack['unit_pools'][str(stars)] for stars in GACHA_STARS}
+
+
+def simulate(rates: GachaRates, pools: Dict[int, List[str]], plan: PullPlan, players: int,
+             seed: Optional[int] = None) -> GachaResult:
+    """Run every player through the pull plan"""
+    unit_ids = [unit_id for stars in GACHA_STARS for unit_id in pools[stars]]
+    result = GachaResult(rates, plan, unit_ids, [stars for stars in GACHA_STARS for _ in pools[stars]])
+    # (first unit index, pool size) per star rating; an empty pool falls back to the 3★ pool,
+    # as _get_random_from_pool does
+    pool_slices = {}
+    for stars in GACHA_STARS:
+        first = unit_ids.index(pools[stars][0]) if pools[stars] else 0
+        pool_slices[stars] = (first, len(pools[stars])) if pools[stars] else (0, len(pools[3]))
+    rate_by_pity = rates.five_star_rate_by_pity()
+    never = plan.pulls
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, players, PLAYER_CHUNK):
+        n = min(PLAYER_CHUNK, players - start)
+        result.players += n
+        pity = np.zeros(n, dtype=np.int64)
+        got_four_star = np.zeros(n, dtype=bool)
+        first_copy = np.full((n, len(unit_ids)), never, dtype=np.int16 if never < 2 ** 15 else np.int32)
+        flat_first_copy = first_copy.reshape(-1)
+        rows = np.arange(n, dtype=np.int64) * len(unit_ids)
+
+        for i in range(plan.pulls):
+            if plan.batch_start[i]:
+                got_four_star[:] = False
+            pity += 1
+            rate = rate_by_pity[pity]  # pity never passes hard pity: that pull is a 5★ and resets it
+            roll = rng.random(n)
+            hard = pity >= rates.hard_pity
+            if plan.batch_end[i]:
+                # _perform_guaranteed_4_star_pull for players still without a 4★ in this 10-pull
+                guaranteed = ~got_four_star
+                result.guarantees_used += int(guaranteed.sum())
+                five = hard | np.where(guaranteed, roll < rate / (rate + rates.four_star_rate), roll < rate)
+                four = ~five & (guaranteed | (roll < rate + rates.four_star_rate))
+            else:
+                five = hard | (roll < rate)
+                four = ~five & (roll < rate + rates.four_star_rate)
+            got_four_star |= five | four
+
+            result.pity_at_five_star += np.bincount(pity[five], minlength=rates.hard_pity + 1)
+            pity[five] = 0
+
+            # One unit per player, uniform within the rolled star rating's pool: pick a 3★ for
+            # everyone, then replace the (few) 4★ and 5★ pulls
+            pick = rng.random(n)
+            first, size = pool_slices[3]
+            units = first + (pick * size).astype(np.int64)
+            for stars, mask in ((4, four), (5, five)):
+                hits = np.flatnonzero(mask)
+                first, size = pool_slices[stars]
+                units[hits] = first + (pick[hits] * size).astype(np.int64)
+            # Tally the unit granted, not the rolled rating: an empty pool hands out a 3★
+            result.star_counts += np.bincount(result.unit_stars[units], minlength=len(result.star_counts))
+            result.copies += np.bincount(units, minlength=len(unit_ids))
+            cells = rows + units
+            flat_first_copy[cells] = np.minimum(flat_first_copy[cells], i)
+
+        for u in range(len(unit_ids)):
+            result.first_copy[u] += np.bincount(first_copy[:, u], minlength=never + 1)
+        five_star_units = result.unit_stars == 5
+        if five_star_units.any():
+            first_five = first_copy[:, five_star_units].min(axis=1)
+        else:
+            first_five = np.full(n, never)
+        result.first_five_star += np.bincount(first_five, minlength=never + 1)
+
+    return result
+
+
+def _format_values(values: List[Optional[int]]) -> str:
+    return "  ".join(f"p{p} {'-' if v is None else f'{v:,}'}" for p, v in zip(PERCENTILES, values))
+
+
+def format_report(result: GachaResult, pools: Dict[int, List[str]]) -> str:
+    rates, plan = result.rates, result.plan
+    total_pulls = result.players * plan.pulls
+    lines = [
+        f"{result.players:,} players x {plan.pulls} pulls ({plan.multis} multi + {plan.singles} single, "
+        f"{int(plan.gems_after[-1]) if plan.pulls else 0:,} gems each)",
+        f"Rates: 5★ {rates.five_star_rate:.1%} (+{rates.soft_pity_step:.1%}/pull from pity {rates.soft_pity_start}, "
+        f"hard pity {rates.hard_pity}), 4★ {rates.four_star_rate:.1%}",
+        "Pools: " + ", ".join(f"{stars}★ {len(pools[stars])}" for stars in GACHA_STARS),
+        "",
+        "Pulls by rarity: " + ", ".join(f"{stars}★ {result.star_counts[stars] / max(total_pulls, 1):.2%}"
+                                        for stars in GACHA_STARS),
+    ]
+    if plan.multis:
+        lines.append(f"  10-pull guarantee used in {result.guarantees_used / (result.players * plan.multis):.1%} "
+                     f"of 10-pulls")
+
+    exact = rates.pulls_to_five_star()
+    pity = np.arange(len(exact))
+    lines += [
+        "",
+        f"Pulls per 5★, exact for single pulls: mean {(exact * pity).sum():.1f}  "
+        + _format_values(histogram_percentiles(exact)) + f"  max {int(pity[exact > 0].max())}",
+    ]
+    hits = result.pity_at_five_star
+    if hits.sum():
+        base = hits[:min(rates.soft_pity_start, rates.hard_pity)].sum()
+        soft = hits[rates.soft_pity_start:rates.hard_pity].sum()
+        lines += [
+            f"Pulls per 5★ won within budget: mean {(hits * pity).sum() / hits.sum():.1f}  "
+            + _format_values(histogram_percentiles(hits)) + f"  max {int(pity[hits > 0].max())}",
+            f"  won at base rate {base / hits.sum():.1%}, in soft pity {soft / hits.sum():.1%}, "
+            f"at hard pity {hits[rates.hard_pity] / hits.sum():.1%}",
+        ]
+
+    first = result.first_five_star
+    lines += [
+        "",
+        f"First 5★ within budget: {1 - first[-1] / result.players:.1%} of players",
+        "  pulls: " + _format_values(result.pull_percentiles(first)),
+        "  gems:  " + _format_values(result.gem_percentiles(first)),
+        "",
+        "Per unit within budget (gem percentiles over all players, '-' = beyond budget):",
+        f"  {'Unit':<22}{'Stars':>6}{'Owned':>9}{'Copies':>8}   Gems to first copy",
+    ]
+    for u, unit_id in enumerate(result.unit_ids):
+        histogram = result.first_copy[u]
+        lines.append(f"  {unit_id:<22}{result.unit_stars[u]:>6}{1 - histogram[-1] / result.players:>9.1%}"
+                     f"{result.copies[u] / result.players:>8.2f}   " + _format_values(result.gem_percentiles(histogram)))
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Simulate summoning across a population of players")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--players", type=int, default=1_000_000)
+    arg_parser.add_argument("--gems", type=int, help="Gems each player spends (default: starting gems)")
+    arg_parser.add_argument("--strategy", choices=('multi', 'single'), default='multi',
+                            help="'multi': 10-pulls while affordable, then single pulls")
+    arg_parser.add_argument("--five-star-rate", type=float, help="Override BASE_5_STAR_RATE")
+    arg_parser.add_argument("--four-star-rate", type=float, help="Override BASE_4_STAR_RATE")
+    arg_parser.add_argument("--soft-pity", type=int, help="Override SOFT_PITY_START")
+    arg_parser.add_argument("--soft-pity-step", type=float, help="Override the per-pull soft pity increase")
+    arg_parser.add_argument("--hard-pity", type=int, help="Override HARD_PITY")
+    arg_parser.add_argument("--seed", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    game_root = os.path.normpath(args.root)
+    try:
+        rates = GachaRates.from_player_data(game_root)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    overrides = {
+        'five_star_rate': args.five_star_rate, 'four_star_rate': args.four_star_rate,
+        'soft_pity_start': args.soft_pity, 'soft_pity_step': args.soft_pity_step, 'hard_pity': args.hard_pity,
+    }
+    rates = replace(rates, **{key: value for key, value in overrides.items() if value is not None})
+    if rates.hard_pity < 1:
+        print("ERROR: --hard-pity must be at least 1")
+        sys.exit(1)
+    if args.players < 1:
+        print("ERROR: --players must be at least 1")
+        sys.exit(1)
+
+    pools = unit_pools(game_root)
+    if not pools[3]:
+        print("ERROR: No summonable 3★ units")
+        sys.exit(1)
+    plan = PullPlan.for_budget(rates, rates.starting_gems if args.gems is None else args.gems, args.strategy)
+    if not plan.pulls:
+        print("ERROR: Not enough gems for a single pull")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = simulate(rates, pools, plan, args.players, args.seed)
+    elapsed = time.perf_counter() - start
+    print(format_report(result, pools))
+    print(f"\n{args.players * plan.pulls:,} pulls in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+GDScript Resource Schemas
+Extracts the exported properties of the data scripts (scripts/data/*.gd) so the
+content editor can parse, validate and build forms from the game's own types.
+
+Each script's `@export var name: Type = default  # comment` declarations and
+`enum` blocks are read with a couple of regexes. Results are cached in
+.schema_cache.json in the game root and a script is only re-parsed when its
+content hash changes. Enum types declared in another script
+(e.g. GearData.StatType) are resolved across the registry.
+
+Usage:
+    python gd_schema.py
+    python gd_schema.py GearData
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA_CACHE_FILE = '.schema_cache.json'
+SCHEMA_CACHE_VERSION = 1
+SCRIPT_DIRS = ('scripts/data',)
+
+CLASS_NAME_PATTERN = re.compile(r'^class_name\s+(\w+)', re.MULTILINE)
+ENUM_PATTERN = re.compile(r'^enum\s+(\w+)\s*\{(.*?)\}', re.MULTILINE | re.DOTALL)
+EXPORT_PATTERN = re.compile(
+    r'^@export(?:_(\w+))?(?:\(([^)]*)\))?\s+var\s+(\w+)'
+    r'\s*(?::\s*([\w.\[\]]+))?\s*(?::?=\s*(.+?))?\s*(?:#\s*(.*?))?\s*$',
+    re.MULTILINE
+)
+
+SCALAR_TYPES = {'bool', 'int', 'float', 'String', 'StringName'}
+VALUE_TYPES = {'Color', 'Vector2'}
+
+# Godot's named colors that appear as defaults in the data scripts
+NAMED_COLORS = {
+    'WHITE': [1.0, 1.0, 1.0, 1.0],
+    'BLACK': [0.0, 0.0, 0.0, 1.0],
+    'RED': [1.0, 0.0, 0.0, 1.0],
+    'GREEN': [0.0, 1.0, 0.0, 1.0],
+    'BLUE': [0.0, 0.0, 1.0, 1.0],
+    'YELLOW': [1.0, 1.0, 0.0, 1.0],
+    'GRAY': [0.745098, 0.745098, 0.745098, 1.0],
+    'TRANSPARENT': [1.0, 1.0, 1.0, 0.0],
+}
+
+
+@dataclass
+class FieldSchema:
+    """One @export property of a data script"""
+    name: str
+    type: str  # Declared type, e.g. "int", "GearType", "GearData.StatType", "Array[UnitData]"
+    default_expr: str = ""  # Default as written in the script
+    hint: str = ""  # Suffix of @export_<hint>, e.g. "multiline", "range"
+    hint_args: str = ""
+    comment: str = ""
+    # Filled in by SchemaRegistry after every script is loaded
+    kind: str = field(default="", compare=False)  # bool/int/float/String/Color/Vector2/enum/Array/Resource
+    enum: Dict[str, int] = field(default_factory=dict, compare=False)
+    element_type: str = field(default="", compare=False)  # For arrays
+    default: Any = field(default=None, compare=False)  # In TresParser's value representation
+
+    @property
+    def label(self) -> str:
+        return self.name.replace('_', ' ').title()
+
+    def enum_label(self, value: int) -> str:
+        """Combo box text for an enum value, e.g. 1 (Attack)"""
+        for member, member_value in self.enum.items():
+            if member_value == value:
+                return f"{value} ({member.replace('_', ' ').title()})"
+        return str(value)
+
+    def enum_options(self) -> List[str]:
+        return [self.enum_label(v) for v in self.enum.values()]
+
+    def range_limits(self) -> Tuple[Optional[float], Optional[float]]:
+        """Min and max from @export_range(min, max[, step])"""
+        if self.hint != 'range':
+            return None, None
+        parts = [p.strip() for p in self.hint_args.split(',')]
+        try:
+            return float(parts[0]), float(parts[1])
+        except (IndexError, ValueError):
+            return None, None
+
+    def coerce(self, value: Any) -> Any:
+        """Convert form input to the property's type, raising ValueError with a readable message"""
+        if self.kind == 'bool':
+            if isinstance(value, str):
+                return value.strip().lower() in ('true', '1', 'yes')
+            return bool(value)
+
+        if self.kind == 'String':
+            return str(value)
+
+        text = str(value).strip()
+        if self.kind == 'enum':
+            # Accept "2", "2 (Defense)", "DEFENSE" or "Defense"
+            head = text.split()[0] if text else ''
+            member = text.upper().replace(' ', '_')
+            if head.lstrip('-').isdigit():
+                result = int(head)
+            elif member in self.enum:
+                result = self.enum[member]
+            else:
+                raise ValueError(f"{self.label}: '{text}' is not one of {', '.join(self.enum)}")
+        elif self.kind == 'int':
+            try:
+                result = int(text)
+            except ValueError:
+                raise ValueError(f"{self.label}: '{text}' is not a whole number") from None
+        elif self.kind == 'float':
+            try:
+                result = float(text)
+            except ValueError:
+                raise ValueError(f"{self.label}: '{text}' is not a number") from None
+        else:
+            return value
+
+        error = self.check(result)
+        if error:
+            raise ValueError(error)
+        return result
+
+    def check(self, value: Any) -> Optional[str]:
+        """Return an error message if value is not valid for this property"""
+        kind = self.kind
+        if kind == 'bool' and not isinstance(value, bool):
+            return f"{self.name}: expected bool, got {value!r}"
+        if kind == 'String' and not isinstance(value, str):
+            return f"{self.name}: expected String, got {value!r}"
+        if kind in ('int', 'enum') and (isinstance(value, bool) or not isinstance(value, int)):
+            return f"{self.name}: expected {self.type}, got {value!r}"
+        if kind == 'float' and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return f"{self.name}: expected float, got {value!r}"
+        if kind in VALUE_TYPES and not (isinstance(value, dict) and value.get('type') == kind):
+            return f"{self.name}: expected {kind}, got {value!r}"
+        if kind == 'Resource' and value is not None and not (isinstance(value, dict) and value.get('type') == 'ExtResource'):
+            return f"{self.name}: expected a resource reference or null, got {value!r}"
+        if kind == 'Array':
+            items = value.get('items') if isinstance(value, dict) and value.get('type') == 'Array' else value
+            if not isinstance(items, list):
+                return f"{self.name}: expected {self.type}, got {value!r}"
+
+        if kind == 'enum' and self.enum and value not in self.enum.values():
+            return f"{self.name}: {value} is not a valid {self.type}"
+        if kind in ('int', 'float'):
+            low, high = self.range_limits()
+            if low is not None and not low <= value <= high:
+                return f"{self.name}: {value} is outside {low:g}..{high:g}"
+        return None
+
+
+@dataclass
+class ScriptSchema:
+    """Exported properties and enums of one data script"""
+    class_name: str
+    script_path: str  # res:// path
+    enums: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    fields: Dict[str, FieldSchema] = field(default_factory=dict)  # In declaration order
+
+    @property
+    def uid_prefix(self) -> str:
+        """Prefix for generated uids, e.g. "gear" for gear_data.gd"""
+        stem = os.path.splitext(os.path.basename(self.script_path))[0]
+        return stem[:-len('_data')] if stem.endswith('_data') else stem
+
+    def defaults(self) -> Dict[str, Any]:
+        """Default property values in TresParser's representation"""
+        return {name: _copy_value(f.default) for name, f in self.fields.items()}
+
+    def validate(self, properties: Dict[str, Any]) -> List[str]:
+        """Check parsed properties against the schema; returns error messages"""
+        errors = []
+        for name, value in properties.items():
+            if name == 'script':
+                continue
+            schema_field = self.fields.get(name)
+            if schema_field is None:
+                errors.append(f"{name}: not an exported property of {self.class_name}")
+                continue
+            error = schema_field.check(value)
+            if error:
+                errors.append(error)
+        return errors
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ScriptSchema':
+        fields = {f['name']: FieldSchema(**f) for f in data['fields']}
+        return ScriptSchema(data['class_name'], data['script_path'], data['enums'], fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Only the parsed declarations are cached; resolved kinds/defaults are cheap to rebuild
+        fields = [
+            {k: v for k, v in asdict(f).items() if k in ('name', 'type', 'default_expr', 'hint', 'hint_args', 'comment')}
+            for f in self.fields.values()
+        ]
+        return {'class_name': self.class_name, 'script_path': self.script_path, 'enums': self.enums, 'fields': fields}
+
+
+def parse_script(source: str, script_path: str) -> Optional[ScriptSchema]:
+    """Extract class_name, enums and @export properties from GDScript source"""
+    class_match = CLASS_NAME_PATTERN.search(source)
+    if not class_match:
+        return None
+    schema = ScriptSchema(class_match.group(1), script_path)
+
+    for enum_match in ENUM_PATTERN.finditer(source):
+        members = {}
+        next_value = 0
+        for entry in enum_match.group(2).split('\n'):
+            for part in entry.split('#')[0].split(','):
+                part = part.strip()
+                if not part:
+                    continue
+                member, _, explicit = part.partition('=')
+                if explicit.strip():
+                    next_value = int(explicit.strip())
+                members[member.strip()] = next_value
+                next_value += 1
+        schema.enums[enum_match.group(1)] = members
+
+    for m in EXPORT_PATTERN.finditer(source):
+        hint, hint_args, name, type_name, default_expr, comment = m.groups()
+        schema.fields[name] = FieldSchema(
+            name=name,
+            type=type_name or _infer_type(default_expr or ''),
+            default_expr=(default_expr or '').strip(),
+            hint=hint or '',
+            hint_args=hint_args or '',
+            comment=comment or '',
+        )
+    return schema
+
+
+def _infer_type(expr: str) -> str:
+    """Type of an untyped `var x = literal` export"""
+    expr = expr.strip()
+    if expr in ('true', 'false'):
+        return 'bool'
+    if re.fullmatch(r'-?\d+', expr):
+        return 'int'
+    if re.fullmatch(r'-?\d*\.\d+', expr):
+        return 'float'
+    if expr.startswith('"'):
+        return 'String'
+    return 'Variant'
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    return value
+
+
+class SchemaRegistry:
+    """All data script schemas of a project, keyed by class_name"""
+
+    def __init__(self, game_root: str, script_dirs: Tuple[str, ...] = SCRIPT_DIRS):
+        self.game_root = game_root
+        self.script_dirs = script_dirs
+        self.cache_path = os.path.join(game_root, SCHEMA_CACHE_FILE)
+        self.schemas: Dict[str, ScriptSchema] = {}
+        self._by_path: Dict[str, ScriptSchema] = {}
+        self.reparsed: List[str] = []  # Scripts parsed (not served from cache) by the last load()
+        self.fingerprint = ""  # Hash over every script's content hash; changes when any schema may have
+        self.load()
+
+    def get(self, class_name: str) -> Optional[ScriptSchema]:
+        return self.schemas.get(class_name)
+
+    def for_script(self, res_path: str) -> Optional[ScriptSchema]:
+        """Look up a schema by its res:// script path"""
+        return self._by_path.get(res_path)
+
+    def load(self) -> Dict[str, ScriptSchema]:
+        """Load schemas, re-parsing only the scripts whose content hash changed"""
+        cached = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == SCHEMA_CACHE_VERSION:
+                    cached = data.get('scripts', {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable schema cache: {e}")
+
+        scripts = {}
+        self.reparsed = []
+        for rel_path in self._script_files():
+            with open(os.path.join(self.game_root, rel_path), 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            entry = cached.get(rel_path)
+            if entry is None or entry.get('sha1') != digest:
+                schema = parse_script(raw.decode('utf-8'), 'res://' + rel_path)
+                entry = {'sha1': digest, 'schema': schema.to_dict() if schema else None}
+                self.reparsed.append(rel_path)
+            scripts[rel_path] = entry
+
+        if self.reparsed or set(scripts) != set(cached):
+            try:
+                with open(self.cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': SCHEMA_CACHE_VERSION, 'scripts': scripts}, f, indent=1)
+            except OSError as e:
+                print(f"Could not write schema cache: {e}")
+
+        self.fingerprint = hashlib.sha1(
+            ''.join(f"{path}:{entry['sha1']};" for path, entry in scripts.items()).encode('utf-8')
+        ).hexdigest()
+
+        self.schemas = {}
+        for entry in scripts.values():
+            if entry['schema']:
+                schema = ScriptSchema.from_dict(entry['schema'])
+                self.schemas[schema.class_name] = schema
+        self._by_path = {s.script_path: s for s in self.schemas.values()}
+        for schema in self.schemas.values():
+            for schema_field in schema.fields.values():
+                self._resolve_field(schema, schema_field)
+        return self.schemas
+
+    def _script_files(self) -> List[str]:
+        files = []
+        for script_dir in self.script_dirs:
+            folder = os.path.join(self.game_root, *script_dir.split('/'))
+            if not os.path.isdir(folder):
+                continue
+            with os.scandir(folder) as it:
+                files.extend(f"{script_dir}/{e.name}" for e in it if e.is_file() and e.name.endswith('.gd'))
+        return sorted(files)
+
+    # === Type resolution ===
+
+    def resolve_enum(self, schema: ScriptSchema, type_name: str) -> Optional[Dict[str, int]]:
+        """Members of a local (GearType) or qualified (GearData.StatType) enum type"""
+        owner_name, _, enum_name = type_name.rpartition('.')
+        owner = self.schemas.get(owner_name) if owner_name else schema
+        if owner is None:
+            return None
+        return owner.enums.get(enum_name)
+
+    def _resolve_field(self, schema: ScriptSchema, schema_field: FieldSchema):
+        type_name = schema_field.type
+        array_match = re.fullmatch(r'Array(?:\[([\w.]+)\])?', type_name)
+        enum = self.resolve_enum(schema, type_name)
+
+        if type_name in SCALAR_TYPES:
+            schema_field.kind = 'String' if type_name == 'StringName' else type_name
+        elif type_name in VALUE_TYPES:
+            schema_field.kind = type_name
+        elif enum is not None:
+            schema_field.kind = 'enum'
+            schema_field.enum = enum
+        elif array_match:
+            schema_field.kind = 'Array'
+            element = array_match.group(1) or 'Variant'
+            # .tres files store arrays of custom resources as Array[Resource]
+            is_builtin = element in SCALAR_TYPES or element in VALUE_TYPES or element == 'Variant'
+            schema_field.element_type = element if is_builtin else 'Resource'
+        else:
+            schema_field.kind = 'Resource'
+
+        schema_field.default = self._evaluate_default(schema, schema_field)
+
+    def _evaluate_default(self, schema: ScriptSchema, schema_field: FieldSchema) -> Any:
+        """Turn the default expression into TresParser's value representation"""
+        expr = schema_field.default_expr
+        kind = schema_field.kind
+        if not expr:
+            return {
+                'bool': False, 'int': 0, 'float': 0.0, 'String': '',
+                'enum': min(schema_field.enum.values(), default=0),
+                'Color': {'type': 'Color', 'values': [0.0, 0.0, 0.0, 1.0]},
+                'Vector2': {'type': 'Vector2', 'values': [0.0, 0.0]},
+                'Array': {'type': 'Array', 'element_type': schema_field.element_type, 'items': []},
+            }.get(kind)
+
+        if kind == 'enum':
+            member = expr.rpartition('.')[2]
+            return schema_field.enum.get(member, 0)
+        if kind == 'Color':
+            if expr.startswith('Color.'):
+                return {'type': 'Color', 'values': list(NAMED_COLORS.get(expr[len('Color.'):], [1.0, 1.0, 1.0, 1.0]))}
+            values = [float(v) for v in re.findall(r'-?\d+(?:\.\d+)?', expr)]
+            if len(values) == 3:
+                values.append(1.0)
+            return {'type': 'Color', 'values': values}
+        if kind == 'Vector2':
+            return {'type': 'Vector2', 'values': [float(v) for v in re.findall(r'-?\d+(?:\.\d+)?', expr)]}
+        if kind == 'Array':
+            items = []
+            inner = expr.strip()[1:-1].strip()
+            if inner:
+                items = [_literal(part.strip(), schema_field.element_type) for part in inner.split(',')]
+            return {'type': 'Array', 'element_type': schema_field.element_type, 'items': items}
+        if kind == 'Resource':
+            return None
+        return _literal(expr, kind)
+
+
+def _literal(expr: str, kind: str) -> Any:
+    """Evaluate a GDScript literal default"""
+    if expr == 'null':
+        return None
+    if kind == 'bool':
+        return expr == 'true'
+    if kind == 'int':
+        return int(expr)
+    if kind == 'float':
+        return float(expr)
+    if kind == 'String' or expr.startswith('"'):
+        return expr[1:-1] if expr.startswith('"') and expr.endswith('"') else expr
+    return expr
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the schemas extracted from the data scripts")
+    parser.add_argument("classes", nargs='*', help="class_names to print (default: all)")
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="Game root folder")
+    args = parser.parse_args()
+
+    registry = SchemaRegistry(os.path.abspath(args.root))
+    print(f"{len(registry.schemas)} schemas ({len(registry.reparsed)} scripts re-parsed)")
+    for class_name in args.classes or sorted(registry.schemas):
+        schema = registry.get(class_name)
+        if schema is None:
+            print(f"Unknown class: {class_name}")
+            continue
+        print(f"\n{schema.class_name} ({schema.script_path})")
+        for f in schema.fields.values():
+            extra = f" [{', '.join(f.enum)}]" if f.enum else ""
+            print(f"  {f.name}: {f.type} = {f.default!r}{extra}")
+
+
+if __name__ == "__main__":
+    main()
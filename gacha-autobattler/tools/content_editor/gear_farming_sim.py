@@ -0,0 +1,393 @@
+"""
+Gear Farming Simulator
+Simulates players farming the gear dungeons until one unit wears a full
+legendary set (weapon, armor and two accessories, all legendary and enhanced
+to max), to tune drop tables, stone drops and enhancement costs before release.
+
+Every run goes to the dungeon that drops the gear type of the weakest slot.
+A win pays stones (generate_stone_drop) and a gear drop (generate_gear_drop),
+which replaces the weakest equipped piece of its type if it is rarer. After
+each run the player enhances with the stones on hand, one level at a time:
+  - greedy: the lowest-level equipped piece of any rarity. Stones and gold put
+    into pieces that are later replaced count as wasted
+  - legendary: only legendary pieces
+Dungeons pay no gold, so gold is assumed to be on hand and only counted.
+
+Scenarios are the grid of --tiers x --win-rates x --legendary-scales x
+--stone-scales x --policies. A legendary scale multiplies the tier's legendary
+rate and shrinks the other rarities to match. Each scenario simulates all of
+its players together as NumPy arrays; scenarios run in a process pool.
+
+Dungeons and gear templates are read with TresParser; drop rates, stone drops,
+enhancement costs and gear max levels come from dungeon_data.gd and
+gear_data.gd.
+
+Usage:
+    python gear_farming_sim.py
+    python gear_farming_sim.py --tiers 2 --legendary-scales 1,1.5,2 --stone-scales 1,2
+    python gear_farming_sim.py --policies greedy --win-rates 0.7,1 --players 20000 -w 4
+"""
+
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from progression_sim import RARITIES, SLOT_TYPES, ProgressionRules
+from tres_parser import TresParser
+
+POLICIES = ('greedy', 'legendary')
+GEAR_TYPES = ('weapon', 'armor', 'accessory')  # GearData.GearType order
+LEGENDARY = len(RARITIES) - 1
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass(frozen=True)
+class FarmingScenario:
+    tier: int
+    win_rate: float
+    legendary_scale: float
+    stone_scale: float
+    policy: str
+
+
+@dataclass
+class FarmingResult:
+    scenario: FarmingScenario
+    legendary_rate: float
+    set_share: float  # Players with four legendary pieces by --max-runs
+    set_runs: np.ndarray  # Runs at PERCENTILES
+    set_mean: float  # Over players who got there
+    maxed_share: float  # Players whose legendary set is also fully enhanced
+    maxed_runs: np.ndarray
+    maxed_mean: float
+    stones: np.ndarray  # Spent on enhancement until maxed, at PERCENTILES
+    gold: np.ndarray
+    wasted_stones: float  # Mean share of spent stones lost to replaced pieces
+    wasted_gold: float
+
+
+class FarmingContent:
+    """Dungeon drop tables and costs as arrays"""
+
+    def __init__(self, game_root: str):
+        self.rules = ProgressionRules.from_scripts(game_root)
+        parser = TresParser(game_root)
+        dungeons = sorted(parser.get_all_dungeons(), key=lambda r: r.properties.get('dungeon_id', ''))
+        if not dungeons:
+            raise ValueError("No dungeons in resources/dungeons")
+        self.dungeon_ids = [d.properties.get('dungeon_id', '') for d in dungeons]
+        names = dungeons[0].properties.get('tier_names') or []
+        self.tier_names = [str(n) for n in (names.get('items', []) if isinstance(names, dict) else names)]
+        stats = [d.properties.get('drops_stat_type', 0) for d in dungeons]
+
+        # Gear type of every template a dungeon can drop, by [dungeon, rarity, pick]
+        gear = [g.properties for g in parser.get_all_gear()]
+        choices = [[[g.get('gear_type', 0) for g in gear
+                     if g.get('stat_type', 0) == stat and g.get('rarity', 0) == rarity]
+                    for rarity in range(len(RARITIES))] for stat in stats]
+        self.template_count = np.array([[len(c) for c in row] for row in choices])
+        self.template_type = np.full(self.template_count.shape + (max(1, self.template_count.max()),), -1)
+        for d, row in enumerate(choices):
+            for rarity, types in enumerate(row):
+                self.template_type[d, rarity, :len(types)] = types
+
+        # The dungeon most likely to drop each gear type at the highest rarity that has it
+        self.target_dungeon = np.zeros(len(GEAR_TYPES), dtype=np.int64)
+        for gear_type in range(len(GEAR_TYPES)):
+            for rarity in reversed(range(len(RARITIES))):
+                share = ((self.template_type[:, rarity] == gear_type).sum(axis=1)
+                         / np.maximum(self.template_count[:, rarity], 1))
+                if share.max() > 0:
+                    self.target_dungeon[gear_type] = int(np.argmax(share))
+                    break
+            else:
+                if gear_type in SLOT_TYPES:
+                    raise ValueError(f"No dungeon drops {GEAR_TYPES[gear_type]} gear")
+
+    def tier_name(self, tier: int) -> str:
+        return self.tier_names[tier] if tier < len(self.tier_names) else f"Tier {tier}"
+
+    def drop_rates(self, scenario: FarmingScenario) -> np.ndarray:
+        """The tier's rarity rates with the legendary rate scaled and the rest shrunk to fit"""
+        rates = np.array(self.rules.drop_rates[scenario.tier], dtype=float)
+        legendary = min(1.0, rates[LEGENDARY] * scenario.legendary_scale)
+        others = rates[:LEGENDARY].sum()
+        if others > 0:
+            rates[:LEGENDARY] *= (1.0 - legendary) / others
+        rates[LEGENDARY] = legendary
+        return rates
+
+
+class Farmers:
+    """Every simulated player's equipped pieces and stones; the player axis is last"""
+
+    def __init__(self, content: FarmingContent, count: int, policy: str):
+        rules = content.rules
+        self.policy = policy
+        self.slot_type = np.array(SLOT_TYPES)
+        self.gear_max = np.array(rules.gear_max_level)
+        self.enhance_gold, self.enhance_stones = np.array(rules.enhance_gold), np.array(rules.enhance_stones)
+        shape = (len(SLOT_TYPES), count)
+        self.rarity = np.full(shape, -1)  # -1 = empty slot
+        self.level = np.zeros(shape, dtype=np.int64)
+        self.piece_stones = np.zeros(shape, dtype=np.int64)  # Spent on the piece in the slot
+        self.piece_gold = np.zeros(shape, dtype=np.int64)
+        self.stones = np.full(count, rules.starting_stones, dtype=np.int64)
+        self.stones_spent = np.zeros(count, dtype=np.int64)
+        self.gold_spent = np.zeros(count, dtype=np.int64)
+        self.stones_wasted = np.zeros(count, dtype=np.int64)
+        self.gold_wasted = np.zeros(count, dtype=np.int64)
+
+    def target_type(self, rows: np.ndarray) -> np.ndarray:
+        """Gear type of each player's weakest slot (lowest rarity, then lowest level)"""
+        score = self.rarity[:, rows] * 100 + self.level[:, rows]
+        return self.slot_type[np.argmin(score, axis=0)]
+
+    def equip(self, rows: np.ndarray, rarity: np.ndarray, gear_type: np.ndarray):
+        """Put each drop over the weakest piece of its type, if it is rarer"""
+        fits = self.slot_type[:, None] == gear_type[None, :]
+        score = np.where(fits, self.rarity[:, rows] * 100 + self.level[:, rows], np.iinfo(np.int64).max)
+        slots = np.argmin(score, axis=0)
+        better = rarity > self.rarity[slots, rows]
+        rows, slots, rarity = rows[better], slots[better], rarity[better]
+        self.stones_wasted[rows] += self.piece_stones[slots, rows]
+        self.gold_wasted[rows] += self.piece_gold[slots, rows]
+        self.rarity[slots, rows] = rarity
+        self.level[slots, rows] = 0
+        self.piece_stones[slots, rows] = 0
+        self.piece_gold[slots, rows] = 0
+
+    def enhance(self, rows: np.ndarray):
+        """enhance_gear on the lowest-level allowed piece, while the stones last"""
+        while len(rows):
+            rarity, level = self.rarity[:, rows], self.level[:, rows]
+            allowed = (rarity >= 0) & (level < self.gear_max[np.maximum(rarity, 0)])
+            if self.policy == 'legendary':
+                allowed &= rarity == LEGENDARY
+            slots = np.argmin(np.where(allowed, level, np.iinfo(np.int64).max), axis=0)
+            cost_rarity = np.maximum(self.rarity[slots, rows], 0)
+            stones, gold = self.enhance_stones[cost_rarity], self.enhance_gold[cost_rarity]
+            buy = allowed.any(axis=0) & (self.stones[rows] >= stones)
+            rows, slots, stones, gold = rows[buy], slots[buy], stones[buy], gold[buy]
+            self.stones[rows] -= stones
+            self.stones_spent[rows] += stones
+            self.gold_spent[rows] += gold
+            self.piece_stones[slots, rows] += stones
+            self.piece_gold[slots, rows] += gold
+            self.level[slots, rows] += 1
+
+    def legendary_set(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(all four pieces legendary, and also all at max level) per row"""
+        legendary = (self.rarity[:, rows] == LEGENDARY).all(axis=0)
+        return legendary, legendary & (self.level[:, rows] >= self.gear_max[LEGENDARY]).all(axis=0)
+
+
+def simulate(content: FarmingContent, scenario: FarmingScenario, players: int, max_runs: int,
+             seed=None) -> FarmingResult:
+    """Farm scenario.tier until every player's set is maxed or max_runs is reached"""
+    rng = np.random.default_rng(seed)
+    rates = content.drop_rates(scenario)
+    bounds = np.cumsum(rates)[:-1]  # The last rarity is the rest, as in generate_gear_drop
+    low, high = content.rules.stone_drops[scenario.tier]
+    low, high = int(round(low * scenario.stone_scale)), int(round(high * scenario.stone_scale))
+
+    farmers = Farmers(content, players, scenario.policy)
+    set_run = np.full(players, -1)
+    maxed_run = np.full(players, -1)
+    # Nobody finishes when a slot's target dungeon never drops a legendary of its type
+    reachable = rates[LEGENDARY] > 0 and all(
+        (content.template_type[content.target_dungeon[t], LEGENDARY] == t).any() for t in set(SLOT_TYPES))
+    active = np.arange(players if reachable else 0)
+    for run in range(1, max_runs + 1):
+        if not len(active):
+            break
+        count = len(active)
+        dungeon = content.target_dungeon[farmers.target_type(active)]
+        won = rng.random(count) < scenario.win_rate
+        stones = low + (rng.random(count) * (high - low + 1)).astype(np.int64)
+        farmers.stones[active] += np.where(won, stones, 0)
+
+        rarity = (rng.random(count)[None, :] >= bounds[:, None]).sum(axis=0)
+        templates = content.template_count[dungeon, rarity]
+        pick = (rng.random(count) * templates).astype(np.int64)
+        gear_type = content.template_type[dungeon, rarity, np.minimum(pick, content.template_type.shape[2] - 1)]
+        dropped = won & (templates > 0)
+        farmers.equip(active[dropped], rarity[dropped], gear_type[dropped])
+        farmers.enhance(active)
+
+        legendary, maxed = farmers.legendary_set(active)
+        set_run[active[legendary & (set_run[active] < 0)]] = run
+        maxed_run[active[maxed]] = run
+        active = active[~maxed]
+
+    done = maxed_run >= 0
+    spent_stones, spent_gold = farmers.stones_spent[done], farmers.gold_spent[done]
+    return FarmingResult(
+        scenario=scenario,
+        legendary_rate=float(rates[LEGENDARY]),
+        set_share=float((set_run >= 0).mean()),
+        set_runs=_run_percentiles(set_run),
+        set_mean=float(set_run[set_run >= 0].mean()) if (set_run >= 0).any() else float('nan'),
+        maxed_share=float(done.mean()),
+        maxed_runs=_run_percentiles(maxed_run),
+        maxed_mean=float(maxed_run[done].mean()) if done.any() else float('nan'),
+        stones=np.percentile(spent_stones, PERCENTILES) if done.any() else np.full(len(PERCENTILES), np.nan),
+        gold=np.percentile(spent_gold, PERCENTILES) if done.any() else np.full(len(PERCENTILES), np.nan),
+        wasted_stones=_share(farmers.stones_wasted[done], spent_stones),
+        wasted_gold=_share(farmers.gold_wasted[done], spent_gold),
+    )
+
+
+def _run_percentiles(runs: np.ndarray) -> np.ndarray:
+    """Run at each percentile, inf where it lies beyond --max-runs"""
+    return np.percentile(np.where(runs >= 0, runs, np.inf), PERCENTILES, method="inverted_cdf")
+
+
+def _share(part: np.ndarray, total: np.ndarray) -> float:
+    return float(part.sum() / total.sum()) if total.sum() else 0.0
+
+
+# --- Process pool ---
+
+_worker_content: Optional[FarmingContent] = None
+
+
+def _init_worker(game_root: str):
+    global _worker_content
+    _worker_content = FarmingContent(game_root)
+
+
+def _simulate_scenario(job: Tuple[FarmingScenario, int, int, np.random.SeedSequence]) -> FarmingResult:
+    scenario, players, max_runs, seed = job
+    return simulate(_worker_content, scenario, players, max_runs, seed)
+
+
+def run_sweep(game_root: str, scenarios: List[FarmingScenario], players: int, max_runs: int,
+              seed: Optional[int] = None, workers: Optional[int] = None) -> List[FarmingResult]:
+    """Simulate every scenario, in worker processes when there are several"""
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(len(scenarios))
+    jobs = [(scenario, players, max_runs, s) for scenario, s in zip(scenarios, seeds)]
+    if workers < 2 or len(jobs) < 2:
+        _init_worker(game_root)
+        return [_simulate_scenario(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                             initargs=(game_root,)) as pool:
+        return list(pool.map(_simulate_scenario, jobs))
+
+
+# --- Report ---
+
+def _runs(values: np.ndarray, runs_per_day: float) -> str:
+    cells = ['-' if not np.isfinite(v) else f"{v:,.0f}" for v in values]
+    days = '-' if not np.isfinite(values[1]) else f"{values[1] / runs_per_day:.0f}d"
+    return f"{' / '.join(cells):>17} {days:>5}"
+
+
+def _spend(values: np.ndarray) -> str:
+    return ' / '.join('-' if not np.isfinite(v) else f"{v:,.0f}" for v in values)
+
+
+def format_report(results: List[FarmingResult], content: FarmingContent, players: int, max_runs: int,
+                  runs_per_day: float) -> str:
+    p = '/'.join(f"p{v}" for v in PERCENTILES)
+    lines = [
+        f"{len(results)} scenarios x {players:,} players, up to {max_runs:,} runs, {runs_per_day:g} runs/day",
+        "Target: " + ", ".join(f"{GEAR_TYPES[t]} from {content.dungeon_ids[content.target_dungeon[t]]}"
+                               for t in sorted(set(SLOT_TYPES))),
+        "",
+        f"  {'tier':<8}{'win':>5}{'legend':>8}{'stones':>8}  {'policy':<10}"
+        f"{'4 legendary':>12}  {p + ' runs':>17} {'p50':>5}{'maxed':>8}  {p + ' runs':>17} {'p50':>5}",
+    ]
+    for r in results:
+        s = r.scenario
+        lines.append(
+            f"  {content.tier_name(s.tier):<8}{s.win_rate:>5.0%}{r.legendary_rate:>8.1%}{'x' + format(s.stone_scale, 'g'):>8}"
+            f"  {s.policy:<10}{r.set_share:>12.1%}  {_runs(r.set_runs, runs_per_day)}"
+            f"{r.maxed_share:>8.1%}  {_runs(r.maxed_runs, runs_per_day)}")
+
+    lines += ["", f"Enhancement spend until the set is maxed ({p})",
+              f"  {'tier':<8}{'win':>5}{'legend':>8}{'stones':>8}  {'policy':<10}"
+              f"{'stones':>24}{'wasted':>8}{'gold':>30}{'wasted':>8}"]
+    for r in results:
+        s = r.scenario
+        lines.append(
+            f"  {content.tier_name(s.tier):<8}{s.win_rate:>5.0%}{r.legendary_rate:>8.1%}{'x' + format(s.stone_scale, 'g'):>8}"
+            f"  {s.policy:<10}{_spend(r.stones):>24}{r.wasted_stones:>8.0%}{_spend(r.gold):>30}{r.wasted_gold:>8.0%}")
+    return "\n".join(lines)
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(',') if v.strip()]
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Simulate farming dungeons for a full legendary gear set")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--tiers", default=None, help="Comma-separated dungeon tiers (default: all)")
+    arg_parser.add_argument("--win-rates", default="1", help="Comma-separated chances to win a run")
+    arg_parser.add_argument("--legendary-scales", default="1", help="Comma-separated legendary rate multipliers")
+    arg_parser.add_argument("--stone-scales", default="1", help="Comma-separated stone drop multipliers")
+    arg_parser.add_argument("--policies", default=','.join(POLICIES), help=f"Comma-separated: {', '.join(POLICIES)}")
+    arg_parser.add_argument("--players", type=int, default=5000, help="Players per scenario")
+    arg_parser.add_argument("--max-runs", type=int, default=3000, help="Runs before a player gives up")
+    arg_parser.add_argument("--runs-per-day", type=float, default=20, help="Converts runs to days in the report")
+    arg_parser.add_argument("--seed", type=int, default=None)
+    arg_parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args()
+
+    game_root = os.path.normpath(args.root)
+    try:
+        content = FarmingContent(game_root)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    tier_count = len(content.rules.drop_rates)
+    try:
+        tiers = [int(t) for t in args.tiers.split(',')] if args.tiers else list(range(tier_count))
+        win_rates, legendary_scales = _floats(args.win_rates), _floats(args.legendary_scales)
+        stone_scales = _floats(args.stone_scales)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    policies = [p.strip() for p in args.policies.split(',') if p.strip()]
+    for tier in tiers:
+        if not 0 <= tier < tier_count:
+            print(f"ERROR: Unknown tier {tier} (0-{tier_count - 1})")
+            sys.exit(1)
+    for policy in policies:
+        if policy not in POLICIES:
+            print(f"ERROR: Unknown policy '{policy}' (known: {', '.join(POLICIES)})")
+            sys.exit(1)
+    if any(not 0 < w <= 1 for w in win_rates):
+        print("ERROR: --win-rates must be in (0, 1]")
+        sys.exit(1)
+    if any(v < 0 for v in legendary_scales + stone_scales):
+        print("ERROR: Scales must not be negative")
+        sys.exit(1)
+
+    scenarios = [FarmingScenario(*values) for values in
+                 itertools.product(tiers, win_rates, legendary_scales, stone_scales, policies)]
+    start = time.perf_counter()
+    results = run_sweep(game_root, scenarios, args.players, args.max_runs, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print(format_report(results, content, args.players, args.max_runs, args.runs_per_day))
+    print(f"\n{len(scenarios)} scenarios in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
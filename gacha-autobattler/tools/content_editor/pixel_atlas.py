@@ -0,0 +1,786 @@
+"""
+Pixel Art Atlas Baker
+Renders PixelArtGenerator's procedural unit sprites ahead of time, into one
+atlas the game can load instead of drawing sprites pixel by pixel in battle setup.
+
+The renderer is a line-for-line port of scripts/core/pixel_art_generator.gd:
+class from the unit_id, hair, skin and sparkles from its string hash, colors
+from the element palette and star rating, then the outline and rarity glow.
+Colors are rounded to 32-bit floats like Godot's Color, and stored the way
+Image.set_pixel stores RGBA8, so the pixels match the GDScript output.
+
+Output is resources/pixel_atlas.json:
+  - png: base64 PNG atlas, one row per unit (sorted by unit_id) and one 32x32
+    column per AnimFrame (IDLE, ATTACK, HURT, SPECIAL)
+  - units: {unit_id: [row, element, star_rating]}, so a loader can fall back to
+    drawing a unit that is missing or whose element or rarity has changed
+  - generator_version: the PixelArtGenerator.GENERATOR_VERSION this port
+    reproduces
+The PNG is embedded so the game can read it without a Godot import step.
+source_hash covers every unit file and pixel_art_generator.gd. After changing
+the generator, bump its GENERATOR_VERSION, port the change here (and bump
+GENERATOR_VERSION below), then check parity. Building refuses to run while the
+two versions differ.
+
+The game does not load the atlas yet, and it is not committed. Wire it into
+PixelArtGenerator only once --parity reports no differing sprites.
+
+Parity: export the GDScript sprites with
+    godot --headless --script res://scripts/tools/export_pixel_art.gd -- <dir>
+then run --parity <dir> to compare every sprite pixel by pixel.
+
+Usage:
+    python pixel_atlas.py
+    python pixel_atlas.py --check
+    python pixel_atlas.py --parity /tmp/pixel_art --png /tmp/atlas.png
+"""
+
+import base64
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import struct
+import sys
+from typing import Any, Dict, List, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install pillow")
+    sys.exit(1)
+
+from content_pack import ContentPackBuilder
+from tres_parser import TresParser
+
+ATLAS_PATH = os.path.join('resources', 'pixel_atlas.json')
+ATLAS_VERSION = 1
+GENERATOR_PATH = os.path.join('scripts', 'core', 'pixel_art_generator.gd')
+GENERATOR_VERSION = 1  # PixelArtGenerator.GENERATOR_VERSION this port reproduces
+
+SPRITE_SIZE = 32
+FRAMES = ('IDLE', 'ATTACK', 'HURT', 'SPECIAL')  # PixelArtGenerator.AnimFrame
+IDLE, ATTACK, HURT, SPECIAL = range(len(FRAMES))
+
+Color = Tuple[float, float, float, float]
+
+
+# --- Colors (Godot Color: 32-bit float components) ---
+
+def _f32(value: float) -> float:
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def rgba(r: float, g: float, b: float, a: float = 1.0) -> Color:
+    return (_f32(r), _f32(g), _f32(b), _f32(a))
+
+
+def darkened(c: Color, amount: float) -> Color:
+    k = _f32(1.0 - _f32(amount))
+    return (_f32(c[0] * k), _f32(c[1] * k), _f32(c[2] * k), c[3])
+
+
+def lightened(c: Color, amount: float) -> Color:
+    k = _f32(amount)
+    return tuple(_f32(v + _f32(_f32(1.0 - v) * k)) for v in c[:3]) + (c[3],)
+
+
+def lerp(c: Color, to: Color, weight: float) -> Color:
+    w = _f32(weight)
+    return tuple(_f32(a + _f32(_f32(b - a) * w)) for a, b in zip(c, to))
+
+
+def with_alpha(c: Color, alpha: float) -> Color:
+    return c[:3] + (_f32(alpha),)
+
+
+WHITE = rgba(1, 1, 1)
+CLEAR = rgba(0, 0, 0, 0)
+
+# [primary, secondary, accent, skin_tone]
+ELEMENT_PALETTES = {
+    'fire': (rgba(0.9, 0.3, 0.1), rgba(0.7, 0.2, 0.05), rgba(1.0, 0.6, 0.1), rgba(0.85, 0.65, 0.5)),
+    'water': (rgba(0.2, 0.5, 0.9), rgba(0.1, 0.3, 0.7), rgba(0.4, 0.8, 1.0), rgba(0.7, 0.75, 0.85)),
+    'nature': (rgba(0.3, 0.7, 0.2), rgba(0.2, 0.5, 0.1), rgba(0.6, 0.9, 0.3), rgba(0.7, 0.8, 0.6)),
+    'dark': (rgba(0.4, 0.2, 0.5), rgba(0.25, 0.1, 0.35), rgba(0.6, 0.3, 0.8), rgba(0.6, 0.55, 0.65)),
+    'light': (rgba(0.95, 0.9, 0.5), rgba(0.85, 0.75, 0.3), rgba(1.0, 1.0, 0.8), rgba(0.9, 0.8, 0.7)),
+}
+RARITY_COLORS = {3: rgba(0.7, 0.7, 0.7), 4: rgba(0.6, 0.3, 0.8), 5: rgba(1.0, 0.85, 0.2)}
+HAIR_COLORS = (rgba(0.15, 0.1, 0.08), rgba(0.4, 0.25, 0.15), rgba(0.85, 0.7, 0.4),
+               rgba(0.6, 0.3, 0.2), rgba(0.5, 0.5, 0.55), rgba(0.9, 0.9, 0.85))
+OUTLINE = rgba(0.08, 0.06, 0.1)
+
+# Checked in order, like _determine_class
+CLASS_KEYWORDS = (
+    ('warrior', ('warrior',)),
+    ('mage', ('mage',)),
+    ('cleric', ('cleric', 'healer', 'priest')),
+    ('paladin', ('paladin',)),
+    ('knight', ('knight',)),
+    ('tank', ('tank', 'guardian')),
+    ('imp', ('imp', 'demon')),
+    ('sprite', ('sprite', 'fairy')),
+    ('wisp', ('wisp', 'ghost', 'spirit')),
+    ('scout', ('scout', 'rogue')),
+    ('assassin', ('assassin', 'ninja')),
+    ('archer', ('archer', 'ranger', 'hunter')),
+)
+
+
+class Sprite:
+    """A 32x32 RGBA8 image written like Godot's Image.set_pixel"""
+
+    def __init__(self):
+        self.pixels = bytearray(SPRITE_SIZE * SPRITE_SIZE * 4)
+
+    def set_pixel(self, x: int, y: int, c: Color):
+        """_set_pixel: clipped, and fully transparent colors draw nothing"""
+        if 0 <= x < SPRITE_SIZE and 0 <= y < SPRITE_SIZE and c[3] > 0:
+            i = (y * SPRITE_SIZE + x) * 4
+            self.pixels[i:i + 4] = bytes(int(min(max(v * 255.0, 0.0), 255.0)) for v in c)
+
+    def alpha(self, x: int, y: int) -> float:
+        """_get_pixel(...).a, 0 outside the sprite"""
+        if 0 <= x < SPRITE_SIZE and 0 <= y < SPRITE_SIZE:
+            return self.pixels[(y * SPRITE_SIZE + x) * 4 + 3] / 255.0
+        return 0.0
+
+    def to_image(self) -> 'Image.Image':
+        return Image.frombytes('RGBA', (SPRITE_SIZE, SPRITE_SIZE), bytes(self.pixels))
+
+
+# --- Generator port ---
+
+def determine_class(unit_id: str) -> str:
+    id_lower = unit_id.lower()
+    for unit_class, keywords in CLASS_KEYWORDS:
+        if any(k in id_lower for k in keywords):
+            return unit_class
+    return 'generic'
+
+
+def hash_string(s: str) -> int:
+    h = 0
+    for c in s:
+        h = (h * 31 + ord(c)) % 2147483647
+    return h
+
+
+def _hair_color(seed_hash: int) -> Color:
+    return HAIR_COLORS[seed_hash % len(HAIR_COLORS)]
+
+
+def _skin_variant(base_skin: Color, seed_hash: int) -> Color:
+    variants = (base_skin, darkened(base_skin, 0.15), lightened(base_skin, 0.1),
+                rgba(0.55, 0.4, 0.3), rgba(0.4, 0.28, 0.2), rgba(0.95, 0.85, 0.75))
+    return variants[seed_hash % len(variants)]
+
+
+def _rect_filled(img: Sprite, x: int, y: int, w: int, h: int, c: Color):
+    for px in range(x, x + w):
+        for py in range(y, y + h):
+            img.set_pixel(px, py, c)
+
+
+def _rect_shaded(img: Sprite, x: int, y: int, w: int, h: int, base: Color):
+    # Light from the top-left, the only direction the generator uses
+    highlight, shadow = lightened(base, 0.25), darkened(base, 0.3)
+    for px in range(x, x + w):
+        for py in range(y, y + h):
+            shade = float(px - x) / float(w) * 0.5 + float(py - y) / float(h) * 0.5
+            img.set_pixel(px, py, highlight if shade < 0.3 else shadow if shade > 0.7 else base)
+
+
+def _circle_filled(img: Sprite, cx: int, cy: int, radius: int, c: Color):
+    for x in range(cx - radius, cx + radius + 1):
+        for y in range(cy - radius, cy + radius + 1):
+            if (x - cx) * (x - cx) + (y - cy) * (y - cy) <= radius * radius:
+                img.set_pixel(x, y, c)
+
+
+def _spherical(img: Sprite, x: int, y: int, nx: float, ny: float, base: Color, highlight: Color, shadow: Color):
+    shade = -nx * 0.5 - ny * 0.5 + 0.5
+    img.set_pixel(x, y, highlight if shade > 0.65 else shadow if shade < 0.35 else base)
+
+
+def _circle_shaded(img: Sprite, cx: int, cy: int, radius: int, base: Color):
+    highlight, shadow = lightened(base, 0.3), darkened(base, 0.35)
+    for x in range(cx - radius, cx + radius + 1):
+        for y in range(cy - radius, cy + radius + 1):
+            if (x - cx) * (x - cx) + (y - cy) * (y - cy) <= radius * radius:
+                _spherical(img, x, y, float(x - cx) / float(radius), float(y - cy) / float(radius),
+                           base, highlight, shadow)
+
+
+def _ellipse_shaded(img: Sprite, cx: int, cy: int, rx: int, ry: int, base: Color):
+    highlight, shadow = lightened(base, 0.3), darkened(base, 0.35)
+    for x in range(cx - rx, cx + rx + 1):
+        for y in range(cy - ry, cy + ry + 1):
+            nx, ny = float(x - cx) / float(rx), float(y - cy) / float(ry)
+            if nx * nx + ny * ny <= 1.0:
+                _spherical(img, x, y, nx, ny, base, highlight, shadow)
+
+
+def _touches_content(img: Sprite, x: int, y: int) -> bool:
+    return any(img.alpha(x + dx, y + dy) > 0.5 for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+
+def _add_outline(img: Sprite, c: Color):
+    outline = [(x, y) for x in range(SPRITE_SIZE) for y in range(SPRITE_SIZE)
+               if img.alpha(x, y) < 0.5 and _touches_content(img, x, y)]
+    for x, y in outline:
+        img.set_pixel(x, y, c)
+
+
+def _add_glow(img: Sprite, c: Color, radius: int = 2):
+    glow = []
+    for x in range(SPRITE_SIZE):
+        for y in range(SPRITE_SIZE):
+            if img.alpha(x, y) < 0.1:
+                min_dist = radius + 1
+                for dx in range(-radius, radius + 1):
+                    for dy in range(-radius, radius + 1):
+                        if img.alpha(x + dx, y + dy) > 0.5:
+                            min_dist = min(min_dist, math.sqrt(dx * dx + dy * dy))
+                if min_dist <= radius:
+                    glow.append((x, y, (1.0 - min_dist / float(radius)) * 0.6))
+    for x, y, alpha in glow:
+        img.set_pixel(x, y, with_alpha(c, alpha))
+
+
+def _add_subtle_glow(img: Sprite, c: Color):
+    glow = [(x, y) for x in range(SPRITE_SIZE) for y in range(SPRITE_SIZE)
+            if img.alpha(x, y) < 0.1 and _touches_content(img, x, y)]
+    for x, y in glow:
+        if img.alpha(x, y) < 0.1:
+            img.set_pixel(x, y, with_alpha(c, 0.3))
+
+
+def _head(img: Sprite, cx: int, cy: int, skin: Color, hair: Color, seed_hash: int, show_face: bool = True):
+    _circle_shaded(img, cx, cy, 5, skin)
+    style = seed_hash % 6
+    if style == 0:  # Short spiky
+        _rect_filled(img, cx - 5, cy - 5, 10, 4, hair)
+        for x in (cx - 3, cx, cx + 2):
+            img.set_pixel(x, cy - 6, hair)
+    elif style == 1:  # Long
+        _rect_filled(img, cx - 5, cy - 5, 10, 5, hair)
+        _rect_filled(img, cx - 5, cy, 2, 5, hair)
+        _rect_filled(img, cx + 3, cy, 2, 5, hair)
+    elif style == 2:  # Bald
+        _rect_filled(img, cx - 4, cy - 5, 8, 2, lightened(skin, 0.1))
+    elif style == 3:  # Mohawk
+        _rect_filled(img, cx - 1, cy - 7, 3, 4, hair)
+        _rect_filled(img, cx - 2, cy - 5, 5, 2, hair)
+    elif style == 4:  # Side part
+        _rect_filled(img, cx - 5, cy - 5, 10, 4, hair)
+        _rect_filled(img, cx + 2, cy - 4, 3, 2, darkened(hair, 0.3))
+    else:  # Ponytail
+        _rect_filled(img, cx - 5, cy - 5, 10, 4, hair)
+        _rect_filled(img, cx + 3, cy - 3, 3, 8, hair)
+
+    if show_face:
+        eye, shine, mouth = rgba(0.1, 0.1, 0.15), rgba(1, 1, 1, 0.8), darkened(skin, 0.2)
+        img.set_pixel(cx - 2, cy - 1, eye)
+        img.set_pixel(cx + 2, cy - 1, eye)
+        img.set_pixel(cx - 2, cy - 2, shine)
+        img.set_pixel(cx + 2, cy - 2, shine)
+        for x in (cx - 1, cx, cx + 1):
+            img.set_pixel(x, cy + 2, mouth)
+
+
+def _armored_head(img: Sprite, cx: int, cy: int, armor: Color, accent: Color, has_plume: bool = False):
+    _rect_shaded(img, cx - 5, cy - 5, 10, 10, armor)
+    _rect_filled(img, cx - 3, cy - 1, 6, 2, rgba(0.05, 0.05, 0.1))
+    eye_glow = rgba(0.8, 0.9, 1.0, 0.8)
+    img.set_pixel(cx - 2, cy - 1, eye_glow)
+    img.set_pixel(cx + 1, cy - 1, eye_glow)
+    _rect_filled(img, cx - 1, cy - 6, 2, 2, lightened(armor, 0.25))
+    if has_plume:
+        _rect_filled(img, cx - 1, cy - 9, 3, 4, accent)
+        img.set_pixel(cx, cy - 10, accent)
+
+
+def _hooded_head(img: Sprite, cx: int, cy: int, skin: Color, hood: Color, show_lower_face: bool = True):
+    _rect_shaded(img, cx - 6, cy - 6, 12, 9, hood)
+    _rect_filled(img, cx - 5, cy - 7, 10, 2, hood)
+    _circle_filled(img, cx, cy, 4, darkened(skin, 0.2))
+    gleam = rgba(0.9, 0.95, 1.0)
+    img.set_pixel(cx - 2, cy - 1, gleam)
+    img.set_pixel(cx + 2, cy - 1, gleam)
+    if show_lower_face:
+        _rect_filled(img, cx - 3, cy + 1, 6, 3, skin)
+
+
+def _body_armored(img: Sprite, cx: int, cy: int, armor: Color, accent: Color):
+    _rect_shaded(img, cx - 6, cy, 12, 10, armor)
+    _rect_filled(img, cx - 2, cy + 2, 4, 4, accent)
+    _rect_shaded(img, cx - 8, cy, 3, 4, armor)
+    _rect_shaded(img, cx + 5, cy, 3, 4, armor)
+    _rect_filled(img, cx - 5, cy + 8, 10, 2, darkened(armor, 0.4))
+
+
+def _body_robed(img: Sprite, cx: int, cy: int, robe: Color, trim: Color):
+    _rect_shaded(img, cx - 5, cy, 10, 14, robe)
+    _rect_shaded(img, cx - 7, cy + 10, 14, 5, robe)
+    _rect_filled(img, cx - 1, cy + 1, 2, 12, trim)
+    _rect_filled(img, cx - 3, cy, 6, 2, trim)
+
+
+def _arms(img: Sprite, cx: int, cy: int, arm: Color, hand: Color, pose: int = 0):
+    if pose == 0:  # Idle
+        _rect_shaded(img, cx - 10, cy + 2, 4, 8, arm)
+        _rect_shaded(img, cx + 6, cy + 2, 4, 8, arm)
+        _rect_filled(img, cx - 10, cy + 9, 3, 3, hand)
+        _rect_filled(img, cx + 7, cy + 9, 3, 3, hand)
+    elif pose == 1:  # Raised
+        _rect_shaded(img, cx - 10, cy - 2, 4, 8, arm)
+        _rect_shaded(img, cx + 6, cy - 4, 4, 8, arm)
+        _rect_filled(img, cx - 10, cy - 3, 3, 3, hand)
+        _rect_filled(img, cx + 7, cy - 5, 3, 3, hand)
+    elif pose == 2:  # Casting
+        _rect_shaded(img, cx - 10, cy + 2, 4, 8, arm)
+        _rect_shaded(img, cx + 6, cy, 8, 4, arm)
+        _rect_filled(img, cx - 10, cy + 9, 3, 3, hand)
+        _rect_filled(img, cx + 12, cy, 3, 3, hand)
+
+
+def _legs(img: Sprite, cx: int, cy: int, leg: Color, boot: Color, stance: int = 0):
+    if stance == 0:
+        _rect_shaded(img, cx - 4, cy, 4, 8, leg)
+        _rect_shaded(img, cx, cy, 4, 8, leg)
+        _rect_filled(img, cx - 5, cy + 7, 5, 3, boot)
+        _rect_filled(img, cx, cy + 7, 5, 3, boot)
+    elif stance == 1:  # Wide
+        _rect_shaded(img, cx - 6, cy, 4, 8, leg)
+        _rect_shaded(img, cx + 2, cy, 4, 8, leg)
+        _rect_filled(img, cx - 7, cy + 7, 5, 3, boot)
+        _rect_filled(img, cx + 2, cy + 7, 5, 3, boot)
+
+
+def _sword(img: Sprite, x: int, y: int, blade: Color, hilt: Color, length: int = 12):
+    _rect_filled(img, x, y, 2, length, blade)
+    img.set_pixel(x, y, lightened(blade, 0.25))
+    for i in range(length):
+        img.set_pixel(x, y + i, lightened(blade, 0.2))
+    _rect_filled(img, x - 2, y + length, 6, 2, hilt)
+    img.set_pixel(x, y + length + 2, hilt)
+    img.set_pixel(x + 1, y + length + 2, hilt)
+
+
+def _staff(img: Sprite, x: int, y: int, wood: Color, orb: Color):
+    _rect_filled(img, x, y + 4, 2, 16, wood)
+    _rect_filled(img, x, y + 4, 1, 16, lightened(wood, 0.25))
+    _circle_shaded(img, x + 1, y + 2, 3, orb)
+    img.set_pixel(x, y + 1, lightened(orb, 0.5))
+
+
+def _shield(img: Sprite, x: int, y: int, body: Color, emblem: Color, size: int = 8):
+    _rect_shaded(img, x, y, size, size + 2, body)
+    _rect_filled(img, x + 2, y + size + 2, size - 4, 2, body)
+    img.set_pixel(x + size // 2, y + size + 4, body)
+    _rect_filled(img, x + 2, y + 2, size - 4, size - 2, emblem)
+    _rect_filled(img, x, y, 1, size, lightened(body, 0.3))
+
+
+def _bow(img: Sprite, x: int, y: int, wood: Color):
+    for dx, dy in ((2, 0), (1, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (1, 7), (2, 8)):
+        img.set_pixel(x + dx, y + dy, wood)
+    string = rgba(0.8, 0.8, 0.7)
+    for i in range(9):
+        img.set_pixel(x + 3, y + i, string)
+
+
+def _daggers(img: Sprite, x1: int, y1: int, x2: int, y2: int, blade: Color):
+    for x, y in ((x1, y1), (x2, y2)):
+        _rect_filled(img, x, y, 2, 6, blade)
+        img.set_pixel(x, y, lightened(blade, 0.25))
+
+
+def _draw_warrior(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary, accent = palette[:3]
+    skin, hair = _skin_variant(palette[3], seed_hash), _hair_color(seed_hash)
+    y = -1 if frame == ATTACK else 1 if frame == HURT else 0
+    _legs(img, 16, 22 + y, secondary, darkened(secondary, 0.4), 1)
+    _body_armored(img, 16, 12 + y, primary, accent)
+    _arms(img, 16, 12 + y, primary, skin, 0 if frame == IDLE else 1)
+    _sword(img, 24, (6 if frame == ATTACK else 10) + y, rgba(0.75, 0.78, 0.82), rgba(0.45, 0.35, 0.25), 14)
+    if stars >= 4:
+        _armored_head(img, 16, 7 + y, primary, accent, stars >= 5)
+    else:
+        _head(img, 16, 7 + y, skin, hair, seed_hash)
+
+
+def _draw_mage(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary, accent = palette[:3]
+    skin, hair = _skin_variant(palette[3], seed_hash), _hair_color(seed_hash)
+    y = -1 if frame == ATTACK else 0
+    _body_robed(img, 16, 13 + y, primary, secondary)
+    _arms(img, 16, 13 + y, primary, skin, 2 if frame == ATTACK else 0)
+    _staff(img, 4, 4 + y, rgba(0.5, 0.35, 0.2), accent)
+    if stars >= 4:
+        _hooded_head(img, 16, 8 + y, skin, primary, True)
+    else:
+        _head(img, 16, 8 + y, skin, hair, seed_hash)
+        _rect_filled(img, 11, 2 + y, 10, 4, primary)  # Wizard hat
+        _rect_filled(img, 14, 0 + y, 4, 3, primary)
+    if frame == ATTACK or stars >= 4:
+        img.set_pixel(20, 10 + y, accent)
+        img.set_pixel(22, 8 + y, lightened(accent, 0.25))
+        img.set_pixel(19, 6 + y, accent)
+        if frame == ATTACK:
+            img.set_pixel(24, 6 + y, lightened(accent, 0.25))
+            img.set_pixel(26, 9 + y, accent)
+
+
+def _draw_cleric(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary = palette[0]
+    skin, white = _skin_variant(palette[3], seed_hash), rgba(0.95, 0.93, 0.88)
+    y = -1 if frame == ATTACK else 0
+    _body_robed(img, 16, 12 + y, white, primary)
+    _arms(img, 16, 12 + y, white, skin, 0)
+    _rect_filled(img, 25, 5 + y, 2, 18, rgba(0.85, 0.8, 0.5))  # Holy staff
+    _rect_filled(img, 23, 7 + y, 6, 2, rgba(0.85, 0.8, 0.5))
+    _hooded_head(img, 16, 7 + y, skin, white, True)
+    if stars >= 5:
+        _circle_filled(img, 16, 1 + y, 3, rgba(1, 0.95, 0.6, 0.8))  # Halo
+        _circle_filled(img, 16, 1 + y, 1, CLEAR)  # Draws nothing, as in the GDScript
+    if frame == ATTACK:
+        heal = rgba(0.5, 1, 0.6, 0.9)
+        for x, py in ((12, 15), (20, 18), (14, 20)):
+            img.set_pixel(x, py + y, heal)
+
+
+def _draw_knight(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, accent = palette[0], palette[2]
+    metal, dark_metal = rgba(0.65, 0.65, 0.7), rgba(0.35, 0.35, 0.4)
+    y = -1 if frame == ATTACK else 0
+    _legs(img, 16, 22 + y, metal, dark_metal, 1)
+    _body_armored(img, 16, 12 + y, metal, primary)
+    _arms(img, 16, 12 + y, metal, metal, 0)
+    _shield(img, 2, 13 + y, primary, accent, 7)
+    _sword(img, 26, 6 + y, rgba(0.8, 0.82, 0.85), rgba(0.5, 0.4, 0.3), 15)
+    _armored_head(img, 16, 7 + y, metal, primary, stars >= 4)
+
+
+def _draw_tank(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary, accent = palette[:3]
+    skin = _skin_variant(palette[3], seed_hash)
+    y = 1 if frame == HURT else 0
+    _rect_shaded(img, 9, 22 + y, 6, 9, secondary)
+    _rect_shaded(img, 17, 22 + y, 6, 9, secondary)
+    _rect_shaded(img, 6, 11 + y, 20, 12, primary)
+    _rect_shaded(img, 9, 13 + y, 14, 8, secondary)
+    _rect_shaded(img, 1, 11 + y, 5, 12, primary)
+    _rect_shaded(img, 26, 11 + y, 5, 12, primary)
+    _rect_filled(img, 0, 21 + y, 4, 4, skin)
+    _rect_filled(img, 28, 21 + y, 4, 4, skin)
+    _circle_shaded(img, 16, 7 + y, 4, skin)
+    img.set_pixel(14, 6 + y, rgba(0.15, 0.15, 0.2))
+    img.set_pixel(18, 6 + y, rgba(0.15, 0.15, 0.2))
+    _rect_shaded(img, 11, 2 + y, 10, 5, primary)
+    if stars >= 4:
+        _shield(img, 0, 9 + y, accent, primary, 6)
+
+
+def _draw_imp(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary, accent = palette[:3]
+    skin = lerp(primary, rgba(0.85, 0.55, 0.55), 0.35)
+    y = -2 if frame == ATTACK else 0
+    _ellipse_shaded(img, 16, 20 + y, 5, 6, skin)
+    _rect_filled(img, 12, 25 + y, 3, 5, skin)
+    _rect_filled(img, 17, 25 + y, 3, 5, skin)
+    _rect_filled(img, 8, 18 + y, 3, 6, skin)
+    _rect_filled(img, 21, 18 + y, 3, 6, skin)
+    _circle_shaded(img, 16, 11 + y, 7, skin)
+    _rect_filled(img, 8, 4 + y, 2, 6, secondary)  # Horns
+    _rect_filled(img, 22, 4 + y, 2, 6, secondary)
+    img.set_pixel(8, 3 + y, lightened(secondary, 0.25))
+    img.set_pixel(22, 3 + y, lightened(secondary, 0.25))
+    _circle_filled(img, 13, 10 + y, 2, WHITE)
+    _circle_filled(img, 19, 10 + y, 2, WHITE)
+    img.set_pixel(13, 10 + y, accent)
+    img.set_pixel(19, 10 + y, accent)
+    grin = rgba(0.15, 0.08, 0.08)
+    _rect_filled(img, 12, 15 + y, 8, 1, grin)
+    img.set_pixel(11, 14 + y, grin)
+    img.set_pixel(20, 14 + y, grin)
+    _rect_filled(img, 21, 21 + y, 6, 2, skin)  # Tail
+    _rect_filled(img, 26, 19 + y, 2, 3, secondary)
+    if frame == ATTACK:
+        img.set_pixel(7, 16 + y, accent)
+        img.set_pixel(6, 15 + y, rgba(1, 0.9, 0.3))
+        img.set_pixel(8, 14 + y, accent)
+
+
+SPARKLES = ((5, 7), (27, 8), (8, 22), (24, 21), (16, 5), (3, 15), (29, 14))
+
+
+def _draw_sprite(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, accent = palette[0], palette[2]
+    glow, inner_glow = lightened(primary, 0.45), lightened(accent, 0.3)
+    y = -2 if frame == ATTACK else 0
+    _circle_shaded(img, 16, 15 + y, 7, glow)
+    _circle_filled(img, 16, 14 + y, 4, primary)
+    _circle_filled(img, 16, 13 + y, 2, inner_glow)
+    img.set_pixel(14, 13 + y, WHITE)
+    img.set_pixel(18, 13 + y, WHITE)
+    wing = with_alpha(glow, 0.75)
+    _ellipse_shaded(img, 7, 13 + y, 4, 6, wing)
+    _ellipse_shaded(img, 25, 13 + y, 4, 6, wing)
+    for i, (x, py) in enumerate(SPARKLES):
+        if (seed_hash + i) % 3 == 0 or stars >= 4:
+            img.set_pixel(x, py + y, WHITE)
+    if frame == ATTACK:
+        img.set_pixel(12, 8 + y, accent)
+        img.set_pixel(20, 9 + y, accent)
+        img.set_pixel(16, 6 + y, lightened(accent, 0.25))
+
+
+def _draw_scout(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    secondary = palette[1]
+    skin, cloak = _skin_variant(palette[3], seed_hash), darkened(secondary, 0.25)
+    y = -1 if frame == ATTACK else 0
+    _legs(img, 16, 22 + y, secondary, darkened(secondary, 0.4), 0)
+    _rect_shaded(img, 11, 13 + y, 10, 10, secondary)
+    _rect_shaded(img, 8, 11 + y, 16, 14, cloak)
+    img.set_pixel(7, 24 + y, cloak)
+    img.set_pixel(24, 23 + y, cloak)
+    _rect_filled(img, 6, 14 + y, 3, 7, cloak)
+    _rect_filled(img, 23, 14 + y, 3, 7, cloak)
+    _rect_filled(img, 5, 19 + y, 3, 3, skin)
+    _rect_filled(img, 24, 19 + y, 3, 3, skin)
+    _daggers(img, 3, 16 + y, 27, 16 + y, rgba(0.72, 0.74, 0.78))
+    _hooded_head(img, 16, 7 + y, skin, cloak, False)
+    _rect_filled(img, 12, 9 + y, 8, 3, secondary)  # Mask
+
+
+def _draw_archer(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary, accent = palette[:3]
+    skin, hair = _skin_variant(palette[3], seed_hash), _hair_color(seed_hash)
+    y = -1 if frame == ATTACK else 0
+    _legs(img, 16, 22 + y, secondary, darkened(secondary, 0.4), 0)
+    _rect_shaded(img, 11, 13 + y, 10, 10, primary)
+    _rect_filled(img, 13, 14 + y, 6, 8, secondary)
+    _arms(img, 16, 13 + y, primary, skin, 0)
+    _bow(img, 3, 10 + y, rgba(0.5, 0.35, 0.2))
+    _rect_filled(img, 22, 12 + y, 3, 10, rgba(0.45, 0.3, 0.18))  # Quiver
+    _rect_filled(img, 22, 10 + y, 1, 3, rgba(0.6, 0.6, 0.65))
+    _rect_filled(img, 24, 10 + y, 1, 3, rgba(0.6, 0.6, 0.65))
+    _head(img, 16, 8 + y, skin, hair, seed_hash)
+    _rect_filled(img, 10, 5 + y, 12, 2, accent)  # Headband
+
+
+def _draw_generic(img: Sprite, palette, stars: int, seed_hash: int, frame: int):
+    primary, secondary = palette[:2]
+    skin, hair = _skin_variant(palette[3], seed_hash), _hair_color(seed_hash)
+    y = 1 if frame == HURT else 0
+    _legs(img, 16, 22 + y, secondary, darkened(secondary, 0.4), 0)
+    _rect_shaded(img, 10, 13 + y, 12, 10, primary)
+    _arms(img, 16, 13 + y, primary, skin, 0)
+    _head(img, 16, 8 + y, skin, hair, seed_hash)
+
+
+TEMPLATES = {
+    'warrior': _draw_warrior, 'mage': _draw_mage, 'cleric': _draw_cleric,
+    'knight': _draw_knight, 'paladin': _draw_knight, 'tank': _draw_tank, 'imp': _draw_imp,
+    'sprite': _draw_sprite, 'wisp': _draw_sprite, 'scout': _draw_scout, 'assassin': _draw_scout,
+    'archer': _draw_archer, 'generic': _draw_generic,
+}
+
+
+def render_unit(unit_id: str, element: str, stars: int, frame: int = IDLE) -> Sprite:
+    """PixelArtGenerator.draw_unit_image"""
+    img = Sprite()
+    palette = ELEMENT_PALETTES.get(element, ELEMENT_PALETTES['fire'])
+    rarity_color = RARITY_COLORS.get(stars, RARITY_COLORS[3])
+    TEMPLATES[determine_class(unit_id)](img, palette, stars, hash_string(unit_id), frame)
+    _add_outline(img, OUTLINE)
+    if stars >= 5:
+        _add_glow(img, rarity_color, 2)
+    elif stars >= 4:
+        _add_subtle_glow(img, rarity_color)
+    return img
+
+
+# --- Atlas ---
+
+class PixelAtlasBuilder:
+    """Bakes every unit's sprites into the atlas the game loads"""
+
+    def __init__(self, game_root: str):
+        self.game_root = game_root
+        self.parser = TresParser(game_root)
+        self.pack = ContentPackBuilder(game_root)
+        self.atlas_path = os.path.join(game_root, ATLAS_PATH)
+
+    def unit_files(self) -> List[str]:
+        return [f for f in self.pack.source_files() if os.sep + 'units' + os.sep in f]
+
+    def source_hash(self) -> str:
+        """Hash of the generator script and every unit file"""
+        digest = hashlib.sha1(self.pack.source_hash(self.unit_files()).encode('utf-8'))
+        with open(os.path.join(self.game_root, GENERATOR_PATH), 'rb') as f:
+            digest.update(f.read())
+        return digest.hexdigest()
+
+    def script_version(self) -> int:
+        """GENERATOR_VERSION declared in pixel_art_generator.gd"""
+        with open(os.path.join(self.game_root, GENERATOR_PATH), 'r', encoding='utf-8') as f:
+            match = re.search(r'^const\s+GENERATOR_VERSION\s*(?::\s*\w+)?\s*=\s*(\d+)', f.read(), re.MULTILINE)
+        if not match:
+            raise ValueError(f"Could not find GENERATOR_VERSION in {GENERATOR_PATH}")
+        return int(match.group(1))
+
+    def check_version(self):
+        """Raise ValueError when the GDScript generator has moved on from this port"""
+        version = self.script_version()
+        if version != GENERATOR_VERSION:
+            raise ValueError(f"{GENERATOR_PATH} is at GENERATOR_VERSION {version}, but pixel_atlas.py ports "
+                             f"version {GENERATOR_VERSION}: port the drawing changes first")
+
+    def units(self) -> List[Tuple[str, str, int]]:
+        """(unit_id, element, star_rating) of every unit, sorted by unit_id"""
+        schema = self.parser.schemas.get('UnitData')
+        units = {}
+        for path in self.unit_files():
+            resource = self.parser.parse_file(path)
+            if resource.script_class != 'UnitData':
+                continue
+            props = {**schema.defaults(), **resource.properties} if schema else resource.properties
+            units.setdefault(props.get('unit_id', ''), (props.get('element', 'fire'), int(props.get('star_rating', 3))))
+        return [(unit_id, element, stars) for unit_id, (element, stars) in sorted(units.items())]
+
+    def build(self) -> Dict[str, Any]:
+        self.check_version()
+        units = self.units()
+        atlas = Image.new('RGBA', (SPRITE_SIZE * len(FRAMES), SPRITE_SIZE * max(len(units), 1)), (0, 0, 0, 0))
+        index = {}
+        for row, (unit_id, element, stars) in enumerate(units):
+            for frame in range(len(FRAMES)):
+                atlas.paste(render_unit(unit_id, element, stars, frame).to_image(), (frame * SPRITE_SIZE, row * SPRITE_SIZE))
+            index[unit_id] = [row, element, stars]
+
+        png = io.BytesIO()
+        atlas.save(png, format='PNG', optimize=True)
+        data = {
+            'version': ATLAS_VERSION,
+            'source_hash': self.source_hash(),
+            'generator_version': GENERATOR_VERSION,
+            'sprite_size': SPRITE_SIZE,
+            'frames': list(FRAMES),
+            'units': index,
+            'png': base64.b64encode(png.getvalue()).decode('ascii'),
+        }
+        return data
+
+    def write(self, data: Dict[str, Any]) -> int:
+        """Write the index one unit per line, then the PNG. Returns bytes written."""
+        lines = []
+        for key, value in data.items():
+            if key == 'units':
+                rows = [f"{json.dumps(unit_id)}:{json.dumps(entry, separators=(',', ':'))}"
+                        for unit_id, entry in value.items()]
+                lines.append(f"{json.dumps(key)}:{{\n" + ",\n".join(rows) + "\n}")
+            else:
+                lines.append(f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}")
+        text = "{\n" + ",\n".join(lines) + "\n}\n"
+        with open(self.atlas_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        return len(text.encode('utf-8'))
+
+    @staticmethod
+    def atlas_image(data: Dict[str, Any]) -> 'Image.Image':
+        """Decode the atlas PNG embedded in built data"""
+        return Image.open(io.BytesIO(base64.b64decode(data['png'])))
+
+    def is_current(self) -> bool:
+        """Whether the atlas on disk matches the current units and generator"""
+        try:
+            with open(self.atlas_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return (data.get('version') == ATLAS_VERSION and data.get('source_hash') == self.source_hash()
+                    and data.get('generator_version') == self.script_version() == GENERATOR_VERSION)
+        except (OSError, ValueError):
+            return False
+
+    def check_parity(self, reference_dir: str) -> Tuple[int, List[str]]:
+        """Compare every sprite with <unit_id>_<frame>.png from export_pixel_art.gd. Returns (compared, problems)."""
+        compared, problems = 0, []
+        for unit_id, element, stars in self.units():
+            for frame, name in enumerate(FRAMES):
+                path = os.path.join(reference_dir, f"{unit_id}_{frame}.png")
+                if not os.path.isfile(path):
+                    problems.append(f"{unit_id} {name}: no reference sprite")
+                    continue
+                with Image.open(path) as reference:
+                    expected = reference.convert('RGBA')
+                compared += 1
+                if expected.size != (SPRITE_SIZE, SPRITE_SIZE):
+                    problems.append(f"{unit_id} {name}: reference is {expected.size[0]}x{expected.size[1]}")
+                    continue
+                mine, theirs = render_unit(unit_id, element, stars, frame).pixels, expected.tobytes()
+                diffs = [max(abs(mine[i + c] - theirs[i + c]) for c in range(4)) for i in range(0, len(mine), 4)]
+                differing = sum(1 for d in diffs if d)
+                if differing:
+                    first = next(i for i, d in enumerate(diffs) if d)
+                    problems.append(f"{unit_id} {name}: {differing} pixels differ (max {max(diffs)}/255, "
+                                    f"first at {first % SPRITE_SIZE},{first // SPRITE_SIZE})")
+        return compared, problems
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Bake procedural unit sprites into one atlas for the game")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--check", action="store_true", help="Exit with status 1 if the atlas is stale")
+    arg_parser.add_argument("--parity", metavar="DIR", default=None,
+                            help="Compare with sprites exported by scripts/tools/export_pixel_art.gd instead")
+    arg_parser.add_argument("--png", metavar="PATH", default=None, help="Also save the atlas as a PNG to look at")
+    args = arg_parser.parse_args()
+
+    builder = PixelAtlasBuilder(os.path.normpath(args.root))
+    if args.check:
+        if builder.is_current():
+            print(f"Pixel atlas is up to date: {builder.atlas_path}")
+            sys.exit(0)
+        print("Pixel atlas is stale, run: python pixel_atlas.py")
+        sys.exit(1)
+
+    if args.parity:
+        if not os.path.isdir(args.parity):
+            print(f"ERROR: Folder not found: {args.parity}")
+            sys.exit(1)
+        try:
+            builder.check_version()
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        compared, problems = builder.check_parity(args.parity)
+        for problem in problems:
+            print(f"  {problem}")
+        differing = sum(1 for p in problems if 'differ' in p)
+        print(f"Parity: {compared - differing}/{compared} sprites match the GDScript output"
+              + (f", {len(problems)} problem{'s' if len(problems) > 1 else ''}" if problems else ""))
+        sys.exit(1 if problems else 0)
+
+    try:
+        data = builder.build()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    size = builder.write(data)
+    print(f"Wrote {builder.atlas_path} ({size / 1024:.1f} KB)")
+    atlas = builder.atlas_image(data)
+    print(f"  {len(data['units'])} units x {len(FRAMES)} frames, {atlas.size[0]}x{atlas.size[1]} atlas")
+    if args.png:
+        atlas.save(args.png)
+        print(f"Wrote {args.png}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,626 @@
+"""
+Progression Simulator
+Models weeks of play for populations of player archetypes, to check the XP
+curve, level-up and gear costs against what stages and dungeons pay out.
+
+Each player owns a reference team of one 3★, one 4★ and one 5★ unit (the mean
+base stats of the summon pool at each rarity) with four gear slots each
+(weapon, armor, two accessories). Every day they:
+  - fight their archetype's battles (Poisson around the mean): the next campaign stage while their
+    win chance there is at least FARM_WIN_CHANCE, otherwise the highest
+    stage already cleared. Wins pay the stage's gold, materials and XP, and
+    gems on first clear (_give_battle_rewards, give_stage_rewards)
+  - run their archetype's dungeon runs, rotating through them daily, at the highest
+    tier they win at least half the time. Wins pay stones and a gear drop
+    (generate_stone_drop, generate_gear_drop), equipped over the weakest
+    piece of its type
+  - spend gold on manual level-ups (lowest unit first) and, with a share of
+    the day's gold, stones on gear enhancement (lowest piece first)
+
+Battles are not played out: the win chance is 1 / (1 + (enemy CP / team CP)^k)
+with CP from calculate_unit_cp, which keeps a scenario well under a second.
+Use stage_tuner.py or battle_sim.py for real fight odds. Gems are only
+counted; gacha_sim.py models spending them.
+
+The XP curve, level-up costs, stat growth, imprint bonus, starting currencies,
+gear enhancement costs and dungeon drop tables are read from player_data.gd,
+gear_data.gd and dungeon_data.gd, and can be overridden to try changes.
+Every player is an element of NumPy arrays, and all archetypes run together.
+
+Usage:
+    python progression_sim.py
+    python progression_sim.py --weeks 12 --archetypes casual,grinder --players 5000
+    python progression_sim.py --xp-growth 1.12 --gold-per-level 40
+"""
+
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from battle_sim import BattleCatalog, UnitSpec
+from content_pack import GACHA_STARS
+from gacha_sim import PLAYER_DATA_PATH
+from tres_parser import TresParser
+
+GEAR_DATA_PATH = os.path.join('scripts', 'data', 'gear_data.gd')
+DUNGEON_DATA_PATH = os.path.join('scripts', 'data', 'dungeon_data.gd')
+RARITIES = ('COMMON', 'RARE', 'EPIC', 'LEGENDARY')
+STATS = ('hp', 'attack', 'defense', 'speed')  # GearData.StatType order
+SLOT_TYPES = (0, 1, 2, 2)  # Gear type per unit slot: weapon, armor, accessory_1, accessory_2
+WIN_STEEPNESS = 4.0
+FARM_WIN_CHANCE = 0.5
+ROUND_SIZE = 10  # Battles or dungeon runs resolved together, on the CP at the start of the round
+PERCENTILES = (10, 50, 90)
+
+# Flow columns, summed per archetype and week
+FLOWS = ('gold_in', 'gold_levels', 'gold_gear', 'materials_in', 'materials_spent',
+         'stones_in', 'stones_spent', 'gems_in')
+F = {name: i for i, name in enumerate(FLOWS)}
+
+
+@dataclass(frozen=True)
+class ProgressionRules:
+    """Leveling, gear and drop constants from the game scripts"""
+    base_xp: int
+    xp_growth: float
+    gold_per_level: int
+    materials_per_level: int
+    stat_growth: float
+    imprint_step: float
+    max_level_per_star: int
+    starting_gold: int
+    starting_materials: int
+    starting_stones: int
+    gear_growth: float
+    enhance_gold: Tuple[int, ...]  # By gear rarity
+    enhance_stones: Tuple[int, ...]
+    gear_max_level: Tuple[int, ...]
+    drop_rates: Tuple[Tuple[float, ...], ...]  # By dungeon tier, then gear rarity
+    stone_drops: Tuple[Tuple[int, int], ...]  # By dungeon tier
+
+    @classmethod
+    def from_scripts(cls, game_root: str) -> 'ProgressionRules':
+        sources = {}
+        for path in (PLAYER_DATA_PATH, GEAR_DATA_PATH, DUNGEON_DATA_PATH):
+            with open(os.path.join(game_root, path), 'r', encoding='utf-8') as f:
+                sources[path] = f.read()
+
+        def read(path: str, pattern: str, name: str) -> str:
+            match = re.search(pattern, sources[path], re.MULTILINE | re.DOTALL)
+            if not match:
+                raise ValueError(f"Could not find {name} in {path}")
+            return match.group(1)
+
+        def const(name: str) -> str:
+            return read(PLAYER_DATA_PATH, rf'^const\s+{name}\s*(?::\s*\w+)?\s*=\s*([0-9.]+)', name)
+
+        def var(name: str) -> int:
+            return int(read(PLAYER_DATA_PATH, rf'^var\s+{name}\s*(?::\s*int)?\s*=\s*(\d+)', f"starting {name}"))
+
+        def table(name: str) -> list:
+            body = read(DUNGEON_DATA_PATH, rf'^const\s+{name}\s*=\s*\[(.*?)\n\]', name)
+            return [[float(v) for v in row.split(',')] for row in re.findall(r'\[([^\]]*)\]', body)]
+
+        gear = sources[GEAR_DATA_PATH]
+        max_levels = dict(re.findall(r'GearRarity\.(\w+):\s*return\s+(\d+)\s*$', gear, re.MULTILINE))
+        costs = {rarity: (int(gold), int(stones)) for rarity, gold, stones in re.findall(
+            r'GearRarity\.(\w+):\s*\n\s*gold_per_level\s*=\s*(\d+)\s*\n\s*stones_per_level\s*=\s*(\d+)', gear)}
+        missing = [r for r in RARITIES if r not in max_levels or r not in costs]
+        if missing:
+            raise ValueError(f"Could not find gear levels or costs for {', '.join(missing)} in {GEAR_DATA_PATH}")
+
+        return cls(
+            base_xp=int(const('BASE_XP_PER_LEVEL')),
+            xp_growth=float(const('XP_GROWTH_RATE')),
+            gold_per_level=int(const('GOLD_PER_LEVEL')),
+            materials_per_level=int(const('MATERIALS_PER_LEVEL')),
+            stat_growth=float(const('STAT_GROWTH_PER_LEVEL')),
+            # Literals in get_unit_stats_at_level and get_max_level
+            imprint_step=float(read(PLAYER_DATA_PATH, r'imprint_mult\s*=\s*1\.0\s*\+\s*\(([0-9.]+)\s*\*', 'the imprint step')),
+            max_level_per_star=int(read(PLAYER_DATA_PATH, r'return\s+star_rating\s*\*\s*(\d+)', 'the max level')),
+            starting_gold=var('gold'),
+            starting_materials=var('level_materials'),
+            starting_stones=var('enhancement_stones'),
+            gear_growth=float(read(GEAR_DATA_PATH, r'base_value\s*\*\s*([0-9.]+)\s*/\s*max_level', 'the gear growth')),
+            enhance_gold=tuple(costs[r][0] for r in RARITIES),
+            enhance_stones=tuple(costs[r][1] for r in RARITIES),
+            gear_max_level=tuple(int(max_levels[r]) for r in RARITIES),
+            drop_rates=tuple(tuple(row) for row in table('TIER_DROP_RATES')),
+            stone_drops=tuple((int(low), int(high)) for low, high in table('TIER_STONE_DROPS')),
+        )
+
+    def xp_table(self, max_level: int) -> np.ndarray:
+        """get_xp_for_level indexed by level (index 0 unused)"""
+        levels = np.arange(max_level + 1)
+        return np.array([int(self.base_xp * self.xp_growth ** (level - 1)) for level in levels], dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class Archetype:
+    name: str
+    battles: float  # Mean battles per day
+    dungeon_runs: float  # Mean dungeon runs per day
+    max_tier: int  # Highest dungeon tier they will play (0-2)
+    gear_share: float  # Share of each day's gold saved for gear enhancement
+
+
+ARCHETYPES = {
+    'casual': Archetype('casual', battles=6, dungeon_runs=2, max_tier=0, gear_share=0.2),
+    'regular': Archetype('regular', battles=15, dungeon_runs=6, max_tier=1, gear_share=0.3),
+    'grinder': Archetype('grinder', battles=40, dungeon_runs=20, max_tier=2, gear_share=0.4),
+}
+
+
+class ProgressionContent:
+    """Stage rewards, enemy CP, dungeons, gear templates and the reference team, as arrays"""
+
+    def __init__(self, game_root: str, rules: ProgressionRules, imprint: int = 0):
+        self.rules = rules
+        self.imprint = imprint
+        parser = TresParser(game_root)
+        catalog = BattleCatalog(game_root).load()
+
+        pool = catalog.summon_pool()
+        self.team_stars = np.array(GACHA_STARS)
+        self.team_base = np.array([np.mean([self._stats(u) for u in pool if u.star_rating == stars], axis=0)
+                                   for stars in GACHA_STARS])  # [unit, stat]
+        self.max_level = self.team_stars * rules.max_level_per_star
+
+        stages = sorted(parser.get_all_stages(), key=lambda r: (r.properties.get('chapter', 0),
+                                                                r.properties.get('stage_number', 0)))
+        self.stage_ids = [s.properties['stage_id'] for s in stages]
+        reward = lambda key: np.array([s.properties.get(key, 0) for s in stages], dtype=np.int64)
+        self.stage_gold, self.stage_materials = reward('gold_reward'), reward('material_reward')
+        self.stage_xp, self.stage_gems = reward('xp_reward'), reward('gem_reward')
+        self.stage_cp = np.array([sum(self.base_cp(u, catalog.stages[sid].enemy_levels[0])
+                                      for u in catalog.stages[sid].enemy_units) for sid in self.stage_ids], dtype=float)
+
+        dungeons = sorted(parser.get_all_dungeons(), key=lambda r: r.properties.get('dungeon_id', ''))
+        self.dungeon_stat = np.array([d.properties.get('drops_stat_type', 0) for d in dungeons])
+        tiers = len(rules.drop_rates)
+        self.dungeon_cp = np.zeros((len(dungeons), tiers))  # Expected enemy team CP
+        for i, d in enumerate(dungeons):
+            spec = catalog.dungeons[d.properties['dungeon_id']]
+            enemies = list(spec.enemy_units) or [u for u in pool if u.star_rating <= 4]
+            for tier in range(tiers):
+                level = spec.enemy_levels[tier] if tier < len(spec.enemy_levels) else 1
+                self.dungeon_cp[i, tier] = (3 + tier) * np.mean([self.base_cp(u, level) for u in enemies])
+
+        gear = [g.properties for g in parser.get_all_gear()]
+        self.gear_stat = np.array([g.get('stat_type', 0) for g in gear])
+        self.gear_rarity = np.array([g.get('rarity', 0) for g in gear])
+        self.gear_type = np.array([g.get('gear_type', 0) for g in gear])
+        self.gear_pct = np.array([bool(g.get('is_percentage', False)) for g in gear])
+        self.gear_base = np.array([float(g.get('base_value', 0.0)) for g in gear])
+        self.gear_max = np.array(rules.gear_max_level)[self.gear_rarity]
+        # Template choices per (stat type, rarity), as generate_gear_drop picks them
+        self.drop_templates = {(stat, rarity): np.flatnonzero((self.gear_stat == stat) & (self.gear_rarity == rarity))
+                               for stat in range(len(STATS)) for rarity in range(len(RARITIES))}
+
+    @staticmethod
+    def _stats(unit: UnitSpec) -> Tuple[int, int, int, int]:
+        return unit.max_hp, unit.attack, unit.defense, unit.speed
+
+    def stats_at_level(self, base: np.ndarray, level: np.ndarray, imprint: int) -> np.ndarray:
+        """get_unit_stats_at_level; base [..., stat], level broadcast against base[..., 0]"""
+        mult = (1.0 + self.rules.stat_growth * (level - 1)) * (1.0 + self.rules.imprint_step * imprint)
+        return np.floor(base * mult[..., None])
+
+    def base_cp(self, unit: UnitSpec, level: int) -> int:
+        hp, attack, defense, speed = self.stats_at_level(np.array(self._stats(unit), dtype=float), np.array(level), 0)
+        return int(hp / 10.0) + int(attack + defense + speed)
+
+    def gear_bonus(self, template: np.ndarray, level: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(flat, percent) bonus of gear pieces, as get_gear_bonuses adds them up"""
+        base = self.gear_base[template]
+        value = base + base * self.rules.gear_growth / self.gear_max[template] * level
+        pct = self.gear_pct[template]
+        return np.where(pct, 0.0, np.floor(value)), np.where(pct, value / 100.0, 0.0)
+
+
+class Players:
+    """
+    Every simulated player's team, gear and wallets. Arrays keep the player axis last,
+    so per-player sums over units or slots run along contiguous rows. Team CP is kept
+    up to date for the players whose levels or gear changed.
+    """
+
+    def __init__(self, content: ProgressionContent, count: int):
+        rules = content.rules
+        self.content = content
+        self.count = count
+        units = len(GACHA_STARS)
+        self.level = np.ones((units, count), dtype=np.int64)
+        self.xp = np.zeros((units, count), dtype=np.int64)
+        self.max_level = content.max_level[:, None]
+        self.slot_type = np.tile(SLOT_TYPES, units)
+        self.slot_unit = np.repeat(np.arange(units), len(SLOT_TYPES))
+        self.gear_template = np.full((len(self.slot_type), count), -1, dtype=np.int64)
+        self.gear_level = np.zeros_like(self.gear_template)
+        self.gear_rarity = np.full_like(self.gear_template, -1)  # -1 = empty slot
+        self.gear_flat = np.zeros((units, len(STATS), count))  # Summed bonuses per unit and stat
+        self.gear_percent = np.zeros((units, len(STATS), count))
+        self.gear_types = sorted(set(SLOT_TYPES))
+        self.weakest = np.full((len(self.gear_types), count), -1)  # Lowest rarity in a slot of each gear type
+        self.level_gold = np.full(count, rules.starting_gold, dtype=np.int64)
+        self.gear_gold = np.zeros(count, dtype=np.int64)
+        self.materials = np.full(count, rules.starting_materials, dtype=np.int64)
+        self.stones = np.full(count, rules.starting_stones, dtype=np.int64)
+        self.gems = np.zeros(count, dtype=np.int64)
+        self.cleared = np.zeros(count, dtype=np.int64)
+
+        top = int(content.max_level.max())
+        self.xp_need = rules.xp_table(top + 1)
+        levels = np.arange(top + 1)
+        # Stats by [unit, stat, level] and gearless CP by [unit, level]
+        stats = content.stats_at_level(content.team_base[:, None, :], levels[None, :], content.imprint)
+        self.stats_table = stats.transpose(0, 2, 1).copy()
+        self.cp_table = np.floor(stats[..., 0] / 10.0) + stats[..., 1:].sum(axis=-1)
+        self.cp = np.zeros(count)
+        self._refresh(slice(None))
+
+    def _refresh(self, rows):
+        """Recompute calculate_unit_cp, summed over the team, for some players (an index array or slice)"""
+        cp = 0.0
+        for u in range(len(GACHA_STARS)):
+            level = self.level[u, rows]
+            flat, percent = self.gear_flat[u, :, rows], self.gear_percent[u, :, rows]
+            if isinstance(rows, np.ndarray):  # Fancy indexing moves the player axis first
+                flat, percent = flat.T, percent.T
+            cp = cp + self.cp_table[u][level] + np.floor(flat[0] / 10.0) + flat[1] + flat[2] + flat[3]
+            cp = cp + np.floor(self.stats_table[u, 0][level] * percent[0] / 10.0)
+            for s in range(1, len(STATS)):
+                cp = cp + np.floor(self.stats_table[u, s][level] * percent[s])
+        self.cp[rows] = cp
+
+    def gain_xp(self, amount: np.ndarray):
+        """add_xp_to_unit for every team unit; maxed units gain nothing"""
+        self.xp += np.where(self.level < self.max_level, amount, 0)
+        changed = np.zeros(self.count, dtype=bool)
+        while True:
+            need = self.xp_need[self.level]
+            up = (self.level < self.max_level) & (self.xp >= need)
+            if not up.any():
+                break
+            self.xp -= np.where(up, need, 0)
+            self.level += up
+            changed |= up.any(axis=0)
+        if changed.any():
+            self._refresh(np.flatnonzero(changed))
+
+    def _add_gear(self, slots: np.ndarray, rows: np.ndarray, sign: float):
+        template = self.gear_template[slots, rows]
+        flat, percent = self.content.gear_bonus(template, self.gear_level[slots, rows])
+        unit, stat = self.slot_unit[slots], self.content.gear_stat[template]
+        self.gear_flat[unit, stat, rows] += sign * flat
+        self.gear_percent[unit, stat, rows] += sign * percent
+
+    def equip(self, template: np.ndarray):
+        """Put each drop (template >= 0) over the weakest piece in a slot of its type, if it is rarer"""
+        content = self.content
+        rows = np.flatnonzero(template >= 0)
+        template = template[rows]
+        gear_type = content.gear_type[template]
+        better = content.gear_rarity[template] > self.weakest[gear_type, rows]
+        rows, template, gear_type = rows[better], template[better], gear_type[better]
+        if not len(rows):
+            return
+        fits = self.slot_type[:, None] == gear_type[None, :]
+        score = np.where(fits, self.gear_rarity[:, rows] * 100 + self.gear_level[:, rows], np.iinfo(np.int64).max)
+        slots = np.argmin(score, axis=0)
+        replaced = self.gear_template[slots, rows] >= 0
+        self._add_gear(slots[replaced], rows[replaced], -1.0)
+        self.gear_template[slots, rows] = template
+        self.gear_rarity[slots, rows] = content.gear_rarity[template]
+        self.gear_level[slots, rows] = 0
+        self._add_gear(slots, rows, 1.0)
+        for t in self.gear_types:
+            self.weakest[t, rows] = self.gear_rarity[self.slot_type == t][:, rows].min(axis=0)
+        self._refresh(rows)
+
+    def buy_levels(self, flows: np.ndarray):
+        """level_up_unit on the lowest unit below max, one level at a time, while affordable"""
+        rules = self.content.rules
+        rows = np.arange(self.count)
+        changed = np.zeros(self.count, dtype=bool)
+        while len(rows):
+            level = self.level[:, rows]
+            open_units = level < self.max_level
+            target = np.argmin(np.where(open_units, level, np.iinfo(np.int64).max), axis=0)
+            current = level[target, np.arange(len(rows))]
+            gold = rules.gold_per_level * current
+            materials = rules.materials_per_level + current // 10
+            buy = open_units.any(axis=0) & (self.level_gold[rows] >= gold) & (self.materials[rows] >= materials)
+            rows, target, gold, materials = rows[buy], target[buy], gold[buy], materials[buy]
+            self.level_gold[rows] -= gold
+            self.materials[rows] -= materials
+            flows[F['gold_levels'], rows] += gold
+            flows[F['materials_spent'], rows] += materials
+            self.level[target, rows] += 1
+            self.xp[target, rows] = 0  # level_up_unit resets XP
+            changed[rows] = True
+        self._refresh(np.flatnonzero(changed))
+
+    def enhance_gear(self, flows: np.ndarray):
+        """enhance_gear on the lowest equipped piece below max, while affordable"""
+        content = self.content
+        gold_cost, stone_cost = np.array(content.rules.enhance_gold), np.array(content.rules.enhance_stones)
+        rows = np.flatnonzero((self.gear_template >= 0).any(axis=0))
+        changed = np.zeros(self.count, dtype=bool)
+        while len(rows):
+            template, level = self.gear_template[:, rows], self.gear_level[:, rows]
+            open_slots = (template >= 0) & (level < content.gear_max[np.maximum(template, 0)])
+            slots = np.argmin(np.where(open_slots, level, np.iinfo(np.int64).max), axis=0)
+            rarity = np.maximum(self.gear_rarity[slots, rows], 0)
+            gold, stones = gold_cost[rarity], stone_cost[rarity]
+            buy = open_slots.any(axis=0) & (self.gear_gold[rows] >= gold) & (self.stones[rows] >= stones)
+            rows, slots, gold, stones = rows[buy], slots[buy], gold[buy], stones[buy]
+            self.gear_gold[rows] -= gold
+            self.stones[rows] -= stones
+            flows[F['gold_gear'], rows] += gold
+            flows[F['stones_spent'], rows] += stones
+            self._add_gear(slots, rows, -1.0)
+            self.gear_level[slots, rows] += 1
+            self._add_gear(slots, rows, 1.0)
+            changed[rows] = True
+        self._refresh(np.flatnonzero(changed))
+
+
+def win_chance(team_cp: np.ndarray, enemy_cp: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + (enemy_cp / np.maximum(team_cp, 1.0)) ** WIN_STEEPNESS)
+
+
+class ProgressionResult:
+    """Per-archetype histories, kept as per-week percentiles and sums"""
+
+    def __init__(self, archetypes: List[Archetype], players: int, weeks: int, content: ProgressionContent):
+        self.archetypes = archetypes
+        self.players = players
+        self.weeks = weeks
+        self.content = content
+        self.cp = np.zeros((len(archetypes), weeks, len(PERCENTILES)))  # Team CP at each week's end
+        self.stages_cleared = np.zeros((len(archetypes), weeks))  # Mean stages cleared
+        self.flows = np.zeros((len(archetypes), weeks, len(FLOWS)))  # Mean per player
+        self.max_day = np.zeros((len(archetypes), len(GACHA_STARS), len(PERCENTILES)))  # Day a unit hit max level
+        self.max_share = np.zeros((len(archetypes), len(GACHA_STARS)))
+        self.clear_day = np.zeros((len(archetypes), len(PERCENTILES)))  # Day the campaign was cleared
+        self.clear_share = np.zeros(len(archetypes))
+        self.balances = np.zeros((len(archetypes), 4))  # Mean gold, materials, stones, gems left
+
+
+def simulate(content: ProgressionContent, archetypes: List[Archetype], players: int, weeks: int,
+             seed=None) -> ProgressionResult:
+    """Play every player of every archetype through weeks * 7 days"""
+    rules = content.rules
+    rng = np.random.default_rng(seed)
+    result = ProgressionResult(archetypes, players, weeks, content)
+    n = players * len(archetypes)
+    kind = np.repeat(np.arange(len(archetypes)), players)
+    battles = np.array([a.battles for a in archetypes], dtype=float)[kind]
+    runs = np.array([a.dungeon_runs for a in archetypes], dtype=float)[kind]
+    max_tier = np.minimum(np.array([a.max_tier for a in archetypes])[kind], len(rules.drop_rates) - 1)
+    gear_share = np.array([a.gear_share for a in archetypes])[kind]
+
+    p = Players(content, n)
+    stage_count = len(content.stage_ids)
+    drop_bounds = np.cumsum(np.array(rules.drop_rates), axis=1)[:, :-1].T  # [rarity, tier]; the last rarity is the rest
+    stone_low, stone_high = np.array(rules.stone_drops).T
+    max_day = np.full((len(GACHA_STARS), n), -1)
+    clear_day = np.full(n, -1)
+
+    for week in range(weeks):
+        flows = np.zeros((len(FLOWS), n), dtype=np.int64)
+        for day in range(week * 7, week * 7 + 7):
+            day_gold = np.zeros(n, dtype=np.int64)
+
+            # Campaign: the next stage, or farm the last cleared one while the next is too hard
+            todo = rng.poisson(battles)
+            for start in range(0, int(todo.max(initial=0)), ROUND_SIZE):
+                count = np.clip(todo - start, 0, ROUND_SIZE)
+                attempt = np.minimum(p.cleared, stage_count - 1)
+                farm = (p.cleared > 0) & ((p.cleared >= stage_count)
+                                          | (win_chance(p.cp, content.stage_cp[attempt]) < FARM_WIN_CHANCE))
+                stage = np.where(farm, p.cleared - 1, attempt)
+                wins = _wins(rng, count, win_chance(p.cp, content.stage_cp[stage]))
+                gold = wins * content.stage_gold[stage]
+                materials = wins * content.stage_materials[stage]
+                first = (wins > 0) & (stage == p.cleared)
+                gems = np.where(first, content.stage_gems[stage], 0)
+                day_gold += gold
+                p.materials += materials
+                p.gems += gems
+                flows[F['gold_in']] += gold
+                flows[F['materials_in']] += materials
+                flows[F['gems_in']] += gems
+                p.cleared += first
+                p.gain_xp(wins * content.stage_xp[stage])
+            clear_day[(p.cleared >= stage_count) & (clear_day < 0)] = day
+
+            # Dungeons, rotating daily, at the highest tier won at least half the time
+            dungeon = day % len(content.dungeon_stat)
+            stat = int(content.dungeon_stat[dungeon])
+            todo = rng.poisson(runs)
+            for start in range(0, int(todo.max(initial=0)), ROUND_SIZE):
+                count = np.clip(todo - start, 0, ROUND_SIZE)
+                tier = np.zeros(n, dtype=np.int64)
+                for t in range(1, len(rules.drop_rates)):
+                    playable = (win_chance(p.cp, content.dungeon_cp[dungeon, t]) >= FARM_WIN_CHANCE) & (t <= max_tier)
+                    tier[playable] = t
+                wins = _wins(rng, count, win_chance(p.cp, content.dungeon_cp[dungeon][tier]))
+                won = np.arange(ROUND_SIZE)[:, None] < wins[None, :]  # [run, P]
+                spread = stone_high[tier] - stone_low[tier] + 1
+                stones = np.where(won, stone_low[tier] + (rng.random(won.shape) * spread).astype(np.int64), 0).sum(axis=0)
+                p.stones += stones
+                flows[F['stones_in']] += stones
+                roll = rng.random(won.shape)
+                rarity = np.zeros(won.shape, dtype=np.int64)
+                for bound in drop_bounds:
+                    rarity += roll >= bound[tier]
+                pick = rng.random(won.shape)
+                template = np.full(won.shape, -1)
+                for r_id in range(len(RARITIES)):
+                    choices = content.drop_templates[(stat, r_id)]
+                    hit = won & (rarity == r_id)
+                    if len(choices) and hit.any():
+                        template[hit] = choices[(pick[hit] * len(choices)).astype(np.int64)]
+                for run in range(int(wins.max(initial=0))):
+                    p.equip(template[run])
+
+            # Spending: a share of the day's gold is kept for gear, the rest buys levels
+            saved = (day_gold * gear_share).astype(np.int64)
+            p.gear_gold += saved
+            p.level_gold += day_gold - saved
+            p.buy_levels(flows)
+            p.enhance_gear(flows)
+            max_day[(p.level >= p.max_level) & (max_day < 0)] = day
+
+        for a in range(len(archetypes)):
+            mine = kind == a
+            result.cp[a, week] = np.percentile(p.cp[mine], PERCENTILES)
+            result.stages_cleared[a, week] = p.cleared[mine].mean()
+            result.flows[a, week] = flows[:, mine].mean(axis=1)
+
+    for a in range(len(archetypes)):
+        mine = kind == a
+        for u in range(len(GACHA_STARS)):
+            result.max_share[a, u] = (max_day[u, mine] >= 0).mean()
+            result.max_day[a, u] = _day_percentiles(max_day[u, mine])
+        result.clear_share[a] = (clear_day[mine] >= 0).mean()
+        result.clear_day[a] = _day_percentiles(clear_day[mine])
+        result.balances[a] = ((p.level_gold[mine] + p.gear_gold[mine]).mean(), p.materials[mine].mean(),
+                              p.stones[mine].mean(), p.gems[mine].mean())
+    return result
+
+
+def _wins(rng: np.random.Generator, count: np.ndarray, chance: np.ndarray) -> np.ndarray:
+    """Wins out of count (<= ROUND_SIZE) tries at chance; uniform draws are much cheaper than rng.binomial"""
+    tries = np.arange(ROUND_SIZE)[:, None] < count[None, :]
+    return (tries & (rng.random(tries.shape) < chance)).sum(axis=0)
+
+
+def _day_percentiles(days: np.ndarray) -> np.ndarray:
+    """Day (1-based) at each percentile, NaN where it lies beyond the horizon"""
+    reached = np.where(days >= 0, days + 1, np.inf)
+    return np.percentile(reached, PERCENTILES, method="inverted_cdf")
+
+
+def _days(values: np.ndarray) -> str:
+    return "  ".join(f"p{p} {'-' if not np.isfinite(v) else f'd{int(v)}'}" for p, v in zip(PERCENTILES, values))
+
+
+def format_report(result: ProgressionResult, rules: ProgressionRules) -> str:
+    content = result.content
+    names = [a.name for a in result.archetypes]
+    lines = [
+        f"{len(names)} archetypes x {result.players:,} players, {result.weeks} weeks",
+        f"Rules: XP {rules.base_xp} x{rules.xp_growth}/level, level-up {rules.gold_per_level} gold x level "
+        f"+ {rules.materials_per_level} materials, stats +{rules.stat_growth:.0%}/level, "
+        f"imprint {content.imprint} (+{rules.imprint_step:.0%} each)",
+        "Archetypes: " + ", ".join(f"{a.name} ({a.battles:g} battles, {a.dungeon_runs:g} dungeon runs/day, "
+                                   f"tier <= {a.max_tier}, {a.gear_share:.0%} gold to gear)" for a in result.archetypes),
+        "",
+        f"Team CP by week (p{PERCENTILES[0]} / p{PERCENTILES[1]} / p{PERCENTILES[2]}), stages cleared "
+        f"(of {len(content.stage_ids)})",
+        f"  {'week':<6}" + "".join(f"{name:>26}" for name in names),
+    ]
+    for week in range(result.weeks):
+        cells = [f"{' / '.join(f'{v:,.0f}' for v in result.cp[a, week])}  {result.stages_cleared[a, week]:4.1f}"
+                 for a in range(len(names))]
+        lines.append(f"  {week + 1:<6}" + "".join(f"{cell:>26}" for cell in cells))
+
+    lines += ["", "Campaign cleared"]
+    for a, name in enumerate(names):
+        lines.append(f"  {name:<10}{result.clear_share[a]:>7.1%}   " + _days(result.clear_day[a]))
+
+    lines += ["", "Time to max level by rarity (share of players, day percentiles)"]
+    for a, name in enumerate(names):
+        for u, stars in enumerate(GACHA_STARS):
+            label = name if u == 0 else ''
+            lines.append(f"  {label:<10}{stars}★ L{content.max_level[u]:<4}{result.max_share[a, u]:>7.1%}   "
+                         + _days(result.max_day[a, u]))
+
+    lines += ["", "Currency per player: sources vs sinks (mean over the whole run)",
+              f"  {'':<10}{'gold in':>10}{'levels':>9}{'gear':>9}{'left':>9}"
+              f"{'mat in':>9}{'spent':>8}{'left':>7}{'stone in':>10}{'spent':>8}{'left':>7}{'gems in':>9}"]
+    for a, name in enumerate(names):
+        total = result.flows[a].sum(axis=0)
+        gold, mats, stones, gems = result.balances[a]
+        lines.append(
+            f"  {name:<10}{total[F['gold_in']]:>10,.0f}{total[F['gold_levels']]:>9,.0f}{total[F['gold_gear']]:>9,.0f}"
+            f"{gold:>9,.0f}{total[F['materials_in']]:>9,.0f}{total[F['materials_spent']]:>8,.0f}{mats:>7,.0f}"
+            f"{total[F['stones_in']]:>10,.0f}{total[F['stones_spent']]:>8,.0f}{stones:>7,.0f}{gems:>9,.0f}")
+
+    lines += ["", "Gold earned / spent by week (mean per player)",
+              f"  {'week':<6}" + "".join(f"{name:>20}" for name in names)]
+    for week in range(result.weeks):
+        cells = []
+        for a in range(len(names)):
+            w = result.flows[a, week]
+            cells.append(f"{w[F['gold_in']]:,.0f} / {w[F['gold_levels']] + w[F['gold_gear']]:,.0f}")
+        lines.append(f"  {week + 1:<6}" + "".join(f"{cell:>20}" for cell in cells))
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Simulate player progression and the currency economy")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--archetypes", default=','.join(ARCHETYPES),
+                            help=f"Comma-separated archetypes: {', '.join(ARCHETYPES)}")
+    arg_parser.add_argument("--players", type=int, default=1000, help="Players per archetype")
+    arg_parser.add_argument("--weeks", type=int, default=8)
+    arg_parser.add_argument("--imprint", type=int, default=0, help="Imprint level of the team (0-5)")
+    arg_parser.add_argument("--base-xp", type=int, help="Override BASE_XP_PER_LEVEL")
+    arg_parser.add_argument("--xp-growth", type=float, help="Override XP_GROWTH_RATE")
+    arg_parser.add_argument("--gold-per-level", type=int, help="Override GOLD_PER_LEVEL")
+    arg_parser.add_argument("--materials-per-level", type=int, help="Override MATERIALS_PER_LEVEL")
+    arg_parser.add_argument("--stat-growth", type=float, help="Override STAT_GROWTH_PER_LEVEL")
+    arg_parser.add_argument("--seed", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    game_root = os.path.normpath(args.root)
+    try:
+        rules = ProgressionRules.from_scripts(game_root)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    overrides = {
+        'base_xp': args.base_xp, 'xp_growth': args.xp_growth, 'gold_per_level': args.gold_per_level,
+        'materials_per_level': args.materials_per_level, 'stat_growth': args.stat_growth,
+    }
+    rules = replace(rules, **{key: value for key, value in overrides.items() if value is not None})
+
+    names = [a.strip() for a in args.archetypes.split(',') if a.strip()]
+    for name in names:
+        if name not in ARCHETYPES:
+            print(f"ERROR: Unknown archetype '{name}' (known: {', '.join(ARCHETYPES)})")
+            sys.exit(1)
+    if not 0 <= args.imprint <= 5:
+        print("ERROR: --imprint must be between 0 and 5")
+        sys.exit(1)
+
+    content = ProgressionContent(game_root, rules, args.imprint)
+    if not content.stage_ids:
+        print("ERROR: No campaign stages")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    result = simulate(content, [ARCHETYPES[name] for name in names], args.players, args.weeks, args.seed)
+    elapsed = time.perf_counter() - start
+    print(format_report(result, rules))
+    print(f"\n{args.players * len(names):,} players x {args.weeks * 7} days in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
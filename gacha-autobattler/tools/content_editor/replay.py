@@ -0,0 +1,407 @@
+"""
+Battle Replays
+Reads the replay logs battle.gd writes, and verifies them in bulk by
+re-simulating every battle headlessly with battle_sim.
+
+Format: line-delimited JSON, one finished battle per line (version 1).
+The game appends to user://replays/<date>.jsonl; gzipped files are read too.
+  v           format version
+  seed        the value the battle seeded Godot's RNG with
+  time        unix time the battle ended
+  mode        campaign (+ stage), dungeon (+ dungeon, tier), pvp or random
+  difficulty  enemy AI difficulty
+  teams       [player team, enemy team]; unit = [unit_id, level, imprint, max_hp]
+  turns       per turn [player actions, enemy actions]; action =
+              [unit index, cell, ability index] with cell = row * 3 + col.
+              A unit already on the grid moves to the cell; cell -1 only
+              changes the ability of a unit on the grid
+  result      winner (1 player, 2 enemy), turn, knockouts [player, enemy]
+              and hp [player, enemy] (current HP summed over each team)
+
+Turn resolution is deterministic once the actions are known, so verifying
+needs no RNG: the actions are checked for legality, replayed through
+battle_sim.Battle, and the outcome compared field by field. Files are
+streamed line by line in batches across a process pool with a bounded
+queue, so archives of any size verify in flat memory.
+
+battle_sim.py --replays writes its battles in the same format.
+
+Usage:
+    python replay.py ~/.local/share/godot/app_userdata/GachaAutobattler/replays
+    python replay.py archive.jsonl.gz --workers 4
+    python replay.py 2026-10-19.jsonl --show 12
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from battle_sim import (ACTIONS_PER_TURN, CELL_COUNT, ENEMY, GRID_SIZE, PLAYER, Battle, BattleCatalog, Fighter,
+                        Placement)
+
+REPLAY_VERSION = 1
+REPLAY_SUFFIXES = ('.jsonl', '.jsonl.gz')
+BATCH_SIZE = 500
+MAX_PENDING_PER_WORKER = 4  # Batches queued ahead per worker; bounds lines held in memory
+
+ReplayUnit = Tuple[str, int, int, int]  # (unit_id, level, imprint, max_hp)
+Source = Tuple[str, int]  # (file, line number)
+
+
+class ReplayError(ValueError):
+    """A replay that cannot be read or replayed"""
+
+
+@dataclass
+class ReplayResult:
+    """Outcome as recorded (or as re-simulated)"""
+    winner: int
+    turn: int
+    knockouts: Tuple[int, int]  # Scored by (player, enemy)
+    hp: Tuple[int, int]  # Current HP left per team
+
+    def differences(self, recorded: 'ReplayResult') -> List[str]:
+        return [f"{name} {mine} (replay says {theirs})"
+                for name, mine, theirs in (('winner', self.winner, recorded.winner),
+                                           ('turn', self.turn, recorded.turn),
+                                           ('knockouts', list(self.knockouts), list(recorded.knockouts)),
+                                           ('hp', list(self.hp), list(recorded.hp)))
+                if mine != theirs]
+
+
+@dataclass
+class Replay:
+    """One battle from a replay log"""
+    seed: Optional[int]
+    teams: Tuple[List[ReplayUnit], List[ReplayUnit]]
+    turns: List[list]
+    result: ReplayResult
+    meta: Dict[str, Any] = field(default_factory=dict)  # time, mode, difficulty, stage, dungeon, tier
+
+    def to_record(self) -> Dict[str, Any]:
+        return {'v': REPLAY_VERSION, 'seed': self.seed, **self.meta,
+                'teams': [[list(u) for u in team] for team in self.teams], 'turns': self.turns,
+                'result': {'winner': self.result.winner, 'turn': self.result.turn,
+                           'knockouts': list(self.result.knockouts), 'hp': list(self.result.hp)}}
+
+
+def parse_replay(line: str) -> Replay:
+    """Parse one replay line; raises ReplayError when it is malformed"""
+    try:
+        record = json.loads(line)
+        if record.get('v') != REPLAY_VERSION:
+            raise ReplayError(f"unsupported replay version {record.get('v')!r}")
+        teams = tuple([(str(u[0]), int(u[1]), int(u[2]), int(u[3])) for u in team] for team in record['teams'])
+        if len(teams) != 2:
+            raise ReplayError("expected two teams")
+        turns = [[[[int(a[0]), int(a[1]), int(a[2])] for a in side] for side in turn] for turn in record['turns']]
+        if any(len(turn) != 2 for turn in turns):
+            raise ReplayError("expected player and enemy actions on every turn")
+        r = record['result']
+        result = ReplayResult(int(r['winner']), int(r['turn']), (int(r['knockouts'][0]), int(r['knockouts'][1])),
+                              (int(r['hp'][0]), int(r['hp'][1])))
+    except ReplayError:
+        raise
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ReplayError(f"malformed replay: {e}") from e
+    meta = {k: v for k, v in record.items() if k not in ('v', 'seed', 'teams', 'turns', 'result')}
+    return Replay(record.get('seed'), teams, turns, result, meta)
+
+
+# --- Files ---
+
+def _open_replays(path: str, mode: str) -> TextIO:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def replay_files(paths: Iterable[str]) -> List[str]:
+    """Files named directly, plus every replay log in named directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(REPLAY_SUFFIXES))
+        else:
+            files.append(path)
+    return files
+
+
+def read_lines(paths: Iterable[str]) -> Iterator[Tuple[Source, str]]:
+    """Stream ((file, line number), line) over every non-blank line"""
+    for path in replay_files(paths):
+        with _open_replays(path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield (path, line_no), line
+
+
+def read_replays(paths: Iterable[str]) -> Iterator[Tuple[Source, Replay]]:
+    """Stream parsed replays; raises ReplayError naming the line of the first malformed one"""
+    for (path, line_no), line in read_lines(paths):
+        try:
+            yield (path, line_no), parse_replay(line)
+        except ReplayError as e:
+            raise ReplayError(f"{path}:{line_no}: {e}") from e
+
+
+class ReplayWriter:
+    """Writes battle_sim battles (with Battle.log set) to a new replay log"""
+
+    def __init__(self, path: str, seed: Optional[int] = None, **meta: Any):
+        self.file = _open_replays(path, 'w')
+        self.seed = seed
+        self.meta = meta
+        self.count = 0
+
+    def write(self, battle: Battle):
+        r = battle.result
+        teams = tuple([(f.spec.unit_id, f.level, f.imprint, f.max_hp) for f in battle.teams[owner]]
+                      for owner in (PLAYER, ENEMY))
+        result = ReplayResult(r.winner, r.turns, (r.player_knockouts, r.enemy_knockouts),
+                              (_sum_hp(battle.teams[PLAYER]), _sum_hp(battle.teams[ENEMY])))
+        replay = Replay(self.seed, teams, battle.log or [], result, {'time': int(time.time()), **self.meta})
+        self.file.write(json.dumps(replay.to_record(), separators=(',', ':')) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+# --- Re-simulation ---
+
+def _sum_hp(units: List[Fighter]) -> int:
+    return sum(max(0, u.hp) for u in units)
+
+
+def build_battle(catalog: BattleCatalog, replay: Replay) -> Battle:
+    """Fresh fighters for both teams, at the recorded max HP"""
+    teams = []
+    for owner, team in ((PLAYER, replay.teams[0]), (ENEMY, replay.teams[1])):
+        fighters = []
+        for unit_id, level, imprint, max_hp in team:
+            spec = catalog.units.get(unit_id)
+            if spec is None:
+                raise ReplayError(f"unknown unit '{unit_id}'")
+            fighter = Fighter(spec, owner, level, imprint)
+            fighter.max_hp = fighter.hp = max_hp  # Gear is not recorded, only the HP it gave
+            fighters.append(fighter)
+        teams.append(fighters)
+    return Battle(*teams)
+
+
+def apply_actions(battle: Battle, owner: int, actions: List[list]) -> List[Placement]:
+    """Set recorded abilities and return the side's placements; raises ReplayError on an illegal action"""
+    team, side = battle.teams[owner], battle.grid[owner]
+    moves, seen, targets = [], set(), set()
+    for index, cell, ability in actions:
+        if not 0 <= index < len(team):
+            raise ReplayError(f"turn {battle.turn}: bad unit index {index}")
+        if index in seen:
+            raise ReplayError(f"turn {battle.turn}: unit {index} acts twice")
+        seen.add(index)
+        unit = team[index]
+        if not unit.is_alive():
+            raise ReplayError(f"turn {battle.turn}: {unit.spec.unit_id} acts while knocked out")
+        if ability and not 0 <= ability < len(unit.spec.abilities):
+            raise ReplayError(f"turn {battle.turn}: {unit.spec.unit_id} has no ability {ability}")
+        if cell < 0:
+            if unit.cell < 0:
+                raise ReplayError(f"turn {battle.turn}: {unit.spec.unit_id} changes ability off the grid")
+        elif cell >= CELL_COUNT or cell in targets:
+            raise ReplayError(f"turn {battle.turn}: bad cell {cell}")
+        else:
+            targets.add(cell)
+            moves.append((unit, cell))
+        unit.ability_index = ability
+
+    if len(moves) > ACTIONS_PER_TURN:
+        raise ReplayError(f"turn {battle.turn}: {len(moves)} actions, limit {ACTIONS_PER_TURN}")
+    moving = {id(unit) for unit, _ in moves}
+    for unit, cell in moves:
+        occupant = side[cell]
+        if occupant is not None and id(occupant) not in moving:
+            raise ReplayError(f"turn {battle.turn}: cell {cell} is already taken by {occupant.spec.unit_id}")
+    return moves
+
+
+def resimulate(catalog: BattleCatalog, replay: Replay) -> Tuple[Battle, ReplayResult]:
+    """Replay every recorded turn; raises ReplayError if an action is illegal or a turn is left over"""
+    battle = build_battle(catalog, replay)
+    for player_actions, enemy_actions in replay.turns:
+        if battle.result is not None:
+            raise ReplayError(f"battle ended on turn {battle.result.turns} but the replay goes on")
+        player_moves = apply_actions(battle, PLAYER, player_actions)
+        enemy_moves = apply_actions(battle, ENEMY, enemy_actions)
+        battle.resolve_turn(player_moves, enemy_moves)
+    # The game plays out a settled board without actions; skip straight to its result
+    if not battle.finish_if_settled():
+        raise ReplayError(f"battle is still going after turn {battle.turn - 1}")
+    r = battle.result
+    return battle, ReplayResult(r.winner, r.turns, (r.player_knockouts, r.enemy_knockouts),
+                                (_sum_hp(battle.teams[PLAYER]), _sum_hp(battle.teams[ENEMY])))
+
+
+def verify(catalog: BattleCatalog, line: str) -> Optional[str]:
+    """None when the replay's outcome reproduces, else what differs"""
+    try:
+        replay = parse_replay(line)
+        _, result = resimulate(catalog, replay)
+    except ReplayError as e:
+        return str(e)
+    differences = result.differences(replay.result)
+    return ", ".join(differences) if differences else None
+
+
+# --- Bulk verification ---
+
+_worker_catalog: Optional[BattleCatalog] = None
+
+
+def _init_worker(game_root: str):
+    global _worker_catalog
+    _worker_catalog = BattleCatalog(game_root).load()
+
+
+def _verify_batch(batch: List[Tuple[Source, str]]) -> List[Tuple[Source, str]]:
+    """Mismatches in a batch of lines"""
+    mismatches = []
+    for source, line in batch:
+        problem = verify(_worker_catalog, line)
+        if problem:
+            mismatches.append((source, problem))
+    return mismatches
+
+
+def _batches(lines: Iterator[Tuple[Source, str]]) -> Iterator[List[Tuple[Source, str]]]:
+    batch = []
+    for item in lines:
+        batch.append(item)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def verify_files(game_root: str, paths: List[str], workers: Optional[int] = None
+                 ) -> Iterator[Tuple[int, List[Tuple[Source, str]]]]:
+    """Stream (replays checked, mismatches) per batch, in file order"""
+    workers = workers or os.cpu_count() or 1
+    batches = _batches(read_lines(paths))
+    if workers < 2:
+        _init_worker(game_root)
+        for batch in batches:
+            yield len(batch), _verify_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(game_root,)) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append((len(batch), pool.submit(_verify_batch, batch)))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+
+# --- Inspection ---
+
+def format_replay(catalog: BattleCatalog, replay: Replay) -> str:
+    """Turn-by-turn actions and team HP, then the re-simulated result against the recorded one"""
+    lines = [" ".join(f"{k}={v}" for k, v in replay.meta.items()) + f" seed={replay.seed}"]
+    for name, team in (('Player', replay.teams[0]), ('Enemy', replay.teams[1])):
+        lines.append(f"{name}: " + ", ".join(f"[{i}] {u[0]} Lv{u[1]} +{u[2]} {u[3]}HP" for i, u in enumerate(team)))
+
+    try:
+        battle = build_battle(catalog, replay)
+        for player_actions, enemy_actions in replay.turns:
+            turn = battle.turn
+            parts = []
+            for owner, actions in ((PLAYER, player_actions), (ENEMY, enemy_actions)):
+                team = battle.teams[owner]
+                for index, cell, ability in actions:
+                    unit_id = team[index].spec.unit_id if 0 <= index < len(team) else f"#{index}"
+                    where = "ability" if cell < 0 else f"({cell // GRID_SIZE},{cell % GRID_SIZE})"
+                    parts.append(f"{'P' if owner == PLAYER else 'E'} {unit_id} {where} a{ability}")
+            battle.resolve_turn(apply_actions(battle, PLAYER, player_actions),
+                                apply_actions(battle, ENEMY, enemy_actions))
+            lines.append(f"  Turn {turn:>2}: {'; '.join(parts) or '-'}")
+            lines.append(f"           HP {_sum_hp(battle.teams[PLAYER])} vs {_sum_hp(battle.teams[ENEMY])}, "
+                         f"knockouts {battle.knockouts[PLAYER]}-{battle.knockouts[ENEMY]}")
+            if battle.result is not None:
+                break
+        _, result = resimulate(catalog, replay)
+    except ReplayError as e:
+        lines.append(f"Cannot replay: {e}")
+        return "\n".join(lines)
+
+    recorded = replay.result
+    lines.append(f"Recorded:     winner {recorded.winner}, turn {recorded.turn}, "
+                 f"knockouts {list(recorded.knockouts)}, hp {list(recorded.hp)}")
+    lines.append(f"Re-simulated: winner {result.winner}, turn {result.turn}, "
+                 f"knockouts {list(result.knockouts)}, hp {list(result.hp)}")
+    differences = result.differences(recorded)
+    lines.append("MISMATCH: " + ", ".join(differences) if differences else "Match")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Verify battle replays by re-simulating them")
+    arg_parser.add_argument("paths", nargs='+', help="Replay logs (.jsonl or .jsonl.gz) or folders of them")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--show", type=int, metavar="LINE", default=None,
+                            help="Print one replay turn by turn (line number in the first file)")
+    arg_parser.add_argument("--max-mismatches", type=int, default=20, help="Mismatches to list (all are counted)")
+    args = arg_parser.parse_args()
+
+    game_root = os.path.normpath(args.root)
+    missing = [p for p in args.paths if not os.path.exists(p)]
+    if missing:
+        print(f"ERROR: Not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    if args.show is not None:
+        catalog = BattleCatalog(game_root).load()
+        for (path, line_no), line in read_lines(replay_files(args.paths)[:1]):
+            if line_no == args.show:
+                try:
+                    print(format_replay(catalog, parse_replay(line)))
+                except ReplayError as e:
+                    print(f"ERROR: {path}:{line_no}: {e}")
+                    sys.exit(1)
+                return
+        print(f"ERROR: No replay on line {args.show}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    checked, mismatches = 0, 0
+    for count, problems in verify_files(game_root, args.paths, args.workers):
+        checked += count
+        for (path, line_no), problem in problems:
+            mismatches += 1
+            if mismatches <= args.max_mismatches:
+                print(f"  {path}:{line_no}: {problem}")
+    elapsed = time.perf_counter() - start
+
+    if mismatches > args.max_mismatches:
+        print(f"  ... and {mismatches - args.max_mismatches} more")
+    print(f"Verified {checked:,} replays in {elapsed:.2f}s ({checked / max(elapsed, 1e-9):,.0f}/s): "
+          f"{checked - mismatches:,} match, {mismatches:,} differ")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
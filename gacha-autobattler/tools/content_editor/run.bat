@@ -11,7 +11,7 @@ if errorlevel 1 (
 )
 
 REM Check if dependencies are installed
-python -c "import customtkinter" >nul 2>&1
+python -c "import customtkinter, numpy" >nul 2>&1
 if errorlevel 1 (
     echo Installing dependencies...
     pip install -r requirements.txt
@@ -0,0 +1,557 @@
+"""
+Stage Tuner
+Proposes enemy_level and enemy_units for campaign stages from simulated battles.
+
+For each stage, a reference player team (the starter trio by default) fights the
+stage with the auto-battle against the enemy AI, at the level a player would have
+reached by then (--level-start, plus --level-step per stage in campaign order):
+  - level: binary search for the highest enemy_level the team still beats at
+    the --target win rate. Win rates fall as enemy_level rises (levels only
+    scale HP), so each probe only has to tell above from below the target. A
+    probe plays batches of battles and stops as soon as the Wilson interval of
+    its win rate excludes the target.
+  - roster: if no level lands within --tolerance of the target, single edits of
+    the roster (swap, add or drop one unit, using units from the same chapter)
+    are screened, and the best one is searched again, up to --max-edits times.
+The final proposal is measured with --battles full battles.
+
+Stages are tuned in parallel across a process pool. Results are cached per stage
+in .stage_tuning_cache.json, keyed by the stage file, the chapter's unit pool
+and the tuning settings; the cache is dropped when combat content (units,
+abilities, effects), the board book or the simulation code changes. Only stages
+that changed since the last run are tuned again.
+
+Proposals are printed; --write applies them through TresParser, after every
+proposed file has been built and validated, then rebuilds resources/content_pack.json.
+The difficulty stars are left alone.
+
+Usage:
+    python stage_tuner.py
+    python stage_tuner.py --stages 1-1,1-2 --target 0.8 --battles 1000
+    python stage_tuner.py --player ember_001,water_mage_001,spark_001 --level-start 5 --level-step 2 --write
+"""
+
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import battle_sim
+import board_solver
+from battle_sim import (DIFFICULTIES, ENEMY, PLAYER, Battle, BattleCatalog, EnemyAI, Fighter, auto_battle)
+from board_solver import BOOK_PATH, BoardBook
+from content_pack import ContentPackBuilder
+from duel_matrix import SOURCE_DIRS
+from tres_parser import TresParser, TresResource
+
+CACHE_FILE = '.stage_tuning_cache.json'
+STARTER_TEAM = ('fire_warrior_001', 'coral_001', 'nature_wisp_001')  # PlayerData._give_starter_units
+MAX_LEVEL = 50  # PlayerData.get_max_level for 5 stars
+MIN_ROSTER, MAX_ROSTER = 3, 5
+PROBE_BATCH = 50
+MIN_PROBE_BATTLES = 100
+WILSON_Z = 2.58  # 99%; probes look at their interval after every batch
+SCREEN_BATTLES = 100  # Battles per roster candidate when screening edits
+
+
+@lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    """Changes whenever the simulation or tuning code changes"""
+    digest = hashlib.sha1()
+    for module_file in (__file__, battle_sim.__file__, board_solver.__file__):
+        with open(module_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def content_fingerprint(game_root: str) -> str:
+    """Hash of everything a battle reads besides the stage itself"""
+    digest = hashlib.sha1(_code_fingerprint().encode('utf-8'))
+    resources = os.path.join(game_root, 'resources')
+    for folder in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(resources, folder)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.tres'):
+                    filepath = os.path.join(dirpath, filename)
+                    digest.update(os.path.relpath(filepath, resources).encode('utf-8'))
+                    with open(filepath, 'rb') as f:
+                        digest.update(hashlib.sha1(f.read()).digest())
+    book_path = os.path.join(game_root, BOOK_PATH)
+    if os.path.exists(book_path):
+        with open(book_path, 'rb') as f:
+            digest.update(hashlib.sha1(f.read()).digest())
+    return digest.hexdigest()
+
+
+def wilson_interval(wins: int, battles: int, z: float = WILSON_Z) -> Tuple[float, float]:
+    """Confidence interval of a win rate; stays inside [0, 1] near the edges"""
+    if battles == 0:
+        return 0.0, 1.0
+    p = wins / battles
+    denom = 1 + z * z / battles
+    center = (p + z * z / (2 * battles)) / denom
+    half = z * math.sqrt(p * (1 - p) / battles + z * z / (4 * battles * battles)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@dataclass(frozen=True)
+class TuningSettings:
+    """Everything besides the stage that decides a proposal"""
+    player_ids: Tuple[str, ...] = STARTER_TEAM
+    level_start: int = 1
+    level_step: int = 1
+    difficulty: str = 'medium'
+    target: float = 0.7
+    tolerance: float = 0.05
+    battles: int = 400
+    max_probe_battles: int = 400
+    max_edits: int = 2
+    seed: int = 0
+    use_book: bool = True
+
+
+@dataclass(frozen=True)
+class StageJob:
+    """One stage to tune, as plain data for a worker"""
+    stage_id: str
+    enemy_units: Tuple[str, ...]
+    enemy_level: int
+    player_level: int
+    pool: Tuple[str, ...]  # Unit ids roster edits may use
+
+
+@dataclass(frozen=True)
+class Proposal:
+    stage_id: str
+    enemy_units: Tuple[str, ...]
+    enemy_level: int
+    win_rate: float
+    old_enemy_units: Tuple[str, ...]
+    old_enemy_level: int
+    old_win_rate: float
+    player_level: int
+    within_tolerance: bool
+    battles_played: int
+
+    @property
+    def changed(self) -> bool:
+        return self.enemy_units != self.old_enemy_units or self.enemy_level != self.old_enemy_level
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'Proposal':
+        return Proposal(**{**data, 'enemy_units': tuple(data['enemy_units']),
+                           'old_enemy_units': tuple(data['old_enemy_units'])})
+
+
+class StageTuner:
+    """Searches one stage at a time; every battle is seeded from its setup, so results are reproducible"""
+
+    def __init__(self, catalog: BattleCatalog, settings: TuningSettings, book: Optional[BoardBook] = None):
+        self.catalog = catalog
+        self.settings = settings
+        self.enemy_policy = EnemyAI(settings.difficulty, book)
+        self.battles_played = 0
+
+    def player_team(self, level: int) -> List[Fighter]:
+        """The reference team, each unit capped at its star rating's max level"""
+        return [Fighter(self.catalog.units[unit_id], PLAYER, min(level, self.catalog.units[unit_id].star_rating * 10))
+                for unit_id in self.settings.player_ids]
+
+    def play(self, job: StageJob, roster: Tuple[str, ...], level: int, start: int, count: int) -> int:
+        """Player wins among battles start..start+count of a roster at an enemy level"""
+        wins = 0
+        for index in range(start, start + count):
+            rng = random.Random(f"{self.settings.seed}:{job.stage_id}:{','.join(roster)}:{level}:{index}")
+            enemy_team = [Fighter(self.catalog.units[unit_id], ENEMY, level) for unit_id in roster]
+            result = Battle(self.player_team(job.player_level), enemy_team, rng).play(auto_battle, self.enemy_policy)
+            wins += result.winner == PLAYER
+        self.battles_played += count
+        return wins
+
+    def measure(self, job: StageJob, roster: Tuple[str, ...], level: int, battles: int) -> float:
+        return self.play(job, roster, level, 0, battles) / battles
+
+    def beats_target(self, job: StageJob, roster: Tuple[str, ...], level: int) -> bool:
+        """Whether the win rate is at least the target, stopping once the interval excludes it"""
+        target = self.settings.target
+        wins = battles = 0
+        while battles < self.settings.max_probe_battles:
+            count = min(PROBE_BATCH, self.settings.max_probe_battles - battles)
+            wins += self.play(job, roster, level, battles, count)
+            battles += count
+            if battles >= MIN_PROBE_BATTLES:
+                low, high = wilson_interval(wins, battles)
+                if low > target or high < target:
+                    break
+        return wins / battles >= target
+
+    def search_level(self, job: StageJob, roster: Tuple[str, ...]) -> int:
+        """Highest enemy level the team still beats at the target rate (1 if it never does)"""
+        low, high = 1, MAX_LEVEL
+        if not self.beats_target(job, roster, low):
+            return low
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.beats_target(job, roster, mid):
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    def best_level(self, job: StageJob, roster: Tuple[str, ...]) -> Tuple[int, float]:
+        """(level, win rate) closest to the target around the searched level"""
+        level = self.search_level(job, roster)
+        options = [(level, self.measure(job, roster, level, self.settings.battles))]
+        if level < MAX_LEVEL:
+            options.append((level + 1, self.measure(job, roster, level + 1, self.settings.battles)))
+        return min(options, key=lambda option: abs(option[1] - self.settings.target))
+
+    def variants(self, roster: Tuple[str, ...], pool: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+        """Rosters one edit away: swap a unit, add one or drop one"""
+        seen = {roster}
+        result = []
+        candidates = [roster[:i] + (unit_id,) + roster[i + 1:] for i in range(len(roster)) for unit_id in pool]
+        if len(roster) < MAX_ROSTER:
+            candidates += [roster + (unit_id,) for unit_id in pool]
+        if len(roster) > MIN_ROSTER:
+            candidates += [roster[:i] + roster[i + 1:] for i in range(len(roster))]
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                result.append(candidate)
+        return result
+
+    def tune(self, job: StageJob) -> Proposal:
+        self.battles_played = 0
+        settings = self.settings
+        old_rate = self.measure(job, job.enemy_units, job.enemy_level, settings.battles)
+        roster = job.enemy_units
+        level, rate = self.best_level(job, roster)
+
+        for _ in range(settings.max_edits):
+            if abs(rate - settings.target) <= settings.tolerance:
+                break
+            # Screen each edit at the current level, then search levels for the closest one
+            screened = [(abs(self.measure(job, candidate, level, SCREEN_BATTLES) - settings.target), candidate)
+                        for candidate in self.variants(roster, job.pool)]
+            if not screened:
+                break
+            candidate = min(screened)[1]
+            candidate_level, candidate_rate = self.best_level(job, candidate)
+            if abs(candidate_rate - settings.target) >= abs(rate - settings.target):
+                break
+            roster, level, rate = candidate, candidate_level, candidate_rate
+
+        # Keep the stage as it is when it already does as well as the proposal
+        if abs(old_rate - settings.target) <= abs(rate - settings.target):
+            roster, level, rate = job.enemy_units, job.enemy_level, old_rate
+        return Proposal(job.stage_id, roster, level, rate, job.enemy_units, job.enemy_level, old_rate,
+                        job.player_level, abs(rate - settings.target) <= settings.tolerance, self.battles_played)
+
+
+_worker_tuner: Optional[StageTuner] = None
+
+
+def _init_worker(game_root: str, settings: TuningSettings):
+    global _worker_tuner
+    catalog = BattleCatalog(game_root).load()
+    book = BoardBook.load(game_root) if settings.use_book else None
+    _worker_tuner = StageTuner(catalog, settings, book)
+
+
+def _tune_stage(job: StageJob) -> Proposal:
+    """Worker entry point"""
+    return _worker_tuner.tune(job)
+
+
+# --- Stages ---
+
+def stage_order(resource: TresResource) -> Tuple[int, int]:
+    return resource.properties.get('chapter', 0), resource.properties.get('stage_number', 0)
+
+
+def file_sha1(filepath: str) -> str:
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class StageCatalog:
+    """Stage resources in campaign order, with their rosters as unit ids"""
+
+    def __init__(self, parser: TresParser, catalog: BattleCatalog):
+        self.parser = parser
+        self.catalog = catalog
+        self.resources = sorted(parser.get_all_stages(), key=stage_order)
+        self.by_id = {r.properties.get('stage_id', ''): r for r in self.resources}
+        self.unit_paths = {spec.unit_id: spec.path for spec in catalog.units.values()}
+
+    def roster(self, stage_id: str) -> Tuple[str, ...]:
+        return tuple(unit.unit_id for unit in self.catalog.stages[stage_id].enemy_units)
+
+    def chapter_pool(self, chapter: int) -> Tuple[str, ...]:
+        """Units any stage of a chapter already fields"""
+        pool = set()
+        for resource in self.resources:
+            if resource.properties.get('chapter') == chapter:
+                pool.update(self.roster(resource.properties['stage_id']))
+        return tuple(sorted(pool))
+
+    def jobs(self, stage_ids: List[str], settings: TuningSettings) -> List[StageJob]:
+        jobs = []
+        for index, resource in enumerate(self.resources):
+            stage_id = resource.properties['stage_id']
+            if stage_id in stage_ids:
+                jobs.append(StageJob(
+                    stage_id, self.roster(stage_id), resource.properties.get('enemy_level', 1),
+                    min(settings.level_start + index * settings.level_step, MAX_LEVEL),
+                    self.chapter_pool(resource.properties.get('chapter', 0))))
+        return jobs
+
+    def apply(self, proposal: Proposal) -> TresResource:
+        """Copy of a stage resource with the proposal's enemy_level and enemy_units"""
+        original = self.by_id[proposal.stage_id]
+        resource = TresResource(original.resource_type, original.script_class, original.uid,
+                                dict(original.ext_resources), dict(original.properties), original.file_path)
+        resource.properties['enemy_level'] = proposal.enemy_level
+        if proposal.enemy_units == proposal.old_enemy_units:
+            return resource
+
+        # Reuse the ext_resource ids already pointing at each unit, in order, and add ids for new units
+        old_ids = [item['id'] for item in resource.properties['enemy_units']['items']]
+        free = {}
+        for ext_id in old_ids:
+            free.setdefault(resource.ext_resources[ext_id]['path'], []).append(ext_id)
+        items = []
+        for unit_id in proposal.enemy_units:
+            path = self.unit_paths[unit_id]
+            ids = free.get(path)
+            if ids:
+                ext_id = ids.pop(0)
+            else:
+                ext_id = next((i for i, info in resource.ext_resources.items() if info['path'] == path), None)
+                if ext_id is None:
+                    ext_id = self._new_ext_id(resource)
+                    uid = self.parser.parse_file(os.path.join(self.catalog.game_root, path[len('res://'):])).uid
+                    resource.ext_resources[ext_id] = {'type': 'Resource', 'uid': uid, 'path': path}
+            items.append({'type': 'ExtResource', 'id': ext_id})
+        resource.properties['enemy_units'] = {'type': 'Array', 'element_type': 'Resource', 'items': items}
+
+        # Drop ids nothing references any more (first_clear_unit may share one with the roster)
+        used = {item['id'] for item in items}
+        used.update(v['id'] for k, v in resource.properties.items()
+                    if k != 'enemy_units' and isinstance(v, dict) and v.get('type') == 'ExtResource')
+        resource.ext_resources = {i: info for i, info in resource.ext_resources.items()
+                                  if info['type'] == 'Script' or i in used}
+        return resource
+
+    @staticmethod
+    def _new_ext_id(resource: TresResource) -> str:
+        numbers = [int(ext_id.split('_')[0]) for ext_id in resource.ext_resources if ext_id.split('_')[0].isdigit()]
+        return f"{max(numbers, default=1) + 1}_unit"
+
+    def write(self, proposals: List[Proposal]) -> List[str]:
+        """Write every changed proposal, or nothing if any of them fails validation; returns the files written"""
+        updates = [self.apply(p) for p in proposals if p.changed]
+        errors = [f"{os.path.basename(r.file_path)}: {e}" for r in updates for e in self.parser.validate(r)]
+        if errors:
+            raise ValueError("; ".join(errors))
+        for resource in updates:
+            self.parser.write_file(resource, resource.file_path)
+        return [resource.file_path for resource in updates]
+
+
+# --- Tuning run ---
+
+class TuningRun:
+    """Tunes a set of stages, reusing cached proposals for stages that haven't changed"""
+
+    def __init__(self, game_root: str, settings: TuningSettings, workers: Optional[int] = None,
+                 use_cache: bool = True):
+        self.game_root = game_root
+        self.settings = settings
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_path = os.path.join(game_root, CACHE_FILE)
+        self.parser = TresParser(game_root)
+        self.stages = StageCatalog(self.parser, BattleCatalog(game_root).load())
+        self.fingerprint = content_fingerprint(game_root)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.cache_hits = 0
+        self.battles_played = 0
+
+    def stage_key(self, job: StageJob) -> str:
+        resource = self.stages.by_id[job.stage_id]
+        digest = hashlib.sha1(file_sha1(resource.file_path).encode('utf-8'))
+        digest.update(repr((job, asdict(self.settings))).encode('utf-8'))
+        return digest.hexdigest()
+
+    def load(self):
+        self.entries = {}
+        if not self.use_cache or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == self.fingerprint:
+                self.entries = data.get('stages', {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable stage tuning cache: {e}")
+
+    def save(self):
+        if not self.use_cache:
+            return
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'stages': self.entries}, f, separators=(',', ':'))
+
+    def run(self, stage_ids: List[str]) -> List[Proposal]:
+        self.load()
+        jobs = self.stages.jobs(stage_ids, self.settings)
+        keys = {job.stage_id: self.stage_key(job) for job in jobs}
+        proposals: Dict[str, Proposal] = {}
+        todo = []
+        for job in jobs:
+            entry = self.entries.get(job.stage_id)
+            if entry and entry['key'] == keys[job.stage_id]:
+                proposals[job.stage_id] = Proposal.from_dict(entry['proposal'])
+                self.cache_hits += 1
+            else:
+                todo.append(job)
+
+        for proposal in self._tune(todo):
+            proposals[proposal.stage_id] = proposal
+            self.battles_played += proposal.battles_played
+            self.entries[proposal.stage_id] = {'key': keys[proposal.stage_id], 'proposal': asdict(proposal)}
+        self.save()
+        return [proposals[job.stage_id] for job in jobs]
+
+    def _tune(self, jobs: List[StageJob]) -> List[Proposal]:
+        if self.workers < 2 or len(jobs) < 2:
+            _init_worker(self.game_root, self.settings)
+            return [_tune_stage(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)), initializer=_init_worker,
+                                 initargs=(self.game_root, self.settings)) as pool:
+            return list(pool.map(_tune_stage, jobs))
+
+    def write(self, proposals: List[Proposal]) -> List[str]:
+        """Apply the proposals, then cache them as already tuned against the files just written"""
+        written = self.stages.write(proposals)
+        for proposal in proposals:
+            if not proposal.changed:
+                continue
+            applied = replace(proposal, old_enemy_units=proposal.enemy_units, old_enemy_level=proposal.enemy_level,
+                              old_win_rate=proposal.win_rate)
+            job = StageJob(proposal.stage_id, proposal.enemy_units, proposal.enemy_level, proposal.player_level,
+                           self._written_pool(proposal.stage_id, proposals))
+            self.entries[proposal.stage_id] = {'key': self.stage_key(job), 'proposal': asdict(applied)}
+        self.save()
+        return written
+
+    def _written_pool(self, stage_id: str, proposals: List[Proposal]) -> Tuple[str, ...]:
+        """Chapter pool as it will be read back after the proposals are written"""
+        chapter = self.stages.by_id[stage_id].properties.get('chapter', 0)
+        rosters = {p.stage_id: p.enemy_units for p in proposals}
+        pool = set()
+        for resource in self.stages.resources:
+            if resource.properties.get('chapter') == chapter:
+                other = resource.properties['stage_id']
+                pool.update(rosters.get(other) or self.stages.roster(other))
+        return tuple(sorted(pool))
+
+
+def format_proposals(proposals: List[Proposal], target: float) -> str:
+    lines = [f"Target player win rate {target:.0%}",
+             f"  {'stage':<6} {'player':>6} {'level':>9} {'win rate':>15}  roster"]
+    for p in proposals:
+        level = f"{p.old_enemy_level}->{p.enemy_level}" if p.enemy_level != p.old_enemy_level else str(p.enemy_level)
+        rate = f"{p.old_win_rate:.0%}->{p.win_rate:.0%}" if p.changed else f"{p.win_rate:.0%}"
+        roster = ','.join(p.enemy_units)
+        if p.enemy_units != p.old_enemy_units:
+            roster = f"{','.join(p.old_enemy_units)} -> {roster}"
+        flag = '' if p.within_tolerance else '  (off target)'
+        lines.append(f"  {p.stage_id:<6} {'L' + str(p.player_level):>6} {level:>9} {rate:>15}  {roster}{flag}")
+    return "\n".join(lines)
+
+
+def _split(value: str) -> List[str]:
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Tune stage enemy levels and rosters to a target win rate")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--stages", default=None, help="Comma-separated stage ids (default: every stage)")
+    arg_parser.add_argument("--player", default=','.join(STARTER_TEAM),
+                            help="Comma-separated unit ids of the reference team (default: the starter units)")
+    arg_parser.add_argument("--level-start", type=int, default=1, help="Reference team level on the first stage")
+    arg_parser.add_argument("--level-step", type=int, default=1, help="Reference team levels gained per stage")
+    arg_parser.add_argument("--difficulty", choices=DIFFICULTIES, default='medium', help="Enemy AI difficulty")
+    arg_parser.add_argument("--target", type=float, default=0.7, help="Target player win rate")
+    arg_parser.add_argument("--tolerance", type=float, default=0.05, help="Accepted distance from the target")
+    arg_parser.add_argument("--battles", type=int, default=400, help="Battles per final measurement")
+    arg_parser.add_argument("--max-probe-battles", type=int, default=400,
+                            help="Battle cap of one level probe before early stopping")
+    arg_parser.add_argument("--max-edits", type=int, default=2, help="Roster edits per stage (0 keeps rosters)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--no-book", action="store_true", help="Enemy HARD ignores the board book")
+    arg_parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Tune every stage and don't write the cache")
+    arg_parser.add_argument("--write", action="store_true", help="Write the proposals to the stage .tres files")
+    args = arg_parser.parse_args()
+
+    if not 0 < args.target < 1:
+        print("ERROR: --target must be between 0 and 1")
+        sys.exit(1)
+    settings = TuningSettings(tuple(_split(args.player)), args.level_start, args.level_step, args.difficulty,
+                              args.target, args.tolerance, args.battles, args.max_probe_battles, args.max_edits,
+                              args.seed, not args.no_book)
+    tuning = TuningRun(os.path.normpath(args.root), settings, args.workers, use_cache=not args.no_cache)
+    known = [r.properties['stage_id'] for r in tuning.stages.resources]
+    stage_ids = _split(args.stages) if args.stages else known
+    for stage_id in stage_ids:
+        if stage_id not in known:
+            print(f"ERROR: Unknown stage '{stage_id}' (known: {', '.join(known)})")
+            sys.exit(1)
+    for unit_id in settings.player_ids:
+        if unit_id not in tuning.stages.catalog.units:
+            print(f"ERROR: Unknown unit '{unit_id}'")
+            sys.exit(1)
+
+    start = time.perf_counter()
+    proposals = tuning.run(stage_ids)
+    elapsed = time.perf_counter() - start
+
+    print(format_proposals(proposals, settings.target))
+    tuned = len(proposals) - tuning.cache_hits
+    print(f"{tuned} stage(s) tuned, {tuning.cache_hits} from cache, in {elapsed:.2f}s "
+          f"({tuning.battles_played:,} battles)")
+
+    if args.write:
+        try:
+            written = tuning.write(proposals)
+        except ValueError as e:
+            print(f"ERROR: Nothing written, invalid proposals: {e}")
+            sys.exit(1)
+        print(f"Wrote {len(written)} stage file(s)")
+        for filepath in written:
+            print(f"  {os.path.relpath(filepath, tuning.game_root)}")
+
+        # PlayerData reads stage tables from the content pack, so rebuild it like the editor does on close
+        pack = ContentPackBuilder(tuning.game_root)
+        if not pack.is_current():
+            pack.write(pack.build())
+            print(f"Rebuilt {os.path.relpath(pack.pack_path, tuning.game_root)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Stat Table Builder
+Precomputes the stat formulas PlayerData runs for every card it draws, and
+writes them to resources/stat_tables.json for the game to index directly.
+
+Tables:
+  - units: for every ownable unit, get_unit_stats_at_level and the gearless
+    part of calculate_unit_cp at every level (1 to max) and imprint (0 to max).
+    Rows are flat int arrays of [max_hp, attack, defense, speed, cp] per
+    (imprint, level): index = ((imprint * max_level) + level - 1) * 5
+  - gear: for every gear template, its stat type and the bonus
+    get_gear_bonuses adds at every level (0 to max): int(value) for flat gear,
+    value / 100 for percentage gear
+
+The growth constants are read from player_data.gd and gear_data.gd, so the
+tables always match the GDScript formulas. source_hash covers those constants
+and every unit and gear file; the game falls back to the formulas for anything
+missing from the tables.
+
+Usage:
+    python stat_tables.py
+    python stat_tables.py --check
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Tuple
+
+from content_pack import ContentPackBuilder
+from tres_parser import TresParser
+
+TABLES_PATH = os.path.join('resources', 'stat_tables.json')
+TABLES_VERSION = 1
+PLAYER_DATA_PATH = os.path.join('scripts', 'core', 'player_data.gd')
+GEAR_DATA_PATH = os.path.join('scripts', 'data', 'gear_data.gd')
+
+UNIT_COLUMNS = ('max_hp', 'attack', 'defense', 'speed', 'cp')
+RARITIES = ('COMMON', 'RARE', 'EPIC', 'LEGENDARY')
+
+
+@dataclass(frozen=True)
+class StatRules:
+    """Stat growth constants from the game scripts"""
+    stat_growth: float
+    imprint_step: float
+    max_imprint: int
+    max_level_per_star: int
+    gear_growth: float
+    gear_max_level: Tuple[int, ...]  # By gear rarity
+
+    @classmethod
+    def from_scripts(cls, game_root: str) -> 'StatRules':
+        sources = {}
+        for path in (PLAYER_DATA_PATH, GEAR_DATA_PATH):
+            with open(os.path.join(game_root, path), 'r', encoding='utf-8') as f:
+                sources[path] = f.read()
+
+        def read(path: str, pattern: str, name: str) -> str:
+            match = re.search(pattern, sources[path], re.MULTILINE)
+            if not match:
+                raise ValueError(f"Could not find {name} in {path}")
+            return match.group(1)
+
+        max_levels = dict(re.findall(r'GearRarity\.(\w+):\s*return\s+(\d+)\s*$', sources[GEAR_DATA_PATH], re.MULTILINE))
+        missing = [r for r in RARITIES if r not in max_levels]
+        if missing:
+            raise ValueError(f"Could not find gear max levels for {', '.join(missing)} in {GEAR_DATA_PATH}")
+
+        return cls(
+            stat_growth=float(read(PLAYER_DATA_PATH, r'^const\s+STAT_GROWTH_PER_LEVEL\s*(?::\s*\w+)?\s*=\s*([0-9.]+)',
+                                   'STAT_GROWTH_PER_LEVEL')),
+            # Literals in get_unit_stats_at_level, imprint_unit and get_max_level
+            imprint_step=float(read(PLAYER_DATA_PATH, r'imprint_mult\s*=\s*1\.0\s*\+\s*\(([0-9.]+)\s*\*', 'the imprint step')),
+            max_imprint=int(read(PLAYER_DATA_PATH, r'imprint_level\s*>=\s*(\d+)', 'the max imprint')),
+            max_level_per_star=int(read(PLAYER_DATA_PATH, r'return\s+star_rating\s*\*\s*(\d+)', 'the max level')),
+            gear_growth=float(read(GEAR_DATA_PATH, r'base_value\s*\*\s*([0-9.]+)\s*/\s*max_level', 'the gear growth')),
+            gear_max_level=tuple(int(max_levels[r]) for r in RARITIES),
+        )
+
+
+class StatTableBuilder:
+    """Builds the stat tables from the .tres catalog and the script constants"""
+
+    def __init__(self, game_root: str):
+        self.game_root = game_root
+        self.parser = TresParser(game_root)
+        self.pack = ContentPackBuilder(game_root)
+        self.tables_path = os.path.join(game_root, TABLES_PATH)
+
+    def source_hash(self, rules: StatRules) -> str:
+        """Hash of the constants and of every unit and gear file"""
+        files = [f for f in self.pack.source_files()
+                 if os.sep + 'units' + os.sep in f or os.sep + 'gear' + os.sep in f]
+        digest = hashlib.sha1(json.dumps(asdict(rules), sort_keys=True).encode('utf-8'))
+        digest.update(self.pack.source_hash(files).encode('utf-8'))
+        return digest.hexdigest()
+
+    def unit_rows(self, stats: Tuple[int, int, int, int], max_level: int, rules: StatRules) -> list:
+        """get_unit_stats_at_level plus base CP, in the same float order as the GDScript"""
+        rows = []
+        for imprint in range(rules.max_imprint + 1):
+            imprint_mult = 1.0 + (rules.imprint_step * imprint)
+            for level in range(1, max_level + 1):
+                total_mult = (1.0 + (rules.stat_growth * (level - 1))) * imprint_mult
+                max_hp, attack, defense, speed = (int(value * total_mult) for value in stats)
+                rows += [max_hp, attack, defense, speed, int(max_hp / 10.0) + attack + defense + speed]
+        return rows
+
+    def gear_values(self, base_value: float, max_level: int, percentage: bool, rules: StatRules) -> list:
+        """GearData.get_stat_at_level as get_gear_bonuses adds it"""
+        growth_per_level = base_value * rules.gear_growth / max_level
+        values = (base_value + (growth_per_level * level) for level in range(max_level + 1))
+        return [value / 100.0 if percentage else int(value) for value in values]
+
+    def build(self) -> Dict[str, Any]:
+        rules = StatRules.from_scripts(self.game_root)
+        tables = {
+            'version': TABLES_VERSION,
+            'source_hash': self.source_hash(rules),
+            'unit_columns': list(UNIT_COLUMNS),
+            'units': {},
+            'gear': {},
+        }
+
+        unit_schema = self.parser.schemas.get('UnitData')
+        for unit in sorted(self.parser.get_all_units(), key=lambda r: r.file_path):
+            if '/monsters/' in self.pack.to_res_path(unit.file_path):
+                continue  # Never owned, so never drawn on a card
+            props = {**unit_schema.defaults(), **unit.properties} if unit_schema else unit.properties
+            max_level = int(props.get('star_rating', 3)) * rules.max_level_per_star
+            stats = tuple(int(props.get(key, 0)) for key in UNIT_COLUMNS[:4])
+            tables['units'][props.get('unit_id', '')] = {
+                'max_level': max_level,
+                'stats': self.unit_rows(stats, max_level, rules),
+            }
+
+        gear_schema = self.parser.schemas.get('GearData')
+        for gear in sorted(self.parser.get_all_gear(), key=lambda r: r.file_path):
+            props = {**gear_schema.defaults(), **gear.properties} if gear_schema else gear.properties
+            rarity = int(props.get('rarity', 0))
+            percentage = bool(props.get('is_percentage', False))
+            tables['gear'][props.get('gear_id', '')] = {
+                'stat_type': int(props.get('stat_type', 0)),
+                'percentage': percentage,
+                'values': self.gear_values(float(props.get('base_value', 0.0)), rules.gear_max_level[rarity],
+                                           percentage, rules),
+            }
+        return tables
+
+    def write(self, tables: Dict[str, Any]) -> int:
+        """Write the tables compactly, one unit or gear item per line. Returns bytes written."""
+        lines = []
+        for key, value in tables.items():
+            if key in ('units', 'gear'):
+                rows = [f"{json.dumps(item_id)}:{json.dumps(row, separators=(',', ':'))}"
+                        for item_id, row in sorted(value.items())]
+                lines.append(f"{json.dumps(key)}:{{\n" + ",\n".join(rows) + "\n}")
+            else:
+                lines.append(f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}")
+        text = "{\n" + ",\n".join(lines) + "\n}\n"
+        with open(self.tables_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        return len(text.encode('utf-8'))
+
+    def is_current(self) -> bool:
+        """Whether the tables on disk match the current catalog and constants"""
+        try:
+            with open(self.tables_path, 'r', encoding='utf-8') as f:
+                tables = json.load(f)
+            rules = StatRules.from_scripts(self.game_root)
+        except (OSError, ValueError):
+            return False
+        return tables.get('version') == TABLES_VERSION and tables.get('source_hash') == self.source_hash(rules)
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Precompute unit and gear stat tables for the game")
+    arg_parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                            help="Game root (folder containing project.godot)")
+    arg_parser.add_argument("--check", action="store_true", help="Exit with status 1 if the tables are stale")
+    args = arg_parser.parse_args()
+
+    builder = StatTableBuilder(os.path.normpath(args.root))
+    if args.check:
+        if builder.is_current():
+            print(f"Stat tables are up to date: {builder.tables_path}")
+            sys.exit(0)
+        print("Stat tables are stale, run: python stat_tables.py")
+        sys.exit(1)
+
+    try:
+        tables = builder.build()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    size = builder.write(tables)
+    print(f"Wrote {builder.tables_path} ({size / 1024:.1f} KB)")
+    print(f"  {len(tables['units'])} units, {len(tables['gear'])} gear")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Thumbnail Cache
+Small previews of asset images for the content editor.
+
+Thumbnails are decoded at reduced resolution (Image.draft for JPEGs, integer
+Image.reduce for everything else) so full-size images are never held in memory,
+and stored on disk in an LRU cache keyed by path + mtime + size. AsyncThumbnailer
+runs decoding on worker threads; the UI collects finished thumbnails with poll().
+"""
+
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from PIL import Image
+
+THUMBNAIL_CACHE_DIR = '.thumbnail_cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ThumbnailCache:
+    """On-disk LRU cache of PNG thumbnails"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # {file name: bytes}, least recent first
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # Recover LRU order from the last access times recorded on disk
+        with os.scandir(cache_dir) as it:
+            existing = [(e.stat().st_mtime_ns, e.name, e.stat().st_size) for e in it if e.name.endswith('.png')]
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _key(path: str, mtime_ns: int, size: Tuple[int, int]) -> str:
+        raw = f"{os.path.abspath(path)}|{mtime_ns}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest() + '.png'
+
+    def get(self, path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        """Return a thumbnail that fits in size, decoding and caching it on a miss"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        name = self._key(path, mtime_ns, size)
+        cached_path = os.path.join(self.cache_dir, name)
+
+        with self._lock:
+            hit = name in self._entries
+            if hit:
+                self._entries.move_to_end(name)
+        if hit:
+            try:
+                os.utime(cached_path)  # Record the access for the next session's LRU order
+                with Image.open(cached_path) as img:
+                    img.load()
+                    return img
+            except OSError:
+                pass  # Evicted or corrupted on disk; decode again
+
+        thumb = make_thumbnail(path, size)
+        if thumb is None:
+            return None
+        try:
+            thumb.save(cached_path, format='PNG')
+            self._add(name, os.path.getsize(cached_path))
+        except OSError:
+            pass  # Caching is best-effort
+        return thumb
+
+    def _add(self, name: str, nbytes: int):
+        with self._lock:
+            self._total_bytes += nbytes - self._entries.pop(name, 0)
+            self._entries[name] = nbytes
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_name, old_bytes = self._entries.popitem(last=False)
+                self._total_bytes -= old_bytes
+                try:
+                    os.remove(os.path.join(self.cache_dir, old_name))
+                except OSError:
+                    pass
+
+
+def make_thumbnail(path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """
+    Decode an image at reduced resolution and fit it in size.
+    Pixel art is scaled with nearest filtering so it stays crisp.
+    """
+    try:
+        with Image.open(path) as img:
+            # JPEG can decode straight to a smaller scale; other formats reduce by an integer factor
+            img.draft('RGB', size)
+            factor = max(1, min(img.width // size[0], img.height // size[1]))
+            # Reduce before converting so the conversion runs on the small image; palettes,
+            # 1-bit and colour-keyed images can't be averaged, so those convert first
+            if img.mode not in ('L', 'LA', 'RGB', 'RGBA') or 'transparency' in img.info:
+                img = img.convert('RGBA')
+            if factor > 1:
+                img = img.reduce(factor)
+            img = img.convert('RGBA')
+            img.thumbnail(size, Image.NEAREST)
+            return img
+    except Exception:
+        return None
+
+
+class AsyncThumbnailer:
+    """
+    Generates thumbnails on worker threads. request() never blocks; poll() is
+    called from the UI thread and returns [(token, image)] for finished requests.
+    """
+
+    def __init__(self, cache: ThumbnailCache, workers: int = 2):
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnail')
+        self._done: "queue.Queue[Tuple[Any, int, Optional[Image.Image]]]" = queue.Queue()
+        self._generation = 0
+
+    def request(self, path: str, size: Tuple[int, int], token: Any):
+        """Queue a thumbnail; token is handed back with the result"""
+        generation = self._generation
+        self._pool.submit(self._work, path, size, token, generation)
+
+    def cancel_pending(self):
+        """Drop results of everything requested so far (e.g. when the list is rebuilt)"""
+        self._generation += 1
+
+    def _work(self, path: str, size: Tuple[int, int], token: Any, generation: int):
+        if generation != self._generation:
+            return  # Cancelled before it started
+        self._done.put((token, generation, self.cache.get(path, size)))
+
+    def poll(self) -> List[Tuple[Any, Optional[Image.Image]]]:
+        """Collect finished thumbnails (call from the UI thread)"""
+        results = []
+        while True:
+            try:
+                token, generation, image = self._done.get_nowait()
+            except queue.Empty:
+                return results
+            if generation == self._generation:
+                results.append((token, image))
+
+    def shutdown(self):
+        self.cancel_pending()
+        self._pool.shutdown(wait=False)
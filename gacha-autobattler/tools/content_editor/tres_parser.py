@@ -8,6 +8,19 @@ import os
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 
+from gd_schema import FieldSchema, SchemaRegistry, ScriptSchema
+
+# Compiled once; the content validator parses whole catalogs with these
+HEADER_PATTERN = re.compile(r'\[gd_resource type="([^"]*)"(?:\s+script_class="([^"]*)")?(?:[^\]]*?uid="([^"]*)")?')
+EXT_RESOURCE_PATTERN = re.compile(r'\[ext_resource type="([^"]*)"(?:\s+uid="([^"]*)")?\s+path="([^"]*)"\s+id="([^"]*)"\]')
+PROPERTY_PATTERN = re.compile(r'^[ \t]*(\w+)[ \t]*=[ \t]*(.+)$', re.MULTILINE)
+INT_PATTERN = re.compile(r'^-?\d+$')
+FLOAT_PATTERN = re.compile(r'^-?\d+\.\d+$')
+COLOR_PATTERN = re.compile(r'Color\(([^)]+)\)')
+VECTOR2_PATTERN = re.compile(r'Vector2\(([^)]+)\)')
+EXT_REFERENCE_PATTERN = re.compile(r'ExtResource\("([^"]+)"\)')
+TYPED_ARRAY_PATTERN = re.compile(r'Array\[(\w+)\]\(\[(.*)\]\)', re.DOTALL)
+
 
 @dataclass
 class TresResource:
@@ -27,24 +40,27 @@ class TresParser:
         self.game_root = game_root
         self.resources_path = os.path.join(game_root, "resources")
         self.assets_path = os.path.join(game_root, "assets")
+        self.schemas = SchemaRegistry(game_root)
 
     def parse_file(self, filepath: str) -> TresResource:
         """Parse a .tres file and return a TresResource object"""
-        resource = TresResource(file_path=filepath)
-
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
+        return self.parse_text(content, filepath)
+
+    def parse_text(self, content: str, filepath: str = "") -> TresResource:
+        """Parse the contents of a .tres file"""
+        resource = TresResource(file_path=filepath)
 
         # Parse header [gd_resource ...]
-        header_match = re.search(r'\[gd_resource type="([^"]*)"(?:\s+script_class="([^"]*)")?.*?uid="([^"]*)"', content)
+        header_match = HEADER_PATTERN.search(content)
         if header_match:
             resource.resource_type = header_match.group(1)
             resource.script_class = header_match.group(2) or ""
-            resource.uid = header_match.group(3)
+            resource.uid = header_match.group(3) or ""
 
         # Parse external resources [ext_resource ...]
-        ext_pattern = r'\[ext_resource type="([^"]*)"(?:\s+uid="([^"]*)")?\s+path="([^"]*)"\s+id="([^"]*)"\]'
-        for match in re.finditer(ext_pattern, content):
+        for match in EXT_RESOURCE_PATTERN.finditer(content):
             res_type, uid, path, res_id = match.groups()
             resource.ext_resources[res_id] = {
                 'type': res_type,
@@ -53,32 +69,74 @@ class TresParser:
             }
 
         # Parse [resource] section
-        resource_section = re.search(r'\[resource\](.*?)$', content, re.DOTALL)
-        if resource_section:
-            props_text = resource_section.group(1)
-            resource.properties = self._parse_properties(props_text)
+        section_start = content.find('[resource]')
+        if section_start >= 0:
+            props_text = content[section_start + len('[resource]'):]
+            schema = self.schemas.get(resource.script_class)
+            resource.properties = self._parse_properties(props_text, schema)
 
         return resource
 
-    def _parse_properties(self, text: str) -> Dict[str, Any]:
-        """Parse property assignments from the [resource] section"""
+    def _parse_properties(self, text: str, schema: Optional[ScriptSchema] = None) -> Dict[str, Any]:
+        """Parse property assignments from the [resource] section, typed by the script schema if known"""
         props = {}
-        lines = text.strip().split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            # Match property = value
-            match = re.match(r'(\w+)\s*=\s*(.+)$', line)
-            if match:
-                key = match.group(1)
-                value_str = match.group(2)
+        fields = schema.fields if schema else {}
+
+        for match in PROPERTY_PATTERN.finditer(text):
+            key, value_str = match.groups()
+            schema_field = fields.get(key)
+            if schema_field is not None:
+                props[key] = self._parse_typed(value_str, schema_field)
+            else:
                 props[key] = self._parse_value(value_str)
 
         return props
 
+    def _parse_typed(self, value_str: str, schema_field: FieldSchema) -> Any:
+        """Parse a value as its declared type; malformed values fall back to _parse_value for validate() to report"""
+        value_str = value_str.strip()
+        kind = schema_field.kind
+        try:
+            if value_str == 'null' and kind in ('Resource', 'Array'):
+                return None
+            if kind == 'String':
+                if value_str.startswith('"') and value_str.endswith('"') and len(value_str) >= 2:
+                    return value_str[1:-1]
+            elif kind == 'bool':
+                if value_str in ('true', 'false'):
+                    return value_str == 'true'
+            elif kind in ('int', 'enum'):
+                return int(value_str)
+            elif kind == 'float':
+                return float(value_str)
+        except ValueError:
+            pass
+        # Colors, vectors, arrays and references have a single spelling each
+        return self._parse_value(value_str)
+
+    def new_resource(self, script_class: str, filepath: str = "", **properties) -> TresResource:
+        """Create a resource with the schema's default values, overridden by properties"""
+        schema = self.schemas.get(script_class)
+        if schema is None:
+            raise ValueError(f"No schema for {script_class}")
+
+        resource = TresResource(resource_type="Resource", script_class=script_class, file_path=filepath)
+        resource.uid = self.generate_uid(schema.uid_prefix)
+        resource.ext_resources = {
+            '1_script': {'type': 'Script', 'uid': '', 'path': schema.script_path}
+        }
+        resource.properties = {'script': {'type': 'ExtResource', 'id': '1_script'}}
+        resource.properties.update(schema.defaults())
+        resource.properties.update(properties)
+        return resource
+
+    def validate(self, resource: TresResource) -> List[str]:
+        """Check a resource's properties against its script schema"""
+        schema = self.schemas.get(resource.script_class)
+        if schema is None:
+            return [f"No schema for script class '{resource.script_class}'"] if resource.script_class else []
+        return schema.validate(resource.properties)
+
     def _parse_value(self, value_str: str) -> Any:
         """Parse a Godot value string into Python type"""
         value_str = value_str.strip()
@@ -98,32 +156,32 @@ class TresParser:
             return None
 
         # Integer
-        if re.match(r'^-?\d+$', value_str):
+        if INT_PATTERN.match(value_str):
             return int(value_str)
 
         # Float
-        if re.match(r'^-?\d+\.\d+$', value_str):
+        if FLOAT_PATTERN.match(value_str):
             return float(value_str)
 
         # Color
-        color_match = re.match(r'Color\(([^)]+)\)', value_str)
+        color_match = COLOR_PATTERN.match(value_str)
         if color_match:
             parts = [float(x.strip()) for x in color_match.group(1).split(',')]
             return {'type': 'Color', 'values': parts}
 
         # Vector2
-        vec2_match = re.match(r'Vector2\(([^)]+)\)', value_str)
+        vec2_match = VECTOR2_PATTERN.match(value_str)
         if vec2_match:
             parts = [float(x.strip()) for x in vec2_match.group(1).split(',')]
             return {'type': 'Vector2', 'values': parts}
 
         # ExtResource reference
-        ext_match = re.match(r'ExtResource\("([^"]+)"\)', value_str)
+        ext_match = EXT_REFERENCE_PATTERN.match(value_str)
         if ext_match:
             return {'type': 'ExtResource', 'id': ext_match.group(1)}
 
         # Array
-        array_match = re.match(r'Array\[(\w+)\]\(\[(.*)\]\)', value_str, re.DOTALL)
+        array_match = TYPED_ARRAY_PATTERN.match(value_str)
         if array_match:
             array_type = array_match.group(1)
             items_str = array_match.group(2).strip()
@@ -177,7 +235,10 @@ class TresParser:
         header = f'[gd_resource type="{resource.resource_type}"'
         if resource.script_class:
             header += f' script_class="{resource.script_class}"'
-        header += f' load_steps={load_steps} format=3 uid="{resource.uid}"]'
+        header += f' load_steps={load_steps} format=3'
+        if resource.uid:
+            header += f' uid="{resource.uid}"'
+        header += ']'
         lines.append(header)
         lines.append('')
 
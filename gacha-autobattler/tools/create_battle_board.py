@@ -1,556 +1,553 @@
 """
 Create battle board backgrounds using various tilesets.
 Supports multiple themes: dungeon, forest, cloud/sky.
+
+Themes are described declaratively in board_themes.json (tiles, fill pattern,
+border, decoration scatter, cell and overlay tints, and which chapters use
+them). One rendering engine turns each theme into a board, a grid cell and
+ownership / field effect overlays, and themes render in parallel.
+
+Builds are incremental: every target (one asset kind of one theme, plus the
+highlights) declares its input images and spec parameters, and is only rebuilt
+when their hash differs from the one recorded in the build manifest or an
+output is missing. Outputs shared by several paths are encoded once and
+hardlinked.
+
+Usage:
+    python create_battle_board.py
+    python create_battle_board.py --dry-run
+    python create_battle_board.py --native
+    python create_battle_board.py --themes forest cloud --workers 2
+    python create_battle_board.py --force
 """
 
 from PIL import Image
+import argparse
+import hashlib
+import json
 import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
+from png_optimizer import encode_png
+
 # Paths
 GAME_ROOT = Path(__file__).parent.parent
-TILES_DIR = GAME_ROOT / "assets/board/tiles"
-FOREST_DIR = GAME_ROOT / "assets/board/forest tileset"
-CLOUD_DIR = GAME_ROOT / "assets/board/cloud_tileset"
 OUTPUT_DIR = GAME_ROOT / "assets/board"
 BOARDS_DIR = OUTPUT_DIR / "boards"
+CELLS_DIR = OUTPUT_DIR / "cells"
+THEME_SPEC_FILE = Path(__file__).parent / "board_themes.json"
+
+# Incremental builds: target id -> {"key": input hash, "outputs": [...]}
+BUILD_MANIFEST_FILE = OUTPUT_DIR / ".build_manifest.json"
+GENERATOR_FILES = [Path(__file__), Path(__file__).parent / "png_optimizer.py"]
+
+# Asset kinds rendered for every theme
+ASSET_KINDS = ["board", "cell", "ownership", "field_effects"]
+# Shared spec fields each asset kind depends on
+SHARED_PARAMS = {
+    "board": ["board_display_size"],
+    "cell": ["cell_display_size"],
+    "ownership": ["cell_display_size"],
+    "field_effects": ["cell_display_size", "field_effect_colors"],
+}
+OVERLAY_LABELS = {"ownership": "ownership overlays", "field_effects": "field effect overlays"}
+
+
+# === Tileset cache ===
+# Each sheet is decoded and converted to RGBA once per process, and tiles are
+# memoized as read-only arrays keyed by (sheet, col, row, size).
+
+@lru_cache(maxsize=None)
+def load_sheet(path):
+    """Load a tileset or sprite image as a read-only RGBA array (cached)."""
+    with Image.open(path) as img:
+        pixels = np.array(img.convert("RGBA"))
+    pixels.setflags(write=False)
+    return pixels
+
+
+def load_image(path):
+    """Load a sprite image as an RGBA PIL image, backed by the sheet cache."""
+    return Image.fromarray(load_sheet(path), "RGBA")
+
+
+@lru_cache(maxsize=None)
+def load_scaled_sprite(path, scale):
+    """Load a sprite upscaled by an integer factor with nearest filtering (cached)."""
+    sprite = load_image(path)
+    return sprite.resize((sprite.width * scale, sprite.height * scale), Image.NEAREST)
+
+
+@lru_cache(maxsize=None)
+def get_tile(sheet_path, col, row, size):
+    """Return one size x size tile of a sheet as an RGBA array (cached)."""
+    sheet = load_sheet(sheet_path)
+    tile = np.zeros((size, size, 4), dtype=np.uint8)  # Out-of-bounds areas stay transparent, like crop()
+    region = sheet[row * size:(row + 1) * size, col * size:(col + 1) * size]
+    tile[:region.shape[0], :region.shape[1]] = region
+    tile.setflags(write=False)
+    return tile
+
+
+def spec_tile(ref):
+    """Resolve a spec tile reference [sheet, col, row, size] (sheet relative to OUTPUT_DIR)."""
+    sheet, col, row, size = ref
+    return get_tile(OUTPUT_DIR / sheet, col, row, size)
+
+
+def render_tile_map(tiles, index_map, size=None):
+    """
+    Render a 2D array of tile indices into one RGBA image with a single gather.
+    Index -1 is an empty (fully transparent) tile. The result is cropped to size
+    (width, height) if given.
+    """
+    index_map = np.asarray(index_map, dtype=np.intp)
+    stack = np.stack(list(tiles) + [np.zeros_like(tiles[0])])  # Trailing empty tile for index -1
+    rows, cols = index_map.shape
+    _, tile_h, tile_w, channels = stack.shape
+
+    # (rows, cols, tile_h, tile_w, 4) -> (rows * tile_h, cols * tile_w, 4)
+    pixels = stack[index_map].transpose(0, 2, 1, 3, 4).reshape(rows * tile_h, cols * tile_w, channels)
+    if size is not None:
+        pixels = pixels[:size[1], :size[0]]
+    return Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
+
+
+def place_layer(board, layer, position=(0, 0), masked=False):
+    """Paste a rendered tile layer onto a board, alpha-blended through its own alpha if masked."""
+    board.paste(layer, position, layer if masked else None)
+
+def write_outputs(data, paths):
+    """
+    Write encoded PNG bytes to the first path and hardlink the other paths to it
+    (falling back to a copy where hardlinks are not supported).
+    """
+    first, *rest = [Path(p) for p in paths]
+    first.parent.mkdir(parents=True, exist_ok=True)
+    first.unlink(missing_ok=True)  # Never write through a hardlink left by a previous build
+    first.write_bytes(data)
+    for path in rest:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        try:
+            os.link(first, path)
+        except OSError:
+            shutil.copyfile(first, path)
+
+
+def export_image(img, display_size, paths, native=False):
+    """
+    Save a composed image to one or more paths (encoded once, see write_outputs).
+    By default it is upscaled to display_size with nearest filtering first. With
+    native=True the composite is saved as-is; the game scales textures to its own
+    display size when it draws them.
+    """
+    if not native and img.size != tuple(display_size):
+        img = img.resize(display_size, Image.NEAREST)
+
+    data, _ = encode_png(img)
+    write_outputs(data, paths)
+    return img
 
-# Tile sizes
-DUNGEON_TILE_SIZE = 32
-FOREST_TILE_SIZE = 16
-
-def extract_tile(img, col, row, tile_size=DUNGEON_TILE_SIZE):
-    """Extract a single tile from the tileset."""
-    x = col * tile_size
-    y = row * tile_size
-    return img.crop((x, y, x + tile_size, y + tile_size))
-
-def create_battle_board():
-    """Create the main battle board background."""
-
-    # Load tilesets
-    walls_floors = Image.open(TILES_DIR / "Dungeon_WallsAndFloors.png").convert("RGBA")
-    decorations = Image.open(TILES_DIR / "DungeonDecorations.png").convert("RGBA")
-
-    # Board dimensions (in tiles)
-    # We want a larger arena with the 3x3 grid in the center
-    board_width_tiles = 20
-    board_height_tiles = 14
-
-    # Create the board canvas
-    board_width = board_width_tiles * DUNGEON_TILE_SIZE
-    board_height = board_height_tiles * DUNGEON_TILE_SIZE
-    board = Image.new("RGBA", (board_width, board_height), (0, 0, 0, 255))
-
-    # Extract useful tiles from Dungeon_WallsAndFloors.png
-    # Row 0: Stone floor variations
-    stone_floor_1 = extract_tile(walls_floors, 0, 0)  # Main stone floor
-    stone_floor_2 = extract_tile(walls_floors, 1, 0)  # Stone floor variant
-    stone_floor_3 = extract_tile(walls_floors, 2, 0)  # Stone floor variant
-
-    # Row 4-5: Brick/wall tiles (yellow/gold bricks)
-    gold_brick = extract_tile(walls_floors, 0, 4)
-
-    # Fill the entire board with stone floor first
-    for y in range(board_height_tiles):
-        for x in range(board_width_tiles):
-            # Alternate floor tiles for variety
-            if (x + y) % 3 == 0:
-                tile = stone_floor_2
-            elif (x + y) % 3 == 1:
-                tile = stone_floor_3
-            else:
-                tile = stone_floor_1
-            board.paste(tile, (x * DUNGEON_TILE_SIZE, y * DUNGEON_TILE_SIZE))
-
-    # Add a border around the arena with gold bricks
-    # Top and bottom borders
-    for x in range(board_width_tiles):
-        board.paste(gold_brick, (x * DUNGEON_TILE_SIZE, 0))
-        board.paste(gold_brick, (x * DUNGEON_TILE_SIZE, (board_height_tiles - 1) * DUNGEON_TILE_SIZE))
-
-    # Left and right borders
-    for y in range(board_height_tiles):
-        board.paste(gold_brick, (0, y * DUNGEON_TILE_SIZE))
-        board.paste(gold_brick, ((board_width_tiles - 1) * DUNGEON_TILE_SIZE, y * DUNGEON_TILE_SIZE))
-
-    # Scale up for the game (the game expects a larger board)
-    final_width = 1920
-    final_height = 1080
-    board = board.resize((final_width, final_height), Image.NEAREST)
-
-    # Save the board - both to legacy location and boards folder
-    BOARDS_DIR.mkdir(exist_ok=True)
-    output_path = OUTPUT_DIR / "dungeon_board.png"
-    board.save(output_path)
-    board.save(BOARDS_DIR / "chapter_2_board.png")  # Arena/Dungeon for Chapter 2
-    print(f"Saved dungeon board to: {output_path}")
-
-    return board
-
-
-def create_forest_board():
-    """Create a forest-themed battle board for Chapter 1."""
-
-    # Load forest tiles - use the 3x3 simplified versions for cleaner tiling
-    grass_3x3 = Image.open(FOREST_DIR / "grass_3x3.png").convert("RGBA")
-    grass_dark_3x3 = Image.open(FOREST_DIR / "grass_dark_3x3.png").convert("RGBA")
-
-    # Load decorations for border
-    tree1 = Image.open(FOREST_DIR / "tree1.png").convert("RGBA")
-    tree2 = Image.open(FOREST_DIR / "tree2.png").convert("RGBA")
-    bush1 = Image.open(FOREST_DIR / "decor_bush1.png").convert("RGBA")
-    bush2 = Image.open(FOREST_DIR / "decor_bush2.png").convert("RGBA")
-
-    # grass_3x3 is 144x48 - that's 3 tiles of 48x48
-    GRASS_TILE = 48
-
-    def extract_grass_tile(img, index):
-        """Extract a 48x48 tile from the 3x3 grass sheet."""
-        x = index * GRASS_TILE
-        return img.crop((x, 0, x + GRASS_TILE, GRASS_TILE))
-
-    # Get the three grass variants
-    grass_tiles = [extract_grass_tile(grass_3x3, i) for i in range(3)]
-    grass_dark_tiles = [extract_grass_tile(grass_dark_3x3, i) for i in range(3)]
-
-    # Board dimensions (using 48x48 tiles)
-    board_width = 1200
-    board_height = 750
-
-    # Create base board with dark green background
-    board = Image.new("RGBA", (board_width, board_height), (25, 40, 20, 255))
-
-    # Fill with grass tiles - mix light and dark for natural look
-    import random
-    random.seed(42)  # Consistent generation
-
-    tiles_x = board_width // GRASS_TILE + 1
-    tiles_y = board_height // GRASS_TILE + 1
 
-    for y in range(tiles_y):
-        for x in range(tiles_x):
-            # Mostly light grass, some dark patches
-            if random.random() < 0.25:
-                tile = random.choice(grass_dark_tiles)
+# === Theme spec ===
+
+def load_theme_spec(path=THEME_SPEC_FILE):
+    """Load the board theme spec (see board_themes.json)."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fill_index_map(fill, cols, rows, rng):
+    """
+    Build the (tiles, index_map) pair for a board fill.
+      diagonal: tiles[(x + y) % len(tiles)]
+      random:   per tile, pick a group by cumulative chance (the last group takes
+                the remainder), then a random tile within that group
+    """
+    if fill["type"] == "diagonal":
+        tiles = [spec_tile(ref) for ref in fill["tiles"]]
+        ys, xs = np.indices((rows, cols))
+        return tiles, (xs + ys) % len(tiles)
+
+    if fill["type"] == "random":
+        groups = fill["groups"]
+        tiles, offsets = [], []
+        for group in groups:
+            offsets.append(len(tiles))
+            tiles.extend(spec_tile(ref) for ref in group["tiles"])
+
+        index_map = np.empty((rows, cols), dtype=np.intp)
+        for y in range(rows):
+            for x in range(cols):
+                roll = rng.random()
+                chosen, cumulative = len(groups) - 1, 0.0
+                for i, group in enumerate(groups[:-1]):
+                    cumulative += group["chance"]
+                    if roll < cumulative:
+                        chosen = i
+                        break
+                index_map[y, x] = offsets[chosen] + rng.randrange(len(groups[chosen]["tiles"]))
+        return tiles, index_map
+
+    raise ValueError(f"Unknown fill type: {fill['type']}")
+
+
+def edge_positions(edges, size, rng):
+    """
+    Scatter positions along the board edges.
+    Each edge walks range(margin, length - margin, spacing) along its side, sits
+    offset pixels in from it, and jitters both coordinates by randint(jitter).
+    """
+    width, height = size
+    positions = []
+    for edge in edges:
+        side = edge["edge"]
+        length = width if side in ("top", "bottom") else height
+        margin = edge.get("margin", 0)
+        offset = edge.get("offset", 0)
+        for v in range(margin, length - margin, edge["spacing"]):
+            dx = rng.randint(*edge["jitter_x"])
+            dy = rng.randint(*edge["jitter_y"])
+            if side == "top":
+                positions.append((v + dx, offset + dy))
+            elif side == "bottom":
+                positions.append((v + dx, height - offset + dy))
+            elif side == "left":
+                positions.append((offset + dx, v + dy))
+            elif side == "right":
+                positions.append((width - offset + dx, v + dy))
             else:
-                tile = random.choice(grass_tiles)
-            board.paste(tile, (x * GRASS_TILE, y * GRASS_TILE))
-
-    # Add trees around the border
-    tree_positions = []
-
-    # Top edge trees
-    for x in range(0, board_width, 80):
-        tree_positions.append((x + random.randint(-10, 10), random.randint(-20, 30)))
-
-    # Bottom edge trees
-    for x in range(0, board_width, 80):
-        tree_positions.append((x + random.randint(-10, 10), board_height - 100 + random.randint(-10, 20)))
-
-    # Left edge trees
-    for y in range(100, board_height - 100, 100):
-        tree_positions.append((random.randint(-20, 40), y + random.randint(-20, 20)))
-
-    # Right edge trees
-    for y in range(100, board_height - 100, 100):
-        tree_positions.append((board_width - 80 + random.randint(-20, 20), y + random.randint(-20, 20)))
-
-    # Draw trees
-    trees = [tree1, tree2]
-    for px, py in tree_positions:
-        tree = random.choice(trees)
-        # Scale tree up a bit
-        scaled_tree = tree.resize((tree.width * 3, tree.height * 3), Image.NEAREST)
-        board.paste(scaled_tree, (px, py), scaled_tree)
-
-    # Add some bushes in front of trees
-    for px, py in tree_positions[::2]:
-        bush = random.choice([bush1, bush2])
-        scaled_bush = bush.resize((bush.width * 2, bush.height * 2), Image.NEAREST)
-        board.paste(scaled_bush, (px + 20, py + 60), scaled_bush)
-
-    # Scale to game resolution
-    board = board.resize((1920, 1080), Image.NEAREST)
-
-    # Save
-    BOARDS_DIR.mkdir(exist_ok=True)
-    board.save(BOARDS_DIR / "chapter_1_board.png")
-    print(f"Saved forest board to: {BOARDS_DIR / 'chapter_1_board.png'}")
+                raise ValueError(f"Unknown edge: {side}")
+    return positions
+
+
+def scatter_decorations(board, decorations, rng):
+    """Paste randomly chosen sprites along the edges, then companions on every Nth one."""
+    positions = edge_positions(decorations["edges"], board.size, rng)
+    sprites = [OUTPUT_DIR / s for s in decorations["sprites"]]
+    for px, py in positions:
+        sprite = load_scaled_sprite(rng.choice(sprites), decorations["scale"])
+        board.paste(sprite, (px, py), sprite)
+
+    companions = decorations.get("companions")
+    if companions:
+        sprites = [OUTPUT_DIR / s for s in companions["sprites"]]
+        ox, oy = companions["offset"]
+        for px, py in positions[::companions["every"]]:
+            sprite = load_scaled_sprite(rng.choice(sprites), companions["scale"])
+            board.paste(sprite, (px + ox, py + oy), sprite)
+
+
+def render_board(spec):
+    """Compose a theme's board background at its native size."""
+    rng = random.Random(spec.get("seed", 0))
+    tile_size = spec.get("tile_size")
+    cols, rows = spec.get("tiles", (0, 0))
+    size = tuple(spec.get("size") or (cols * tile_size, rows * tile_size))
+    board = Image.new("RGBA", size, tuple(spec.get("background", (0, 0, 0, 255))))
+
+    if "background_image" in spec:
+        # Tile the image over the whole board
+        image = load_sheet(OUTPUT_DIR / spec["background_image"])
+        img_h, img_w = image.shape[:2]
+        image_map = np.zeros((-(-size[1] // img_h), -(-size[0] // img_w)), dtype=np.intp)
+        place_layer(board, render_tile_map([image], image_map, size))
+
+    if "fill" in spec:
+        tiles, index_map = fill_index_map(spec["fill"], cols, rows, rng)
+        if "border" in spec:
+            border = len(tiles)
+            tiles = tiles + [spec_tile(spec["border"]["tile"])]
+            index_map[[0, -1], :] = border
+            index_map[:, [0, -1]] = border
+        place_layer(board, render_tile_map(tiles, index_map, size), masked=spec.get("masked", False))
+
+    if "platform" in spec:
+        platform = spec["platform"]
+        platform_cols, platform_rows = platform["tiles"]
+        tiles = [spec_tile(platform["top"]), spec_tile(platform["bottom"]), spec_tile(platform["fill"])]
+        platform_map = np.full((platform_rows, platform_cols), 2, dtype=np.intp)
+        platform_map[0, :] = 0
+        platform_map[-1, :] = 1
+        place_layer(board, render_tile_map(tiles, platform_map), tuple(platform["position"]), masked=True)
+
+    if "decorations" in spec:
+        scatter_decorations(board, spec["decorations"], rng)
 
     return board
 
 
-def create_cloud_board():
-    """Create a cloud/sky-themed battle board for future chapters."""
-
-    # Load cloud tileset
-    cloud_tiles = Image.open(CLOUD_DIR / "cloud_tileset.png").convert("RGBA")
-    bg_sky = Image.open(CLOUD_DIR / "bg_bluesky.png").convert("RGBA")
-
-    # Cloud tiles appear to be 16x16
-    def extract_cloud_tile(img, col, row, size=16):
-        x = col * size
-        y = row * size
-        return img.crop((x, y, x + size, y + size))
-
-    # Extract cloud platform tiles (examine tileset for good ones)
-    # Top row usually has platform tops
-    cloud_top = extract_cloud_tile(cloud_tiles, 1, 1)
-    cloud_mid = extract_cloud_tile(cloud_tiles, 1, 2)
-    cloud_fill = extract_cloud_tile(cloud_tiles, 2, 2)
-
-    # Board dimensions
-    board_width = 1920
-    board_height = 1080
-
-    # Create sky background by tiling
-    board = Image.new("RGBA", (board_width, board_height), (135, 206, 235, 255))
-
-    # Tile the sky background
-    sky_w, sky_h = bg_sky.size
-    for y in range(0, board_height, sky_h):
-        for x in range(0, board_width, sky_w):
-            board.paste(bg_sky, (x, y))
-
-    # Add cloud platforms in the arena area
-    cloud_tile_size = 16
-    arena_left = 400
-    arena_top = 200
-    arena_width = 35
-    arena_height = 20
-
-    for y in range(arena_height):
-        for x in range(arena_width):
-            px = arena_left + x * cloud_tile_size
-            py = arena_top + y * cloud_tile_size
-            if y == 0:
-                board.paste(cloud_top, (px, py), cloud_top)
-            elif y == arena_height - 1:
-                board.paste(cloud_mid, (px, py), cloud_mid)
+def compose_theme_cell(spec):
+    """Compose a cell background from a theme's cell/overlay spec."""
+    return compose_cell(spec_tile(spec["tile"]), spec["tiles_across"], tuple(spec["background"]),
+                        masked=spec.get("masked", False))
+
+
+def overlay_colors(theme, kind, shared):
+    """Tint colors for an overlay kind; field effects fall back to the shared palette."""
+    return theme[kind].get("colors") or shared["field_effect_colors"]
+
+
+def asset_paths(theme, kind, variant=None):
+    """Every output path of one theme asset (variant is the overlay color name)."""
+    chapters = theme["chapters"]
+    legacy = [OUTPUT_DIR / p for p in theme.get("legacy_outputs", {}).get(kind, [])]
+    if kind == "board":
+        return legacy + [BOARDS_DIR / f"chapter_{c}_board.png" for c in chapters]
+    if kind == "cell":
+        return legacy + [CELLS_DIR / f"chapter_{c}_cell.png" for c in chapters]
+
+    folder = OUTPUT_DIR / kind
+    paths = [folder / f"{variant}.png"] if theme.get("default", False) else []
+    return paths + [folder / f"chapter_{c}" / f"{variant}.png" for c in chapters]
+
+
+def render_theme_asset(name, theme, kind, shared, native=False):
+    """
+    Render one asset kind (board, cell, ownership or field_effects) of a theme and
+    save it for every chapter that uses the theme.
+    """
+    chapters = theme["chapters"]
+    default = theme.get("default", False)
+
+    if kind == "board":
+        board = render_board(theme["board"])
+        export_image(board, shared["board_display_size"], asset_paths(theme, kind), native)
+        print(f"Saved {name} board (chapters {chapters})")
+
+    elif kind == "cell":
+        cell = compose_theme_cell(theme["cell"])
+        add_cell_border(cell, tuple(theme["cell"]["border"]))
+        export_image(cell, shared["cell_display_size"], asset_paths(theme, kind), native)
+        print(f"Saved {name} grid cell (chapters {chapters})")
+
+    else:
+        overlay_spec = theme[kind]
+        base = compose_theme_cell(overlay_spec)
+        overlays = tinted_overlays(base, overlay_colors(theme, kind, shared), overlay_spec["intensity"])
+        for color_name, overlay in overlays.items():
+            export_image(overlay, shared["cell_display_size"], asset_paths(theme, kind, color_name), native)
+        print(f"Saved {name} {OVERLAY_LABELS[kind]} (chapters {chapters}{' / default' if default else ''})")
+
+
+# === Build graph ===
+
+@lru_cache(maxsize=None)
+def file_digest(path):
+    """SHA-256 of a file's contents, or "missing" if it does not exist (cached per run)."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+
+def spec_inputs(node):
+    """Collect every image a spec subtree references (any string ending in .png)."""
+    if isinstance(node, str):
+        return {OUTPUT_DIR / node} if node.lower().endswith(".png") else set()
+    if isinstance(node, dict):
+        node = list(node.values())
+    if isinstance(node, list):
+        return set().union(*(spec_inputs(item) for item in node)) if node else set()
+    return set()
+
+
+def build_targets(spec, theme_names=None, native=False):
+    """
+    Declare one build target per theme asset plus one for the highlights. Each
+    target lists its input images, the parameters it is rendered from, its output
+    paths and the task that renders it.
+    """
+    themes = spec["themes"]
+    theme_names = theme_names or list(themes)
+    for name in theme_names:
+        if name not in themes:
+            raise ValueError(f"Unknown theme: {name} (available: {', '.join(themes)})")
+
+    shared = {k: v for k, v in spec.items() if k != "themes"}
+    targets = []
+    for name in theme_names:
+        theme = themes[name]
+        for kind in ASSET_KINDS:
+            if kind in ("board", "cell"):
+                outputs = asset_paths(theme, kind)
             else:
-                board.paste(cloud_fill, (px, py), cloud_fill)
-
-    # Scale with nearest neighbor to keep pixel art crisp
-    # (already at target resolution)
-
-    # Save
-    BOARDS_DIR.mkdir(exist_ok=True)
-    board.save(BOARDS_DIR / "chapter_3_board.png")
-    print(f"Saved cloud board to: {BOARDS_DIR / 'chapter_3_board.png'}")
-
-    return board
-
-
-def create_grid_cell_tile():
-    """Create grid cell tiles for each theme."""
-
-    CELLS_DIR = OUTPUT_DIR / "cells"
-    CELLS_DIR.mkdir(exist_ok=True)
-
-    # === DUNGEON CELL ===
-    walls_floors = Image.open(TILES_DIR / "Dungeon_WallsAndFloors.png").convert("RGBA")
-    base_tile = extract_tile(walls_floors, 0, 0)
-
-    cell_size_tiles = 4
-    cell = Image.new("RGBA", (cell_size_tiles * DUNGEON_TILE_SIZE, cell_size_tiles * DUNGEON_TILE_SIZE), (0, 0, 0, 0))
-
-    for y in range(cell_size_tiles):
-        for x in range(cell_size_tiles):
-            cell.paste(base_tile, (x * DUNGEON_TILE_SIZE, y * DUNGEON_TILE_SIZE))
-
-    # Add border
-    add_cell_border(cell, (80, 70, 60, 255))
-    cell = cell.resize((150, 150), Image.NEAREST)
-
-    # Save dungeon cell
-    cell.save(OUTPUT_DIR / "grid_cell_tile.png")  # Legacy location
-    cell.save(CELLS_DIR / "chapter_2_cell.png")
-    print(f"Saved dungeon grid cell")
-
-    # === FOREST CELL ===
-    grass_3x3 = Image.open(FOREST_DIR / "grass_3x3.png").convert("RGBA")
-
-    # Extract a 48x48 grass tile
-    grass_tile = grass_3x3.crop((0, 0, 48, 48))
-
-    # Create cell from grass (3x3 of 48px tiles = 144x144)
-    forest_cell = Image.new("RGBA", (144, 144), (30, 50, 25, 255))
-
-    for y in range(3):
-        for x in range(3):
-            forest_cell.paste(grass_tile, (x * 48, y * 48))
-
-    # Add natural wood/earth border
-    add_cell_border(forest_cell, (60, 45, 30, 255))
-    forest_cell = forest_cell.resize((150, 150), Image.NEAREST)
-    forest_cell.save(CELLS_DIR / "chapter_1_cell.png")
-    print(f"Saved forest grid cell")
-
-    # === CLOUD CELL ===
-    cloud_tiles = Image.open(CLOUD_DIR / "cloud_tileset.png").convert("RGBA")
-
-    def extract_cloud_tile(img, col, row, size=16):
-        x = col * size
-        y = row * size
-        return img.crop((x, y, x + size, y + size))
-
-    cloud_tile = extract_cloud_tile(cloud_tiles, 2, 2)
-
-    cloud_cell_tiles = 8
-    cloud_cell = Image.new("RGBA", (cloud_cell_tiles * 16, cloud_cell_tiles * 16), (200, 220, 255, 255))
-
-    for y in range(cloud_cell_tiles):
-        for x in range(cloud_cell_tiles):
-            cloud_cell.paste(cloud_tile, (x * 16, y * 16), cloud_tile)
-
-    add_cell_border(cloud_cell, (180, 200, 255, 255))
-    cloud_cell = cloud_cell.resize((150, 150), Image.NEAREST)
-    cloud_cell.save(CELLS_DIR / "chapter_3_cell.png")
-    print(f"Saved cloud grid cell")
-
-    return cell
+                outputs = [p for color in overlay_colors(theme, kind, shared) for p in asset_paths(theme, kind, color)]
+            targets.append({
+                "id": f"{name}/{kind}",
+                "inputs": sorted(spec_inputs(theme[kind])),
+                "params": {
+                    "spec": theme[kind],
+                    "chapters": theme["chapters"],
+                    "default": theme.get("default", False),
+                    "legacy_outputs": theme.get("legacy_outputs", {}).get(kind, []),
+                    "shared": {key: shared[key] for key in SHARED_PARAMS[kind]},
+                    "native": native,
+                },
+                "outputs": outputs,
+                "task": (render_theme_asset, (name, theme, kind, shared, native)),
+            })
+
+    targets.append({
+        "id": "highlights",
+        "inputs": [],
+        "params": {"spec": shared["highlights"]},
+        "outputs": [OUTPUT_DIR / f"cell_highlight_{name}.png" for name in shared["highlights"]],
+        "task": (create_cell_highlight, (shared["highlights"],)),
+    })
+    return targets
+
+
+def target_key(target):
+    """Hash of everything a target's outputs depend on: params, input images and generator code."""
+    inputs = {Path(p).relative_to(GAME_ROOT).as_posix(): file_digest(p) for p in target["inputs"]}
+    generator = {p.name: file_digest(p) for p in GENERATOR_FILES}
+    payload = json.dumps({"params": target["params"], "inputs": inputs, "generator": generator}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest():
+    """Load the build manifest (empty if no build has been recorded yet)."""
+    if not BUILD_MANIFEST_FILE.exists():
+        return {}
+    return json.loads(BUILD_MANIFEST_FILE.read_text(encoding="utf-8"))
+
+
+def stale_targets(targets, manifest, force=False):
+    """Return [(target, reason)] for every target that needs rebuilding."""
+    stale = []
+    for target in targets:
+        record = manifest.get(target["id"])
+        missing = [p for p in target["outputs"] if not Path(p).exists()]
+        if force:
+            reason = "forced"
+        elif record is None:
+            reason = "never built"
+        elif record["key"] != target_key(target):
+            reason = "inputs changed"
+        elif missing:
+            reason = f"missing {Path(missing[0]).relative_to(OUTPUT_DIR).as_posix()}"
+        else:
+            continue
+        stale.append((target, reason))
+    return stale
+
+
+def build(targets, workers=None, force=False, dry_run=False):
+    """
+    Rebuild the stale targets across a process pool and record them in the
+    manifest. With dry_run=True only report what would be rebuilt.
+    Returns the list of (target, reason) that were (or would be) rebuilt.
+    """
+    manifest = load_manifest()
+    stale = stale_targets(targets, manifest, force)
+
+    print(f"{len(stale)} of {len(targets)} targets stale")
+    for target, reason in stale:
+        print(f"  {target['id']:<24} {reason}")
+    if dry_run or not stale:
+        return stale
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(target, pool.submit(target["task"][0], *target["task"][1])) for target, _ in stale]
+        for target, future in futures:
+            future.result()
+            manifest[target["id"]] = {
+                "key": target_key(target),
+                "outputs": [Path(p).relative_to(OUTPUT_DIR).as_posix() for p in target["outputs"]],
+            }
+
+    BUILD_MANIFEST_FILE.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return stale
+
+
+def paint_border(img, color, thickness):
+    """Paint a solid border of the given thickness around an image, in place."""
+    width, height = img.size
+    img.paste(color, (0, 0, width, thickness))
+    img.paste(color, (0, height - thickness, width, height))
+    img.paste(color, (0, 0, thickness, height))
+    img.paste(color, (width - thickness, 0, width, height))
 
 
 def add_cell_border(cell, border_color):
     """Add a border to a cell image."""
-    pixels = cell.load()
-    width, height = cell.size
+    paint_border(cell, border_color, 2)
 
-    for i in range(2):
-        for x in range(width):
-            pixels[x, i] = border_color
-            pixels[x, height - 1 - i] = border_color
-        for y in range(height):
-            pixels[i, y] = border_color
-            pixels[width - 1 - i, y] = border_color
-
-def create_cell_highlight():
-    """Create highlight overlays for grid cells."""
+def create_cell_highlight(highlights):
+    """Create highlight overlays for grid cells. These are always display size."""
 
     size = 150
 
-    # Player highlight (blue)
-    player_highlight = Image.new("RGBA", (size, size), (50, 100, 200, 80))
-    player_highlight.save(OUTPUT_DIR / "cell_highlight_player.png")
-
-    # Enemy highlight (red)
-    enemy_highlight = Image.new("RGBA", (size, size), (200, 50, 50, 80))
-    enemy_highlight.save(OUTPUT_DIR / "cell_highlight_enemy.png")
-
-    # Contested highlight (purple)
-    contested_highlight = Image.new("RGBA", (size, size), (150, 50, 150, 80))
-    contested_highlight.save(OUTPUT_DIR / "cell_highlight_contested.png")
-
-    # Hover highlight (white)
-    hover_highlight = Image.new("RGBA", (size, size), (255, 255, 255, 40))
-    hover_highlight.save(OUTPUT_DIR / "cell_highlight_hover.png")
+    # One flat translucent square per highlight (player, enemy, contested, hover)
+    for name, color in highlights.items():
+        highlight = Image.new("RGBA", (size, size), tuple(color))
+        write_outputs(encode_png(highlight)[0], [OUTPUT_DIR / f"cell_highlight_{name}.png"])
 
     print("Saved cell highlight textures")
 
 
 def apply_color_tint(img, tint_color, intensity=0.5):
     """Apply a color tint to an image while preserving some detail."""
-    # Convert to RGBA if needed
-    img = img.convert("RGBA")
-
-    # Create a tinted version
-    r, g, b = tint_color
-    pixels = img.load()
-    width, height = img.size
-
-    for y in range(height):
-        for x in range(width):
-            pr, pg, pb, pa = pixels[x, y]
-            # Blend original color with tint
-            nr = int(pr * (1 - intensity) + r * intensity)
-            ng = int(pg * (1 - intensity) + g * intensity)
-            nb = int(pb * (1 - intensity) + b * intensity)
-            pixels[x, y] = (nr, ng, nb, pa)
-
-    return img
-
-
-def create_ownership_overlays():
-    """Create tile-based ownership overlays for each chapter theme."""
-
-    size = 150
-
-    # Create chapter-specific directories
-    for chapter in [1, 2, 3]:
-        chapter_dir = OUTPUT_DIR / "ownership" / f"chapter_{chapter}"
-        chapter_dir.mkdir(parents=True, exist_ok=True)
-
-    # Also keep default for quick battle
-    default_dir = OUTPUT_DIR / "ownership"
-    default_dir.mkdir(exist_ok=True)
-
-    # === CHAPTER 2 / DEFAULT (Dungeon) ===
-    walls_floors = Image.open(TILES_DIR / "Dungeon_WallsAndFloors.png").convert("RGBA")
-    dungeon_tile = extract_tile(walls_floors, 1, 0)
-
-    def create_dungeon_overlay(tint_color):
-        cell_size_tiles = 4
-        overlay = Image.new("RGBA", (cell_size_tiles * DUNGEON_TILE_SIZE, cell_size_tiles * DUNGEON_TILE_SIZE), (0, 0, 0, 255))
-        for y in range(cell_size_tiles):
-            for x in range(cell_size_tiles):
-                overlay.paste(dungeon_tile, (x * DUNGEON_TILE_SIZE, y * DUNGEON_TILE_SIZE))
-        overlay = apply_color_tint(overlay, tint_color, 0.5)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    # Dungeon overlays
-    for name, color in [("player", (60, 120, 220)), ("enemy", (200, 60, 60)), ("contested", (160, 60, 180))]:
-        overlay = create_dungeon_overlay(color)
-        overlay.save(default_dir / f"{name}.png")
-        overlay.save(OUTPUT_DIR / "ownership" / "chapter_2" / f"{name}.png")
-    print("Saved dungeon ownership overlays (chapter 2 / default)")
-
-    # === CHAPTER 1 (Forest) ===
-    grass_3x3 = Image.open(FOREST_DIR / "grass_3x3.png").convert("RGBA")
-    grass_tile = grass_3x3.crop((0, 0, 48, 48))
-
-    def create_forest_overlay(tint_color):
-        overlay = Image.new("RGBA", (144, 144), (30, 50, 25, 255))
-        for y in range(3):
-            for x in range(3):
-                overlay.paste(grass_tile, (x * 48, y * 48))
-        overlay = apply_color_tint(overlay, tint_color, 0.5)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    for name, color in [("player", (60, 150, 120)), ("enemy", (180, 80, 60)), ("contested", (140, 100, 160))]:
-        overlay = create_forest_overlay(color)
-        overlay.save(OUTPUT_DIR / "ownership" / "chapter_1" / f"{name}.png")
-    print("Saved forest ownership overlays (chapter 1)")
-
-    # === CHAPTER 3 (Cloud) ===
-    cloud_tiles = Image.open(CLOUD_DIR / "cloud_tileset.png").convert("RGBA")
-    cloud_tile = cloud_tiles.crop((32, 32, 48, 48))
-
-    def create_cloud_overlay(tint_color):
-        overlay = Image.new("RGBA", (128, 128), (200, 220, 255, 255))
-        for y in range(8):
-            for x in range(8):
-                overlay.paste(cloud_tile, (x * 16, y * 16), cloud_tile)
-        overlay = apply_color_tint(overlay, tint_color, 0.4)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    for name, color in [("player", (100, 150, 255)), ("enemy", (255, 120, 120)), ("contested", (200, 140, 255))]:
-        overlay = create_cloud_overlay(color)
-        overlay.save(OUTPUT_DIR / "ownership" / "chapter_3" / f"{name}.png")
-    print("Saved cloud ownership overlays (chapter 3)")
+    # Blend every pixel's color with the tint in one array operation, keeping alpha
+    pixels = np.asarray(img.convert("RGBA"))
+    tinted = pixels.copy()
+    tinted[..., :3] = (pixels[..., :3] * (1 - intensity) + np.array(tint_color) * intensity).astype(np.uint8)
+    return Image.fromarray(tinted, "RGBA")
 
 
 def make_opaque_with_border(img, tint_color):
     """Make image fully opaque and add colored border."""
-    pixels = img.load()
-    width, height = img.size
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            pixels[x, y] = (r, g, b, 255)
-
+    img.putalpha(255)
     border = (min(tint_color[0] + 80, 255), min(tint_color[1] + 80, 255), min(tint_color[2] + 80, 255), 255)
-    for i in range(3):
-        for bx in range(width):
-            pixels[bx, i] = border
-            pixels[bx, height - 1 - i] = border
-        for by in range(height):
-            pixels[i, by] = border
-            pixels[width - 1 - i, by] = border
+    paint_border(img, border, 3)
 
 
-def create_field_effect_overlays():
-    """Create tile-based field effect overlays for each chapter theme."""
+def compose_cell(tile, tiles_across, background, masked=False):
+    """Fill a square cell with copies of one tile (an RGBA array) over a background color."""
+    size = tile.shape[1] * tiles_across
+    cell = Image.new("RGBA", (size, size), background)
+    layer = render_tile_map([tile], np.zeros((tiles_across, tiles_across), dtype=np.intp))
+    place_layer(cell, layer, masked=masked)
+    return cell
 
-    size = 150
-    effect_colors = {
-        "thermal": (255, 100, 30),
-        "repair": (50, 200, 80),
-        "boost": (255, 200, 60),
-        "suppression": (80, 40, 120)
-    }
-
-    # Create chapter-specific directories
-    for chapter in [1, 2, 3]:
-        chapter_dir = OUTPUT_DIR / "field_effects" / f"chapter_{chapter}"
-        chapter_dir.mkdir(parents=True, exist_ok=True)
-
-    # Default directory
-    default_dir = OUTPUT_DIR / "field_effects"
-    default_dir.mkdir(exist_ok=True)
-
-    # === CHAPTER 2 / DEFAULT (Dungeon) ===
-    walls_floors = Image.open(TILES_DIR / "Dungeon_WallsAndFloors.png").convert("RGBA")
-    dungeon_tile = extract_tile(walls_floors, 2, 0)
-
-    def create_dungeon_effect(tint_color):
-        cell_size_tiles = 4
-        overlay = Image.new("RGBA", (cell_size_tiles * DUNGEON_TILE_SIZE, cell_size_tiles * DUNGEON_TILE_SIZE), (0, 0, 0, 255))
-        for y in range(cell_size_tiles):
-            for x in range(cell_size_tiles):
-                overlay.paste(dungeon_tile, (x * DUNGEON_TILE_SIZE, y * DUNGEON_TILE_SIZE))
-        overlay = apply_color_tint(overlay, tint_color, 0.6)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    for name, color in effect_colors.items():
-        overlay = create_dungeon_effect(color)
-        overlay.save(default_dir / f"{name}.png")
-        overlay.save(OUTPUT_DIR / "field_effects" / "chapter_2" / f"{name}.png")
-    print("Saved dungeon field effect overlays (chapter 2 / default)")
-
-    # === CHAPTER 1 (Forest) ===
-    grass_3x3 = Image.open(FOREST_DIR / "grass_3x3.png").convert("RGBA")
-    grass_tile = grass_3x3.crop((48, 0, 96, 48))  # Use different grass variant
-
-    def create_forest_effect(tint_color):
-        overlay = Image.new("RGBA", (144, 144), (30, 50, 25, 255))
-        for y in range(3):
-            for x in range(3):
-                overlay.paste(grass_tile, (x * 48, y * 48))
-        overlay = apply_color_tint(overlay, tint_color, 0.55)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    for name, color in effect_colors.items():
-        overlay = create_forest_effect(color)
-        overlay.save(OUTPUT_DIR / "field_effects" / "chapter_1" / f"{name}.png")
-    print("Saved forest field effect overlays (chapter 1)")
-
-    # === CHAPTER 3 (Cloud) ===
-    cloud_tiles = Image.open(CLOUD_DIR / "cloud_tileset.png").convert("RGBA")
-    cloud_tile = cloud_tiles.crop((48, 32, 64, 48))
-
-    def create_cloud_effect(tint_color):
-        overlay = Image.new("RGBA", (128, 128), (200, 220, 255, 255))
-        for y in range(8):
-            for x in range(8):
-                overlay.paste(cloud_tile, (x * 16, y * 16), cloud_tile)
-        overlay = apply_color_tint(overlay, tint_color, 0.5)
-        make_opaque_with_border(overlay, tint_color)
-        return overlay.resize((size, size), Image.NEAREST)
-
-    for name, color in effect_colors.items():
-        overlay = create_cloud_effect(color)
-        overlay.save(OUTPUT_DIR / "field_effects" / "chapter_3" / f"{name}.png")
-    print("Saved cloud field effect overlays (chapter 3)")
+
+def tinted_overlays(base, colors, intensity):
+    """Tint one composed cell background with each color. Returns {name: overlay}."""
+    overlays = {}
+    for name, color in colors.items():
+        overlay = apply_color_tint(base, color, intensity)
+        make_opaque_with_border(overlay, color)
+        overlays[name] = overlay
+    return overlays
 
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Create battle board assets")
+    arg_parser.add_argument("--native", action="store_true",
+                            help="Save boards, cells and overlays at native resolution for engine-side upscaling")
+    arg_parser.add_argument("--spec", type=Path, default=THEME_SPEC_FILE,
+                            help="Theme spec JSON (default: board_themes.json next to this script)")
+    arg_parser.add_argument("--themes", nargs="+", default=None,
+                            help="Only build these themes (default: all themes in the spec)")
+    arg_parser.add_argument("--workers", "-w", type=int, default=None,
+                            help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--dry-run", "-n", action="store_true",
+                            help="List stale targets without building anything")
+    arg_parser.add_argument("--force", "-f", action="store_true",
+                            help="Rebuild every target even if it is up to date")
+    args = arg_parser.parse_args()
+
+    spec = load_theme_spec(args.spec)
+    targets = build_targets(spec, args.themes, args.native)
+
     print("Creating battle board assets...")
-    print("\n=== Creating Boards ===")
-    create_battle_board()  # Dungeon/Arena for Chapter 2
-    create_forest_board()  # Forest for Chapter 1
-    create_cloud_board()   # Cloud/Sky for Chapter 3+
-
-    print("\n=== Creating Grid Cells ===")
-    create_grid_cell_tile()
-
-    print("\n=== Creating Overlays ===")
-    create_cell_highlight()
-    create_ownership_overlays()
-    create_field_effect_overlays()
+    build(targets, args.workers or os.cpu_count(), args.force, args.dry_run)
     print("\nDone!")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+PNG Optimizer
+Shared PNG encoding for generated assets, plus a batch re-encoder for existing files.
+
+Every PNG written by the asset tools goes through save_png(), which:
+  - stores images with 256 colors or fewer as an indexed (palette) PNG, losslessly
+  - compresses with optimize=True at the highest zlib level
+  - drops metadata chunks (text, ICC profile, EXIF, DPI)
+
+Usage:
+    python png_optimizer.py ../assets/board
+    python png_optimizer.py ../assets --workers 8
+    python png_optimizer.py ../assets/sprites --dry-run
+"""
+
+import argparse
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install Pillow")
+    sys.exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+MAX_PALETTE_COLORS = 256
+COMPRESS_LEVEL = 9
+SUPPORTED_MODES = ("RGB", "RGBA", "P", "L", "LA")  # Anything else is left untouched
+
+
+def to_palette(img: Image.Image) -> Image.Image | None:
+    """
+    Convert an RGB/RGBA image to mode "P" without changing any pixel.
+    Returns None if the image has more than 256 distinct colors.
+    """
+    if img.getcolors(MAX_PALETTE_COLORS) is None:
+        return None
+
+    has_alpha = img.mode == "RGBA"
+    pixels = np.asarray(img.convert("RGBA" if has_alpha else "RGB"))
+    channels = pixels.shape[2]
+
+    # Pack each pixel into one integer (R high byte first) so unique() is a flat sort;
+    # the palette order matches a row-wise unique over (R, G, B[, A])
+    shifts = np.arange(channels - 1, -1, -1, dtype=np.uint32) * 8
+    packed = (pixels.reshape(-1, channels).astype(np.uint32) << shifts).sum(axis=1, dtype=np.uint32)
+    keys, indices = np.unique(packed, return_inverse=True)
+    colors = (keys[:, None] >> shifts) & 0xFF
+
+    indexed = Image.fromarray(indices.reshape(pixels.shape[:2]).astype(np.uint8), "P")
+    indexed.putpalette(colors[:, :3].astype(np.uint8).tobytes())
+    if has_alpha and (colors[:, 3] < 255).any():
+        indexed.info["transparency"] = colors[:, 3].astype(np.uint8).tobytes()
+    return indexed
+
+
+def encode_png(img: Image.Image) -> tuple[bytes, bool]:
+    """
+    Encode an image as an optimized PNG. Returns (png_bytes, used_palette).
+    Raises ValueError for modes that would lose data as RGBA (e.g. I;16, 1, CMYK).
+    """
+    if img.mode not in SUPPORTED_MODES:
+        raise ValueError(f"unsupported image mode {img.mode}")
+    # Palettes and tRNS color keys become real alpha, so clearing info below keeps transparency
+    if img.mode in ("P", "LA") or "transparency" in img.info:
+        img = img.convert("RGBA")
+
+    indexed = to_palette(img) if img.mode in ("RGB", "RGBA") else None
+    out = indexed if indexed is not None else img
+
+    # Build a clean copy so nothing from the source's info dict is written back
+    clean = out.copy()
+    clean.info = {}
+    params = {"optimize": True, "compress_level": COMPRESS_LEVEL}
+    if indexed is not None and "transparency" in indexed.info:
+        params["transparency"] = indexed.info["transparency"]
+
+    buffer = io.BytesIO()
+    clean.save(buffer, format="PNG", **params)
+    return buffer.getvalue(), indexed is not None
+
+
+def save_png(img: Image.Image, path: Path) -> int:
+    """Save an image as an optimized PNG. Returns the number of bytes written."""
+    data, _ = encode_png(img)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return len(data)
+
+
+def optimize_file(path: str, dry_run: bool = False) -> tuple[str, int, int, bool]:
+    """
+    Re-encode one PNG in place if that makes it smaller.
+    Returns (path, bytes_before, bytes_after, used_palette).
+    """
+    before = os.path.getsize(path)
+    try:
+        with Image.open(path) as img:
+            img.load()
+            data, used_palette = encode_png(img)
+    except Exception as e:
+        print(f"  Skipped {path}: {e}")
+        return path, before, before, False
+
+    if len(data) >= before:
+        return path, before, before, False
+    if not dry_run:
+        Path(path).write_bytes(data)
+    return path, before, len(data), used_palette
+
+
+def optimize_pngs(paths: list[str], workers: int | None = None, dry_run: bool = False) -> dict:
+    """Re-encode many PNGs across a process pool and summarize the savings."""
+    report = {"files": len(paths), "changed": 0, "palettized": 0, "bytes_before": 0, "bytes_after": 0}
+    if not paths:
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        dry_run_flags = [dry_run] * len(paths)
+        for path, before, after, used_palette in pool.map(optimize_file, paths, dry_run_flags, chunksize=16):
+            report["bytes_before"] += before
+            report["bytes_after"] += after
+            if after < before:
+                report["changed"] += 1
+                if used_palette:
+                    report["palettized"] += 1
+    return report
+
+
+def find_pngs(roots: list[Path]) -> list[str]:
+    """Collect every .png below the given files/folders."""
+    paths = []
+    for root in roots:
+        if root.is_file() and root.suffix.lower() == ".png":
+            paths.append(str(root))
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            paths.extend(os.path.join(dirpath, f) for f in filenames if f.lower().endswith(".png"))
+    return sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Losslessly shrink PNG assets")
+    parser.add_argument("paths", nargs="+", help="PNG files or folders to process")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--dry-run", "-n", action="store_true", help="Report savings without rewriting files")
+
+    args = parser.parse_args()
+
+    roots = [Path(p) for p in args.paths]
+    for root in roots:
+        if not root.exists():
+            print(f"ERROR: Path not found: {root}")
+            sys.exit(1)
+
+    paths = find_pngs(roots)
+    print(f"Optimizing {len(paths)} PNGs{' (dry run)' if args.dry_run else ''}...")
+    report = optimize_pngs(paths, args.workers, args.dry_run)
+
+    saved = report["bytes_before"] - report["bytes_after"]
+    percent = 100.0 * saved / report["bytes_before"] if report["bytes_before"] else 0.0
+    print(f"Re-encoded {report['changed']} of {report['files']} files ({report['palettized']} as palette PNGs)")
+    print(f"Size: {report['bytes_before'] / 1e6:.2f} MB -> {report['bytes_after'] / 1e6:.2f} MB "
+          f"(saved {saved / 1e6:.2f} MB, {percent:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Extracts frames from video/GIF and assembles them into sprite sheets.
 Usage:
     python sprite_sheet_maker.py input.mp4 output.png --frames 3
     python sprite_sheet_maker.py input.gif output.png --frames 3 --size 128
+    python sprite_sheet_maker.py input.mp4 output.png --frames 3 --select even
 """
 
 import argparse
@@ -18,6 +19,14 @@ except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from png_optimizer import save_png
+
 try:
     import cv2
 except ImportError:
@@ -25,10 +34,100 @@ except ImportError:
     print("WARNING: OpenCV not installed. Video support disabled. Run: pip install opencv-python")
 
 
-def extract_frames_from_gif(gif_path: Path, num_frames: int) -> list[Image.Image]:
-    """Extract evenly spaced frames from a GIF."""
+# Width of the grayscale thumbnails used for motion scoring
+MOTION_THUMB_WIDTH = 64
+
+
+def even_frame_indices(total_frames: int, num_frames: int) -> list[int]:
+    """Return evenly spaced frame indices (the legacy selection)."""
+    if total_frames <= num_frames:
+        return list(range(total_frames))
+    step = total_frames / num_frames
+    return [int(i * step) for i in range(num_frames)]
+
+
+def motion_thumbnail(gray: np.ndarray) -> np.ndarray:
+    """Downscale a grayscale frame to a flat float32 vector for motion scoring."""
+    h, w = gray.shape
+    thumb_w = min(MOTION_THUMB_WIDTH, w)
+    thumb_h = max(1, round(h * thumb_w / w))
+    if cv2 is not None:
+        small = cv2.resize(gray, (thumb_w, thumb_h), interpolation=cv2.INTER_AREA)
+    else:
+        small = np.asarray(Image.fromarray(gray).resize((thumb_w, thumb_h), Image.Resampling.BOX))
+    return small.astype(np.float32).ravel() / 255.0
+
+
+class KeyframeSelector:
+    """
+    Streaming picker for the N most distinctive frames of a clip.
+
+    Frames are offered one at a time in decode order. The selector keeps a pool
+    of at most N frames and the pairwise frame-difference energy (mean absolute
+    difference of their grayscale thumbnails). When the pool is full, a new frame
+    replaces the most redundant member if it is further from the rest of the pool
+    than that member was, so only N full-size frames are ever held in memory.
+    """
+
+    def __init__(self, num_frames: int):
+        self.num_frames = num_frames
+        self.indices: list[int] = []
+        self.frames: list[Image.Image] = []
+        self.thumbs: np.ndarray | None = None
+        self.dist = np.full((num_frames, num_frames), np.inf, dtype=np.float32)
+
+    def offer(self, index: int, thumb: np.ndarray, load_frame) -> bool:
+        """Score a frame and keep it if it adds variety. load_frame() is only called when kept."""
+        count = len(self.indices)
+        if self.thumbs is None:
+            self.thumbs = np.empty((self.num_frames, thumb.size), dtype=np.float32)
+
+        diff = np.abs(self.thumbs[:count] - thumb).mean(axis=1)
+
+        if count < self.num_frames:
+            slot = count
+            self.indices.append(index)
+            self.frames.append(load_frame())
+        else:
+            nearest = self.dist.min(axis=1)
+            slot = int(np.argmin(nearest))
+            others = np.delete(diff, slot)
+            if others.size == 0 or others.min() <= nearest[slot]:
+                return False
+            self.indices[slot] = index
+            self.frames[slot] = load_frame()
+
+        self.thumbs[slot] = thumb
+        self.dist[slot, :count] = diff
+        self.dist[:count, slot] = diff
+        self.dist[slot, slot] = np.inf
+        return True
+
+    def selected(self) -> list[tuple[int, Image.Image]]:
+        """Return the kept (index, frame) pairs in playback order."""
+        return sorted(zip(self.indices, self.frames), key=lambda pair: pair[0])
+
+
+def extract_frames_from_gif(gif_path: Path, num_frames: int, select: str = "motion") -> list[Image.Image]:
+    """Extract frames from a GIF, picked by motion scoring or even spacing."""
     gif = Image.open(gif_path)
 
+    if select == "motion":
+        # Single linear pass: score every frame, keep only the distinctive ones
+        selector = KeyframeSelector(num_frames)
+        index = 0
+        while True:
+            thumb = motion_thumbnail(np.asarray(gif.convert("L")))
+            selector.offer(index, thumb, lambda: gif.convert("RGBA").copy())
+            index += 1
+            try:
+                gif.seek(gif.tell() + 1)
+            except EOFError:
+                break
+        picked = selector.selected()
+        print(f"Motion-selected frames: {[i for i, _ in picked]} of {index}")
+        return [frame for _, frame in picked]
+
     # Count total frames
     total_frames = 0
     try:
@@ -39,11 +138,7 @@ def extract_frames_from_gif(gif_path: Path, num_frames: int) -> list[Image.Image
         pass
 
     # Calculate which frames to extract (evenly spaced)
-    if total_frames <= num_frames:
-        frame_indices = list(range(total_frames))
-    else:
-        step = total_frames / num_frames
-        frame_indices = [int(i * step) for i in range(num_frames)]
+    frame_indices = even_frame_indices(total_frames, num_frames)
 
     # Extract frames
     frames = []
@@ -61,8 +156,8 @@ def extract_frames_from_gif(gif_path: Path, num_frames: int) -> list[Image.Image
     return frames
 
 
-def extract_frames_from_video(video_path: Path, num_frames: int) -> list[Image.Image]:
-    """Extract evenly spaced frames from a video file."""
+def extract_frames_from_video(video_path: Path, num_frames: int, select: str = "motion") -> list[Image.Image]:
+    """Extract frames from a video file, picked by motion scoring or even spacing."""
     if cv2 is None:
         print("ERROR: OpenCV required for video files. Run: pip install opencv-python")
         sys.exit(1)
@@ -74,22 +169,36 @@ def extract_frames_from_video(video_path: Path, num_frames: int) -> list[Image.I
         print(f"ERROR: Could not read video: {video_path}")
         sys.exit(1)
 
+    def to_image(bgr):
+        # Convert BGR to RGB
+        frame_rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        return Image.fromarray(frame_rgb).convert("RGBA")
+
+    if select == "motion":
+        # Decode sequentially (no seeking) and score each frame as it streams past
+        selector = KeyframeSelector(num_frames)
+        index = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            thumb = motion_thumbnail(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+            selector.offer(index, thumb, lambda: to_image(frame))
+            index += 1
+        cap.release()
+        picked = selector.selected()
+        print(f"Motion-selected frames: {[i for i, _ in picked]} of {index}")
+        return [img for _, img in picked]
+
     # Calculate which frames to extract
-    if total_frames <= num_frames:
-        frame_indices = list(range(total_frames))
-    else:
-        step = total_frames / num_frames
-        frame_indices = [int(i * step) for i in range(num_frames)]
+    frame_indices = even_frame_indices(total_frames, num_frames)
 
     frames = []
     for idx in frame_indices:
         cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
         ret, frame = cap.read()
         if ret:
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb).convert("RGBA")
-            frames.append(img)
+            frames.append(to_image(frame))
 
     cap.release()
     return frames
@@ -154,6 +263,8 @@ def main():
     parser.add_argument("--tolerance", "-t", type=int, default=30, help="Background removal tolerance (default: 30)")
     parser.add_argument("--vertical", "-v", action="store_true", help="Stack frames vertically instead of horizontally")
     parser.add_argument("--preview", "-p", action="store_true", help="Save individual frames as well")
+    parser.add_argument("--select", choices=["motion", "even"], default="motion",
+                        help="Frame selection: most distinctive by motion scoring, or evenly spaced (default: motion)")
 
     args = parser.parse_args()
 
@@ -169,9 +280,9 @@ def main():
     print(f"Processing: {input_path}")
 
     if suffix == ".gif":
-        frames = extract_frames_from_gif(input_path, args.frames)
+        frames = extract_frames_from_gif(input_path, args.frames, args.select)
     elif suffix in [".mp4", ".avi", ".mov", ".webm", ".mkv"]:
-        frames = extract_frames_from_video(input_path, args.frames)
+        frames = extract_frames_from_video(input_path, args.frames, args.select)
     else:
         print(f"ERROR: Unsupported format: {suffix}")
         print("Supported: .gif, .mp4, .avi, .mov, .webm, .mkv")
@@ -191,15 +302,15 @@ def main():
         for i, frame in enumerate(frames):
             frame_resized = frame.copy()
             frame_resized.thumbnail((args.size, args.size), Image.Resampling.LANCZOS)
-            frame_resized.save(preview_dir / f"frame_{i:02d}.png")
+            save_png(frame_resized, preview_dir / f"frame_{i:02d}.png")
         print(f"Saved individual frames to: {preview_dir}")
 
     # Create and save sprite sheet
     sheet = create_sprite_sheet(frames, args.size, horizontal=not args.vertical)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    sheet.save(output_path)
+    size = save_png(sheet, output_path)
 
-    print(f"Sprite sheet saved: {output_path}")
+    print(f"Sprite sheet saved: {output_path} ({size / 1024:.1f} KB)")
     print(f"Dimensions: {sheet.width}x{sheet.height} ({len(frames)} frames @ {args.size}x{args.size})")
 
 